@@ -226,8 +226,50 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'pivy_chat.monitor_intraday_alerts',
         'schedule': crontab(minute='0,30', hour='14-20', day_of_week='1-5'),
     },
+    # Sharded full market scan: hourly, 9:30 AM–4:00 PM ET (13:30–21:00 UTC), Mon–Fri
+    'market-scan': {
+        'task': 'financial_data.start_market_scan',
+        'schedule': crontab(minute=35, hour='13-20', day_of_week='1-5'),
+    },
+    # Incremental market scan update from new 5m bars: every minute during the session
+    'market-scan-update': {
+        'task': 'financial_data.update_market_scan',
+        'schedule': crontab(minute='*', hour='13-20', day_of_week='1-5'),
+        'options': {'expires': 55},
+    },
+    # Closing scan update: 4:05 PM ET in EST (21:05 UTC), Mon–Fri. The updates above stop
+    # at 20:59 UTC, before the 21:00 UTC winter close; in EDT (20:00 UTC close) they already cover it
+    'market-scan-close-update': {
+        'task': 'financial_data.update_market_scan',
+        'schedule': crontab(hour=21, minute=5, day_of_week='1-5'),
+        'options': {'expires': 55},
+    },
+    # Historical signals precompute: after the close, 4:30 PM ET (21:30 UTC), Mon–Fri
+    'historical-signals-precompute': {
+        'task': 'financial_data.precompute_historical_signals',
+        'schedule': crontab(hour=21, minute=30, day_of_week='1-5'),
+    },
+    # 52-week / 200-day window roll: 4:45 PM ET (21:45 UTC), Mon–Fri, after the closing
+    # scan update so the session is complete in both EST and EDT
+    'long-window-refresh': {
+        'task': 'financial_data.refresh_long_windows',
+        'schedule': crontab(hour=21, minute=45, day_of_week='1-5'),
+    },
+    # Reference data (names, sectors, P/E) refresh: 5:00 PM ET (22:00 UTC), Mon–Fri
+    'reference-data-refresh': {
+        'task': 'financial_data.refresh_reference_data',
+        'schedule': crontab(hour=22, minute=0, day_of_week='1-5'),
+    },
+    # Default backtest summaries: 5:30 PM ET (22:30 UTC), Mon–Fri
+    'backtest-precompute': {
+        'task': 'financial_data.precompute_backtest_summaries',
+        'schedule': crontab(hour=22, minute=30, day_of_week='1-5'),
+    },
 }
 
+# Symbol listing for search (symbol,name,quote_type,exchange CSV); defaults to financial_data/data/symbol_listing.csv
+SYMBOL_LISTING_FILE = getenv('SYMBOL_LISTING_FILE')
+
 # Email settings
 EMAIL_BACKEND = getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = getenv('EMAIL_HOST', 'mail.spacemail.com')
@@ -0,0 +1,336 @@
+"""
+Vectorized backtests of the published signals over the scan universe.
+
+Signals become a (tickers x bars) matrix of position targets: +1 after a
+BUY, -1 after a SELL (0 when only long positions are allowed), NaN where the
+previous target carries on (no signal, or HOLD). From there everything is
+array math over the whole universe at once:
+
+- positions: forward-filled targets, entered `delay` bars after the signal
+- returns: close-to-close, less `cost_bps` on every change in position
+- equity curves and drawdowns: cumulative products / running maxima
+- trades and hit rates: runs of an unchanged non-zero position, summed with
+  np.bincount over run ids
+
+The signal source is 'overall': calculate_overall_signal evaluated on
+every bar (RSI, MACD, stochastic and moving-average votes over the same
+indicator settings as calculate_batch_summary), which only looks at bars up
+to the one it is evaluated on. The historical signal markers are not a
+source: their votes are normalized by the series maximum and mean volume
+and the consensus passes pick between signals using later ones, so a marker
+depends on bars after it and a backtest of them would see future prices.
+
+Daily bars come from the bar store when it already covers the period;
+anything else is fetched with batched yf.download calls.
+
+Run through the management command, or through the summary endpoint, which
+serves stored results computed by a background job (see backtest_store):
+    python manage.py backtest_signals --source overall --period 10y
+    GET /api/market-data/backtest/summary/?source=overall&period=10y
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+BACKTEST_SOURCES = ('overall',)
+BACKTEST_MODES = ('long_only', 'long_short')
+BACKTEST_PERIODS = ('1y', '2y', '5y', '10y')
+
+TRADING_DAYS = 252
+
+# Symbols per yf.download call when the bar store doesn't cover the period
+BACKTEST_DOWNLOAD_SIZE = 100
+
+# Floor for log returns of positions that lose everything
+_MIN_RETURN = -0.999999
+
+BAR_FIELDS = ('High', 'Low', 'Close', 'Volume')
+
+
+def forward_fill(values):
+    """Carry the last non-NaN value forward along the bar axis of a (tickers x bars) array."""
+    values = np.asarray(values, dtype=np.float64)
+    bars = np.arange(values.shape[-1])
+    last = np.maximum.accumulate(np.where(np.isnan(values), 0, bars), axis=-1)
+    filled = np.take_along_axis(values, last, axis=-1)
+    # Bars before the first value stay NaN
+    return filled
+
+
+def align_bars(frames):
+    """
+    Stack {symbol: daily DataFrame} into date-aligned (tickers x bars)
+    arrays. Returns (symbols, dates, {field: array}); NaN where a symbol has
+    no bar for a date.
+    """
+    symbols = list(frames)
+    by_date = {}
+    for symbol, df in frames.items():
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        df = df.set_axis(index.normalize())
+        by_date[symbol] = df[~df.index.duplicated(keep='last')]
+
+    dates = pd.DatetimeIndex(sorted(set().union(*(df.index for df in by_date.values())))) if frames else pd.DatetimeIndex([])
+    arrays = {
+        field: np.vstack([by_date[s][field].reindex(dates).to_numpy(dtype=np.float64) for s in symbols])
+        if symbols else np.empty((0, 0))
+        for field in BAR_FIELDS
+    }
+    return symbols, dates, arrays
+
+
+def overall_signal_targets(close, high, low):
+    """
+    calculate_overall_signal for every bar of a (tickers x bars) matrix:
+    +1 (BUY), -1 (SELL) or NaN (HOLD).
+    """
+    c = pd.DataFrame(np.asarray(close, dtype=np.float64).T)
+    h = pd.DataFrame(np.asarray(high, dtype=np.float64).T)
+    l = pd.DataFrame(np.asarray(low, dtype=np.float64).T)
+
+    # RSI (SMA-smoothed, as calculate_rsi)
+    delta = c.diff()
+    gain = delta.where(delta > 0, 0).where(c.notna()).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).where(c.notna()).rolling(window=14).mean()
+    rsi = (100 - (100 / (1 + gain / loss))).fillna(50).round(2).to_numpy()
+
+    # MACD histogram
+    ema12 = c.ewm(span=12, adjust=False).mean()
+    ema26 = c.ewm(span=26, adjust=False).mean()
+    macd_line = ema12 - ema26
+    histogram = (macd_line - macd_line.ewm(span=9, adjust=False).mean()).round(4).to_numpy()
+
+    # Stochastic %K
+    lowest = l.rolling(window=14).min()
+    highest = h.rolling(window=14).max()
+    k = (100 * (c - lowest) / (highest - lowest)).fillna(50).round(2).to_numpy()
+
+    # Moving averages: bullish/bearish beyond a 2% band
+    price = c.to_numpy()
+    ma_votes = np.zeros(price.shape)
+    for ma in (c.rolling(window=20).mean(), c.rolling(window=50).mean(), ema12, ema26):
+        ma = ma.to_numpy()
+        ma_votes += (price > ma * 1.02).astype(float) - (price < ma * 0.98)
+
+    score = (
+        25 * (np.where(rsi <= 30, 1, 0) - np.where(rsi >= 70, 1, 0))
+        + 30 * np.sign(np.nan_to_num(histogram))
+        + 20 * (np.where(k <= 20, 1, 0) - np.where(k >= 80, 1, 0))
+        + 25 * np.sign(ma_votes)
+    ) / 100
+    targets = np.where(score > 0.3, 1.0, np.where(score < -0.3, -1.0, np.nan))
+    targets[np.isnan(price)] = np.nan
+    return targets.T
+
+
+def run_backtest(close, targets, delay=1, cost_bps=0.0, mode='long_only'):
+    """
+    Backtest position targets against closes, both (tickers x bars).
+
+    Returns a dict of (tickers x bars) arrays: 'positions', 'returns'
+    (strategy, net of costs), 'equity', 'drawdown', 'valid' (bars with a
+    price), plus per-ticker 'trades' and 'wins'.
+    """
+    close = forward_fill(close)
+    targets = np.asarray(targets, dtype=np.float64)
+    if mode == 'long_only':
+        targets = np.where(targets < 0, 0.0, targets)
+
+    held = np.nan_to_num(forward_fill(targets), nan=0.0)
+    positions = np.zeros_like(held)
+    if delay > 0:
+        positions[:, delay:] = held[:, :-delay]
+    else:
+        positions = held
+    valid = ~np.isnan(close)
+    positions[~valid] = 0.0
+
+    bar_returns = np.zeros_like(close)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bar_returns[:, 1:] = close[:, 1:] / close[:, :-1] - 1
+    bar_returns = np.nan_to_num(bar_returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+    turnover = np.abs(np.diff(positions, axis=1, prepend=0.0))
+    returns = positions * bar_returns - turnover * cost_bps / 10_000
+    equity = np.cumprod(1 + returns, axis=1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=1) - 1
+
+    # Trades: runs of the same non-zero position, one id per run across the matrix
+    tickers, bars = positions.shape
+    starts = turnover > 0
+    starts[:, 0] = True
+    run_ids = np.cumsum(starts.ravel()) - 1
+    in_market = (positions != 0).ravel()
+    runs = int(run_ids[-1]) + 1 if run_ids.size else 0
+    log_returns = np.log1p(np.maximum(returns, _MIN_RETURN)).ravel()
+    run_log_return = np.bincount(run_ids, weights=log_returns * in_market, minlength=runs)
+    is_trade = np.bincount(run_ids, weights=in_market, minlength=runs) > 0
+    run_ticker = np.empty(runs, dtype=np.int64)
+    run_ticker[run_ids] = np.repeat(np.arange(tickers), bars)
+
+    return {
+        'positions': positions,
+        'returns': returns,
+        'equity': equity,
+        'drawdown': drawdown,
+        'valid': valid,
+        'close': close,
+        'trades': np.bincount(run_ticker[is_trade], minlength=tickers),
+        'wins': np.bincount(run_ticker[is_trade & (run_log_return > 0)], minlength=tickers),
+    }
+
+
+def _stats(returns, valid):
+    """Per-row return statistics for (rows x bars) strategy returns."""
+    active = valid.sum(axis=1)
+    equity_end = np.prod(1 + np.where(valid, returns, 0.0), axis=1)
+    mean = np.where(active > 0, np.sum(np.where(valid, returns, 0.0), axis=1) / np.maximum(active, 1), 0.0)
+    variance = np.sum(np.where(valid, (returns - mean[:, None]) ** 2, 0.0), axis=1) / np.maximum(active - 1, 1)
+    std = np.sqrt(variance)
+    years = active / TRADING_DAYS
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cagr = np.where(years > 0, np.power(np.maximum(equity_end, 0), 1 / np.maximum(years, 1e-9)) - 1, 0.0)
+        sharpe = np.where(std > 0, mean / std * np.sqrt(TRADING_DAYS), 0.0)
+    equity = np.cumprod(1 + np.where(valid, returns, 0.0), axis=1)
+    max_drawdown = (equity / np.maximum.accumulate(equity, axis=1) - 1).min(axis=1) if equity.size else np.zeros(0)
+    return {
+        'totalReturn': equity_end - 1,
+        'cagr': cagr,
+        'volatility': std * np.sqrt(TRADING_DAYS),
+        'sharpe': sharpe,
+        'maxDrawdown': max_drawdown,
+    }
+
+
+def _rounded(value, digits=4):
+    value = float(value)
+    return round(value, digits) if np.isfinite(value) else None
+
+
+def summarize(symbols, dates, result):
+    """JSON-ready summary: equal-weight portfolio, per-ticker medians and per-ticker rows."""
+    valid = result['valid']
+    returns = result['returns']
+    positions = result['positions']
+    close = result['close']
+
+    per_ticker = _stats(returns, valid)
+    active = valid.sum(axis=1)
+    exposure = np.where(active > 0, ((positions != 0) & valid).sum(axis=1) / np.maximum(active, 1), 0.0)
+    trades = result['trades']
+    hit_rate = np.where(trades > 0, result['wins'] / np.maximum(trades, 1), np.nan)
+    first = np.argmax(valid, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        buy_hold = close[:, -1] / close[np.arange(len(symbols)), first] - 1 if len(symbols) else np.zeros(0)
+
+    # Equal weight across the tickers trading on each bar
+    counts = valid.sum(axis=0)
+    portfolio_returns = np.where(counts > 0, np.where(valid, returns, 0.0).sum(axis=0) / np.maximum(counts, 1), 0.0)
+    portfolio = {key: _rounded(values[0]) for key, values in
+                 _stats(portfolio_returns[None, :], (counts > 0)[None, :]).items()}
+    portfolio['trades'] = int(trades.sum())
+    portfolio['hitRate'] = _rounded(result['wins'].sum() / trades.sum()) if trades.sum() else None
+    portfolio['exposure'] = _rounded(exposure.mean()) if len(symbols) else None
+
+    rows = []
+    for i, symbol in enumerate(symbols):
+        row = {'symbol': symbol}
+        row.update({key: _rounded(values[i]) for key, values in per_ticker.items()})
+        row.update({
+            'buyHoldReturn': _rounded(buy_hold[i]),
+            'trades': int(trades[i]),
+            'hitRate': _rounded(hit_rate[i]),
+            'exposure': _rounded(exposure[i]),
+        })
+        rows.append(row)
+    rows.sort(key=lambda r: r['totalReturn'] if r['totalReturn'] is not None else -np.inf, reverse=True)
+
+    median = {}
+    for key in ('totalReturn', 'cagr', 'sharpe', 'maxDrawdown', 'hitRate', 'buyHoldReturn'):
+        values = [r[key] for r in rows if r[key] is not None]
+        median[key] = _rounded(np.median(values)) if values else None
+
+    return {
+        'symbols': len(symbols),
+        'bars': len(dates),
+        'start': dates[0].strftime('%Y-%m-%d') if len(dates) else None,
+        'end': dates[-1].strftime('%Y-%m-%d') if len(dates) else None,
+        'portfolio': portfolio,
+        'median': median,
+        'tickers': rows,
+    }
+
+
+def _covers(df, period):
+    """Whether daily bars reach back (within a week) to the start of a yfinance period."""
+    if df is None or df.empty:
+        return False
+    years = int(period.rstrip('y'))
+    last = pd.Timestamp(df.index[-1])
+    return pd.Timestamp(df.index[0]) <= last - pd.DateOffset(years=years) + pd.Timedelta(days=7)
+
+
+def load_backtest_bars(symbols, period='10y'):
+    """Daily bars {symbol: DataFrame}: from the bar store when it covers `period`, else downloaded in batches."""
+    from .bar_store import bar_store
+    from .indicators import download_bars_batch
+
+    frames = {}
+    missing = []
+    for symbol in symbols:
+        bars = bar_store.get(symbol)
+        df = bars.frame('1d', period) if bars is not None else None
+        if _covers(df, period):
+            frames[symbol] = df
+        else:
+            missing.append(symbol)
+
+    for start in range(0, len(missing), BACKTEST_DOWNLOAD_SIZE):
+        chunk = missing[start:start + BACKTEST_DOWNLOAD_SIZE]
+        try:
+            frames.update(download_bars_batch(chunk, period, '1d'))
+        except Exception as e:
+            print(f"[backtest] Bar download failed for {len(chunk)} symbols: {e}")
+    return frames
+
+
+def backtest_universe(symbols=None, period='10y', source='overall', mode='long_only', cost_bps=0.0,
+                      delay=1, frames=None):
+    """
+    Load bars, build signal targets and backtest. Returns summarize() output
+    plus the parameters and per-stage timings. `frames` skips loading.
+    """
+    from .services import SCAN_UNIVERSE
+
+    symbols = symbols or SCAN_UNIVERSE
+
+    started = time.perf_counter()
+    if frames is None:
+        frames = load_backtest_bars(symbols, period)
+    loaded = time.perf_counter()
+
+    names, dates, arrays = align_bars({s: frames[s] for s in symbols if s in frames})
+    targets = overall_signal_targets(arrays['Close'], arrays['High'], arrays['Low'])
+    signalled = time.perf_counter()
+
+    summary = summarize(names, dates, run_backtest(arrays['Close'], targets, delay, cost_bps, mode))
+    finished = time.perf_counter()
+
+    summary.update({
+        'source': source,
+        'period': period,
+        'mode': mode,
+        'costBps': cost_bps,
+        'delay': delay,
+        'missing': [s for s in symbols if s not in frames],
+        'timings': {
+            'loadSeconds': round(loaded - started, 3),
+            'signalSeconds': round(signalled - loaded, 3),
+            'backtestSeconds': round(finished - signalled, 3),
+        },
+    })
+    return summary
+
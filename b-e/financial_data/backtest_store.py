@@ -0,0 +1,118 @@
+"""
+Result store and job queue for universe backtest summaries.
+
+A summary runs backtest_universe() over the whole scan universe (batched
+multi-year downloads), which is far too slow for a request. Summaries are
+stored in BacktestSummary per parameter set and computed by a Celery job,
+with the same job rows as the historical signals store (result_jobs):
+
+- request_summary() returns the stored summary while it is fresh, otherwise
+  queues (or reuses) a job and returns a pending status with the job id and
+  the last stored summary, if any.
+- Daily bars only change at the close, so a summary stays fresh until the
+  next session close passes; while the market is open it is reused for
+  BACKTEST_INTRADAY_TTL.
+- cost_bps is limited to BACKTEST_COST_BPS, so the parameter sets (and the
+  stored rows, one per set) are bounded.
+- precompute_summaries() refreshes BACKTEST_PRECOMPUTE after the close so
+  the default views are served from the store.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from .models import BacktestSummary
+from .result_jobs import ResultJobs
+
+logger = logging.getLogger(__name__)
+
+# Costs per position change (basis points) the endpoint accepts
+BACKTEST_COST_BPS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# How long a summary computed during market hours is reused
+BACKTEST_INTRADAY_TTL = timedelta(hours=1)
+
+# A pending job older than this is assumed lost and queued again
+BACKTEST_JOB_TIMEOUT = timedelta(minutes=30)
+
+# Suggested client poll interval while a job is pending (seconds)
+BACKTEST_POLL_SECONDS = 5
+
+# (period, source, mode, cost_bps) sets recomputed after the close
+BACKTEST_PRECOMPUTE = (
+    ('10y', 'overall', 'long_only', 0),
+    ('10y', 'overall', 'long_short', 0),
+)
+
+
+def _key(period, source, mode, cost_bps):
+    return {'period': period, 'source': source, 'mode': mode, 'cost_bps': cost_bps}
+
+
+def serialize_summary(result):
+    """API body for a stored summary (pending, complete or failed)."""
+    body = dict(result.summary) if result.status == 'complete' else {}
+    body.update({
+        'status': result.status,
+        'job_id': result.job_id,
+        'error': result.error or None,
+    })
+    return body
+
+
+def compute_and_store(period, source, mode, cost_bps, job_id=None):
+    """
+    Run backtest_universe and store the summary, filling in the pending row
+    for `job_id` if given. Older finished rows for the parameter set are
+    replaced; a failure keeps the last complete summary. Returns the row.
+    """
+    from .backtest import backtest_universe
+
+    key = _key(period, source, mode, cost_bps)
+    result = jobs.job_row(key, job_id)
+    try:
+        summary = backtest_universe(period=period, source=source, mode=mode, cost_bps=float(cost_bps))
+    except Exception as e:
+        logger.warning("Backtest %s failed: %s", key, e)
+        result.summary = {}
+        return jobs.save_failed(result, key, str(e))
+
+    summary['generatedAt'] = int(time.time() * 1000)
+    result.status, result.summary, result.error = 'complete', summary, ''
+    return jobs.save(result, key, status__in=('complete', 'failed'))
+
+
+jobs = ResultJobs(
+    BacktestSummary,
+    key_fields=('period', 'source', 'mode', 'cost_bps'),
+    task='compute_backtest_summary_task',
+    compute=compute_and_store,
+    serialize=serialize_summary,
+    stale_fields=lambda stored: stored.summary,
+    intraday_ttl=BACKTEST_INTRADAY_TTL,
+    job_timeout=BACKTEST_JOB_TIMEOUT,
+    poll_seconds=BACKTEST_POLL_SECONDS,
+)
+
+
+def request_summary(period='10y', source='overall', mode='long_only', cost_bps=0):
+    """
+    Endpoint entry point: a fresh stored summary, or a pending status (with
+    the previous summary marked stale while the new job runs).
+    """
+    return jobs.request(_key(period, source, mode, cost_bps))
+
+
+def precompute_summaries(parameter_sets=BACKTEST_PRECOMPUTE):
+    """
+    Recompute and store each (period, source, mode, cost_bps) set. Failures
+    are stored per set and do not stop the run. Returns (succeeded, failed).
+    """
+    succeeded = failed = 0
+    for period, source, mode, cost_bps in parameter_sets:
+        if compute_and_store(period, source, mode, cost_bps).status == 'complete':
+            succeeded += 1
+        else:
+            failed += 1
+    logger.info("Backtest precompute: %d stored, %d failed", succeeded, failed)
+    return succeeded, failed
@@ -0,0 +1,368 @@
+"""
+In-memory OHLCV bar store with precomputed multi-resolution rollups.
+
+Each symbol keeps one set of NumPy arrays per resolution in the chain
+5m -> 15m -> 1h -> 4h -> 1d -> 1w. Yahoo only serves 5m bars for ~60 days
+and 1h bars for ~2 years, so a symbol is seeded once from the finest
+resolution Yahoo provides for each range (5m/1mo, 1h/1y, 1d/2y) and the
+coarser levels are rolled up from those. After that, the 5m bars since
+the last stored one are appended and only the affected tail buckets of
+every coarser level are re-aggregated, so every (period, interval)
+combination the indicators endpoint supports is a slice of an existing
+array - no resample() and no extra download per request.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .invalid_symbols import history_error, is_invalid, is_missing_symbol_error, record_hit, record_miss
+
+MINUTE_MS = 60 * 1000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+
+# Rollup chain, finest first. Each level is aggregated from the one before it.
+RESOLUTIONS = ['5m', '15m', '1h', '4h', '1d', '1w']
+
+RESOLUTION_WIDTH_MS = {
+    '5m': 5 * MINUTE_MS,
+    '15m': 15 * MINUTE_MS,
+    '1h': HOUR_MS,
+    '4h': 4 * HOUR_MS,
+    '1d': DAY_MS,
+    '1w': 7 * DAY_MS,
+}
+
+# Levels seeded directly from Yahoo: {resolution: (yf_period, yf_interval)}
+# 15m, 4h and 1w are always rolled up from 5m, 1h and 1d respectively.
+SEED_SOURCES = {
+    '5m': ('1mo', '5m'),
+    '1h': ('1y', '1h'),
+    '1d': ('2y', '1d'),
+}
+
+# 1970-01-05 was a Monday - weekly buckets start on Monday like yfinance '1wk'
+WEEK_ANCHOR_MS = 4 * DAY_MS
+
+# How long the finest level is retained once new bars are appended
+BASE_RETENTION_MS = 60 * DAY_MS
+
+BAR_REFRESH_SECONDS = 60  # Append new 5m bars at most once a minute per symbol
+
+# Yahoo serves 5m bars for ~60 days; a symbol idle for longer is reseeded
+# because the gap since its last bar can no longer be filled
+REFRESH_MAX_GAP_MS = 55 * DAY_MS
+MAX_SYMBOLS = 500  # Least recently used symbols are evicted past this
+
+FIELDS = ['open', 'high', 'low', 'close', 'volume']
+COLUMNS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+
+def _empty_level():
+    level = {'ts': np.empty(0, dtype=np.int64), 'local': np.empty(0, dtype=np.int64)}
+    for field in FIELDS:
+        level[field] = np.empty(0, dtype=np.float64)
+    return level
+
+
+def _frame_to_level(df):
+    """Convert a yfinance OHLCV DataFrame to a level dict of arrays."""
+    df = df.dropna(subset=['Close'])
+    index = pd.DatetimeIndex(df.index).as_unit('ms')
+    if index.tz is not None:
+        ts = index.tz_convert('UTC').tz_localize(None).asi8
+        local = index.tz_localize(None).asi8
+    else:
+        ts = index.asi8
+        local = ts.copy()
+    level = {'ts': ts.astype(np.int64), 'local': local.astype(np.int64)}
+    for field, column in COLUMNS.items():
+        if column in df.columns:
+            level[field] = df[column].to_numpy(dtype=np.float64)
+        else:
+            level[field] = np.zeros(len(df), dtype=np.float64)
+    return level
+
+
+def _slice_level(level, start, stop=None):
+    return {key: values[start:stop] for key, values in level.items()}
+
+
+def _concat_levels(head, tail):
+    return {key: np.concatenate([head[key], tail[key]]) for key in head}
+
+
+def _bucket_ids(local, resolution, anchor):
+    """Integer bucket id of each bar for the given resolution."""
+    if resolution == '1w':
+        return (local - WEEK_ANCHOR_MS) // RESOLUTION_WIDTH_MS['1w']
+    return (local - anchor) // RESOLUTION_WIDTH_MS[resolution]
+
+
+def _bucket_start_local(bucket_id, resolution, anchor):
+    if resolution == '1w':
+        return bucket_id * RESOLUTION_WIDTH_MS['1w'] + WEEK_ANCHOR_MS
+    return bucket_id * RESOLUTION_WIDTH_MS[resolution] + anchor
+
+
+def aggregate_level(finer, resolution, anchor=0):
+    """
+    Roll finer bars up into `resolution` buckets with reduceat.
+    Bars must be sorted by time; each run of equal bucket ids is one output bar.
+    """
+    if len(finer['ts']) == 0:
+        return _empty_level()
+
+    ids = _bucket_ids(finer['local'], resolution, anchor)
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.r_[starts[1:], len(ids)]
+
+    bucket_local = _bucket_start_local(ids[starts], resolution, anchor)
+    # Offset between wall-clock and UTC of the first bar in each bucket
+    utc_offset = finer['local'][starts] - finer['ts'][starts]
+
+    return {
+        'ts': (bucket_local - utc_offset).astype(np.int64),
+        'local': bucket_local.astype(np.int64),
+        'open': finer['open'][starts],
+        'high': np.maximum.reduceat(finer['high'], starts),
+        'low': np.minimum.reduceat(finer['low'], starts),
+        'close': finer['close'][ends - 1],
+        'volume': np.add.reduceat(finer['volume'], starts),
+    }
+
+
+class SymbolBars:
+    """All resolutions for one symbol plus the bucket anchors they were built with."""
+
+    def __init__(self, symbol, tz=None):
+        self.symbol = symbol
+        self.tz = tz
+        self.levels = {resolution: _empty_level() for resolution in RESOLUTIONS}
+        # Bucket origin (wall-clock ms modulo width) per resolution. US equity
+        # hourly bars start at :30, so the 1h anchor is detected from seed data.
+        self.anchors = {resolution: 0 for resolution in RESOLUTIONS}
+        self.updated_at = 0.0
+
+    def seed(self, frames):
+        """
+        Load seed frames {resolution: DataFrame} and build every rollup level.
+        Levels without their own seed are aggregated from the next finer level.
+        """
+        for resolution, df in frames.items():
+            if df is None or df.empty:
+                continue
+            if self.tz is None and getattr(df.index, 'tz', None) is not None:
+                self.tz = str(df.index.tz)
+            level = _frame_to_level(df)
+            self.levels[resolution] = level
+            if resolution == '1h' and len(level['local']):
+                self.anchors['1h'] = int(level['local'][-1] % HOUR_MS)
+
+        for i, resolution in enumerate(RESOLUTIONS[1:], start=1):
+            if resolution in frames and frames[resolution] is not None and not frames[resolution].empty:
+                continue
+            self.levels[resolution] = aggregate_level(
+                self.levels[RESOLUTIONS[i - 1]], resolution, self.anchors[resolution]
+            )
+        self.updated_at = time.time()
+
+    def append(self, df):
+        """
+        Merge new 5m bars and incrementally update every coarser level.
+
+        Existing base bars at or after the first new bar are replaced (the
+        latest bar is usually still forming). Each coarser level is truncated
+        at the bucket containing the first changed bar and only that tail is
+        re-aggregated from the level below it.
+        """
+        new = _frame_to_level(df)
+        if len(new['ts']) == 0:
+            return
+
+        base = self.levels['5m']
+        keep = np.searchsorted(base['ts'], new['ts'][0], side='left')
+        base = _concat_levels(_slice_level(base, 0, keep), new)
+
+        # Drop base bars past the retention window
+        cutoff = base['ts'][-1] - BASE_RETENTION_MS
+        base = _slice_level(base, np.searchsorted(base['ts'], cutoff, side='left'))
+        self.levels['5m'] = base
+
+        changed_local = int(new['local'][0])
+        for i, resolution in enumerate(RESOLUTIONS[1:], start=1):
+            finer = self.levels[RESOLUTIONS[i - 1]]
+            coarse = self.levels[resolution]
+            anchor = self.anchors[resolution]
+
+            bucket_local = int(_bucket_start_local(
+                _bucket_ids(np.array([changed_local]), resolution, anchor)[0], resolution, anchor
+            ))
+            head = _slice_level(coarse, 0, np.searchsorted(coarse['local'], bucket_local, side='left'))
+            tail_source = _slice_level(finer, np.searchsorted(finer['local'], bucket_local, side='left'))
+            self.levels[resolution] = _concat_levels(head, aggregate_level(tail_source, resolution, anchor))
+            changed_local = bucket_local
+
+        self.updated_at = time.time()
+
+    def frame(self, resolution, yf_period=None):
+        """
+        Return bars of one resolution as a yfinance-style DataFrame, limited
+        to the trailing yfinance period string ('1d', '5d', '1mo', '1y', ...).
+        """
+        level = self.levels[resolution]
+        if len(level['ts']) == 0:
+            return pd.DataFrame(columns=list(COLUMNS.values()))
+
+        start = 0
+        if yf_period:
+            start = self._period_start(level, yf_period)
+        level = _slice_level(level, start)
+
+        index = pd.to_datetime(level['ts'], unit='ms', utc=True)
+        index = index.tz_convert(self.tz) if self.tz else index.tz_localize(None)
+        # Match yfinance's index names (Date for daily+, Datetime for intraday)
+        index.name = 'Date' if resolution in ('1d', '1w') else 'Datetime'
+        return pd.DataFrame({column: level[field] for field, column in COLUMNS.items()}, index=index)
+
+    @staticmethod
+    def _period_start(level, yf_period):
+        """Index of the first bar inside a trailing yfinance-style period."""
+        local = level['local']
+        count = int(''.join(ch for ch in yf_period if ch.isdigit()) or 1)
+        if yf_period.endswith('d'):
+            # N trading days = last N distinct session dates
+            days = local // DAY_MS
+            session_starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+            if len(session_starts) <= count:
+                return 0
+            return int(session_starts[-count])
+
+        last = pd.Timestamp(int(local[-1]), unit='ms')
+        if yf_period.endswith('mo'):
+            start = last.normalize() - pd.DateOffset(months=count)
+        elif yf_period.endswith('y'):
+            start = last.normalize() - pd.DateOffset(years=count)
+        else:
+            return 0
+        return int(np.searchsorted(local, start.value // 10**6, side='left'))
+
+
+class BarStore:
+    """Process-wide registry of SymbolBars with on-demand seeding and refresh."""
+
+    def __init__(self, max_symbols=MAX_SYMBOLS):
+        self._symbols = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_symbols = max_symbols
+
+    def has(self, symbol):
+        return symbol.upper() in self._symbols
+
+    def get(self, symbol):
+        symbol = symbol.upper()
+        with self._lock:
+            bars = self._symbols.get(symbol)
+            if bars is not None:
+                self._symbols.move_to_end(symbol)
+            return bars
+
+    def put(self, bars):
+        with self._lock:
+            self._symbols[bars.symbol] = bars
+            self._symbols.move_to_end(bars.symbol)
+            while len(self._symbols) > self.max_symbols:
+                self._symbols.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._symbols.clear()
+
+    def seed(self, symbol):
+        """Download the seed resolutions for a symbol and build all rollups."""
+        import yfinance as yf
+
+        symbol = symbol.upper()
+        ticker = yf.Ticker(symbol)
+        frames = {}
+        errors = []  # Exception or kept yfinance error of each empty resolution
+        for resolution, (yf_period, yf_interval) in SEED_SOURCES.items():
+            try:
+                frames[resolution] = ticker.history(period=yf_period, interval=yf_interval)
+                if frames[resolution] is None or frames[resolution].empty:
+                    errors.append(history_error(ticker))
+            except Exception as e:
+                print(f"[bar_store] Seed {resolution} failed for {symbol}: {e}")
+                frames[resolution] = pd.DataFrame()
+                errors.append(e)
+
+        if all(df is None or df.empty for df in frames.values()):
+            # Only a symbol yfinance reported as missing is a miss, not a throttled empty answer
+            if all(is_missing_symbol_error(error) for error in errors):
+                record_miss(symbol, str(errors[-1]))
+            return None
+        record_hit(symbol)
+
+        bars = SymbolBars(symbol)
+        bars.seed(frames)
+        self.put(bars)
+        print(f"[bar_store] Seeded {symbol}: " + ', '.join(f"{r}={len(bars.levels[r]['ts'])}" for r in RESOLUTIONS))
+        return bars
+
+    def refresh(self, symbol):
+        """
+        Append the 5m bars since the last stored one and roll them up, so a
+        symbol that sat idle for days has no gap in any level. Past
+        REFRESH_MAX_GAP_MS the symbol is reseeded instead.
+        """
+        import yfinance as yf
+
+        bars = self.get(symbol)
+        if bars is None:
+            return None
+        base_ts = bars.levels['5m']['ts']
+        if len(base_ts) and time.time() * 1000 - base_ts[-1] > REFRESH_MAX_GAP_MS:
+            reseeded = self.seed(bars.symbol)
+            if reseeded is not None:
+                return reseeded
+        try:
+            ticker = yf.Ticker(bars.symbol)
+            if len(base_ts):
+                # From the last stored bar, which may still have been forming
+                df = ticker.history(start=pd.Timestamp(int(base_ts[-1]), unit='ms', tz='UTC'), interval='5m')
+            else:
+                df = ticker.history(period='1d', interval='5m')
+            if df is not None and not df.empty:
+                with self._lock:
+                    bars.append(df)
+        except Exception as e:
+            print(f"[bar_store] Refresh failed for {bars.symbol}: {e}")
+        bars.updated_at = time.time()
+        return bars
+
+    def ensure(self, symbol, max_age=BAR_REFRESH_SECONDS):
+        """Return SymbolBars for symbol, seeding or refreshing as needed (None for a known invalid symbol)."""
+        bars = self.get(symbol)
+        if bars is None:
+            return None if is_invalid(symbol) else self.seed(symbol)
+        if time.time() - bars.updated_at > max_age:
+            return self.refresh(symbol)
+        return bars
+
+    def get_frame(self, symbol, yf_period, interval):
+        """
+        Bars for an indicators (period, interval) request, or None if the
+        symbol isn't loaded. `interval` uses the indicators API names
+        (5m, 15m, 1h, 4h, 1d, 1w).
+        """
+        bars = self.get(symbol)
+        if bars is None or interval not in RESOLUTION_WIDTH_MS:
+            return None
+        return bars.frame(interval, yf_period)
+
+
+# Shared instance used by the indicators endpoints and services
+bar_store = BarStore()
@@ -0,0 +1,435 @@
+"""
+Micro-benchmarks for the technical indicator functions.
+
+Synthetic OHLCV series (a seeded random walk, so every run times the same
+data) are generated for a range of bar counts and ticker counts. Each
+calculate_* function is timed on its own and together with JSON
+serialization of its output (what JsonResponse does). Results are kept as a
+flat {case: timings} dict so a run can be saved as a baseline and compared
+against later runs.
+
+Run through the management command:
+    python manage.py benchmark_indicators --save
+    python manage.py benchmark_indicators --threshold 0.25
+"""
+import json
+import os
+import platform
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .indicators import (
+    calculate_macd,
+    calculate_rsi,
+    calculate_stochastic,
+    calculate_moving_averages,
+    calculate_bollinger_bands,
+    calculate_volume_analysis,
+    calculate_overall_signal,
+    calculate_batch_summary,
+)
+from .scan_columns import SCREEN_RULES, ScanColumns
+from .services import compute_signal_arrays, signals_from_arrays
+from .sweeps import rsi_sweep, sma_sweep
+from .swings import swing_points
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Fractional slowdown allowed before a case counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Cases faster than this are dominated by timer noise - never flag them
+NOISE_FLOOR_SECONDS = 0.0005
+
+# Each case is sampled for at least this long (small cases run many times)
+MIN_SAMPLE_SECONDS = 0.1
+
+# Bars per ticker for the multi-ticker cases (~1 week of 5m bars incl. extended hours)
+UNIVERSE_BARS = 500
+
+# The per-bar swing-point loop reference is only timed up to this many bars
+LEGACY_SWING_MAX_BARS = 100_000
+
+PROFILES = {
+    'quick': {
+        'bars': [100, 1_000, 10_000],
+        'tickers': [1, 10],
+    },
+    'full': {
+        'bars': [100, 1_000, 10_000, 100_000, 1_000_000],
+        'tickers': [1, 10, 100, 1_000],
+    },
+}
+
+
+def generate_ohlcv(bars, seed=0, start='2020-01-02 09:30', freq='5min', base_price=100.0):
+    """
+    Synthetic OHLCV DataFrame shaped like a yfinance history() result.
+
+    Closes are a geometric random walk; opens are the previous close, highs and
+    lows bracket both, and volume is lognormal around 1M shares.
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.002, bars)
+    close = base_price * np.exp(np.cumsum(returns))
+    open_ = np.concatenate(([base_price], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.001, bars)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = np.round(rng.lognormal(np.log(1_000_000), 0.5, bars))
+
+    index = pd.date_range(start, periods=bars, freq=freq, tz='America/New_York', name='Datetime')
+    return pd.DataFrame({
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Volume': volume,
+    }, index=index)
+
+
+def generate_universe(tickers, bars=UNIVERSE_BARS, seed=0):
+    """{symbol: DataFrame} of independent synthetic series, one seed per ticker."""
+    return {
+        f"SYN{i:04d}": generate_ohlcv(bars, seed=seed + i, base_price=20.0 + (i % 50) * 10)
+        for i in range(tickers)
+    }
+
+
+def generate_scan_rows(tickers, seed=0):
+    """
+    Synthetic scan snapshot {symbol: metrics} shaped like scan_market rows.
+    Metrics are rounded like the real ones (so sort keys tie) and some are None.
+    """
+    rng = np.random.default_rng(seed)
+    symbols = [f"SYN{i:04d}" for i in range(tickers - 2)] + ['XLK', 'XLF'][:tickers]
+    change = np.round(rng.normal(0, 2.5, tickers), 1)
+    rv = np.round(rng.lognormal(0, 0.5, tickers), 1)
+    rsi = np.round(rng.uniform(10, 90, tickers))
+    bb_width = np.round(rng.uniform(1, 20, tickers), 1)
+    pct_from_high = np.round(-rng.exponential(8, tickers), 1)
+    pe_ratio = np.round(rng.uniform(-10, 60, tickers))
+    rows = {}
+    for i, symbol in enumerate(symbols):
+        rows[symbol] = {
+            'symbol': symbol,
+            'name': symbol,
+            'price': 100.0,
+            'change': float(change[i]),
+            'valueChange': float(change[i]),
+            'rv': float(rv[i]) if i % 7 else None,
+            'rsi': float(rsi[i]) if i % 11 else None,
+            'bb_width': float(bb_width[i]),
+            'pct_from_high': float(pct_from_high[i]),
+            'pct_from_low': 10.0,
+            'sparkline': [],
+            'pe_ratio': float(pe_ratio[i]) if i % 5 else None,
+            'dividend_yield': None,
+            'volume': 1_000_000.0,
+        }
+    return rows
+
+
+def legacy_screen(data, criteria, limit=5):
+    """
+    The dict filters LiveScreensService used before scan_columns.py, kept as
+    the reference the columnar screens are checked and timed against.
+    """
+    filters = {
+        'top_gainers': (lambda info: info.get('change', 0) > 1 and info.get('rv', 0) and info['rv'] >= 1.0,
+                        lambda x: x[1]['change'], True),
+        'unusual_volume': (lambda info: info.get('rv', 0) and info['rv'] >= 2.0, lambda x: x[1]['rv'], True),
+        'oversold': (lambda info: info.get('rsi') and info['rsi'] < 35 and info.get('change', 0) > -2,
+                     lambda x: x[1]['rsi'], False),
+        'overbought': (lambda info: info.get('rsi') and info['rsi'] > 70, lambda x: x[1]['rsi'], True),
+        'volatility_squeeze': (lambda info: info.get('bb_width') and info['bb_width'] < 8,
+                               lambda x: x[1]['bb_width'], False),
+        'near_highs': (lambda info: info.get('pct_from_high') and info['pct_from_high'] > -5
+                       and info.get('change', 0) > 0 and info.get('rv', 0) and info['rv'] >= 1.0,
+                       lambda x: x[1]['pct_from_high'], True),
+        'value_stocks': (lambda info: info.get('pe_ratio') and 0 < info['pe_ratio'] < 15 and info.get('change', 0) > 0,
+                         lambda x: x[1]['pe_ratio'], False),
+    }
+    if criteria == 'sector_etfs':
+        sector_etfs = ['XLK', 'XLF', 'XLE', 'XLV', 'XLI', 'XLY', 'XLP', 'XLU', 'XLB', 'XLRE']
+        candidates = [(ticker, info) for ticker, info in data.items() if ticker in sector_etfs]
+        candidates.sort(key=lambda x: x[1].get('change', 0), reverse=True)
+        return candidates[:limit]
+    keep, key, reverse = filters[criteria]
+    candidates = [(ticker, info) for ticker, info in data.items() if keep(info)]
+    candidates.sort(key=key, reverse=reverse)
+    return candidates[:limit]
+
+
+def _screen_calls(rows):
+    """(name, zero-arg callable) for every screen over one scan snapshot."""
+    columns = ScanColumns(rows)
+
+    def screens_columnar():
+        return {criteria: [symbol for symbol, _ in columns.screen(criteria)] for criteria in SCREEN_RULES}
+
+    def screens_legacy():
+        return {criteria: [symbol for symbol, _ in legacy_screen(rows, criteria)] for criteria in SCREEN_RULES}
+
+    return [
+        ('scan_columns_build', lambda: len(ScanColumns(rows))),
+        ('screens_columnar', screens_columnar),
+        ('screens_legacy', screens_legacy),
+    ]
+
+
+def _serialize(payload):
+    return json.dumps(payload, cls=DjangoJSONEncoder)
+
+
+def _time_call(func, min_repeat=3, min_seconds=MIN_SAMPLE_SECONDS):
+    """
+    Best wall time over at least `min_repeat` calls and `min_seconds` of
+    sampling, plus the last return value. The minimum (as timeit recommends)
+    is the least sensitive to other load on the machine.
+    """
+    timings = []
+    result = None
+    deadline = time.perf_counter() + min_seconds
+    while len(timings) < min_repeat or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def _indicator_calls(df):
+    """(name, zero-arg callable) for every indicator on one frame."""
+    # The overall signal only combines the other indicators' current values
+    inputs = (calculate_rsi(df), calculate_macd(df), calculate_stochastic(df), calculate_moving_averages(df))
+
+    def overall():
+        return calculate_overall_signal(*inputs)
+
+    return [
+        ('calculate_macd', lambda: calculate_macd(df)),
+        ('calculate_rsi', lambda: calculate_rsi(df)),
+        ('calculate_stochastic', lambda: calculate_stochastic(df)),
+        ('calculate_moving_averages', lambda: calculate_moving_averages(df)),
+        ('calculate_bollinger_bands', lambda: calculate_bollinger_bands(df)),
+        ('calculate_volume_analysis', lambda: calculate_volume_analysis(df)),
+        ('calculate_overall_signal', overall),
+    ]
+
+
+def _sweep_calls(df):
+    """(name, zero-arg callable) for the parameter-sweep indicators on one frame."""
+    close = df['Close'].to_numpy()
+    return [
+        ('rsi_sweep(2-50)', lambda: rsi_sweep(close, range(2, 51))[:, -1].tolist()),
+        ('sma_sweep(5-200)', lambda: sma_sweep(close, range(5, 201))[:, -1].tolist()),
+    ]
+
+
+def legacy_swing_points(highs, lows, lookbacks=(1, 2, 3, 4)):
+    """
+    The rolling left/right max/min loops get_historical_signals used before
+    swings.py, kept as the reference the vectorized version is timed against.
+    """
+    n = len(highs)
+    peaks = np.zeros((len(lookbacks), n), dtype=bool)
+    troughs = np.zeros((len(lookbacks), n), dtype=bool)
+    for row, lb in enumerate(lookbacks):
+        left_max = np.zeros(n)
+        left_min = np.full(n, np.inf)
+        for i in range(lb, n):
+            left_max[i] = np.max(highs[i-lb:i])
+            left_min[i] = np.min(lows[i-lb:i])
+        right_max = np.zeros(n)
+        right_min = np.full(n, np.inf)
+        for i in range(n - lb):
+            right_max[i] = np.max(highs[i+1:i+lb+1])
+            right_min[i] = np.min(lows[i+1:i+lb+1])
+        peaks[row] = (highs > left_max) & (highs > right_max)
+        troughs[row] = (lows < left_min) & (lows < right_min)
+        peaks[row, :lb] = peaks[row, n - lb:] = False
+        troughs[row, :lb] = troughs[row, n - lb:] = False
+    return peaks, troughs
+
+
+def _swing_calls(df):
+    """(name, zero-arg callable) for swing-point detection on one frame (swing counts per lookback)."""
+    highs = df['High'].to_numpy()
+    lows = df['Low'].to_numpy()
+
+    def counts(masks):
+        return [m.sum(axis=-1).tolist() for m in masks]
+
+    calls = [
+        ('swing_points(1-4)', lambda: counts(swing_points(highs, lows, range(1, 5)))),
+        ('swing_points(1-20)', lambda: counts(swing_points(highs, lows, range(1, 21)))),
+    ]
+    if len(df) <= LEGACY_SWING_MAX_BARS:
+        calls.append(('legacy_swing_points(1-4)', lambda: counts(legacy_swing_points(highs, lows))))
+    return calls
+
+
+def _signal_calls(df):
+    """(name, zero-arg callable) for the historical signals pipeline on one frame."""
+    def historical_signals():
+        arrays = compute_signal_arrays(df['High'].values, df['Low'].values, df['Close'].values)
+        return signals_from_arrays(df, arrays)
+
+    return [('historical_signals', historical_signals)]
+
+
+def benchmark_bars(bars, seed=0):
+    """Time every indicator (and its serialization) on one series of `bars` bars."""
+    df = generate_ohlcv(bars, seed=seed)
+    results = {}
+    for name, call in _indicator_calls(df) + _sweep_calls(df) + _swing_calls(df) + _signal_calls(df):
+        seconds, payload = _time_call(call)
+        serialize_seconds, body = _time_call(lambda: _serialize(payload))
+        results[f"{name}[bars={bars}]"] = {
+            'function': name,
+            'bars': bars,
+            'tickers': 1,
+            'seconds': seconds,
+            'serialize_seconds': serialize_seconds,
+            'payload_bytes': len(body),
+        }
+    return results
+
+
+def benchmark_tickers(tickers, bars=UNIVERSE_BARS, seed=0):
+    """
+    Time every indicator across a universe of `tickers` symbols (one call per
+    symbol, as the watchlist views do), plus the 2-D batch summary path.
+    """
+    frames = generate_universe(tickers, bars, seed)
+    results = {}
+    per_symbol_calls = {symbol: dict(_indicator_calls(df)) for symbol, df in frames.items()}
+    names = list(next(iter(per_symbol_calls.values())))
+
+    for name in names:
+        def run_all(name=name):
+            return {symbol: calls[name]() for symbol, calls in per_symbol_calls.items()}
+        seconds, payload = _time_call(run_all)
+        serialize_seconds, body = _time_call(lambda: _serialize(payload))
+        results[f"{name}[tickers={tickers}]"] = {
+            'function': name,
+            'bars': bars,
+            'tickers': tickers,
+            'seconds': seconds,
+            'serialize_seconds': serialize_seconds,
+            'payload_bytes': len(body),
+        }
+
+    # Swing points for the whole universe as one (tickers x bars) matrix
+    highs = np.stack([df['High'].to_numpy() for df in frames.values()])
+    lows = np.stack([df['Low'].to_numpy() for df in frames.values()])
+
+    batch_calls = [
+        ('calculate_batch_summary', lambda: calculate_batch_summary(frames)),
+        ('swing_points_2d(1-4)', lambda: [m.sum(axis=-1).tolist() for m in swing_points(highs, lows, range(1, 5))]),
+    ] + _screen_calls(generate_scan_rows(tickers, seed))
+    for name, call in batch_calls:
+        seconds, payload = _time_call(call)
+        serialize_seconds, body = _time_call(lambda: _serialize(payload))
+        results[f"{name}[tickers={tickers}]"] = {
+            'function': name,
+            'bars': bars,
+            'tickers': tickers,
+            'seconds': seconds,
+            'serialize_seconds': serialize_seconds,
+            'payload_bytes': len(body),
+        }
+    return results
+
+
+def run_benchmarks(bar_counts=None, ticker_counts=None, profile='quick', seed=0, progress=None):
+    """
+    Run the suite and return {'meta': {...}, 'results': {case: timings}}.
+
+    bar_counts/ticker_counts override the profile's sizes. `progress` is an
+    optional callable given a short status string before each group.
+    """
+    sizes = PROFILES[profile]
+    bar_counts = bar_counts or sizes['bars']
+    ticker_counts = ticker_counts or sizes['tickers']
+
+    results = {}
+    for bars in bar_counts:
+        if progress:
+            progress(f"bars={bars}")
+        results.update(benchmark_bars(bars, seed))
+    for tickers in ticker_counts:
+        if progress:
+            progress(f"tickers={tickers}")
+        results.update(benchmark_tickers(tickers, seed=seed))
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'profile': profile,
+            'seed': seed,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+        },
+        'results': results,
+    }
+
+
+def compare_to_baseline(baseline, current, threshold=DEFAULT_THRESHOLD, noise_floor=NOISE_FLOOR_SECONDS):
+    """
+    Compare two runs. Returns a list of regressions, each
+    {'case', 'metric', 'baseline', 'current', 'change'} where change is the
+    fractional slowdown. Only cases present in both runs are compared.
+    """
+    regressions = []
+    baseline_results = baseline.get('results', {})
+    for case, timings in current.get('results', {}).items():
+        previous = baseline_results.get(case)
+        if not previous:
+            continue
+        for metric in ('seconds', 'serialize_seconds'):
+            old = previous.get(metric)
+            new = timings.get(metric)
+            if old is None or new is None or new < noise_floor:
+                continue
+            change = (new - old) / old if old > 0 else float('inf')
+            if change > threshold:
+                regressions.append({
+                    'case': case,
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'change': change,
+                })
+    return regressions
+
+
+def merge_runs(run, other):
+    """Keep the faster timing of each case/metric from two runs of the same suite."""
+    merged = {'meta': run['meta'], 'results': {}}
+    for case, timings in run['results'].items():
+        timings = dict(timings)
+        for metric in ('seconds', 'serialize_seconds'):
+            if case in other['results']:
+                timings[metric] = min(timings[metric], other['results'][case][metric])
+        merged['results'][case] = timings
+    return merged
+
+
+def load_baseline(path=DEFAULT_BASELINE_PATH):
+    """Saved run, or None if there is no baseline yet."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(run, path=DEFAULT_BASELINE_PATH):
+    with open(path, 'w') as f:
+        json.dump(run, f, indent=2, sort_keys=True)
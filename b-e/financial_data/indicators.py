@@ -9,6 +9,10 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import time
+from .bar_store import bar_store, RESOLUTION_WIDTH_MS
+from .invalid_symbols import INVALID_SYMBOL_ERROR, download_errors, is_missing_symbol_error, partition, record_miss
+from .timestamps import encode_timestamps, parse_timestamp_mode
+from .sweeps import parse_periods, rsi_sweep, sma_sweep, bollinger_sweep, stochastic_sweep
 
 # Simple in-memory cache for rate limiting
 _cache = {}
@@ -84,15 +88,20 @@ def calculate_stochastic(df, k_period=14, d_period=3):
     }
 
 
-def calculate_moving_averages(df, ticker_symbol=None):
+def calculate_moving_averages(df, ticker_symbol=None, daily_df=None):
     """Calculate various moving averages. 
     If ticker_symbol is provided and df doesn't have enough data for SMA200,
-    fetches additional daily data.
+    fetches additional daily data. Pass daily_df to reuse daily bars that were
+    already downloaded (e.g. by the batch endpoint) instead of fetching again.
     """
     close = df['Close']
     
+    # Prefer pre-fetched daily bars when the requested range is too short for SMA 200
+    if len(close) < 200 and daily_df is not None:
+        if not daily_df.empty and len(daily_df) >= 200:
+            close = daily_df['Close']
     # If we don't have enough data for SMA 200 and ticker_symbol is provided, fetch daily data
-    if len(close) < 200 and ticker_symbol:
+    elif len(close) < 200 and ticker_symbol:
         try:
             ticker = yf.Ticker(ticker_symbol)
             daily_df = ticker.history(period='1y', interval='1d')
@@ -285,6 +294,417 @@ def calculate_overall_signal(rsi_data, macd_data, stoch_data, ma_data):
     }
 
 
+# Map period+interval combination to optimal yfinance period
+# The key insight: period controls the TIME RANGE, interval controls GRANULARITY
+# We need different yfinance periods based on interval to get meaningful data
+PERIOD_INTERVAL_MAP = {
+    # 1D (Day view) - show today's/recent intraday data
+    ('1D', '5m'): '1d',      # Last day with 5-min candles
+    ('1D', '15m'): '5d',     # 5 days with 15-min candles (more context)
+    ('1D', '1h'): '5d',      # 5 days with hourly candles
+    ('1D', '4h'): '1mo',     # 1 month with 4h candles (need more range)
+    ('1D', '1d'): '1mo',     # 1 month of daily candles
+    ('1D', '1w'): '3mo',     # 3 months of weekly candles
+    
+    # 1W (Week view) - show last week's worth of data
+    ('1W', '5m'): '5d',      # 5 days with 5-min candles
+    ('1W', '15m'): '5d',     # 5 days with 15-min candles
+    ('1W', '1h'): '1mo',     # 1 month with hourly candles
+    ('1W', '4h'): '1mo',     # 1 month with 4h candles
+    ('1W', '1d'): '3mo',     # 3 months of daily candles
+    ('1W', '1w'): '6mo',     # 6 months of weekly candles
+    
+    # 1M (Month view) - show last month's worth of data
+    ('1M', '5m'): '5d',      # 5 days max for 5m (yfinance limit)
+    ('1M', '15m'): '1mo',    # 1 month with 15-min candles
+    ('1M', '1h'): '1mo',     # 1 month with hourly candles  
+    ('1M', '4h'): '3mo',     # 3 months with 4h candles
+    ('1M', '1d'): '3mo',     # 3 months of daily candles
+    ('1M', '1w'): '1y',      # 1 year of weekly candles
+    
+    # 1Y (Year view) - show last year's worth of data
+    ('1Y', '5m'): '5d',      # 5 days max for 5m (yfinance limit)
+    ('1Y', '15m'): '1mo',    # 1 month max for 15m with good data
+    ('1Y', '1h'): '3mo',     # 3 months with hourly candles
+    ('1Y', '4h'): '1y',      # 1 year with 4h candles
+    ('1Y', '1d'): '1y',      # 1 year of daily candles
+    ('1Y', '1w'): '2y',      # 2 years of weekly candles
+}
+
+# Map interval to yfinance interval string
+INTERVAL_MAP = {
+    '5m': '5m',
+    '15m': '15m',
+    '1h': '1h',
+    '4h': '1h',      # yfinance doesn't have 4h, use 1h and we'll aggregate
+    '1d': '1d',
+    '1w': '1wk',
+}
+
+# Legacy timeframe mapping (for backwards compatibility)
+LEGACY_TIMEFRAME_MAP = {
+    'D': {'period': '5d', 'interval': '15m'},
+    'W': {'period': '1mo', 'interval': '1h'},
+    'M': {'period': '3mo', 'interval': '1d'},
+    'Y': {'period': '1y', 'interval': '1wk'},
+}
+
+VALID_INDICATORS = ['ALL', 'MACD', 'RSI', 'STOCH', 'MA', 'BB', 'VOLUME']
+
+# Upper bound on symbols per batch request (one yf.download per batch)
+MAX_BATCH_SYMBOLS = 50
+
+
+def indicator_cache_key(prefix, symbol, period, interval, indicator, timestamp_mode='label'):
+    """Cache key for an indicators payload. Label-mode keys keep their original format."""
+    key = f"{prefix}_{symbol}_{period}_{interval}_{indicator}"
+    return key if timestamp_mode == 'label' else f"{key}_{timestamp_mode}"
+
+
+def resolve_period_interval(period, interval, timeframe=None):
+    """
+    Resolve request params to yfinance download params.
+    
+    Returns:
+        tuple: (yf_period, yf_interval, period, interval)
+    """
+    if period and interval:
+        # New format: use period+interval combination map
+        yf_period = PERIOD_INTERVAL_MAP.get((period, interval), '5d')
+        yf_interval = INTERVAL_MAP.get(interval, '15m')
+    elif timeframe:
+        # Legacy format: map timeframe to period+interval
+        config = LEGACY_TIMEFRAME_MAP.get(timeframe, LEGACY_TIMEFRAME_MAP['D'])
+        yf_period = config['period']
+        yf_interval = config['interval']
+        period = {'D': '1D', 'W': '1W', 'M': '1M', 'Y': '1Y'}.get(timeframe, '1D')
+        interval = {'D': '15m', 'W': '1h', 'M': '1d', 'Y': '1w'}.get(timeframe, '15m')
+    else:
+        # Default: 1D with 15m intervals
+        yf_period = '5d'
+        yf_interval = '15m'
+        period = '1D'
+        interval = '15m'
+    return yf_period, yf_interval, period, interval
+
+
+def aggregate_to_4h(df):
+    """Resample 1h bars to 4h bars (yfinance only has 1h)."""
+    return df.resample('4h').agg({
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum'
+    }).dropna()
+
+
+def build_indicator_payload(df, symbol, indicator, period, interval, yf_period, yf_interval, daily_df=None,
+                            timestamp_mode='label'):
+    """
+    Build the indicators response body for one symbol's OHLCV bars.
+    Shared by the single-symbol and batch endpoints so both return the same shape.
+    """
+    # Get timestamps formatted based on period (not interval)
+    # This ensures the time axis matches the user's selected view
+    # (or raw epoch ms when the client formats them itself)
+    timestamp_fields = encode_timestamps(df.index, timestamp_mode, period)
+    timestamps = timestamp_fields['timestamps']
+    
+    # Get close prices for chart data
+    closes = [round(v, 2) if not pd.isna(v) else None for v in df['Close'].tolist()]
+    
+    response_data = {
+        'symbol': symbol,
+        'period': period,
+        'interval': interval,
+        'timeframe': period,  # Legacy support
+        'timestamps': timestamps,
+        'timestampFormat': timestamp_fields['timestampFormat'],
+        'closes': closes,  # Close prices for chart rendering
+        'dataPoints': len(timestamps),
+        'yf_period': yf_period,  # Debug: show what yfinance period was used
+        'yf_interval': yf_interval,  # Debug: show what yfinance interval was used
+    }
+    
+    # When daily bars were pre-fetched, don't let the MA calculation download them again
+    ma_symbol = None if daily_df is not None else symbol
+    
+    # Calculate requested indicators
+    if indicator == 'ALL':
+        response_data['macd'] = calculate_macd(df)
+        response_data['rsi'] = calculate_rsi(df)
+        response_data['stochastic'] = calculate_stochastic(df)
+        response_data['movingAverages'] = calculate_moving_averages(df, ma_symbol, daily_df)
+        response_data['bollingerBands'] = calculate_bollinger_bands(df)
+        response_data['volume'] = calculate_volume_analysis(df)
+        response_data['overallSignal'] = calculate_overall_signal(
+            response_data['rsi'],
+            response_data['macd'],
+            response_data['stochastic'],
+            response_data['movingAverages']
+        )
+    elif indicator == 'MACD':
+        response_data['macd'] = calculate_macd(df)
+    elif indicator == 'RSI':
+        response_data['rsi'] = calculate_rsi(df)
+    elif indicator == 'STOCH':
+        response_data['stochastic'] = calculate_stochastic(df)
+    elif indicator == 'MA':
+        response_data['movingAverages'] = calculate_moving_averages(df, ma_symbol, daily_df)
+    elif indicator == 'BB':
+        response_data['bollingerBands'] = calculate_bollinger_bands(df)
+    elif indicator == 'VOLUME':
+        response_data['volume'] = calculate_volume_analysis(df)
+    
+    return response_data
+
+
+def symbol_indicator_payload(symbol, indicator, period, interval, yf_period, yf_interval,
+                             timestamp_mode='label', bars=None):
+    """
+    Indicators response body for one symbol from its bar store rollups
+    (`bars`, or seeded/refreshed here), cached like the endpoint's
+    responses. Returns None if the symbol has no data.
+    """
+    cache_key = indicator_cache_key('indicators', symbol, period, interval, indicator, timestamp_mode)
+    cached_data = _cache.get(cache_key)
+    if cached_data and time.time() - cached_data['timestamp'] < CACHE_DURATION:
+        return cached_data['data']
+    
+    # Every period/interval combination is a slice of the symbol's
+    # precomputed rollups - seeded once, then refreshed with new 5m bars
+    if bars is None:
+        bars = bar_store.ensure(symbol)
+    resolution = interval if interval in RESOLUTION_WIDTH_MS else '15m'
+    df = bars.frame(resolution, yf_period) if bars is not None else None
+    if df is None or df.empty:
+        return None
+    
+    # Daily bars for SMA 200 come from the same store (no extra download)
+    response_data = build_indicator_payload(
+        df, symbol, indicator, period, interval, yf_period, yf_interval,
+        daily_df=bars.frame('1d', '1y'), timestamp_mode=timestamp_mode
+    )
+    _cache[cache_key] = {
+        'data': response_data,
+        'timestamp': time.time()
+    }
+    return response_data
+
+
+def download_bars_batch(symbols, yf_period, yf_interval):
+    """
+    Download OHLCV bars for many symbols with a single yf.download call.
+    
+    Symbols yfinance reported as missing or delisted are recorded as
+    invalid; a symbol that is merely absent (throttled, or intraday bars
+    for a fund) is not.
+    
+    Returns:
+        dict: {symbol: DataFrame} for symbols that returned data
+    """
+    raw = yf.download(
+        symbols,
+        period=yf_period,
+        interval=yf_interval,
+        progress=False,
+        group_by='ticker',
+        threads=True
+    )
+    
+    frames = {}
+    if raw is None or raw.empty:
+        return frames
+    
+    for symbol in symbols:
+        try:
+            if isinstance(raw.columns, pd.MultiIndex):
+                if symbol in raw.columns.get_level_values(0):
+                    df = raw[symbol]
+                elif symbol in raw.columns.get_level_values(1):
+                    df = raw.xs(symbol, axis=1, level=1)
+                else:
+                    continue
+            else:
+                df = raw
+            
+            if 'Close' not in df.columns:
+                continue
+            df = df.dropna(subset=['Close'])
+            if not df.empty:
+                frames[symbol] = df.copy()
+        except Exception as e:
+            print(f"[indicators] Error extracting batch bars for {symbol}: {e}")
+    
+    errors = download_errors()
+    for symbol in symbols:
+        if symbol not in frames and is_missing_symbol_error(errors.get(symbol)):
+            record_miss(symbol, errors[symbol])
+    
+    return frames
+
+
+def _stack_right_aligned(frames, column):
+    """
+    Stack one OHLCV column of many symbols into a (bars x symbols) DataFrame.
+    Series are aligned on their LAST bar and left-padded with NaN, so the
+    latest values of every symbol share a row regardless of trading calendar.
+    """
+    length = max(len(df) for df in frames.values())
+    data = np.full((length, len(frames)), np.nan)
+    for j, df in enumerate(frames.values()):
+        values = df[column].to_numpy(dtype=float)
+        data[length - len(values):, j] = values
+    return pd.DataFrame(data, columns=list(frames))
+
+
+def _last_rounded(series, digits, default):
+    """Round the last value of a column, falling back to default for NaN."""
+    value = series.iloc[-1]
+    return round(float(value), digits) if not pd.isna(value) else default
+
+
+def calculate_batch_summary(frames, indicator='ALL', ma_frames=None):
+    """
+    Calculate current indicator values for many symbols in one 2-D pass.
+    
+    Mirrors the 'current' blocks of calculate_macd, calculate_rsi,
+    calculate_stochastic, calculate_moving_averages, calculate_bollinger_bands
+    and calculate_volume_analysis, but runs each rolling/ewm operation once
+    over a (bars x symbols) matrix instead of once per symbol.
+    
+    Args:
+        frames: {symbol: OHLCV DataFrame}
+        indicator: ALL, MACD, RSI, STOCH, MA, BB, VOLUME
+        ma_frames: optional {symbol: DataFrame} used for moving averages
+                   (e.g. daily bars when the requested range is too short for SMA 200)
+    
+    Returns:
+        dict: {symbol: {indicatorKey: {'current': ...}, 'overallSignal': ...}}
+    """
+    symbols = list(frames)
+    close = _stack_right_aligned(frames, 'Close')
+    valid = close.notna()
+    summaries = {symbol: {'symbol': symbol, 'dataPoints': len(frames[symbol])} for symbol in symbols}
+    
+    want = lambda name: indicator in ('ALL', name)
+    
+    if want('MACD'):
+        ema_fast = close.ewm(span=12, adjust=False).mean()
+        ema_slow = close.ewm(span=26, adjust=False).mean()
+        macd_line = ema_fast - ema_slow
+        signal_line = macd_line.ewm(span=9, adjust=False).mean()
+        histogram = macd_line - signal_line
+        for symbol in symbols:
+            summaries[symbol]['macd'] = {'current': {
+                'macd': _last_rounded(macd_line[symbol], 4, 0),
+                'signal': _last_rounded(signal_line[symbol], 4, 0),
+                'histogram': _last_rounded(histogram[symbol], 4, 0),
+            }}
+    
+    if want('RSI'):
+        delta = close.diff()
+        # Keep padding rows as NaN so they never fall inside a real symbol's window
+        gain = delta.where(delta > 0, 0).where(valid).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).where(valid).rolling(window=14).mean()
+        rsi = (100 - (100 / (1 + gain / loss))).fillna(50)
+        for symbol in symbols:
+            summaries[symbol]['rsi'] = {
+                'overbought': 70,
+                'oversold': 30,
+                'current': _last_rounded(rsi[symbol], 2, 50),
+            }
+    
+    if want('STOCH'):
+        high = _stack_right_aligned(frames, 'High')
+        low = _stack_right_aligned(frames, 'Low')
+        lowest_low = low.rolling(window=14).min()
+        highest_high = high.rolling(window=14).max()
+        k_line = 100 * (close - lowest_low) / (highest_high - lowest_low)
+        d_line = k_line.rolling(window=3).mean().fillna(50)
+        k_line = k_line.fillna(50)
+        for symbol in symbols:
+            summaries[symbol]['stochastic'] = {
+                'overbought': 80,
+                'oversold': 20,
+                'current': {
+                    'k': _last_rounded(k_line[symbol], 2, 50),
+                    'd': _last_rounded(d_line[symbol], 2, 50),
+                },
+            }
+    
+    if want('MA'):
+        ma_close = _stack_right_aligned(ma_frames or frames, 'Close')
+        averages = {
+            'sma20': ma_close.rolling(window=20).mean(),
+            'sma50': ma_close.rolling(window=50).mean(),
+            'sma200': ma_close.rolling(window=200).mean(),
+            'ema12': ma_close.ewm(span=12, adjust=False).mean(),
+            'ema26': ma_close.ewm(span=26, adjust=False).mean(),
+        }
+        last_price = ma_close.iloc[-1]
+        last_values = {name: values.iloc[-1] for name, values in averages.items()}
+        # Vectorized version of get_status() in calculate_moving_averages
+        statuses = {
+            name: np.where(values.isna(), 'neutral',
+                           np.where(last_price > values * 1.02, 'bullish',
+                                    np.where(last_price < values * 0.98, 'bearish', 'neutral')))
+            for name, values in last_values.items()
+        }
+        for j, symbol in enumerate(symbols):
+            ma_data = {}
+            for name, values in last_values.items():
+                value = values.iloc[j]
+                ma_data[name] = {
+                    'current': round(float(value), 2) if not pd.isna(value) else None,
+                    'status': str(statuses[name][j]),
+                }
+            price = last_price.iloc[j]
+            ma_data['currentPrice'] = round(float(price), 2) if not pd.isna(price) else None
+            summaries[symbol]['movingAverages'] = ma_data
+    
+    if want('BB'):
+        middle = close.rolling(window=20).mean()
+        std = close.rolling(window=20).std()
+        upper = middle + (std * 2)
+        lower = middle - (std * 2)
+        percent_b = (close - lower) / (upper - lower) * 100
+        for symbol in symbols:
+            summaries[symbol]['bollingerBands'] = {'current': {
+                'upper': _last_rounded(upper[symbol], 2, None),
+                'middle': _last_rounded(middle[symbol], 2, None),
+                'lower': _last_rounded(lower[symbol], 2, None),
+                'percentB': _last_rounded(percent_b[symbol], 2, 50),
+                'price': _last_rounded(close[symbol], 2, None),
+            }}
+    
+    if want('VOLUME'):
+        volume = _stack_right_aligned(frames, 'Volume')
+        avg_volume_20 = volume.rolling(window=20).mean()
+        for symbol in symbols:
+            current_volume = volume[symbol].iloc[-1]
+            avg_vol = avg_volume_20[symbol].iloc[-1]
+            volume_ratio = (current_volume / avg_vol) if avg_vol > 0 else 1.0
+            summaries[symbol]['volume'] = {'current': {
+                'volume': int(current_volume) if not pd.isna(current_volume) else 0,
+                'avgVolume': int(avg_vol) if not pd.isna(avg_vol) else 0,
+                'ratio': round(float(volume_ratio), 2) if not pd.isna(volume_ratio) else 1.0,
+            }}
+    
+    if indicator == 'ALL':
+        for symbol in symbols:
+            summary = summaries[symbol]
+            summary['overallSignal'] = calculate_overall_signal(
+                summary['rsi'],
+                summary['macd'],
+                summary['stochastic'],
+                summary['movingAverages']
+            )
+    
+    return summaries
+
+
 @require_GET
 def technical_indicators(request, symbol):
     """
@@ -294,6 +714,8 @@ def technical_indicators(request, symbol):
     - period: 1D, 1W, 1M, 1Y (data range to fetch)
     - interval: 5m, 15m, 1h, 4h, 1d, 1w (candle/bar interval)
     - indicator: MACD, RSI, STOCH, MA, BB, VOLUME, ALL (default: ALL)
+    - timestamps: label (default), epoch or delta - epoch returns UTC epoch
+                  milliseconds, delta returns the first one followed by bar-to-bar gaps
     
     Legacy format (still supported):
     - timeframe: D, W, M, Y (maps to period+interval automatically)
@@ -305,83 +727,15 @@ def technical_indicators(request, symbol):
     interval = request.GET.get('interval')
     timeframe = request.GET.get('timeframe')  # Legacy support
     indicator = request.GET.get('indicator', 'ALL').upper()
-    
-    # Map period+interval combination to optimal yfinance period
-    # The key insight: period controls the TIME RANGE, interval controls GRANULARITY
-    # We need different yfinance periods based on interval to get meaningful data
-    period_interval_map = {
-        # 1D (Day view) - show today's/recent intraday data
-        ('1D', '5m'): '1d',      # Last day with 5-min candles
-        ('1D', '15m'): '5d',     # 5 days with 15-min candles (more context)
-        ('1D', '1h'): '5d',      # 5 days with hourly candles
-        ('1D', '4h'): '1mo',     # 1 month with 4h candles (need more range)
-        ('1D', '1d'): '1mo',     # 1 month of daily candles
-        ('1D', '1w'): '3mo',     # 3 months of weekly candles
-        
-        # 1W (Week view) - show last week's worth of data
-        ('1W', '5m'): '5d',      # 5 days with 5-min candles
-        ('1W', '15m'): '5d',     # 5 days with 15-min candles
-        ('1W', '1h'): '1mo',     # 1 month with hourly candles
-        ('1W', '4h'): '1mo',     # 1 month with 4h candles
-        ('1W', '1d'): '3mo',     # 3 months of daily candles
-        ('1W', '1w'): '6mo',     # 6 months of weekly candles
-        
-        # 1M (Month view) - show last month's worth of data
-        ('1M', '5m'): '5d',      # 5 days max for 5m (yfinance limit)
-        ('1M', '15m'): '1mo',    # 1 month with 15-min candles
-        ('1M', '1h'): '1mo',     # 1 month with hourly candles  
-        ('1M', '4h'): '3mo',     # 3 months with 4h candles
-        ('1M', '1d'): '3mo',     # 3 months of daily candles
-        ('1M', '1w'): '1y',      # 1 year of weekly candles
-        
-        # 1Y (Year view) - show last year's worth of data
-        ('1Y', '5m'): '5d',      # 5 days max for 5m (yfinance limit)
-        ('1Y', '15m'): '1mo',    # 1 month max for 15m with good data
-        ('1Y', '1h'): '3mo',     # 3 months with hourly candles
-        ('1Y', '4h'): '1y',      # 1 year with 4h candles
-        ('1Y', '1d'): '1y',      # 1 year of daily candles
-        ('1Y', '1w'): '2y',      # 2 years of weekly candles
-    }
-    
-    # Map interval to yfinance interval string
-    interval_map = {
-        '5m': '5m',
-        '15m': '15m',
-        '1h': '1h',
-        '4h': '1h',      # yfinance doesn't have 4h, use 1h and we'll aggregate
-        '1d': '1d',
-        '1w': '1wk',
-    }
-    
-    # Legacy timeframe mapping (for backwards compatibility)
-    legacy_timeframe_map = {
-        'D': {'period': '5d', 'interval': '15m'},
-        'W': {'period': '1mo', 'interval': '1h'},
-        'M': {'period': '3mo', 'interval': '1d'},
-        'Y': {'period': '1y', 'interval': '1wk'},
-    }
+    timestamp_mode = parse_timestamp_mode(request.GET.get('timestamps'))
+    if timestamp_mode is None:
+        return JsonResponse({'error': f"Invalid timestamps mode: {request.GET.get('timestamps')}"}, status=400)
     
     # Determine yfinance parameters
-    if period and interval:
-        # New format: use period+interval combination map
-        yf_period = period_interval_map.get((period, interval), '5d')
-        yf_interval = interval_map.get(interval, '15m')
-    elif timeframe:
-        # Legacy format: map timeframe to period+interval
-        config = legacy_timeframe_map.get(timeframe, legacy_timeframe_map['D'])
-        yf_period = config['period']
-        yf_interval = config['interval']
-        period = {'D': '1D', 'W': '1W', 'M': '1M', 'Y': '1Y'}.get(timeframe, '1D')
-        interval = {'D': '15m', 'W': '1h', 'M': '1d', 'Y': '1w'}.get(timeframe, '15m')
-    else:
-        # Default: 1D with 15m intervals
-        yf_period = '5d'
-        yf_interval = '15m'
-        period = '1D'
-        interval = '15m'
+    yf_period, yf_interval, period, interval = resolve_period_interval(period, interval, timeframe)
     
     # Check cache first
-    cache_key = f"indicators_{symbol.upper()}_{period}_{interval}_{indicator}"
+    cache_key = indicator_cache_key('indicators', symbol.upper(), period, interval, indicator, timestamp_mode)
     cached_data = _cache.get(cache_key)
     if cached_data and time.time() - cached_data['timestamp'] < CACHE_DURATION:
         print(f"[indicators] Cache HIT for {symbol} period={period} interval={interval} (yf_period={cached_data['data'].get('yf_period')}, yf_interval={cached_data['data'].get('yf_interval')}, dataPoints={cached_data['data'].get('dataPoints')})")
@@ -390,89 +744,285 @@ def technical_indicators(request, symbol):
     print(f"[indicators] Cache MISS for {symbol} period={period} interval={interval} - fetching with yf_period={yf_period}, yf_interval={yf_interval}")
     
     try:
-        ticker = yf.Ticker(symbol.upper())
-        df = ticker.history(period=yf_period, interval=yf_interval)
+        if indicator not in VALID_INDICATORS:
+            return JsonResponse({'error': f'Invalid indicator: {indicator}'}, status=400)
+        
+        response_data = symbol_indicator_payload(
+            symbol.upper(), indicator, period, interval, yf_period, yf_interval, timestamp_mode
+        )
         
-        if df.empty:
+        if response_data is None:
             return JsonResponse({
-                'error': 'No data found for symbol. The market may be closed or the symbol may be invalid.',
+                'error': INVALID_SYMBOL_ERROR,
                 'symbol': symbol.upper(),
                 'retryAfter': 30
             }, status=404)
         
-        # Aggregate to 4h if requested (yfinance only has 1h)
-        if interval == '4h' and yf_interval == '1h':
-            # Resample 1h data to 4h
-            df = df.resample('4h').agg({
-                'Open': 'first',
-                'High': 'max',
-                'Low': 'min',
-                'Close': 'last',
-                'Volume': 'sum'
-            }).dropna()
+        return JsonResponse(response_data)
+        
+    except Exception as e:
+        error_msg = str(e)
+        print(f"Error fetching indicators for {symbol}: {error_msg}")
         
-        # Get timestamps formatted based on period (not interval)
-        # This ensures the time axis matches the user's selected view
-        timestamps = []
-        for ts in df.index:
-            if period == '1D':
-                # For day view, show time only (h:MMam/pm)
-                timestamps.append(ts.strftime('%I:%M%p').lstrip('0').lower())
-            elif period == '1W':
-                # For week view, show day and time (Mon h:MMam)
-                timestamps.append(ts.strftime('%a %I:%M%p').replace(' 0', ' ').lower())
-            elif period == '1M':
-                # For month view, show date (Jan 15)
-                timestamps.append(ts.strftime('%b %d').replace(' 0', ' '))
-            else:
-                # For year view, show month and date (Jan 15)
-                timestamps.append(ts.strftime('%b %d').replace(' 0', ' '))
+        # Handle rate limiting specifically
+        if 'Too Many Requests' in error_msg or 'Rate' in error_msg:
+            return JsonResponse({
+                'error': 'Rate limited by data provider. Please wait a moment and try again.',
+                'retryAfter': 60,
+                'symbol': symbol.upper()
+            }, status=429)
+        
+        return JsonResponse({
+            'error': 'Failed to fetch indicator data. Please try again.',
+            'details': error_msg,
+            'symbol': symbol.upper()
+        }, status=500)
+
+
+@require_GET
+def batch_technical_indicators(request):
+    """
+    GET /api/market-data/indicators-batch/
+    
+    Query params:
+    - symbols: Comma-separated list of ticker symbols (required, max 50)
+    - period, interval, timeframe, indicator, timestamps: same as technical_indicators
+    - summary: true to return only 'current' values and overallSignal
+               per symbol (for watchlist/list views)
+    
+    Fetches bars for all symbols with one batched yf.download and returns
+    one response: {'results': {symbol: payload}, 'errors': {symbol: message}}
+    """
+    symbols_param = request.GET.get('symbols', '')
+    symbols = []
+    for s in symbols_param.split(','):
+        s = s.strip().upper()
+        if s and s not in symbols:
+            symbols.append(s)
+    
+    if not symbols:
+        return JsonResponse({'error': 'Symbols parameter is required'}, status=400)
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        return JsonResponse({'error': f'Too many symbols (max {MAX_BATCH_SYMBOLS})'}, status=400)
+    
+    indicator = request.GET.get('indicator', 'ALL').upper()
+    if indicator not in VALID_INDICATORS:
+        return JsonResponse({'error': f'Invalid indicator: {indicator}'}, status=400)
+    
+    timestamp_mode = parse_timestamp_mode(request.GET.get('timestamps'))
+    if timestamp_mode is None:
+        return JsonResponse({'error': f"Invalid timestamps mode: {request.GET.get('timestamps')}"}, status=400)
+    
+    summary = request.GET.get('summary', '').lower() in ('1', 'true', 'yes')
+    yf_period, yf_interval, period, interval = resolve_period_interval(
+        request.GET.get('period'), request.GET.get('interval'), request.GET.get('timeframe')
+    )
+    
+    results = {}
+    errors = {}
+    
+    # Serve what we can from cache (full payloads share keys with the single-symbol endpoint)
+    key_prefix = 'indicators_summary' if summary else 'indicators'
+    missing = []
+    for symbol in symbols:
+        cached_data = _cache.get(indicator_cache_key(key_prefix, symbol, period, interval, indicator, timestamp_mode))
+        if cached_data and time.time() - cached_data['timestamp'] < CACHE_DURATION:
+            results[symbol] = cached_data['data']
+        else:
+            missing.append(symbol)
+    
+    # Symbols that recently returned no data aren't downloaded again
+    missing, invalid = partition(missing)
+    for symbol in invalid:
+        errors[symbol] = INVALID_SYMBOL_ERROR
+    
+    print(f"[indicators] Batch request for {len(symbols)} symbols ({len(missing)} uncached) period={period} interval={interval} summary={summary}")
+    
+    if missing:
+        try:
+            # Symbols already in the bar store are sliced from their rollups
+            resolution = interval if interval in RESOLUTION_WIDTH_MS else '15m'
+            stored = {}
+            daily_frames = {}
+            for symbol in missing:
+                if bar_store.has(symbol):
+                    df = bar_store.get_frame(symbol, yf_period, resolution)
+                    if df is not None and not df.empty:
+                        stored[symbol] = df
+                        daily_frames[symbol] = bar_store.get_frame(symbol, '1y', '1d')
+            
+            # Everything else comes from one batched download
+            to_download = [s for s in missing if s not in stored]
+            frames = download_bars_batch(to_download, yf_period, yf_interval) if to_download else {}
+            
+            # Aggregate to 4h if requested (yfinance only has 1h)
+            if interval == '4h' and yf_interval == '1h':
+                frames = {s: aggregate_to_4h(df) for s, df in frames.items()}
+                frames = {s: df for s, df in frames.items() if not df.empty}
+            frames.update(stored)
+            
+            # Moving averages fall back to 1y of daily bars when the range is short -
+            # fetch those for every symbol that needs them in one more batched call
+            if indicator in ('ALL', 'MA'):
+                short = [s for s, df in frames.items() if len(df) < 200 and s not in daily_frames]
+                if short:
+                    daily_frames.update(download_bars_batch(short, '1y', '1d'))
+            
+            if frames:
+                if summary:
+                    ma_frames = {
+                        s: daily_frames[s] if len(df) < 200 and len(daily_frames.get(s, [])) >= 200 else df
+                        for s, df in frames.items()
+                    }
+                    payloads = calculate_batch_summary(frames, indicator, ma_frames)
+                else:
+                    payloads = {
+                        s: build_indicator_payload(
+                            df, s, indicator, period, interval, yf_period, yf_interval,
+                            daily_df=daily_frames.get(s, pd.DataFrame()),
+                            timestamp_mode=timestamp_mode
+                        )
+                        for s, df in frames.items()
+                    }
+                
+                now = time.time()
+                for symbol, payload in payloads.items():
+                    results[symbol] = payload
+                    _cache[indicator_cache_key(key_prefix, symbol, period, interval, indicator, timestamp_mode)] = {
+                        'data': payload,
+                        'timestamp': now
+                    }
+            
+            for symbol in missing:
+                if symbol not in results:
+                    errors[symbol] = INVALID_SYMBOL_ERROR
+        
+        except Exception as e:
+            error_msg = str(e)
+            print(f"Error fetching batch indicators for {missing}: {error_msg}")
+            
+            # Handle rate limiting specifically
+            if 'Too Many Requests' in error_msg or 'Rate' in error_msg:
+                return JsonResponse({
+                    'error': 'Rate limited by data provider. Please wait a moment and try again.',
+                    'retryAfter': 60,
+                }, status=429)
+            
+            for symbol in missing:
+                errors[symbol] = 'Failed to fetch indicator data. Please try again.'
+    
+    return JsonResponse({
+        'period': period,
+        'interval': interval,
+        'indicator': indicator,
+        'summary': summary,
+        'yf_period': yf_period,
+        'yf_interval': yf_interval,
+        'results': {s: results[s] for s in symbols if s in results},
+        'errors': errors,
+    })
+
+
+# Default parameter ranges for the sweep endpoint
+SWEEP_DEFAULT_PERIODS = {
+    'RSI': '2-50',
+    'SMA': '5-200',
+    'BB': '10-50',
+    'STOCH': '5-30',
+}
+
+
+def _matrix_to_lists(matrix, digits=2):
+    """Rounded nested lists with NaN as None, converted in one pass."""
+    values = np.round(matrix, digits).astype(object)
+    values[np.isnan(matrix)] = None
+    return values.tolist()
+
+
+def build_sweep_payload(df, indicator, periods):
+    """(periods x bars) matrices plus the latest value per period for one indicator."""
+    close = df['Close'].to_numpy(dtype=float)
+    if indicator == 'RSI':
+        matrices = {'rsi': rsi_sweep(close, periods)}
+    elif indicator == 'SMA':
+        matrices = {'sma': sma_sweep(close, periods)}
+    elif indicator == 'BB':
+        bands = bollinger_sweep(close, periods)
+        matrices = {key: bands[key] for key in ('upper', 'middle', 'lower', 'percentB')}
+    else:
+        matrices = {'k': stochastic_sweep(
+            df['High'].to_numpy(dtype=float), df['Low'].to_numpy(dtype=float), close, periods
+        )}
+    
+    return {
+        'values': {key: _matrix_to_lists(m) for key, m in matrices.items()},
+        'current': {key: _matrix_to_lists(m[:, -1]) for key, m in matrices.items()},
+    }
+
+
+@require_GET
+def indicator_sweep(request, symbol):
+    """
+    GET /api/market-data/indicators-sweep/{symbol}/
+    
+    Query params:
+    - indicator: RSI, SMA, BB or STOCH (default: RSI)
+    - periods: '2-50', '5-200:5' (range with step) or '5,10,20'
+               (default depends on the indicator, max 200 values)
+    - period, interval, timeframe, timestamps: same as technical_indicators
+    
+    Computes the indicator for every period in one vectorized pass and returns
+    (periods x bars) matrices: values[key][i] is the series for periods[i].
+    """
+    indicator = request.GET.get('indicator', 'RSI').upper()
+    if indicator not in SWEEP_DEFAULT_PERIODS:
+        return JsonResponse({'error': f'Invalid sweep indicator: {indicator}'}, status=400)
+    
+    try:
+        periods = parse_periods(request.GET.get('periods') or SWEEP_DEFAULT_PERIODS[indicator])
+    except ValueError as e:
+        return JsonResponse({'error': f'Invalid periods: {e}'}, status=400)
+    
+    timestamp_mode = parse_timestamp_mode(request.GET.get('timestamps'))
+    if timestamp_mode is None:
+        return JsonResponse({'error': f"Invalid timestamps mode: {request.GET.get('timestamps')}"}, status=400)
+    
+    yf_period, yf_interval, period, interval = resolve_period_interval(
+        request.GET.get('period'), request.GET.get('interval'), request.GET.get('timeframe')
+    )
+    
+    periods_key = ','.join(str(p) for p in periods)
+    cache_key = indicator_cache_key('indicators_sweep', symbol.upper(), period, interval,
+                                    f"{indicator}_{periods_key}", timestamp_mode)
+    cached_data = _cache.get(cache_key)
+    if cached_data and time.time() - cached_data['timestamp'] < CACHE_DURATION:
+        return JsonResponse(cached_data['data'])
+    
+    try:
+        bars = bar_store.ensure(symbol.upper())
+        resolution = interval if interval in RESOLUTION_WIDTH_MS else '15m'
+        df = bars.frame(resolution, yf_period) if bars is not None else None
         
-        # Get close prices for chart data
-        closes = [round(v, 2) if not pd.isna(v) else None for v in df['Close'].tolist()]
+        if df is None or df.empty:
+            return JsonResponse({
+                'error': INVALID_SYMBOL_ERROR,
+                'symbol': symbol.upper(),
+                'retryAfter': 30
+            }, status=404)
         
+        timestamp_fields = encode_timestamps(df.index, timestamp_mode, period)
         response_data = {
             'symbol': symbol.upper(),
+            'indicator': indicator,
+            'periods': periods,
             'period': period,
             'interval': interval,
-            'timeframe': period,  # Legacy support
-            'timestamps': timestamps,
-            'closes': closes,  # Close prices for chart rendering
-            'dataPoints': len(timestamps),
-            'yf_period': yf_period,  # Debug: show what yfinance period was used
-            'yf_interval': yf_interval,  # Debug: show what yfinance interval was used
+            'timestamps': timestamp_fields['timestamps'],
+            'timestampFormat': timestamp_fields['timestampFormat'],
+            'dataPoints': len(df),
+            **build_sweep_payload(df, indicator, periods),
         }
         
-        # Calculate requested indicators
-        if indicator == 'ALL':
-            response_data['macd'] = calculate_macd(df)
-            response_data['rsi'] = calculate_rsi(df)
-            response_data['stochastic'] = calculate_stochastic(df)
-            response_data['movingAverages'] = calculate_moving_averages(df, symbol.upper())
-            response_data['bollingerBands'] = calculate_bollinger_bands(df)
-            response_data['volume'] = calculate_volume_analysis(df)
-            response_data['overallSignal'] = calculate_overall_signal(
-                response_data['rsi'],
-                response_data['macd'],
-                response_data['stochastic'],
-                response_data['movingAverages']
-            )
-        elif indicator == 'MACD':
-            response_data['macd'] = calculate_macd(df)
-        elif indicator == 'RSI':
-            response_data['rsi'] = calculate_rsi(df)
-        elif indicator == 'STOCH':
-            response_data['stochastic'] = calculate_stochastic(df)
-        elif indicator == 'MA':
-            response_data['movingAverages'] = calculate_moving_averages(df, symbol.upper())
-        elif indicator == 'BB':
-            response_data['bollingerBands'] = calculate_bollinger_bands(df)
-        elif indicator == 'VOLUME':
-            response_data['volume'] = calculate_volume_analysis(df)
-        else:
-            return JsonResponse({'error': f'Invalid indicator: {indicator}'}, status=400)
-        
-        # Cache the response
         _cache[cache_key] = {
             'data': response_data,
             'timestamp': time.time()
@@ -482,9 +1032,8 @@ def technical_indicators(request, symbol):
         
     except Exception as e:
         error_msg = str(e)
-        print(f"Error fetching indicators for {symbol}: {error_msg}")
+        print(f"Error computing indicator sweep for {symbol}: {error_msg}")
         
-        # Handle rate limiting specifically
         if 'Too Many Requests' in error_msg or 'Rate' in error_msg:
             return JsonResponse({
                 'error': 'Rate limited by data provider. Please wait a moment and try again.',
@@ -493,7 +1042,7 @@ def technical_indicators(request, symbol):
             }, status=429)
         
         return JsonResponse({
-            'error': 'Failed to fetch indicator data. Please try again.',
+            'error': 'Failed to compute indicator sweep. Please try again.',
             'details': error_msg,
             'symbol': symbol.upper()
         }, status=500)
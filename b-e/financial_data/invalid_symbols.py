@@ -0,0 +1,112 @@
+"""
+Negative cache for symbols that returned no data.
+
+Invalid and delisted symbols ("possibly delisted" from yfinance) used to
+cost a full upstream round trip, and retries, every time they appeared in
+market_data (including fetch_all_tickers_batch's one-by-one fallback,
+again every CACHE_DURATION_SECONDS), stock_detail, search_stocks or the
+indicators endpoints. Each of those now checks is_invalid() before calling
+Yahoo, and records a miss when Yahoo answered without data for a symbol.
+
+A miss is only recorded when yfinance reports the symbol as missing or
+delisted (an exception, or the error it keeps for a Ticker's or a batch
+download's last request), never because bars or .info simply came back
+empty: yfinance swallows rate limits into empty results, so an outage or
+throttled batch would otherwise mark good symbols. Entries expire:
+the first miss blocks a symbol for INVALID_SYMBOL_SECONDS, and each
+further miss doubles that up to INVALID_SYMBOL_MAX_SECONDS, so a symbol
+that starts trading again is picked up. Any successful fetch clears it.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+INVALID_SYMBOL_SECONDS = 15 * 60
+INVALID_SYMBOL_MAX_SECONDS = 24 * 60 * 60
+INVALID_SYMBOL_MAX = 10000  # Entries closest to expiry are dropped past this
+
+INVALID_SYMBOL_ERROR = 'No data found for symbol. The market may be closed or the symbol may be invalid.'
+
+# Error text yfinance uses for symbols it doesn't know
+MISSING_SYMBOL_MARKERS = ('404', 'not found', 'delisted', 'no data found')
+
+# Error text of throttled requests, which never count as a miss
+RATE_LIMIT_MARKERS = ('rate limit', 'too many requests')
+
+_invalid = {}  # symbol -> (blocked until, misses)
+_invalid_lock = threading.Lock()
+
+
+def is_invalid(symbol):
+    """True if `symbol` returned no data recently and shouldn't be fetched."""
+    entry = _invalid.get(symbol.upper())
+    return entry is not None and entry[0] > time.time()
+
+
+def partition(symbols):
+    """(symbols to fetch, recently invalid symbols), keeping order."""
+    now = time.time()
+    valid, invalid = [], []
+    for symbol in symbols:
+        entry = _invalid.get(symbol.upper())
+        (invalid if entry is not None and entry[0] > now else valid).append(symbol)
+    return valid, invalid
+
+
+def record_miss(symbol, reason=''):
+    """Block `symbol` after Yahoo answered without data for it."""
+    symbol = symbol.upper()
+    now = time.time()
+    with _invalid_lock:
+        misses = _invalid[symbol][1] + 1 if symbol in _invalid else 1
+        seconds = min(INVALID_SYMBOL_SECONDS * 2 ** (misses - 1), INVALID_SYMBOL_MAX_SECONDS)
+        _invalid[symbol] = (now + seconds, misses)
+        if len(_invalid) > INVALID_SYMBOL_MAX:
+            for stale in sorted(_invalid, key=lambda s: _invalid[s][0])[:len(_invalid) - INVALID_SYMBOL_MAX]:
+                del _invalid[stale]
+    logger.info("Marked %s invalid for %ds (miss %d)%s", symbol, seconds, misses, f": {reason}" if reason else '')
+
+
+def record_hit(symbol):
+    """Forget `symbol`'s misses after it returned data."""
+    if _invalid:
+        with _invalid_lock:
+            _invalid.pop(symbol.upper(), None)
+
+
+def is_missing_symbol_error(error):
+    """
+    True if a yfinance exception or error message says the symbol doesn't
+    exist (not a rate limit or network error). False for None.
+    """
+    from yfinance.exceptions import YFRateLimitError
+
+    if error is None or isinstance(error, YFRateLimitError):
+        return False
+    message = str(error).lower()
+    if any(marker in message for marker in RATE_LIMIT_MARKERS):
+        return False
+    return any(marker in message for marker in MISSING_SYMBOL_MARKERS)
+
+
+def history_error(ticker):
+    """The error yfinance kept for a Ticker's last history() call without raising, or None."""
+    return getattr(getattr(ticker, '_price_history', None), '_last_error', None)
+
+
+def download_errors():
+    """
+    Per-symbol errors of the last yf.download, {symbol: message}. Newer
+    yfinance versions keep these per call instead of in yf.shared, in which
+    case this is empty and no batch symbol is recorded as missing.
+    """
+    import yfinance as yf
+
+    return dict(getattr(getattr(yf, 'shared', None), '_ERRORS', None) or {})
+
+
+def clear_invalid_symbols():
+    with _invalid_lock:
+        _invalid.clear()
@@ -0,0 +1,342 @@
+"""
+Long-window scan metrics: 252-session high/low, 200-day SMA and 50-day
+average volume.
+
+Scans only download a month of daily bars, so their "52-week" high and low
+were one-month values. Downloading a year per symbol on every scan would
+be 12x the data. Instead each symbol keeps a RollingWindow over its
+completed sessions:
+
+- the 251-session high/low as monotonic deques (the scan's current bar
+  makes the 252nd session),
+- running sums of the last 199 closes and the last 50 volumes.
+
+refresh_long_windows() runs nightly after the close. It seeds new symbols
+once, from the bar store's daily level when the symbol is loaded there,
+otherwise from one chunked 1y download. It then pushes each completed
+session from the newest scan snapshot's daily bars, so no extra download
+is needed. The window's scalars are stored as LongWindowState columns;
+scans read them through long_window_map() and combine them with the
+current bar in O(1) (long_window_metrics).
+"""
+import io
+import logging
+import math
+import threading
+import time
+from collections import deque
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LONG_WINDOW_SESSIONS = 252
+SMA_LONG_WINDOW = 200
+AVG_VOLUME_WINDOW = 50
+
+# Daily history downloaded once for symbols the bar store does not have
+LONG_WINDOW_SEED_PERIOD = '1y'
+LONG_WINDOW_SEED_CHUNK = 200
+
+# How often a process re-reads the table (rows only change nightly)
+LONG_WINDOW_RELOAD_SECONDS = 3600
+
+# US session close (ET) after which today's daily bar counts as completed
+SESSION_CLOSE_ET = (16, 5)
+
+WINDOW_FIELDS = ['last_day', 'sessions', 'window_high', 'window_low', 'close_sum', 'close_count', 'avg_volume']
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+DAY_MS = 24 * 60 * 60 * 1000
+
+_window_cache = {}
+_window_loaded_at = None
+_window_lock = threading.Lock()
+
+
+class RollingWindow:
+    """
+    Completed daily sessions of one symbol with O(1) amortized push and O(1)
+    window high/low (monotonic deques) and close/volume sums (running sums).
+    Windows are one session short of LONG_WINDOW_SESSIONS and SMA_LONG_WINDOW
+    so that adding the current, unfinished bar gives the full window.
+    """
+
+    def __init__(self):
+        self.extreme_len = LONG_WINDOW_SESSIONS - 1
+        self.days = deque(maxlen=self.extreme_len)
+        self.highs = deque(maxlen=self.extreme_len)
+        self.lows = deque(maxlen=self.extreme_len)
+        self.closes = deque(maxlen=SMA_LONG_WINDOW - 1)
+        self.volumes = deque(maxlen=AVG_VOLUME_WINDOW)
+        self.close_sum = 0.0
+        self.volume_sum = 0.0
+        self.count = 0
+        self._max = deque()  # (session index, high), highs decreasing
+        self._min = deque()  # (session index, low), lows increasing
+
+    @property
+    def last_day(self):
+        return self.days[-1] if self.days else None
+
+    def push(self, day, high, low, close, volume):
+        """Append one completed session (day is a date ordinal)."""
+        if close is None or not math.isfinite(close):
+            return
+        high = high if high is not None and math.isfinite(high) else close
+        low = low if low is not None and math.isfinite(low) else close
+        volume = volume if volume is not None and math.isfinite(volume) else 0.0
+
+        if len(self.closes) == self.closes.maxlen:
+            self.close_sum -= self.closes[0]
+        if len(self.volumes) == self.volumes.maxlen:
+            self.volume_sum -= self.volumes[0]
+        self.closes.append(close)
+        self.close_sum += close
+        self.volumes.append(volume)
+        self.volume_sum += volume
+        self.days.append(day)
+        self.highs.append(high)
+        self.lows.append(low)
+
+        index = self.count
+        while self._max and self._max[-1][1] <= high:
+            self._max.pop()
+        self._max.append((index, high))
+        while self._min and self._min[-1][1] >= low:
+            self._min.pop()
+        self._min.append((index, low))
+        expired = index - self.extreme_len
+        while self._max[0][0] <= expired:
+            self._max.popleft()
+        while self._min[0][0] <= expired:
+            self._min.popleft()
+        self.count += 1
+
+    def stats(self):
+        """LongWindowState column values."""
+        return {
+            'last_day': self.last_day,
+            'sessions': len(self.days),
+            'window_high': self._max[0][1] if self._max else None,
+            'window_low': self._min[0][1] if self._min else None,
+            'close_sum': self.close_sum,
+            'close_count': len(self.closes),
+            'avg_volume': self.volume_sum / len(self.volumes) if len(self.volumes) == self.volumes.maxlen else None,
+        }
+
+    def pack(self):
+        """npz blob of the buffers (the deques and sums are rebuilt by unpack)."""
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            days=np.array(self.days, dtype=np.int64),
+            highs=np.array(self.highs, dtype=np.float64),
+            lows=np.array(self.lows, dtype=np.float64),
+            closes=np.array(self.closes, dtype=np.float64),
+            volumes=np.array(self.volumes, dtype=np.float64),
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def unpack(cls, blob):
+        with np.load(io.BytesIO(bytes(blob))) as data:
+            days, highs, lows = data['days'].tolist(), data['highs'].tolist(), data['lows'].tolist()
+            closes, volumes = data['closes'].tolist(), data['volumes'].tolist()
+        window = cls()
+        # Replay the sessions; closes and volumes only cover the newest ones
+        close_start, volume_start = len(days) - len(closes), len(days) - len(volumes)
+        for i, (day, high, low) in enumerate(zip(days, highs, lows)):
+            window.push(day, high, low, closes[i - close_start] if i >= close_start else high,
+                        volumes[i - volume_start] if i >= volume_start else 0.0)
+        return window
+
+    @classmethod
+    def from_bars(cls, days, highs, lows, closes, volumes, before_day=None):
+        """Window over daily bars (oldest first), skipping sessions on or after `before_day`."""
+        window = cls()
+        window.extend(days, highs, lows, closes, volumes, before_day)
+        return window
+
+    def extend(self, days, highs, lows, closes, volumes, before_day=None):
+        """Push the sessions after last_day and before `before_day`. Returns how many were pushed."""
+        pushed = 0
+        for day, high, low, close, volume in zip(days, highs, lows, closes, volumes):
+            if (self.last_day is not None and day <= self.last_day) or (before_day is not None and day >= before_day):
+                continue
+            self.push(int(day), high, low, close, volume)
+            pushed += 1
+        return pushed
+
+
+def long_window_metrics(stats, day, high, low, close):
+    """
+    high_52w, low_52w, sma_200 and avg_volume for a symbol's current daily
+    bar from its LongWindowState values. The stored window ends before the
+    current session, so the bar is added to it. After a nightly refresh the
+    window may already include `day`; it is then used as-is.
+    """
+    if day is not None and stats['last_day'] is not None and stats['last_day'] >= day:
+        close_sum, close_count = stats['close_sum'], stats['close_count']
+        window_high, window_low = stats['window_high'], stats['window_low']
+    else:
+        close_sum, close_count = stats['close_sum'] + close, stats['close_count'] + 1
+        window_high = max(stats['window_high'], high) if stats['window_high'] is not None else high
+        window_low = min(stats['window_low'], low) if stats['window_low'] is not None else low
+    return {
+        'high_52w': window_high,
+        'low_52w': window_low,
+        'sma_200': round(close_sum / close_count, 2) if close_count >= SMA_LONG_WINDOW - 1 else None,
+        'avg_volume': stats['avg_volume'],
+    }
+
+
+def completed_before(now=None):
+    """Date ordinal of the first session that is not completed yet (today until the close, ET)."""
+    import pytz
+
+    now = now or datetime.now(pytz.timezone('US/Eastern'))
+    today = now.date()
+    if (now.hour, now.minute) >= SESSION_CLOSE_ET:
+        today += timedelta(days=1)
+    return today.toordinal()
+
+
+def _bar_store_window(symbol, before_day):
+    """Window from the bar store's daily level, if the symbol is loaded there."""
+    from .bar_store import bar_store
+
+    bars = bar_store.get(symbol)
+    if bars is None:
+        return None
+    level = bars.levels['1d']
+    if len(level['ts']) == 0:
+        return None
+    days = (level['local'] // DAY_MS + EPOCH_ORDINAL).tolist()
+    return RollingWindow.from_bars(days, level['high'].tolist(), level['low'].tolist(), level['close'].tolist(),
+                                   level['volume'].tolist(), before_day)
+
+
+def _download_windows(symbols, before_day):
+    """{symbol: RollingWindow} from one yf.download of LONG_WINDOW_SEED_PERIOD daily bars."""
+    import yfinance as yf
+
+    from .services import LiveScreensService, yf_lock
+
+    with yf_lock:
+        df = yf.download(symbols, period=LONG_WINDOW_SEED_PERIOD, interval='1d', progress=False,
+                         group_by='ticker', threads=True)
+    windows = {}
+    for symbol in symbols:
+        frame = LiveScreensService._ticker_frame(df, symbol)
+        if frame is None or 'Close' not in frame.columns:
+            continue
+        frame = frame.dropna(subset=['Close'])
+        if frame.empty:
+            continue
+        closes = frame['Close'].tolist()
+        windows[symbol] = RollingWindow.from_bars(
+            [ts.date().toordinal() for ts in frame.index],
+            frame['High'].tolist() if 'High' in frame.columns else closes,
+            frame['Low'].tolist() if 'Low' in frame.columns else closes,
+            closes,
+            frame['Volume'].tolist() if 'Volume' in frame.columns else [0.0] * len(closes),
+            before_day,
+        )
+    return windows
+
+
+def refresh_long_windows(symbols=None, snapshot=None):
+    """
+    Seed windows for symbols without one, push the completed sessions from
+    `snapshot` (default: the newest published scan) into every window, and
+    store them. Returns a report with counts and seconds.
+    """
+    from yfinance.exceptions import YFRateLimitError
+
+    from .market_scan import latest_snapshot, scan_universe, split_chunks, unpack_scan_state
+    from .models import LongWindowState
+
+    started = time.perf_counter()
+    symbols = [s.upper() for s in symbols] if symbols else scan_universe()
+    before_day = completed_before()
+    snapshot = snapshot or latest_snapshot()
+    scan_state = unpack_scan_state(snapshot.state) if snapshot else {}
+
+    windows = {
+        row.symbol: RollingWindow.unpack(row.state)
+        for row in LongWindowState.objects.filter(symbol__in=symbols).only('symbol', 'state')
+    }
+    missing = [symbol for symbol in symbols if symbol not in windows]
+    from_bar_store = 0
+    for symbol in missing:
+        window = _bar_store_window(symbol, before_day)
+        if window is not None and window.days:
+            windows[symbol] = window
+            from_bar_store += 1
+
+    seeded = from_bar_store
+    for chunk in split_chunks([symbol for symbol in missing if symbol not in windows], LONG_WINDOW_SEED_CHUNK):
+        try:
+            downloaded = _download_windows(chunk, before_day)
+        except YFRateLimitError as e:
+            logger.warning("Long-window seed rate limited, remaining symbols wait for the next run: %s", e)
+            break
+        windows.update(downloaded)
+        seeded += len(downloaded)
+
+    rolled = 0
+    for symbol, window in windows.items():
+        entry = scan_state.get(symbol)
+        if entry and window.extend(entry['days'], entry['highs'], entry['lows'], entry['closes'],
+                                   entry['volumes'], before_day):
+            rolled += 1
+
+    rows = [LongWindowState(symbol=symbol, state=window.pack(), **window.stats())
+            for symbol, window in windows.items() if window.days]
+    if rows:
+        LongWindowState.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['symbol'],
+            update_fields=WINDOW_FIELDS + ['state', 'updated_at'],
+        )
+    load_long_windows(force=True)
+
+    elapsed = time.perf_counter() - started
+    logger.info("Long windows: %d stored, %d seeded (%d from the bar store), %d rolled in %.1fs",
+                len(rows), seeded, from_bar_store, rolled, elapsed)
+    return {'symbols': len(symbols), 'stored': len(rows), 'seeded': seeded, 'fromBarStore': from_bar_store,
+            'rolled': rolled, 'seconds': elapsed}
+
+
+def load_long_windows(force=False):
+    """Load the stored window scalars into memory if never loaded, stale, or `force` is set."""
+    global _window_cache, _window_loaded_at
+    from .models import LongWindowState
+
+    with _window_lock:
+        if (not force and _window_loaded_at is not None
+                and time.time() - _window_loaded_at < LONG_WINDOW_RELOAD_SECONDS):
+            return _window_cache
+        try:
+            rows = LongWindowState.objects.values('symbol', *WINDOW_FIELDS)
+            _window_cache = {row.pop('symbol'): row for row in rows}
+        except Exception as e:
+            logger.warning("Could not load long-window stats: %s", e)
+        _window_loaded_at = time.time()
+        return _window_cache
+
+
+def long_window_map():
+    """{symbol: LongWindowState values} for every stored symbol (no network calls)."""
+    return load_long_windows()
+
+
+def clear_long_window_cache():
+    """Drop the in-memory copy so the next read reloads from the table."""
+    global _window_cache, _window_loaded_at
+    with _window_lock:
+        _window_cache = {}
+        _window_loaded_at = None
@@ -0,0 +1,94 @@
+"""
+Management command for backtesting the published signals over the scan universe.
+
+Usage:
+    # Per-bar overallSignal, long only, 10 years of daily bars
+    python manage.py backtest_signals
+
+    # Long/short, 5bps per trade
+    python manage.py backtest_signals --mode long_short --cost-bps 5
+
+    # A few symbols, full per-ticker table written to a file
+    python manage.py backtest_signals --symbols AAPL MSFT NVDA --period 2y --json backtest.json
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Backtest overallSignal over the scan universe.'
+
+    def add_arguments(self, parser):
+        from financial_data.backtest import BACKTEST_MODES, BACKTEST_PERIODS, BACKTEST_SOURCES
+
+        parser.add_argument('--source', choices=BACKTEST_SOURCES, default='overall',
+                            help='Signal source (default: overall).')
+        parser.add_argument('--period', choices=BACKTEST_PERIODS, default='10y',
+                            help='Daily history to test over (default: 10y).')
+        parser.add_argument('--mode', choices=BACKTEST_MODES, default='long_only',
+                            help='Position mode (default: long_only).')
+        parser.add_argument('--cost-bps', type=float, default=0.0,
+                            help='Cost per position change in basis points (default: 0).')
+        parser.add_argument('--delay', type=int, default=1,
+                            help='Bars between a signal and its position (default: 1).')
+        parser.add_argument('--symbols', nargs='+', default=None,
+                            help='Symbols to test (default: the scan universe).')
+        parser.add_argument('--top', type=int, default=10,
+                            help='Best and worst tickers to print (default: 10).')
+        parser.add_argument('--json', default=None,
+                            help='Write the full summary to this JSON file.')
+
+    def handle(self, *args, **options):
+        from financial_data.backtest import backtest_universe
+
+        symbols = [s.upper() for s in options['symbols']] if options['symbols'] else None
+        summary = backtest_universe(
+            symbols=symbols,
+            period=options['period'],
+            source=options['source'],
+            mode=options['mode'],
+            cost_bps=options['cost_bps'],
+            delay=options['delay'],
+        )
+
+        timings = summary['timings']
+        self.stdout.write(
+            f"{summary['symbols']} symbols x {summary['bars']} bars ({summary['start']} to {summary['end']}): "
+            f"load {timings['loadSeconds']:.1f}s, signals {timings['signalSeconds']:.1f}s, "
+            f"backtest {timings['backtestSeconds']:.2f}s"
+        )
+        if summary['missing']:
+            self.stdout.write(self.style.WARNING(f"No bars for {len(summary['missing'])} symbols"))
+
+        self.stdout.write('Portfolio (equal weight):')
+        for key, value in summary['portfolio'].items():
+            self.stdout.write(f'  {key:<12} {value}')
+        self.stdout.write('Median ticker:')
+        for key, value in summary['median'].items():
+            self.stdout.write(f'  {key:<12} {value}')
+
+        rows = summary['tickers']
+        top = options['top']
+        if rows and top:
+            self.stdout.write(f"{'symbol':<8} {'return':>9} {'buy&hold':>9} {'maxDD':>8} {'trades':>7} {'hit':>6}")
+            shown = rows if len(rows) <= 2 * top else rows[:top] + [None] + rows[-top:]
+            for row in shown:
+                if row is None:
+                    self.stdout.write('...')
+                else:
+                    self._print_row(row)
+
+        if options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump(summary, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Summary written to {options['json']}"))
+
+    def _print_row(self, row):
+        def pct(value):
+            return f'{value * 100:.1f}%' if value is not None else '-'
+
+        self.stdout.write(
+            f"{row['symbol']:<8} {pct(row['totalReturn']):>9} {pct(row['buyHoldReturn']):>9} "
+            f"{pct(row['maxDrawdown']):>8} {row['trades']:>7} {pct(row['hitRate']):>6}"
+        )
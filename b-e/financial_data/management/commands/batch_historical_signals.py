@@ -0,0 +1,77 @@
+"""
+Management command for computing historical signals for many symbols at once.
+
+Usage:
+    # Watchlist + universe symbols, daily signals, all cores
+    python manage.py batch_historical_signals
+
+    # Several timeframes, specific symbols, 4 workers
+    python manage.py batch_historical_signals --timeframe day week --symbols AAPL MSFT NVDA --workers 4
+
+    # Time the run without writing to the signal store
+    python manage.py batch_historical_signals --dry-run
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Compute historical signals for many symbols on a process pool and store the results.'
+
+    def add_arguments(self, parser):
+        from financial_data.services import HISTORICAL_SIGNAL_MODES
+        from financial_data.signal_store import SIGNAL_TIMEFRAMES
+
+        parser.add_argument(
+            '--timeframe',
+            nargs='+',
+            choices=SIGNAL_TIMEFRAMES,
+            default=['day'],
+            help='Timeframes to compute (default: day).',
+        )
+        parser.add_argument(
+            '--symbols',
+            nargs='+',
+            default=None,
+            help='Symbols to compute (default: watchlist and universe symbols).',
+        )
+        parser.add_argument(
+            '--mode',
+            choices=HISTORICAL_SIGNAL_MODES,
+            default='exact',
+            help='Vote mode (default: exact).',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Worker processes (default: one per CPU core).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Compute without writing to the signal store.',
+        )
+
+    def handle(self, *args, **options):
+        from financial_data.signal_batch import run_batch
+
+        symbols = [s.upper() for s in options['symbols']] if options['symbols'] else None
+        for timeframe in options['timeframe']:
+            self.stdout.write(f'Computing {timeframe} signals...')
+            report = run_batch(
+                symbols=symbols,
+                timeframe=timeframe,
+                mode=options['mode'],
+                workers=options['workers'],
+                store=not options['dry_run'],
+            )
+            self.stdout.write(
+                f"  {report['succeeded']}/{report['symbols']} symbols on {report['workers']} workers: "
+                f"load {report['load_seconds']:.1f}s, compute {report['compute_seconds']:.1f}s, "
+                f"store {report['store_seconds']:.1f}s"
+            )
+            if report['missing']:
+                self.stdout.write(self.style.WARNING(
+                    f"  No bars for {len(report['missing'])} symbols: {', '.join(report['missing'][:10])}"
+                ))
+            self.stdout.write(self.style.SUCCESS(f"  {report['tickers_per_second']:.1f} tickers/sec"))
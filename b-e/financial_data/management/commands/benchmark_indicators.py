@@ -0,0 +1,128 @@
+"""
+Management command for benchmarking the technical indicator functions.
+
+Usage:
+    # Record a baseline (quick profile: up to 10k bars / 10 tickers)
+    python manage.py benchmark_indicators --save
+
+    # Compare against the baseline, failing if anything is >25% slower
+    python manage.py benchmark_indicators --threshold 0.25
+
+    # Full sweep (100 to 1M bars, 1 to 1,000 tickers) - takes several minutes
+    python manage.py benchmark_indicators --profile full --save
+
+    # Specific sizes only
+    python manage.py benchmark_indicators --bars 1000 100000 --tickers 100
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Benchmark indicator calculations on synthetic OHLCV data and check for regressions.'
+
+    def add_arguments(self, parser):
+        from financial_data.benchmarks import PROFILES, DEFAULT_BASELINE_PATH, DEFAULT_THRESHOLD
+
+        parser.add_argument(
+            '--profile',
+            choices=sorted(PROFILES),
+            default='quick',
+            help='Size preset to run (default: quick).',
+        )
+        parser.add_argument(
+            '--bars',
+            type=int,
+            nargs='+',
+            default=None,
+            help='Bar counts for the single-ticker cases (overrides the profile).',
+        )
+        parser.add_argument(
+            '--tickers',
+            type=int,
+            nargs='+',
+            default=None,
+            help='Ticker counts for the multi-ticker cases (overrides the profile).',
+        )
+        parser.add_argument(
+            '--baseline',
+            default=DEFAULT_BASELINE_PATH,
+            help='Baseline JSON file to compare against / write to.',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help='Allowed fractional slowdown before failing (default: 0.25 = 25%%).',
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=2,
+            help='Re-run the suite this many times when something regresses, keeping the best '
+                 'timings, before failing (filters out machine noise; default: 2).',
+        )
+        parser.add_argument(
+            '--save',
+            action='store_true',
+            help='Write this run to the baseline file instead of comparing.',
+        )
+
+    def handle(self, *args, **options):
+        from financial_data.benchmarks import (
+            run_benchmarks, compare_to_baseline, merge_runs, load_baseline, save_baseline
+        )
+
+        def run_suite():
+            return run_benchmarks(
+                bar_counts=options['bars'],
+                ticker_counts=options['tickers'],
+                profile=options['profile'],
+                progress=lambda status: self.stdout.write(f'Benchmarking {status}...'),
+            )
+
+        run = run_suite()
+        self._print_results(run['results'])
+
+        baseline_path = options['baseline']
+        if options['save']:
+            save_baseline(run, baseline_path)
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {baseline_path}'))
+            return
+
+        baseline = load_baseline(baseline_path)
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(f'No baseline at {baseline_path} - run with --save to record one.'))
+            return
+
+        regressions = compare_to_baseline(baseline, run, options['threshold'])
+        for attempt in range(options['retries']):
+            if not regressions:
+                break
+            self.stdout.write(self.style.WARNING(
+                f'{len(regressions)} possible regression(s) - re-running to confirm ({attempt + 1}/{options["retries"]})...'
+            ))
+            run = merge_runs(run, run_suite())
+            regressions = compare_to_baseline(baseline, run, options['threshold'])
+
+        if regressions:
+            for r in regressions:
+                self.stdout.write(self.style.ERROR(
+                    f"  {r['case']} {r['metric']}: {r['baseline'] * 1000:.2f}ms -> "
+                    f"{r['current'] * 1000:.2f}ms (+{r['change'] * 100:.0f}%)"
+                ))
+            raise CommandError(
+                f'{len(regressions)} benchmark(s) regressed more than {options["threshold"] * 100:.0f}%.'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'No regressions beyond {options["threshold"] * 100:.0f}% against {baseline_path}.'
+        ))
+
+    # ---------------------------------------------------------------- #
+
+    def _print_results(self, results):
+        self.stdout.write(f"{'case':<52} {'calc ms':>10} {'json ms':>10} {'KB':>10}")
+        for case, r in results.items():
+            self.stdout.write(
+                f"{case:<52} {r['seconds'] * 1000:>10.2f} {r['serialize_seconds'] * 1000:>10.2f} "
+                f"{r['payload_bytes'] / 1024:>10.1f}"
+            )
@@ -0,0 +1,32 @@
+"""
+Management command for rolling the long-window scan metrics forward.
+
+Usage:
+    # Every universe symbol (seeds symbols without a window)
+    python manage.py refresh_long_windows
+
+    # Specific symbols
+    python manage.py refresh_long_windows --symbols AAPL MSFT NVDA
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Maintain 52-week high/low, 200-day SMA and average volume windows from the newest scan snapshot.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--symbols',
+            nargs='+',
+            default=None,
+            help='Symbols to refresh (default: the scan universe).',
+        )
+
+    def handle(self, *args, **options):
+        from financial_data.long_window import refresh_long_windows
+
+        report = refresh_long_windows(symbols=options['symbols'])
+        self.stdout.write(
+            f"{report['stored']}/{report['symbols']} windows stored ({report['seeded']} seeded, "
+            f"{report['fromBarStore']} from the bar store, {report['rolled']} rolled) in {report['seconds']:.1f}s"
+        )
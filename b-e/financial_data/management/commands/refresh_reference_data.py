@@ -0,0 +1,41 @@
+"""
+Management command for refreshing the reference data table.
+
+Usage:
+    # Watchlist, universe and already-stored symbols
+    python manage.py refresh_reference_data
+
+    # Specific symbols, 8 parallel requests
+    python manage.py refresh_reference_data --symbols AAPL MSFT NVDA --workers 8
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Fetch names, sectors and valuation fields for many symbols in parallel and store them.'
+
+    def add_arguments(self, parser):
+        from financial_data.reference_data import REFERENCE_REFRESH_WORKERS
+
+        parser.add_argument(
+            '--symbols',
+            nargs='+',
+            default=None,
+            help='Symbols to refresh (default: stored, watchlist and universe symbols).',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=REFERENCE_REFRESH_WORKERS,
+            help=f'Parallel requests (default: {REFERENCE_REFRESH_WORKERS}).',
+        )
+
+    def handle(self, *args, **options):
+        from financial_data.reference_data import refresh_reference_data
+
+        report = refresh_reference_data(symbols=options['symbols'], workers=options['workers'])
+        self.stdout.write(f"{report['updated']}/{report['symbols']} symbols updated in {report['seconds']:.1f}s")
+        if report['failed']:
+            self.stdout.write(self.style.WARNING(
+                f"Failed for {len(report['failed'])} symbols: {', '.join(report['failed'][:20])}"
+            ))
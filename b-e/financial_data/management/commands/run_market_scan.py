@@ -0,0 +1,80 @@
+"""
+Management command for starting a sharded market scan.
+
+Usage:
+    # Queue chunk tasks for the Celery workers
+    python manage.py run_market_scan
+
+    # Scan every chunk in this process (no workers needed)
+    python manage.py run_market_scan --local
+
+    # Specific symbols, 50 per chunk
+    python manage.py run_market_scan --local --symbols AAPL MSFT NVDA --chunk-size 50
+
+    # Roll the newest snapshot forward with the 5m bars since it was published
+    python manage.py run_market_scan --update
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Split the scan universe into chunks and scan them on Celery workers (or locally).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--local',
+            action='store_true',
+            help='Scan the chunks in this process instead of queueing Celery tasks.',
+        )
+        parser.add_argument(
+            '--update',
+            action='store_true',
+            help='Apply new intraday bars to the newest snapshot instead of a full scan.',
+        )
+        parser.add_argument(
+            '--symbols',
+            nargs='+',
+            default=None,
+            help='Symbols to scan (default: SCAN_UNIVERSE plus stocks and ETFs in the reference data).',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Symbols per chunk (default: sized from the previous scan).',
+        )
+
+    def handle(self, *args, **options):
+        from financial_data.market_scan import run_scan_locally, scan_progress, start_scan
+        from financial_data.reference_data import seed_reference_data
+        from financial_data.scan_update import run_update
+
+        seeded = seed_reference_data()
+        if seeded:
+            self.stdout.write(f"Seeded reference data: {seeded['updated']}/{seeded['symbols']} symbols")
+
+        if options['update']:
+            snapshot = run_update()
+            if snapshot is None:
+                self.stdout.write(self.style.WARNING('A full scan is running, update skipped'))
+                return
+            if snapshot.kind == 'update':
+                self.stdout.write(self.style.SUCCESS(
+                    f"Scan v{snapshot.pk}: updated {snapshot.symbols_done}/{snapshot.universe_size} symbols "
+                    f"from v{snapshot.base_id}"
+                ))
+                return
+        elif options['local']:
+            snapshot = run_scan_locally(options['symbols'], options['chunk_size'])
+        else:
+            snapshot = start_scan(options['symbols'], options['chunk_size'])
+
+        progress = scan_progress(snapshot)
+        self.stdout.write(
+            f"Scan v{progress['version']} {progress['status']}: {progress['universeSize']} symbols in "
+            f"{progress['chunks']} chunks of {progress['chunkSize']}, {progress['chunksDone']} done"
+        )
+        if progress['rateLimitHits']:
+            self.stdout.write(self.style.WARNING(f"Rate limited {progress['rateLimitHits']} times"))
+        if snapshot.status in ('complete', 'partial'):
+            self.stdout.write(self.style.SUCCESS(f"Published {len(snapshot.rows)} symbols"))
@@ -0,0 +1,49 @@
+"""
+Management command for writing the symbol search listing file.
+
+Usage:
+    # Every US exchange listing into settings.SYMBOL_LISTING_FILE (or the bundled file)
+    python manage.py update_symbol_listing
+
+    # Write somewhere else
+    python manage.py update_symbol_listing --output /data/symbol_listing.csv
+"""
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ('Download the NASDAQ Trader symbol directory and write the symbol search listing, '
+            'keeping the crypto, index and futures rows of the current file.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=None,
+            help='Listing file to write (default: settings.SYMBOL_LISTING_FILE or the bundled listing).',
+        )
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+
+        from financial_data.symbol_search import SYMBOL_LISTING_FILE, exchange_listing, write_listing
+
+        path = options['output'] or getattr(settings, 'SYMBOL_LISTING_FILE', None) or SYMBOL_LISTING_FILE
+        try:
+            listed = exchange_listing()
+        except OSError as e:
+            raise CommandError(f"Could not download the symbol directory: {e}")
+
+        # The directory only covers exchange listings
+        kept = []
+        for source in (path, SYMBOL_LISTING_FILE):
+            try:
+                with open(source, newline='', encoding='utf-8') as f:
+                    kept = [row for row in csv.DictReader(f) if row.get('quote_type') not in ('EQUITY', 'ETF')]
+                break
+            except OSError:
+                continue
+
+        count = write_listing(kept + listed, path)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} symbols to {path}"))
@@ -0,0 +1,445 @@
+"""
+Sharded market scan.
+
+LiveScreensService.scan_market downloads the whole universe with one
+yf.download per resolution in a single process, so its wall-clock time
+grows linearly with the universe. start_scan() instead:
+
+1. Splits scan_universe() into chunks sized from the previous scan
+   (plan_chunk_size): its seconds per symbol and rate-limit hits decide how
+   many symbols one worker downloads at a time.
+2. Queues one Celery task per chunk (financial_data.scan_market_chunk);
+   each worker scans its chunk with LiveScreensService.scan_frames.
+3. Shares rate limits through the snapshot row: a throttled worker sets
+   rate_limited_until with exponential backoff and every worker waits until
+   then before its next download.
+4. Has the last chunk to finish merge all chunk rows into the snapshot and
+   publish it as a new version ('partial' when a chunk gave up; its symbols
+   keep their rows from the previous version). The snapshot also keeps each
+   symbol's daily bars (pack_scan_state) so scan_update can roll it forward
+   between full scans.
+
+Progress (scan_progress) is readable while a scan runs, and current_rows()
+overlays the finished chunks of a running scan on the last published
+snapshot, so screens see fresh rows as soon as each chunk lands.
+"""
+import io
+import logging
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import MarketScanChunk, MarketScanSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Symbols per chunk: bounds, first-scan default, and the per-chunk duration
+# plan_chunk_size aims for
+SCAN_CHUNK_MIN = 25
+SCAN_CHUNK_MAX = 500
+SCAN_CHUNK_DEFAULT = 100
+SCAN_CHUNK_TARGET_SECONDS = 20
+
+# A chunk that returns bars for fewer than this share of its symbols is
+# treated as throttled (yf.download reports per-symbol errors without raising)
+SCAN_MIN_COVERAGE = 0.5
+SCAN_COVERAGE_MIN_SYMBOLS = 10
+
+# Rate-limit backoff: doubles per attempt of the throttled chunk
+SCAN_BACKOFF_SECONDS = 15
+SCAN_BACKOFF_MAX_SECONDS = 300
+SCAN_MAX_ATTEMPTS = 4
+
+# A scan still running after this long is published with what it has
+SCAN_STALE_SECONDS = 15 * 60
+
+# Reference-data quote types added to the universe
+SCAN_UNIVERSE_QUOTE_TYPES = ('EQUITY', 'ETF')
+
+# Published snapshots kept (older ones are deleted after each publish)
+SCAN_SNAPSHOT_KEEP = 30
+
+PUBLISHED_STATUSES = ('complete', 'partial')
+
+STATE_FIELDS = ('closes', 'highs', 'lows', 'volumes')
+
+_rows_cache = {'key': None, 'version': None, 'rows': {}}
+_rows_lock = threading.Lock()
+
+
+class ScanRateLimited(Exception):
+    """Raised when a chunk must wait `retry_after` seconds before downloading."""
+
+    def __init__(self, message, retry_after=SCAN_BACKOFF_SECONDS):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def pack_scan_state(state):
+    """
+    npz blob of per-symbol scan state ({symbol: {'days', 'closes', 'highs',
+    'lows', 'volumes', 'last_ts', 'last_volume'}}): left-aligned (symbols x
+    days) arrays with per-symbol lengths.
+    """
+    symbols = list(state)
+    lengths = np.array([len(state[symbol]['days']) for symbol in symbols], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+    days = np.zeros((len(symbols), width), dtype=np.int64)
+    fields = {field: np.full((len(symbols), width), np.nan) for field in STATE_FIELDS}
+    for row, symbol in enumerate(symbols):
+        entry = state[symbol]
+        n = lengths[row]
+        days[row, :n] = entry['days']
+        for field in STATE_FIELDS:
+            fields[field][row, :n] = entry[field]
+
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer,
+        symbols=np.array(symbols, dtype=str),
+        lengths=lengths,
+        days=days,
+        last_ts=np.array([state[s]['last_ts'] if state[s]['last_ts'] is not None else -1 for s in symbols],
+                         dtype=np.int64),
+        last_volume=np.array([state[s]['last_volume'] if state[s]['last_volume'] is not None else np.nan
+                              for s in symbols], dtype=np.float64),
+        **fields,
+    )
+    return buffer.getvalue()
+
+
+def unpack_scan_state(blob):
+    """{symbol: state entry} from a pack_scan_state blob ({} for None)."""
+    if blob is None:
+        return {}
+    with np.load(io.BytesIO(bytes(blob))) as data:
+        arrays = {key: data[key] for key in data.files}
+    state = {}
+    for row, symbol in enumerate(arrays['symbols'].tolist()):
+        n = int(arrays['lengths'][row])
+        last_ts = int(arrays['last_ts'][row])
+        last_volume = float(arrays['last_volume'][row])
+        state[symbol] = {
+            'days': arrays['days'][row, :n].tolist(),
+            **{field: arrays[field][row, :n].tolist() for field in STATE_FIELDS},
+            'last_ts': last_ts if last_ts >= 0 else None,
+            'last_volume': None if np.isnan(last_volume) else last_volume,
+        }
+    return state
+
+
+def scan_universe():
+    """SCAN_UNIVERSE followed by every stock and ETF in the reference data, deduplicated."""
+    from .models import ReferenceData
+    from .services import SCAN_UNIVERSE
+
+    stored = ReferenceData.objects.filter(quote_type__in=SCAN_UNIVERSE_QUOTE_TYPES).values_list('symbol', flat=True)
+    return list(dict.fromkeys(list(SCAN_UNIVERSE) + list(stored)))
+
+
+def latest_snapshot(before=None, kind=None):
+    """Newest published snapshot (older than version `before`, of `kind` if given), or None."""
+    snapshots = MarketScanSnapshot.objects.filter(status__in=PUBLISHED_STATUSES)
+    if before is not None:
+        snapshots = snapshots.filter(pk__lt=before)
+    if kind is not None:
+        snapshots = snapshots.filter(kind=kind)
+    return snapshots.first()
+
+
+def plan_chunk_size(previous=None):
+    """
+    Symbols per chunk so one chunk takes about SCAN_CHUNK_TARGET_SECONDS at
+    the previous scan's seconds per symbol, halved after a rate-limited scan.
+    """
+    if previous is None:
+        return SCAN_CHUNK_DEFAULT
+    chunks = list(previous.chunks.filter(status='complete', seconds__gt=0).values_list('symbols', 'seconds'))
+    if not chunks:
+        return SCAN_CHUNK_DEFAULT
+    symbols = sum(len(chunk_symbols) for chunk_symbols, _ in chunks)
+    seconds = sum(chunk_seconds for _, chunk_seconds in chunks)
+    size = SCAN_CHUNK_TARGET_SECONDS * symbols / seconds
+    if previous.rate_limit_hits:
+        size = min(size, previous.chunk_size or size) / 2
+    return int(min(SCAN_CHUNK_MAX, max(SCAN_CHUNK_MIN, size)))
+
+
+def split_chunks(symbols, size):
+    """`symbols` in consecutive chunks of at most `size`."""
+    return [symbols[start:start + size] for start in range(0, len(symbols), size)]
+
+
+def _expire_stale(now):
+    cutoff = now - timedelta(seconds=SCAN_STALE_SECONDS)
+    for snapshot in MarketScanSnapshot.objects.filter(status='running', started_at__lt=cutoff):
+        if MarketScanSnapshot.objects.filter(pk=snapshot.pk, status='running').update(status='merging'):
+            logger.warning("Market scan v%d timed out after %d/%d chunks", snapshot.pk, snapshot.chunks_done,
+                           snapshot.chunk_count)
+            _publish(snapshot.pk)
+
+
+def start_scan(symbols=None, chunk_size=None, dispatch=True):
+    """
+    Create a snapshot and its chunks for `symbols` (default:
+    scan_universe()) and queue a Celery task per chunk unless `dispatch` is
+    False. Returns the running snapshot instead if one is already in progress.
+    """
+    _expire_stale(timezone.now())
+    running = MarketScanSnapshot.objects.filter(status__in=('running', 'merging')).first()
+    if running:
+        return running
+
+    symbols = [s.upper() for s in symbols] if symbols else scan_universe()
+    size = chunk_size or plan_chunk_size(latest_snapshot(kind='full'))
+    chunks = split_chunks(symbols, size)
+    with transaction.atomic():
+        snapshot = MarketScanSnapshot.objects.create(
+            universe_size=len(symbols),
+            chunk_size=size,
+            chunk_count=len(chunks),
+        )
+        MarketScanChunk.objects.bulk_create([
+            MarketScanChunk(snapshot=snapshot, index=index, symbols=chunk_symbols)
+            for index, chunk_symbols in enumerate(chunks)
+        ])
+    logger.info("Market scan v%d: %d symbols in %d chunks of %d", snapshot.pk, len(symbols), len(chunks), size)
+
+    if not chunks:
+        MarketScanSnapshot.objects.filter(pk=snapshot.pk).update(status='merging')
+        _publish(snapshot.pk)
+    elif dispatch:
+        from .tasks import scan_market_chunk_task
+
+        for index in range(len(chunks)):
+            scan_market_chunk_task.delay(snapshot.pk, index)
+    return snapshot
+
+
+def fetch_chunk(symbols):
+    """
+    Download and scan one chunk. Returns (rows, state); raises
+    ScanRateLimited when Yahoo throttles it.
+    """
+    import yfinance as yf
+    from yfinance.exceptions import YFRateLimitError
+
+    from .reference_data import reference_map
+    from .services import LiveScreensService, yf_lock
+
+    try:
+        with yf_lock:
+            df_daily = yf.download(symbols, period='1mo', interval='1d', progress=False, group_by='ticker',
+                                   threads=True)
+            df_intraday = yf.download(symbols, period='1d', interval='5m', progress=False, group_by='ticker',
+                                      threads=True)
+    except YFRateLimitError as e:
+        raise ScanRateLimited(str(e))
+
+    state = {}
+    rows = LiveScreensService().scan_frames(symbols, df_daily, df_intraday, reference_map(), state)
+    if len(symbols) >= SCAN_COVERAGE_MIN_SYMBOLS and len(rows) < SCAN_MIN_COVERAGE * len(symbols):
+        raise ScanRateLimited(f"Only {len(rows)}/{len(symbols)} symbols returned bars")
+    return rows, state
+
+
+def _backoff_seconds(attempts):
+    return min(SCAN_BACKOFF_MAX_SECONDS, SCAN_BACKOFF_SECONDS * 2 ** max(0, attempts - 1))
+
+
+def run_chunk(snapshot_id, index):
+    """
+    Scan one chunk and store its rows. Returns the chunk status; raises
+    ScanRateLimited (with the seconds to wait) when it should be retried.
+    """
+    chunk = MarketScanChunk.objects.select_related('snapshot').get(snapshot_id=snapshot_id, index=index)
+    snapshot = chunk.snapshot
+    if chunk.status != 'pending' or snapshot.status != 'running':
+        return chunk.status
+
+    now = timezone.now()
+    if snapshot.rate_limited_until and snapshot.rate_limited_until > now:
+        raise ScanRateLimited('Rate limit cooldown', retry_after=(snapshot.rate_limited_until - now).total_seconds())
+
+    chunk.attempts += 1
+    started = time.perf_counter()
+    try:
+        rows, state = fetch_chunk(chunk.symbols)
+    except ScanRateLimited as e:
+        wait = _backoff_seconds(chunk.attempts)
+        MarketScanSnapshot.objects.filter(pk=snapshot_id).update(
+            rate_limit_hits=F('rate_limit_hits') + 1,
+            rate_limited_until=timezone.now() + timedelta(seconds=wait),
+        )
+        chunk.error = str(e)
+        if chunk.attempts < SCAN_MAX_ATTEMPTS:
+            logger.warning("Market scan v%d chunk %d rate limited, retrying in %ds", snapshot_id, index, wait)
+            chunk.save(update_fields=['attempts', 'error'])
+            raise ScanRateLimited(str(e), retry_after=wait)
+        chunk.status = 'failed'
+    except Exception as e:
+        logger.error("Market scan v%d chunk %d failed: %s", snapshot_id, index, e)
+        chunk.status = 'failed'
+        chunk.error = str(e)
+    else:
+        chunk.status = 'complete'
+        chunk.rows = rows
+        chunk.state = state
+        chunk.error = ''
+    chunk.seconds = time.perf_counter() - started
+    chunk.save()
+
+    MarketScanSnapshot.objects.filter(pk=snapshot_id).update(
+        chunks_done=F('chunks_done') + 1,
+        symbols_done=F('symbols_done') + len(chunk.symbols),
+    )
+    # Exactly one caller sees the last chunk finish and moves the scan to merging
+    if MarketScanSnapshot.objects.filter(pk=snapshot_id, status='running',
+                                         chunks_done__gte=F('chunk_count')).update(status='merging'):
+        _publish(snapshot_id)
+    return chunk.status
+
+
+def _publish(snapshot_id):
+    """Merge chunk rows into the snapshot and publish it as the newest version."""
+    snapshot = MarketScanSnapshot.objects.get(pk=snapshot_id)
+    previous = latest_snapshot(before=snapshot_id)
+    previous_rows = previous.rows if previous else {}
+    previous_state = None
+
+    rows = {}
+    state = {}
+    missing = 0
+    for chunk in snapshot.chunks.all():
+        if chunk.status == 'complete':
+            rows.update(chunk.rows)
+            state.update(chunk.state)
+            continue
+        missing += 1
+        # Unscanned symbols keep their last known rows and state
+        if previous_state is None:
+            previous_state = unpack_scan_state(previous.state) if previous else {}
+        rows.update({symbol: previous_rows[symbol] for symbol in chunk.symbols if symbol in previous_rows})
+        state.update({symbol: previous_state[symbol] for symbol in chunk.symbols if symbol in previous_state})
+
+    snapshot.rows = rows
+    snapshot.state = pack_scan_state(state)
+    snapshot.status = 'complete' if not missing else ('partial' if rows else 'failed')
+    snapshot.finished_at = timezone.now()
+    snapshot.save(update_fields=['rows', 'state', 'status', 'finished_at'])
+    snapshot.chunks.update(rows={}, state={})
+    prune_snapshots()
+    logger.info("Market scan v%d %s: %d symbols, %d/%d chunks missing", snapshot_id, snapshot.status, len(rows),
+                missing, snapshot.chunk_count)
+    return snapshot
+
+
+def prune_snapshots(keep=SCAN_SNAPSHOT_KEEP):
+    """
+    Delete published and failed snapshots older than the newest `keep`
+    published ones, except the newest full scan (plan_chunk_size reads it).
+    """
+    cutoff = MarketScanSnapshot.objects.filter(status__in=PUBLISHED_STATUSES).values_list('pk', flat=True)[keep:keep + 1]
+    if not cutoff:
+        return
+    stale = MarketScanSnapshot.objects.filter(pk__lte=cutoff[0], status__in=PUBLISHED_STATUSES + ('failed',))
+    last_full = latest_snapshot(kind='full')
+    if last_full:
+        stale = stale.exclude(pk=last_full.pk)
+    stale.delete()
+
+
+def run_scan_locally(symbols=None, chunk_size=None):
+    """
+    Run a sharded scan in this process, chunk by chunk, sleeping through
+    rate-limit backoffs. For development without Celery workers.
+    """
+    snapshot = start_scan(symbols, chunk_size, dispatch=False)
+    for index in range(snapshot.chunk_count):
+        while True:
+            try:
+                run_chunk(snapshot.pk, index)
+                break
+            except ScanRateLimited as e:
+                time.sleep(e.retry_after)
+    return MarketScanSnapshot.objects.get(pk=snapshot.pk)
+
+
+def scan_version(published_pk, running_pk=None, chunks_done=0):
+    """
+    Version string of what current_scan() shows: the published snapshot
+    version, plus '+<running>.<chunks>' while a newer scan's chunks are overlaid.
+    """
+    version = str(published_pk or 0)
+    return f"{version}+{running_pk}.{chunks_done}" if running_pk else version
+
+
+def current_scan(max_age=None):
+    """
+    (version, {symbol: scan metrics}) from the newest published snapshot,
+    overlaid with the finished chunks of a newer scan still running. Returns
+    (None, {}) when there is nothing newer than `max_age` seconds to show.
+    """
+    published = MarketScanSnapshot.objects.filter(status__in=PUBLISHED_STATUSES).values('pk', 'finished_at').first()
+    running = MarketScanSnapshot.objects.filter(status='running', pk__gt=published['pk'] if published else 0)
+    running = running.values('pk', 'chunks_done').first()
+    if running and not running['chunks_done']:
+        running = None
+
+    fresh = published and (max_age is None
+                           or (timezone.now() - published['finished_at']).total_seconds() < max_age)
+    if not fresh and not running:
+        return None, {}
+
+    key = (published['pk'] if published else None, published['finished_at'] if published else None,
+           running['pk'] if running else None, running['chunks_done'] if running else 0)
+    with _rows_lock:
+        if _rows_cache['key'] == key:
+            return _rows_cache['version'], _rows_cache['rows']
+
+    rows = {}
+    if published:
+        rows.update(MarketScanSnapshot.objects.values_list('rows', flat=True).get(pk=published['pk']))
+    if running:
+        for chunk_rows in MarketScanChunk.objects.filter(snapshot_id=running['pk'],
+                                                         status='complete').values_list('rows', flat=True):
+            rows.update(chunk_rows)
+    version = scan_version(key[0], key[2], key[3])
+
+    with _rows_lock:
+        _rows_cache['key'] = key
+        _rows_cache['version'] = version
+        _rows_cache['rows'] = rows
+    return version, rows
+
+
+def current_rows(max_age=None):
+    """{symbol: scan metrics} of current_scan(), or {} when there is nothing to show."""
+    return current_scan(max_age)[1]
+
+
+def scan_progress(snapshot=None):
+    """Progress and status of `snapshot` (default: the newest scan), or None if no scan has run."""
+    snapshot = snapshot or MarketScanSnapshot.objects.defer('rows', 'state').first()
+    if snapshot is None:
+        return None
+    return {
+        'version': snapshot.pk,
+        'status': snapshot.status,
+        'kind': snapshot.kind,
+        'universeSize': snapshot.universe_size,
+        'chunkSize': snapshot.chunk_size,
+        'chunks': snapshot.chunk_count,
+        'chunksDone': snapshot.chunks_done,
+        'symbolsDone': snapshot.symbols_done,
+        'percent': round(100 * snapshot.chunks_done / snapshot.chunk_count, 1) if snapshot.chunk_count else 100.0,
+        'rateLimitHits': snapshot.rate_limit_hits,
+        'rateLimitedUntil': snapshot.rate_limited_until.isoformat() if snapshot.rate_limited_until else None,
+        'startedAt': snapshot.started_at.isoformat(),
+        'finishedAt': snapshot.finished_at.isoformat() if snapshot.finished_at else None,
+    }
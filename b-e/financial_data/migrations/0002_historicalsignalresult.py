@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-19 01:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financial_data', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoricalSignalResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(help_text='Stock ticker symbol (e.g., AAPL)', max_length=20)),
+                ('timeframe', models.CharField(help_text='day, week, month or year', max_length=10)),
+                ('mode', models.CharField(default='exact', help_text='Vote mode (exact or monte_carlo)', max_length=20)),
+                ('last_bar_ts', models.BigIntegerField(blank=True, help_text='Epoch ms of the last bar used', null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('complete', 'Complete'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('job_id', models.CharField(help_text='Job id returned to clients', max_length=64, unique=True)),
+                ('signals', models.JSONField(blank=True, default=list)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+                'indexes': [models.Index(fields=['ticker', 'timeframe', 'mode', '-updated_at'], name='financial_d_ticker_dc9f61_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ticker', 'timeframe', 'mode', 'last_bar_ts'), name='unique_historical_signal_result')],
+            },
+        ),
+    ]
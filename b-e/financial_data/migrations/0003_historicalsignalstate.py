@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-19 01:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financial_data', '0002_historicalsignalresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoricalSignalState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(help_text='Stock ticker symbol (e.g., AAPL)', max_length=20)),
+                ('timeframe', models.CharField(help_text='day, week, month or year', max_length=10)),
+                ('window_bars', models.PositiveIntegerField(help_text='Bars in the full fetch the state was built from')),
+                ('last_bar_ts', models.BigIntegerField(help_text='Epoch ms of the last stored bar')),
+                ('arrays', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('ticker', 'timeframe'), name='unique_historical_signal_state')],
+            },
+        ),
+    ]
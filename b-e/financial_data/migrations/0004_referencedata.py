@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financial_data', '0003_historicalsignalstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReferenceData',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(help_text='Stock ticker symbol (e.g., AAPL)', max_length=20, unique=True)),
+                ('name', models.CharField(blank=True, max_length=200)),
+                ('sector', models.CharField(blank=True, max_length=100)),
+                ('industry', models.CharField(blank=True, max_length=100)),
+                ('quote_type', models.CharField(blank=True, help_text='yfinance quoteType (EQUITY, ETF, ...)', max_length=20)),
+                ('exchange', models.CharField(blank=True, max_length=20)),
+                ('pe_ratio', models.FloatField(blank=True, help_text='Trailing P/E', null=True)),
+                ('dividend_yield', models.FloatField(blank=True, null=True)),
+                ('market_cap', models.BigIntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['symbol'],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financial_data', '0004_referencedata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketScanSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('running', 'Running'), ('merging', 'Merging'), ('complete', 'Complete'), ('partial', 'Partial'), ('failed', 'Failed')], default='running', max_length=10)),
+                ('universe_size', models.PositiveIntegerField(default=0)),
+                ('chunk_size', models.PositiveIntegerField(default=0, help_text='Planned symbols per chunk')),
+                ('chunk_count', models.PositiveIntegerField(default=0)),
+                ('chunks_done', models.PositiveIntegerField(default=0, help_text='Chunks finished (complete or failed)')),
+                ('symbols_done', models.PositiveIntegerField(default=0, help_text='Symbols in finished chunks')),
+                ('rate_limit_hits', models.PositiveIntegerField(default=0)),
+                ('rate_limited_until', models.DateTimeField(blank=True, help_text='Workers wait until then before the next download', null=True)),
+                ('rows', models.JSONField(blank=True, default=dict, help_text='{symbol: scan metrics} once published')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MarketScanChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('symbols', models.JSONField(default=list)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('complete', 'Complete'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('rows', models.JSONField(blank=True, default=dict, help_text='Cleared once merged into the snapshot')),
+                ('error', models.TextField(blank=True)),
+                ('seconds', models.FloatField(blank=True, help_text='Download and scan time of the last attempt', null=True)),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='financial_data.marketscansnapshot')),
+            ],
+            options={
+                'ordering': ['snapshot', 'index'],
+                'constraints': [models.UniqueConstraint(fields=('snapshot', 'index'), name='unique_market_scan_chunk')],
+            },
+        ),
+    ]
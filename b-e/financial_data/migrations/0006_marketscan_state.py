@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financial_data', '0005_marketscan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='marketscanchunk',
+            name='state',
+            field=models.JSONField(blank=True, default=dict, help_text='Per-symbol scan state, cleared once merged'),
+        ),
+        migrations.AddField(
+            model_name='marketscansnapshot',
+            name='base',
+            field=models.ForeignKey(blank=True, help_text='Snapshot an incremental update was applied to', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updates', to='financial_data.marketscansnapshot'),
+        ),
+        migrations.AddField(
+            model_name='marketscansnapshot',
+            name='kind',
+            field=models.CharField(choices=[('full', 'Full scan'), ('update', 'Incremental update')], default='full', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='marketscansnapshot',
+            name='state',
+            field=models.BinaryField(blank=True, help_text='Daily bars and last intraday bar per symbol (market_scan.pack_scan_state)', null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_user_theme'),
+        ('financial_data', '0006_marketscan_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserScreen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('definition', models.JSONField(help_text="{'rule': tree, 'sort': field, 'descending': bool}")),
+                ('rule_hash', models.CharField(db_index=True, max_length=64)),
+                ('limit', models.PositiveIntegerField(default=10)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='screens', to='authentication.user')),
+            ],
+            options={
+                'ordering': ['user', 'name'],
+            },
+        ),
+    ]
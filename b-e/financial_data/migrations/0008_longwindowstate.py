@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financial_data', '0007_userscreen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LongWindowState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(help_text='Stock ticker symbol (e.g., AAPL)', max_length=20, unique=True)),
+                ('last_day', models.PositiveIntegerField(help_text='Date ordinal of the newest session in the window')),
+                ('sessions', models.PositiveIntegerField(help_text='Sessions in the high/low window')),
+                ('window_high', models.FloatField(blank=True, null=True)),
+                ('window_low', models.FloatField(blank=True, null=True)),
+                ('close_sum', models.FloatField(help_text='Sum of the last close_count closes')),
+                ('close_count', models.PositiveIntegerField()),
+                ('avg_volume', models.FloatField(blank=True, help_text='Average volume of the last 50 sessions', null=True)),
+                ('state', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['symbol'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financial_data', '0008_longwindowstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BacktestSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(help_text='Signal source (overall or historical)', max_length=20)),
+                ('period', models.CharField(help_text='Daily history tested over (1y, 2y, 5y or 10y)', max_length=10)),
+                ('mode', models.CharField(help_text='long_only or long_short', max_length=20)),
+                ('cost_bps', models.PositiveIntegerField(default=0, help_text='Cost per position change in basis points')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('complete', 'Complete'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('job_id', models.CharField(help_text='Job id returned to clients', max_length=64, unique=True)),
+                ('summary', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+                'indexes': [models.Index(fields=['source', 'period', 'mode', 'cost_bps', '-updated_at'], name='financial_d_source_34125b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financial_data', '0009_backtestsummary'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='historicalsignalstate',
+            name='window_bars',
+            field=models.PositiveIntegerField(help_text='Bars in the stored series (at most signal_state.SIGNAL_WINDOW_BARS)'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+def delete_historical_backtests(apps, schema_editor):
+    # Summaries of the historical signal markers were computed with look-ahead
+    apps.get_model('financial_data', 'BacktestSummary').objects.filter(source='historical').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financial_data', '0010_historicalsignalstate_window_bars'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_historical_backtests, migrations.RunPython.noop),
+    ]
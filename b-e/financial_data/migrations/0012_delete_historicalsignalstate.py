@@ -0,0 +1,16 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:16
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financial_data', '0011_delete_historical_backtests'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='HistoricalSignalState',
+        ),
+    ]
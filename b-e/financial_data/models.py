@@ -17,3 +17,220 @@ class StockData(models.Model):
 
     def __str__(self):
         return f"{self.ticker} - {self.date} - Close: {self.close_price}"
+
+
+class HistoricalSignalResult(models.Model):
+    """
+    Stored output of get_historical_signals, keyed by the last bar it was
+    computed from. A row starts as 'pending' when a job is queued and is
+    filled in (and given its last_bar_ts) when the job finishes.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+
+    ticker = models.CharField(max_length=20, help_text="Stock ticker symbol (e.g., AAPL)")
+    timeframe = models.CharField(max_length=10, help_text="day, week, month or year")
+    mode = models.CharField(max_length=20, default='exact', help_text="Vote mode (exact or monte_carlo)")
+    last_bar_ts = models.BigIntegerField(null=True, blank=True, help_text="Epoch ms of the last bar used")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    job_id = models.CharField(max_length=64, unique=True, help_text="Job id returned to clients")
+    signals = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-updated_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['ticker', 'timeframe', 'mode', 'last_bar_ts'],
+                name='unique_historical_signal_result',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['ticker', 'timeframe', 'mode', '-updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.ticker} {self.timeframe} ({self.mode}) - {self.status}"
+
+
+class BacktestSummary(models.Model):
+    """
+    Stored backtest_universe() output for one parameter set. A row starts as
+    'pending' when a job is queued and is filled in when the job finishes;
+    only the latest finished row per parameter set is kept.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+
+    source = models.CharField(max_length=20, help_text="Signal source (overall or historical)")
+    period = models.CharField(max_length=10, help_text="Daily history tested over (1y, 2y, 5y or 10y)")
+    mode = models.CharField(max_length=20, help_text="long_only or long_short")
+    cost_bps = models.PositiveIntegerField(default=0, help_text="Cost per position change in basis points")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    job_id = models.CharField(max_length=64, unique=True, help_text="Job id returned to clients")
+    summary = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['source', 'period', 'mode', 'cost_bps', '-updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.source} {self.period} {self.mode} {self.cost_bps}bps - {self.status}"
+
+
+class ReferenceData(models.Model):
+    """
+    Slow-changing reference fields for a symbol (name, classification,
+    valuation), refreshed nightly by reference_data.refresh_reference_data
+    so scans and search never call yfinance's .info at request time.
+    """
+    symbol = models.CharField(max_length=20, unique=True, help_text="Stock ticker symbol (e.g., AAPL)")
+    name = models.CharField(max_length=200, blank=True)
+    sector = models.CharField(max_length=100, blank=True)
+    industry = models.CharField(max_length=100, blank=True)
+    quote_type = models.CharField(max_length=20, blank=True, help_text="yfinance quoteType (EQUITY, ETF, ...)")
+    exchange = models.CharField(max_length=20, blank=True)
+    pe_ratio = models.FloatField(null=True, blank=True, help_text="Trailing P/E")
+    dividend_yield = models.FloatField(null=True, blank=True)
+    market_cap = models.BigIntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['symbol']
+
+    def __str__(self):
+        return f"{self.symbol} - {self.name}"
+
+
+class MarketScanSnapshot(models.Model):
+    """
+    One sharded market scan (market_scan.start_scan). The universe is split
+    into MarketScanChunk rows that Celery workers scan in parallel; the last
+    chunk to finish merges their rows into `rows` and publishes the snapshot.
+    Intraday updates (scan_update) publish a new snapshot from a previous
+    one's `state` without a full scan. The primary key is the snapshot version.
+    """
+    KIND_CHOICES = [
+        ('full', 'Full scan'),
+        ('update', 'Incremental update'),
+    ]
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('merging', 'Merging'),
+        ('complete', 'Complete'),
+        ('partial', 'Partial'),
+        ('failed', 'Failed'),
+    ]
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='running')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default='full')
+    base = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='updates',
+                             help_text="Snapshot an incremental update was applied to")
+    universe_size = models.PositiveIntegerField(default=0)
+    chunk_size = models.PositiveIntegerField(default=0, help_text="Planned symbols per chunk")
+    chunk_count = models.PositiveIntegerField(default=0)
+    chunks_done = models.PositiveIntegerField(default=0, help_text="Chunks finished (complete or failed)")
+    symbols_done = models.PositiveIntegerField(default=0, help_text="Symbols in finished chunks")
+    rate_limit_hits = models.PositiveIntegerField(default=0)
+    rate_limited_until = models.DateTimeField(null=True, blank=True,
+                                              help_text="Workers wait until then before the next download")
+    rows = models.JSONField(default=dict, blank=True, help_text="{symbol: scan metrics} once published")
+    state = models.BinaryField(null=True, blank=True,
+                               help_text="Daily bars and last intraday bar per symbol (market_scan.pack_scan_state)")
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-id']
+
+    def __str__(self):
+        return f"Scan v{self.pk} ({self.kind}) - {self.status} ({self.chunks_done}/{self.chunk_count} chunks)"
+
+
+class MarketScanChunk(models.Model):
+    """A slice of a MarketScanSnapshot's universe, scanned by one worker task."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+
+    snapshot = models.ForeignKey(MarketScanSnapshot, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    symbols = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    rows = models.JSONField(default=dict, blank=True, help_text="Cleared once merged into the snapshot")
+    state = models.JSONField(default=dict, blank=True, help_text="Per-symbol scan state, cleared once merged")
+    error = models.TextField(blank=True)
+    seconds = models.FloatField(null=True, blank=True, help_text="Download and scan time of the last attempt")
+
+    class Meta:
+        ordering = ['snapshot', 'index']
+        constraints = [
+            models.UniqueConstraint(fields=['snapshot', 'index'], name='unique_market_scan_chunk'),
+        ]
+
+    def __str__(self):
+        return f"Scan v{self.snapshot_id} chunk {self.index} - {self.status}"
+
+
+class UserScreen(models.Model):
+    """
+    A screen a user built from conditions over scan metrics. `definition`
+    is the canonical form from screen_rules.compile_screen; screens with
+    the same `rule_hash` share evaluated results.
+    """
+    user = models.ForeignKey('authentication.User', on_delete=models.CASCADE, related_name='screens')
+    name = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+    definition = models.JSONField(help_text="{'rule': tree, 'sort': field, 'descending': bool}")
+    rule_hash = models.CharField(max_length=64, db_index=True)
+    limit = models.PositiveIntegerField(default=10)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['user', 'name']
+
+    def __str__(self):
+        return f"{self.name} ({self.user_id})"
+
+
+class LongWindowState(models.Model):
+    """
+    A symbol's completed daily sessions for 52-week high/low, 200-day SMA
+    and average volume, rolled forward nightly by
+    long_window.refresh_long_windows. Scans read the scalar columns; `state`
+    is the .npz blob of the session buffers the window is rebuilt from.
+    """
+    symbol = models.CharField(max_length=20, unique=True, help_text="Stock ticker symbol (e.g., AAPL)")
+    last_day = models.PositiveIntegerField(help_text="Date ordinal of the newest session in the window")
+    sessions = models.PositiveIntegerField(help_text="Sessions in the high/low window")
+    window_high = models.FloatField(null=True, blank=True)
+    window_low = models.FloatField(null=True, blank=True)
+    close_sum = models.FloatField(help_text="Sum of the last close_count closes")
+    close_count = models.PositiveIntegerField()
+    avg_volume = models.FloatField(null=True, blank=True, help_text="Average volume of the last 50 sessions")
+    state = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['symbol']
+
+    def __str__(self):
+        return f"{self.symbol} long window ({self.sessions} sessions)"
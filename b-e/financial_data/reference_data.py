@@ -0,0 +1,191 @@
+"""
+Reference data store: name, sector, industry, quote type, P/E, dividend
+yield and market cap per symbol.
+
+These fields change at most daily, but scan_market used to read them from
+yf.Ticker(symbol).info for every universe symbol on every scan - one
+serial HTTP request per symbol. Instead:
+
+1. refresh_reference_data() fetches .info for all symbols on a thread pool
+   (the requests are network-bound) and upserts one ReferenceData row per
+   symbol. It runs nightly via Celery beat and from the
+   refresh_reference_data management command. A failed fetch keeps the
+   symbol's previous row.
+2. reference_map() loads the whole table into a module-level dict once and
+   reloads it at most every REFERENCE_RELOAD_SECONDS, so rows written by
+   the nightly worker reach the web processes without any request-time
+   network calls.
+3. On a fresh deploy the table is empty until the nightly run, so the scan
+   entry points (start_market_scan task, run_market_scan command) call
+   seed_reference_data() first, which refreshes once when it is empty.
+"""
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Parallel .info requests during a refresh
+REFERENCE_REFRESH_WORKERS = 16
+
+# How often a process re-reads the table (rows only change nightly)
+REFERENCE_RELOAD_SECONDS = 3600
+
+# yfinance quoteType -> asset type label used by search
+QUOTE_TYPE_LABELS = {
+    'EQUITY': 'Stock',
+    'ETF': 'ETF',
+    'MUTUALFUND': 'Mutual Fund',
+    'CRYPTOCURRENCY': 'Crypto',
+    'CURRENCY': 'Currency',
+    'INDEX': 'Index',
+    'FUTURE': 'Futures',
+}
+
+REFERENCE_FIELDS = ['name', 'sector', 'industry', 'quote_type', 'exchange', 'pe_ratio', 'dividend_yield',
+                    'market_cap']
+
+_reference_cache = {}
+_reference_loaded_at = None
+_reference_lock = threading.Lock()
+_seed_attempted = False
+
+
+def _number(value):
+    """Float for a finite numeric .info value, else None ('Infinity' and NaN show up for some symbols)."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def parse_info(symbol, info):
+    """ReferenceData field values from a yfinance .info dict, or None if it has no quote."""
+    if not info or not (info.get('symbol') or info.get('quoteType')):
+        return None
+    market_cap = _number(info.get('marketCap'))
+    return {
+        'symbol': symbol,
+        'name': (info.get('shortName') or info.get('longName') or symbol)[:200],
+        'sector': (info.get('sector') or '')[:100],
+        'industry': (info.get('industry') or '')[:100],
+        'quote_type': (info.get('quoteType') or '')[:20],
+        'exchange': (info.get('exchange') or '')[:20],
+        'pe_ratio': _number(info.get('trailingPE')),
+        'dividend_yield': _number(info.get('dividendYield')),
+        'market_cap': int(market_cap) if market_cap is not None else None,
+    }
+
+
+def fetch_reference(symbol):
+    """
+    Reference fields for one symbol from yfinance, or None if the lookup
+    fails. A symbol yfinance reports as missing is recorded in
+    invalid_symbols (an .info without a quote isn't: throttled refreshes
+    return those too).
+    """
+    import yfinance as yf
+
+    from .invalid_symbols import is_missing_symbol_error, record_miss
+
+    try:
+        reference = parse_info(symbol, yf.Ticker(symbol).info)
+    except Exception as e:
+        logger.warning("Reference data fetch failed for %s: %s", symbol, e)
+        if is_missing_symbol_error(e):
+            record_miss(symbol, str(e))
+        return None
+    return reference
+
+
+def reference_symbols():
+    """Symbols to refresh: everything already stored plus watchlist and universe symbols."""
+    from .models import ReferenceData
+    from .signal_store import precompute_symbols
+
+    stored = list(ReferenceData.objects.values_list('symbol', flat=True))
+    return list(dict.fromkeys(precompute_symbols() + stored))
+
+
+def refresh_reference_data(symbols=None, workers=REFERENCE_REFRESH_WORKERS):
+    """
+    Fetch and upsert reference data for `symbols` (default:
+    reference_symbols()), then reload this process's in-memory copy.
+    Returns a report with counts, failed symbols and seconds.
+    """
+    from .models import ReferenceData
+
+    started = time.perf_counter()
+    symbols = [s.upper() for s in symbols] if symbols else reference_symbols()
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(symbols) or 1))) as pool:
+        rows = list(pool.map(fetch_reference, symbols))
+    fetched = [row for row in rows if row]
+    failed = [symbol for symbol, row in zip(symbols, rows) if not row]
+
+    if fetched:
+        ReferenceData.objects.bulk_create(
+            [ReferenceData(**row) for row in fetched],
+            update_conflicts=True,
+            unique_fields=['symbol'],
+            update_fields=REFERENCE_FIELDS + ['updated_at'],
+        )
+    load_reference(force=True)
+
+    elapsed = time.perf_counter() - started
+    logger.info("Reference data refresh: %d updated, %d failed in %.1fs", len(fetched), len(failed), elapsed)
+    return {'symbols': len(symbols), 'updated': len(fetched), 'failed': failed, 'seconds': elapsed}
+
+
+def seed_reference_data():
+    """
+    Refresh the table if it is empty, at most once per process (a failed
+    seed is left to the nightly refresh). Returns the refresh report, or
+    None if nothing was done.
+    """
+    global _seed_attempted
+    from .models import ReferenceData
+
+    if _seed_attempted or ReferenceData.objects.exists():
+        return None
+    _seed_attempted = True
+    logger.info("Reference data table is empty - seeding it before the first scan")
+    return refresh_reference_data()
+
+
+def load_reference(force=False):
+    """Load the table into memory if it was never loaded, is stale, or `force` is set."""
+    global _reference_cache, _reference_loaded_at
+    from .models import ReferenceData
+
+    with _reference_lock:
+        if (not force and _reference_loaded_at is not None
+                and time.time() - _reference_loaded_at < REFERENCE_RELOAD_SECONDS):
+            return _reference_cache
+        try:
+            rows = ReferenceData.objects.values('symbol', *REFERENCE_FIELDS)
+            _reference_cache = {row.pop('symbol'): row for row in rows}
+        except Exception as e:
+            logger.warning("Could not load reference data: %s", e)
+        _reference_loaded_at = time.time()
+        return _reference_cache
+
+
+def reference_map():
+    """{symbol: reference fields} for every stored symbol (no network calls)."""
+    return load_reference()
+
+
+def get_reference(symbol):
+    """Reference fields for one symbol, or None if it has not been refreshed yet."""
+    return reference_map().get(symbol.upper())
+
+
+def clear_reference_cache():
+    """Drop the in-memory copy so the next read reloads from the table."""
+    global _reference_cache, _reference_loaded_at
+    with _reference_lock:
+        _reference_cache = {}
+        _reference_loaded_at = None
@@ -0,0 +1,160 @@
+"""
+Stored results computed by Celery jobs.
+
+The historical signals store (signal_store) and the backtest summary store
+(backtest_store) keep results as model rows with a status and a job id:
+
+- a row starts as 'pending' when a job is queued, and the job fills it in
+  as 'complete' or 'failed';
+- requests for a key while a job is pending share that job; a pending row
+  older than the job timeout is assumed lost and replaced;
+- without a reachable broker the job runs in the request instead;
+- a complete row is fresh until the next session close passes, and while
+  the market is open only for the store's intraday TTL;
+- a request that finds no fresh row gets the pending job's status, with the
+  last complete result flagged 'stale' if there is one.
+
+ResultJobs holds that logic once for a model and its key fields; the
+stores only say how a result is computed, stored and serialized.
+"""
+import logging
+import uuid
+from datetime import datetime, time as dt_time, timedelta
+from importlib import import_module
+
+import pytz
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+EASTERN = pytz.timezone('US/Eastern')
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+
+
+def last_close(now=None):
+    """Most recent weekday 4:00 PM ET at or before `now` (holidays are not special-cased)."""
+    now = (now or timezone.now()).astimezone(EASTERN)
+    day = now.date()
+    while True:
+        close = EASTERN.localize(datetime.combine(day, MARKET_CLOSE))
+        if day.weekday() < 5 and close <= now:
+            return close
+        day -= timedelta(days=1)
+
+
+def market_is_open(now=None):
+    now = (now or timezone.now()).astimezone(EASTERN)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+class ResultJobs:
+    """
+    Job rows of `model` keyed by `key_fields`. `task` names the Celery task
+    in financial_data.tasks, called with the key values and the job id;
+    `compute` runs the same job inline. `serialize` turns a row into an API
+    body and `stale_fields` picks what a pending body repeats from the last
+    complete row.
+    """
+
+    def __init__(self, model, key_fields, task, compute, serialize, stale_fields,
+                 intraday_ttl, job_timeout, poll_seconds):
+        self.model = model
+        self.key_fields = key_fields
+        self.task = task
+        self.compute = compute
+        self.serialize = serialize
+        self.stale_fields = stale_fields
+        self.intraday_ttl = intraday_ttl
+        self.job_timeout = job_timeout
+        self.poll_seconds = poll_seconds
+
+    def is_fresh(self, row, now=None):
+        """Whether a complete row can be served without recomputing."""
+        now = now or timezone.now()
+        if row.status != 'complete' or row.updated_at < last_close(now):
+            return False
+        if market_is_open(now):
+            return now - row.updated_at < self.intraday_ttl
+        return True
+
+    def latest(self, key):
+        """Most recently computed complete row for `key`, or None."""
+        return self.model.objects.filter(status='complete', **key).order_by('-updated_at').first()
+
+    def get_job(self, job_id):
+        """Stored row for a job id, or None."""
+        return self.model.objects.filter(job_id=job_id).first()
+
+    def job_row(self, key, job_id=None):
+        """The pending row for `job_id` if there is one, else a new unsaved row for `key`."""
+        row = self.get_job(job_id) if job_id else None
+        return row if row is not None else self.model(job_id=job_id or uuid.uuid4().hex, **key)
+
+    def save(self, row, key, **replaced):
+        """Save a finished row, deleting the other rows for `key` that match `replaced`."""
+        with transaction.atomic():
+            self.model.objects.filter(**key, **replaced).exclude(pk=row.pk).delete()
+            row.save()
+        return row
+
+    def save_failed(self, row, key, error):
+        """Store a failure; only the latest failure per key is worth keeping."""
+        row.status = 'failed'
+        row.error = error
+        return self.save(row, key, status='failed')
+
+    def enqueue(self, key):
+        """
+        Queue a job unless one is already in flight for `key`. Returns the
+        pending row, or the finished row if no worker could be reached and
+        the job ran inline.
+        """
+        cutoff = timezone.now() - self.job_timeout
+        pending = self.model.objects.filter(status='pending', created_at__gte=cutoff, **key).first()
+        if pending:
+            return pending
+
+        # Lost jobs would otherwise block the key until they time out
+        self.model.objects.filter(status='pending', created_at__lt=cutoff, **key).delete()
+
+        job_id = uuid.uuid4().hex
+        pending = self.model.objects.create(job_id=job_id, status='pending', **key)
+
+        args = [key[field] for field in self.key_fields] + [job_id]
+        task = getattr(import_module('financial_data.tasks'), self.task)
+        try:
+            task.apply_async(args=args, task_id=job_id)
+        except Exception as e:
+            # No broker (e.g. local dev without Redis) - compute in the request instead
+            logger.warning("Could not queue %s job for %s: %s - running inline", self.task, key, e)
+            return self.compute(*args)
+        return pending
+
+    def request(self, key):
+        """
+        Endpoint entry point: a fresh stored result, or a pending status
+        (with the last complete result marked stale while the new job runs).
+        """
+        stored = self.latest(key)
+        if stored and self.is_fresh(stored):
+            return self.serialize(stored)
+
+        job = self.enqueue(key)
+        if job.status != 'pending':
+            return self.serialize(job)
+
+        body = self.serialize(job)
+        body['retryAfter'] = self.poll_seconds
+        if stored:
+            body.update(self.stale_fields(stored))
+            body['stale'] = True
+        return body
+
+    def job_body(self, row):
+        """API body for a job status request, with the poll interval while pending."""
+        body = self.serialize(row)
+        if row.status == 'pending':
+            body['retryAfter'] = self.poll_seconds
+        return body
@@ -0,0 +1,131 @@
+"""
+Columnar market-scan snapshot and vectorized screens.
+
+A scan snapshot is {symbol: metrics dict}. Filtering that with a list
+comprehension and a full sorted() for every screen on every request is
+O(n log n) Python work per screen. ScanColumns converts a snapshot once
+into float64 columns (None -> NaN) with a symbol index; a screen is then a
+boolean mask over the columns plus an argpartition top-k, so all screens
+over a 10k-symbol universe take a fraction of a millisecond.
+
+Screens return the same rows in the same order as the original sorted()
+filters: ties on the sort key keep snapshot (insertion) order, including
+at the top-k cutoff.
+"""
+import threading
+
+import numpy as np
+
+# Numeric scan fields kept as columns
+SCAN_COLUMNS = (
+    'price', 'change', 'valueChange', 'rv', 'rsi', 'bb_width', 'pct_from_high', 'pct_from_low',
+    'high_52w', 'low_52w', 'sma_20', 'sma_200', 'pct_from_sma200', 'avg_volume_20', 'avg_volume',
+    'pe_ratio', 'dividend_yield', 'market_cap', 'volume',
+)
+
+SECTOR_ETFS = ('XLK', 'XLF', 'XLE', 'XLV', 'XLI', 'XLY', 'XLP', 'XLU', 'XLB', 'XLRE')
+
+
+# criteria -> (mask(ScanColumns), sort column, descending). Comparisons are
+# False for NaN (a None metric); `!= 0` keeps the dict filters' truthiness test.
+SCREEN_RULES = {
+    # At least 1% gain on normal or higher volume
+    'top_gainers': (lambda c: (c['change'] > 1) & (c['rv'] >= 1.0), 'change', True),
+    # 2x+ average volume
+    'unusual_volume': (lambda c: c['rv'] >= 2.0, 'rv', True),
+    # RSI < 35 and not crashing today, lowest RSI first
+    'oversold': (lambda c: (c['rsi'] != 0) & (c['rsi'] < 35) & (c['change'] > -2), 'rsi', False),
+    # RSI > 70, highest first
+    'overbought': (lambda c: c['rsi'] > 70, 'rsi', True),
+    # Tight Bollinger Bands, tightest first
+    'volatility_squeeze': (lambda c: (c['bb_width'] != 0) & (c['bb_width'] < 8), 'bb_width', False),
+    # Within 5% of the high, positive today on normal or higher volume
+    'near_highs': (lambda c: (c['pct_from_high'] != 0) & (c['pct_from_high'] > -5) & (c['change'] > 0)
+                   & (c['rv'] >= 1.0), 'pct_from_high', True),
+    'sector_etfs': (lambda c: c.symbol_mask(SECTOR_ETFS), 'change', True),
+    # Low P/E with positive momentum, lowest P/E first
+    'value_stocks': (lambda c: (c['pe_ratio'] > 0) & (c['pe_ratio'] < 15) & (c['change'] > 0), 'pe_ratio', False),
+}
+
+
+def _number(value):
+    if value is None or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class ScanColumns:
+    """A scan snapshot as float64 columns with a symbol -> row index."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.symbols = list(rows)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        values = list(rows.values())
+        self.columns = {
+            name: np.fromiter((_number(row.get(name)) for row in values), dtype=np.float64, count=len(values))
+            for name in SCAN_COLUMNS
+        }
+        self._keys = {}
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def symbol_mask(self, symbols):
+        """Boolean mask of the rows for `symbols`."""
+        mask = np.zeros(len(self), dtype=bool)
+        mask[[self.index[s] for s in symbols if s in self.index]] = True
+        return mask
+
+    def _sort_keys(self, key, descending):
+        """Ascending sort keys for a column (negated when descending, NaN last), built once."""
+        keys = self._keys.get((key, descending))
+        if keys is None:
+            keys = -self.columns[key] if descending else self.columns[key]
+            keys = self._keys[(key, descending)] = np.where(np.isnan(keys), np.inf, keys)
+        return keys
+
+    def top_k(self, mask, key, k, descending=False):
+        """
+        Row indexes of the best `k` rows in `mask` by column `key`, in sort
+        order. Ties keep row order, as a stable sorted() would.
+        """
+        rows = np.flatnonzero(mask)
+        if k <= 0 or rows.size == 0:
+            return rows[:0]
+        keys = self._sort_keys(key, descending)[rows]
+
+        if rows.size > k:
+            kth = keys[np.argpartition(keys, k - 1)[k - 1]]
+            # Everything strictly better than the cutoff, then ties at the cutoff in row order
+            better = np.flatnonzero(keys < kth)
+            ties = np.flatnonzero(keys == kth)[:k - better.size]
+            keep = np.concatenate((better, ties))
+            rows, keys = rows[keep], keys[keep]
+
+        return rows[np.lexsort((rows, keys))]
+
+    def screen(self, criteria, limit=5):
+        """[(symbol, metrics)] for a SCREEN_RULES criteria, best first."""
+        mask_func, key, descending = SCREEN_RULES[criteria]
+        return [(self.symbols[i], self.rows[self.symbols[i]])
+                for i in self.top_k(mask_func(self), key, limit, descending)]
+
+
+_columns_cache = {'rows': None, 'columns': None}
+_columns_lock = threading.Lock()
+
+
+def columns_for(rows):
+    """ScanColumns for a snapshot dict, built once per snapshot object."""
+    with _columns_lock:
+        if _columns_cache['rows'] is not rows:
+            _columns_cache['columns'] = ScanColumns(rows)
+            _columns_cache['rows'] = rows
+        return _columns_cache['columns']
@@ -0,0 +1,198 @@
+"""
+Incremental intraday market rescans.
+
+A full scan (market_scan.start_scan) re-downloads a month of daily bars
+and the whole day's 5m bars for every symbol, so it runs hourly at most.
+Between full scans run_update() rolls the newest published snapshot
+forward instead:
+
+1. Unpacks the snapshot's per-symbol state (daily closes/highs/lows/volumes
+   and the timestamp and volume of the last 5m bar seen).
+2. Downloads only the 5m bars since the oldest of those timestamps
+   (download_new_bars), in chunks of SCAN_UPDATE_CHUNK_SIZE.
+3. Folds the new bars into each symbol's last daily bar, or appends a new
+   daily bar on a new session (apply_bars), and recomputes price, change,
+   RV, RSI, BB width and sparkline with LiveScreensService.scan_metrics.
+4. Publishes the result as a new snapshot version (kind='update').
+
+The last 5m bar of the previous run is usually still forming, so it is
+downloaded again and its new volume replaces the old one in the daily
+total. Daily volume is therefore the full scan's daily volume plus the
+intraday volume since; it is re-based on the next full scan.
+"""
+import logging
+import math
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils import timezone
+
+from .market_scan import (
+    ScanRateLimited, latest_snapshot, pack_scan_state, prune_snapshots, split_chunks, start_scan,
+    unpack_scan_state,
+)
+from .models import MarketScanSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Older snapshots are not rolled forward; a full scan is started instead
+SCAN_UPDATE_MAX_AGE = 6 * 60 * 60
+
+# Symbols per intraday download
+SCAN_UPDATE_CHUNK_SIZE = 500
+
+# How far before the base snapshot bars are requested at most
+SCAN_UPDATE_LOOKBACK_SECONDS = 30 * 60
+
+SPARKLINE_POINTS = 20
+
+
+def _finite(value, default):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return default
+    return value if math.isfinite(value) else default
+
+
+def download_new_bars(symbols, since_ms):
+    """
+    {symbol: [(ts_ms, day_ordinal, high, low, close, volume)]} of the 5m
+    bars since `since_ms`, oldest first. Symbols without new bars are left
+    out; raises ScanRateLimited when Yahoo throttles the download.
+    """
+    import yfinance as yf
+    from yfinance.exceptions import YFRateLimitError
+
+    from .services import LiveScreensService, yf_lock
+    from .timestamps import epoch_ms
+
+    start = datetime.fromtimestamp(since_ms / 1000, tz=dt_timezone.utc)
+    try:
+        with yf_lock:
+            df = yf.download(symbols, start=start, interval='5m', progress=False, group_by='ticker',
+                             threads=True)
+    except YFRateLimitError as e:
+        raise ScanRateLimited(str(e))
+
+    bars = {}
+    for symbol in symbols:
+        frame = LiveScreensService._ticker_frame(df, symbol)
+        if frame is None or 'Close' not in frame.columns:
+            continue
+        frame = frame.dropna(subset=['Close'])
+        if frame.empty:
+            continue
+        closes = frame['Close'].tolist()
+        highs = frame['High'].tolist() if 'High' in frame.columns else closes
+        lows = frame['Low'].tolist() if 'Low' in frame.columns else closes
+        volumes = frame['Volume'].tolist() if 'Volume' in frame.columns else [0] * len(closes)
+        days = [ts.date().toordinal() for ts in frame.index]
+        bars[symbol] = [
+            (int(ts), day, _finite(high, close), _finite(low, close), float(close), _finite(volume, 0.0))
+            for ts, day, high, low, close, volume in zip(epoch_ms(frame.index), days, highs, lows, closes, volumes)
+        ]
+    return bars
+
+
+def apply_bars(entry, bars, sparkline):
+    """
+    Fold 5m `bars` into one symbol's scan state. Returns the new (entry,
+    sparkline); the inputs are not modified. Bars older than the entry's
+    last_ts are ignored, the bar at last_ts replaces its earlier version,
+    and a bar from a later session starts a new daily bar (dropping the
+    oldest, so the window keeps its length) and a new sparkline.
+    """
+    entry = {key: list(value) if isinstance(value, list) else value for key, value in entry.items()}
+    sparkline = list(sparkline or [])
+    days, closes, highs, lows, volumes = (entry[key] for key in ('days', 'closes', 'highs', 'lows', 'volumes'))
+    last_ts, last_volume = entry['last_ts'], entry['last_volume']
+
+    for ts, day, high, low, close, volume in bars:
+        if (last_ts is not None and ts < last_ts) or day < days[-1]:
+            continue
+        if day > days[-1]:
+            for values, value in ((days, day), (closes, close), (highs, high), (lows, low), (volumes, volume)):
+                values.append(value)
+                del values[0]
+            sparkline = [close]
+        else:
+            closes[-1] = close
+            highs[-1] = max(highs[-1], high)
+            lows[-1] = min(lows[-1], low)
+            if ts == last_ts:
+                # Refetched bar: swap its earlier volume for the new one
+                volumes[-1] += volume - (last_volume if last_volume is not None else volume)
+                if sparkline:
+                    sparkline[-1] = close
+                else:
+                    sparkline.append(close)
+            else:
+                volumes[-1] += volume
+                # Without a previous 5m bar the sparkline holds daily closes
+                sparkline = sparkline + [close] if last_ts is not None else [close]
+        last_ts, last_volume = ts, volume
+
+    entry['last_ts'], entry['last_volume'] = last_ts, last_volume
+    return entry, sparkline[-SPARKLINE_POINTS:]
+
+
+def _since_ms(state, base):
+    """Oldest last_ts in `state`, but no earlier than the lookback before `base` was published."""
+    floor = int((base.finished_at.timestamp() - SCAN_UPDATE_LOOKBACK_SECONDS) * 1000)
+    seen = [entry['last_ts'] for entry in state.values() if entry['last_ts'] is not None]
+    return max(min(seen), floor) if seen else floor
+
+
+def run_update():
+    """
+    Publish a new snapshot from the newest one plus the 5m bars since.
+    Starts a full scan instead when there is no recent snapshot with state,
+    and does nothing (returns None) while a full scan is running. Returns
+    the new snapshot.
+    """
+    from .long_window import long_window_map
+    from .reference_data import reference_map
+    from .services import LiveScreensService
+
+    if MarketScanSnapshot.objects.filter(status__in=('running', 'merging')).exists():
+        return None
+    base = latest_snapshot()
+    if (base is None or not base.state
+            or (timezone.now() - base.finished_at).total_seconds() > SCAN_UPDATE_MAX_AGE):
+        return start_scan()
+    state = unpack_scan_state(base.state)
+    if not state:
+        return start_scan()
+
+    started = time.perf_counter()
+    since_ms = _since_ms(state, base)
+    bars = {}
+    for symbols in split_chunks(list(state), SCAN_UPDATE_CHUNK_SIZE):
+        bars.update(download_new_bars(symbols, since_ms))
+
+    references = reference_map()
+    windows = long_window_map()
+    service = LiveScreensService()
+    rows = dict(base.rows)
+    for symbol, symbol_bars in bars.items():
+        entry, sparkline = apply_bars(state[symbol], symbol_bars, (rows.get(symbol) or {}).get('sparkline'))
+        state[symbol] = entry
+        rows[symbol] = service.scan_metrics(symbol, entry['closes'], entry['highs'], entry['lows'],
+                                            entry['volumes'], sparkline, references.get(symbol) or {},
+                                            windows.get(symbol), entry['days'][-1])
+
+    snapshot = MarketScanSnapshot.objects.create(
+        kind='update',
+        base=base,
+        status='complete',
+        universe_size=len(state),
+        symbols_done=len(bars),
+        rows=rows,
+        state=pack_scan_state(state),
+        finished_at=timezone.now(),
+    )
+    prune_snapshots()
+    logger.info("Market scan v%d: updated %d/%d symbols from v%d in %.1fs", snapshot.pk, len(bars), len(state),
+                base.pk, time.perf_counter() - started)
+    return snapshot
@@ -0,0 +1,325 @@
+"""
+Rule engine for user-built screens.
+
+A screen definition is a tree of conditions over scan metrics:
+
+    {"op": "and", "rules": [
+        {"field": "rsi", "op": "lt", "value": 35},
+        {"op": "or", "rules": [
+            {"field": "rv", "op": "gte", "value": 2},
+            {"field": "change", "op": "gt", "value": 3}
+        ]}
+    ]}
+
+plus an optional sort field, direction and limit. The watchlist
+RuleBuilder's flat form (conditions joined by AND/OR operators) is
+converted with rule_builder_rule().
+
+compile_screen() validates a definition and canonicalizes it (operator
+aliases resolved, nested groups of the same operator flattened, group
+members sorted), so the same screen written two ways hashes the same.
+evaluate_screens() then runs many screens over one ScanColumns snapshot
+in a single pass: each distinct condition is evaluated once as a boolean
+column mask and shared by every rule that uses it, and results are cached
+per (rule hash, snapshot version), so identical screens of different
+users cost one evaluation per snapshot.
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from .scan_columns import SCAN_COLUMNS
+
+RULE_OPERATORS = {
+    'gt': np.greater,
+    'gte': np.greater_equal,
+    'lt': np.less,
+    'lte': np.less_equal,
+    'eq': np.equal,
+    'ne': np.not_equal,
+}
+
+OPERATOR_ALIASES = {'>': 'gt', '>=': 'gte', '<': 'lt', '<=': 'lte', '==': 'eq', '=': 'eq', '!=': 'ne'}
+
+GROUP_OPERATORS = ('and', 'or')
+
+# RuleBuilder metric names that map onto scan fields
+FIELD_ALIASES = {
+    'RSI': 'rsi',
+    'Price': 'price',
+    'Today Volume': 'volume',
+    '20-Day Avg Volume': 'avg_volume_20',
+    '20-Day SMA': 'sma_20',
+}
+
+# ConditionBlock's metrics per category; a condition without a metric uses
+# the first of its category (RSI when it has no category either), as the UI shows
+RULE_BUILDER_METRICS = {
+    'RSI': ('RSI',),
+    'Volume': ('Today Volume', '20-Day Avg Volume'),
+    'Price Action': ('Price', '20-Day SMA'),
+}
+RULE_BUILDER_DEFAULT_CATEGORY = 'RSI'
+
+# RuleBuilder metrics scan snapshots can't provide (MACD needs more than 1mo of bars)
+RULE_BUILDER_UNSUPPORTED = ('MACD', 'MACD Line', 'Signal Line', 'MACD Histogram')
+
+# Limits on a single definition
+RULE_MAX_CONDITIONS = 50
+RULE_MAX_DEPTH = 5
+
+# Matches kept per (rule, version); a screen's limit slices this
+SCREEN_RESULT_MAX = 200
+SCREEN_LIMIT_MAX = 50
+
+# Cached results are kept for this many snapshot versions
+SCREEN_CACHE_VERSIONS = 4
+
+_results_cache = {}
+_results_lock = threading.Lock()
+
+
+class ScreenRuleError(ValueError):
+    """A screen definition that cannot be compiled."""
+
+
+@dataclass(frozen=True)
+class CompiledScreen:
+    rule: dict
+    sort: str
+    descending: bool
+    rule_hash: str
+
+
+def _field(name):
+    field = FIELD_ALIASES.get(name, name)
+    if field not in SCAN_COLUMNS:
+        raise ScreenRuleError(f"Unknown field '{name}'. Supported: {', '.join(SCAN_COLUMNS)}")
+    return field
+
+
+def _canonical_json(value):
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+
+def normalize_rule(rule, depth=0):
+    """Canonical form of a condition or and/or group. Raises ScreenRuleError."""
+    if not isinstance(rule, dict):
+        raise ScreenRuleError('Each rule must be an object')
+    if depth > RULE_MAX_DEPTH:
+        raise ScreenRuleError(f'Rules may be nested at most {RULE_MAX_DEPTH} deep')
+
+    op = str(rule.get('op', '')).lower()
+    op = OPERATOR_ALIASES.get(op, op)
+
+    if 'rules' in rule:
+        if op not in GROUP_OPERATORS:
+            raise ScreenRuleError(f"Group operator must be one of {GROUP_OPERATORS}, got '{rule.get('op')}'")
+        members = rule['rules']
+        if not isinstance(members, list) or not members:
+            raise ScreenRuleError('A group needs a non-empty list of rules')
+        flat = []
+        for member in members:
+            member = normalize_rule(member, depth + 1)
+            # (a and (b and c)) is (a and b and c)
+            flat.extend(member['rules'] if member.get('op') == op and 'rules' in member else [member])
+        unique = {_canonical_json(member): member for member in flat}
+        if len(unique) == 1:
+            return next(iter(unique.values()))
+        return {'op': op, 'rules': [unique[key] for key in sorted(unique)]}
+
+    if op not in RULE_OPERATORS:
+        raise ScreenRuleError(f"Operator must be one of {tuple(RULE_OPERATORS)}, got '{rule.get('op')}'")
+    try:
+        value = float(rule.get('value'))
+    except (TypeError, ValueError):
+        raise ScreenRuleError(f"Condition on '{rule.get('field')}' needs a numeric value")
+    if not np.isfinite(value):
+        raise ScreenRuleError(f"Condition on '{rule.get('field')}' needs a finite value")
+    return {'field': _field(rule.get('field')), 'op': op, 'value': value}
+
+
+def rule_builder_rule(conditions, operators=None):
+    """
+    Rule tree for the RuleBuilder's flat form: conditions ({category,
+    metric, comparator, value}) joined by AND/OR operators, AND binding tighter.
+    """
+    if not conditions:
+        raise ScreenRuleError('At least one condition is required')
+    operators = list(operators or [])
+    groups = [[]]
+    for index, condition in enumerate(conditions):
+        comparator = condition.get('comparator') or 'gt'
+        if comparator.startswith('crosses'):
+            raise ScreenRuleError(f"'{comparator}' needs bar history and is not supported by scan screens")
+        category = condition.get('category') or RULE_BUILDER_DEFAULT_CATEGORY
+        metric = condition.get('metric') or RULE_BUILDER_METRICS.get(category, (category,))[0]
+        if metric in RULE_BUILDER_UNSUPPORTED:
+            raise ScreenRuleError(f"'{metric}' needs bar history and is not supported by scan screens")
+        groups[-1].append({'field': metric, 'op': comparator, 'value': condition.get('value')})
+        if index < len(conditions) - 1 and str(operators[index] if index < len(operators) else 'AND').upper() == 'OR':
+            groups.append([])
+    return {'op': 'or', 'rules': [{'op': 'and', 'rules': group} for group in groups]}
+
+
+def _count_conditions(rule):
+    return sum(_count_conditions(member) for member in rule['rules']) if 'rules' in rule else 1
+
+
+def compile_screen(definition):
+    """
+    CompiledScreen for a definition {'rule': tree, 'sort': field,
+    'descending': bool}, or a bare rule tree. Raises ScreenRuleError.
+    """
+    if not isinstance(definition, dict):
+        raise ScreenRuleError('A screen definition must be an object')
+    tree = definition.get('rule', definition)
+    if 'conditions' in definition:
+        tree = rule_builder_rule(definition['conditions'], definition.get('operators'))
+    rule = normalize_rule(tree)
+    if _count_conditions(rule) > RULE_MAX_CONDITIONS:
+        raise ScreenRuleError(f'A screen may have at most {RULE_MAX_CONDITIONS} conditions')
+
+    sort = _field(definition.get('sort') or 'change')
+    descending = bool(definition.get('descending', True))
+    rule_hash = hashlib.sha256(
+        _canonical_json({'rule': rule, 'sort': sort, 'descending': descending}).encode()
+    ).hexdigest()
+    return CompiledScreen(rule=rule, sort=sort, descending=descending, rule_hash=rule_hash)
+
+
+class RuleEvaluator:
+    """Evaluates rule trees over one ScanColumns, computing each distinct condition mask once."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self._masks = {}
+
+    def mask(self, rule):
+        if 'rules' in rule:
+            masks = [self.mask(member) for member in rule['rules']]
+            return np.logical_and.reduce(masks) if rule['op'] == 'and' else np.logical_or.reduce(masks)
+
+        key = (rule['field'], rule['op'], rule['value'])
+        mask = self._masks.get(key)
+        if mask is None:
+            column = self.columns[rule['field']]
+            # A missing metric (NaN) never matches, including for 'ne'
+            mask = self._masks[key] = RULE_OPERATORS[rule['op']](column, rule['value']) & ~np.isnan(column)
+        return mask
+
+    def matches(self, screen):
+        """Matching symbols of a CompiledScreen, best first, at most SCREEN_RESULT_MAX."""
+        rows = self.columns.top_k(self.mask(screen.rule), screen.sort, SCREEN_RESULT_MAX, screen.descending)
+        return [self.columns.symbols[i] for i in rows]
+
+
+def evaluate_screens(screens, columns, version):
+    """
+    {rule_hash: [symbols]} for CompiledScreens over one snapshot's
+    ScanColumns. Each distinct rule is evaluated once per `version`;
+    repeated calls for the same version are served from the cache.
+    """
+    with _results_lock:
+        cached = {screen.rule_hash: _results_cache.get((screen.rule_hash, version)) for screen in screens}
+
+    missing = {screen.rule_hash: screen for screen in screens if cached[screen.rule_hash] is None}
+    if missing:
+        evaluator = RuleEvaluator(columns)
+        fresh = {rule_hash: evaluator.matches(screen) for rule_hash, screen in missing.items()}
+        with _results_lock:
+            versions = list(dict.fromkeys(cached_version for _, cached_version in _results_cache))
+            if version not in versions and len(versions) >= SCREEN_CACHE_VERSIONS:
+                stale = set(versions[:len(versions) - SCREEN_CACHE_VERSIONS + 1])
+                for key in [key for key in _results_cache if key[1] in stale]:
+                    del _results_cache[key]
+            for rule_hash, symbols in fresh.items():
+                _results_cache[(rule_hash, version)] = symbols
+        cached.update(fresh)
+    return cached
+
+
+_batched_version = {'version': None}
+
+# Metrics returned with each matched stock
+SCREEN_STOCK_FIELDS = ('price', 'change', 'valueChange', 'rv', 'rsi', 'bb_width', 'pct_from_high', 'volume')
+
+
+def stored_screen(screen):
+    """CompiledScreen for a saved UserScreen (its definition is already canonical)."""
+    definition = screen.definition
+    return CompiledScreen(rule=definition['rule'], sort=definition['sort'],
+                          descending=definition['descending'], rule_hash=screen.rule_hash)
+
+
+def screen_definition(compiled):
+    """The JSON stored as UserScreen.definition."""
+    return {'rule': compiled.rule, 'sort': compiled.sort, 'descending': compiled.descending}
+
+
+def _active_screens():
+    from .models import UserScreen
+
+    screens = UserScreen.objects.filter(is_active=True).only('rule_hash', 'definition')
+    return list({screen.rule_hash: stored_screen(screen) for screen in screens}.values())
+
+
+def run_screens(compiled_screens):
+    """
+    (version, rows, {rule_hash: [symbols]}) for CompiledScreens over the
+    current scan snapshot. The first call for a snapshot version evaluates
+    every active user screen with them in one batch.
+    """
+    from .scan_columns import columns_for
+    from .services import LiveScreensService
+
+    version, rows = LiveScreensService().scan_snapshot()
+    if not rows:
+        return version, rows, {screen.rule_hash: [] for screen in compiled_screens}
+
+    batch = list(compiled_screens)
+    if _batched_version['version'] != version:
+        batch += _active_screens()
+        _batched_version['version'] = version
+    return version, rows, evaluate_screens(batch, columns_for(rows), version)
+
+
+def screen_stocks(symbols, rows, limit):
+    """Stock dicts for the first `limit` matched symbols."""
+    stocks = []
+    for rank, symbol in enumerate(symbols[:limit], 1):
+        info = rows[symbol]
+        stock = {'symbol': symbol, 'name': info.get('name') or symbol, 'sparkline': info.get('sparkline') or [],
+                 'rank': rank}
+        stock.update({field: info.get(field) for field in SCREEN_STOCK_FIELDS})
+        stocks.append(stock)
+    return stocks
+
+
+def user_screen_results(screens):
+    """Response dicts with current matches for saved UserScreens."""
+    compiled = [stored_screen(screen) for screen in screens]
+    version, rows, results = run_screens(compiled)
+    return [
+        {
+            'id': screen.pk,
+            'name': screen.name,
+            'description': screen.description,
+            'definition': screen.definition,
+            'ruleHash': screen.rule_hash,
+            'limit': screen.limit,
+            'isActive': screen.is_active,
+            'version': version,
+            'stocks': screen_stocks(results[screen.rule_hash], rows, screen.limit),
+        }
+        for screen in screens
+    ]
+
+
+def clear_screen_cache():
+    with _results_lock:
+        _results_cache.clear()
+        _batched_version['version'] = None
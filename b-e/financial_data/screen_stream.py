@@ -0,0 +1,228 @@
+"""
+Server-sent live screen updates.
+
+useLiveScreensData used to poll /live-screens/ and receive every screen
+with full sparklines even when the scan snapshot had not changed. The
+/live-screens/stream/ endpoint instead sends the screens once ('screens'
+event) and then, for each new snapshot version, only what changed
+('delta' event): stocks that entered or left a screen, new ranks, and
+changed fields of the stocks that stayed (a sparkline usually as the
+points appended since the last version).
+
+One ScreenBroadcaster per event loop polls the materialized screens
+(LiveScreensService.current_screens) and computes each version's delta
+once; every connected client is woken with it, so one scan fans out to all
+clients. A client that missed a version gets a full 'screens' event.
+
+Holding streams open needs an ASGI server (config/asgi.py). Under WSGI the
+endpoint sends the current screens and closes, and EventSource reconnects
+after the `retry` interval, which degrades to polling.
+"""
+import asyncio
+import json
+import logging
+import weakref
+
+from asgiref.sync import sync_to_async
+
+logger = logging.getLogger(__name__)
+
+# How often the broadcaster checks for a new snapshot version
+SCREEN_STREAM_POLL_SECONDS = 5
+
+# Comment line sent when nothing changed, so proxies keep the stream open
+SCREEN_STREAM_HEARTBEAT_SECONDS = 15
+
+# Streams are closed after this long; EventSource reconnects on its own
+SCREEN_STREAM_MAX_SECONDS = 30 * 60
+
+# EventSource reconnect delay (ms): short while streaming, a poll interval under WSGI
+SCREEN_STREAM_RETRY_MS = 3000
+SCREEN_STREAM_POLL_RETRY_MS = 60000
+
+# Stock fields sent when they change (rank and sparkline are diffed separately)
+STOCK_UPDATE_FIELDS = ('name', 'price', 'change', 'valueChange', 'timeframe', 'screenReason', 'score', 'signals')
+
+# Screen fields sent with every delta of a screen
+SCREEN_META_FIELDS = ('generatedAt', 'expiresAt', 'refreshInterval')
+
+
+def sparkline_update(old, new):
+    """
+    Smallest change turning sparkline `old` into `new`: {} when equal,
+    {'sparklineTail', 'sparklineLength'} when `new` continues `old` (its
+    last point possibly replaced), else {'sparkline': new}. The client
+    applies a tail as (old[:-1] + tail)[-length:].
+    """
+    if old == new:
+        return {}
+    for shift in range(len(old) - 1):
+        kept = old[shift:-1]
+        if new[:len(kept)] == kept:
+            return {'sparklineTail': new[len(kept):], 'sparklineLength': len(new)}
+    return {'sparkline': new}
+
+
+def screens_delta(previous, current):
+    """
+    {screen_id: changes} from one materialized screens dict to the next.
+    Unchanged screens are left out; a new screen is sent whole under
+    'screen' and a dropped one as {'removed': True}.
+    """
+    delta = {}
+    for screen_id, screen in current.items():
+        before = previous.get(screen_id)
+        if before is None:
+            delta[screen_id] = {'screen': screen}
+            continue
+
+        old_stocks = {stock['symbol']: stock for stock in before['stocks']}
+        new_stocks = {stock['symbol']: stock for stock in screen['stocks']}
+        changes = {}
+        entered = [stock for symbol, stock in new_stocks.items() if symbol not in old_stocks]
+        exited = [symbol for symbol in old_stocks if symbol not in new_stocks]
+        ranks = {}
+        updates = {}
+        for symbol, stock in new_stocks.items():
+            old = old_stocks.get(symbol)
+            if old is None:
+                continue
+            if stock.get('rank') != old.get('rank'):
+                ranks[symbol] = stock.get('rank')
+            update = {field: stock.get(field) for field in STOCK_UPDATE_FIELDS if stock.get(field) != old.get(field)}
+            update.update(sparkline_update(old.get('sparkline') or [], stock.get('sparkline') or []))
+            if update:
+                updates[symbol] = update
+
+        for key, value in (('entered', entered), ('exited', exited), ('ranks', ranks), ('updates', updates)):
+            if value:
+                changes[key] = value
+        if changes:
+            changes.update({field: screen.get(field) for field in SCREEN_META_FIELDS})
+            delta[screen_id] = changes
+
+    for screen_id in previous:
+        if screen_id not in current:
+            delta[screen_id] = {'removed': True}
+    return delta
+
+
+def sse_event(event, data, event_id=None):
+    """One text/event-stream message."""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def _select(screens, screen_ids):
+    if not screen_ids:
+        return screens
+    return {screen_id: value for screen_id, value in screens.items() if screen_id in screen_ids}
+
+
+def _screens_event(version, screens, screen_ids):
+    return sse_event('screens', {'version': version, 'screens': list(_select(screens, screen_ids).values())},
+                     event_id=version)
+
+
+async def _load_screens():
+    from .services import LiveScreensService
+
+    return await sync_to_async(LiveScreensService().current_screens)()
+
+
+class ScreenBroadcaster:
+    """Polls the materialized screens for new versions and wakes every subscribed stream."""
+
+    def __init__(self):
+        self.version = None
+        self.screens = {}
+        self.previous_version = None
+        self.delta = None
+        self.subscribers = 0
+        self._changed = asyncio.Condition()
+        self._task = None
+
+    async def _run(self):
+        try:
+            while self.subscribers:
+                try:
+                    version, screens = await _load_screens()
+                except Exception as e:
+                    logger.warning("Live screen stream could not load screens: %s", e)
+                else:
+                    if screens and version != self.version:
+                        delta = screens_delta(self.screens, screens) if self.screens else None
+                        async with self._changed:
+                            self.previous_version, self.version = self.version, version
+                            self.screens, self.delta = screens, delta
+                            self._changed.notify_all()
+                await asyncio.sleep(SCREEN_STREAM_POLL_SECONDS)
+        finally:
+            self._task = None
+
+    async def events(self, screen_ids=None, max_seconds=SCREEN_STREAM_MAX_SECONDS):
+        """SSE messages for one client: the screens, then a delta per new version."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_seconds
+        self.subscribers += 1
+        if self._task is None:
+            self._task = loop.create_task(self._run())
+        try:
+            yield f"retry: {SCREEN_STREAM_RETRY_MS}\n\n"
+            sent = None
+            while loop.time() < deadline:
+                async with self._changed:
+                    if self.version is None or self.version == sent:
+                        try:
+                            await asyncio.wait_for(self._changed.wait(), SCREEN_STREAM_HEARTBEAT_SECONDS)
+                        except asyncio.TimeoutError:
+                            pass
+                    version, screens = self.version, self.screens
+                    previous, delta = self.previous_version, self.delta
+
+                if version is None or version == sent:
+                    yield ': keepalive\n\n'
+                    continue
+                if sent is not None and previous == sent and delta is not None:
+                    # Sent even without changes to the client's screens, so its version
+                    # keeps up and the next delta's 'from' is one it has seen
+                    yield sse_event('delta', {'version': version, 'from': sent, 'screens': _select(delta, screen_ids)},
+                                    event_id=version)
+                else:
+                    yield _screens_event(version, screens, screen_ids)
+                sent = version
+        finally:
+            self.subscribers -= 1
+
+
+_broadcasters = weakref.WeakKeyDictionary()
+
+
+def broadcaster():
+    """The ScreenBroadcaster of the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _broadcasters:
+        _broadcasters[loop] = ScreenBroadcaster()
+    return _broadcasters[loop]
+
+
+def screen_snapshot_events(screen_ids=None):
+    """
+    SSE messages for /live-screens/stream/ without an ASGI server: the
+    current screens only, with a poll-length retry interval.
+    """
+    from .services import LiveScreensService
+
+    yield f"retry: {SCREEN_STREAM_POLL_RETRY_MS}\n\n"
+    version, screens = LiveScreensService().current_screens()
+    if screens:
+        yield _screens_event(version, screens, screen_ids)
+
+
+async def screen_event_stream(screen_ids=None):
+    """SSE messages for /live-screens/stream/ from this event loop's broadcaster."""
+    async for message in broadcaster().events(screen_ids):
+        yield message
@@ -11,6 +11,7 @@ import random
 from functools import lru_cache
 from datetime import datetime, timedelta
 from io import StringIO
+from .invalid_symbols import history_error, is_invalid, is_missing_symbol_error, partition, record_hit, record_miss
 # from alpha_vantage.timeseries import TimeSeries  # Removed Alpha Vantage as it doesn't support indices intraday
 
 # Suppress yfinance verbose output and warnings
@@ -120,6 +121,11 @@ def fetch_all_tickers_batch(tickers):
     result = {}
     service = FinancialDataService()
     
+    # Symbols that recently returned no data fail fast instead of being downloaded and retried
+    yf_tickers, invalid_tickers = partition(yf_tickers)
+    for ticker in invalid_tickers:
+        result[ticker] = {'error': f'No data for {ticker}'}
+    
     # Store intraday data for day sparklines
     intraday_data = {}
     
@@ -372,6 +378,13 @@ def fetch_all_tickers_batch(tickers):
                     finally:
                         sys.stdout, sys.stderr = old_stdout, old_stderr
                 
+                if hist is None or 'Close' not in hist.columns or hist['Close'].dropna().empty:
+                    # Only an invalid or delisted symbol is a miss, not a throttled empty answer
+                    error = history_error(t)
+                    if is_missing_symbol_error(error):
+                        record_miss(ticker, error)
+                    continue
+                
                 if hist is not None and not hist.empty and 'Close' in hist.columns:
                     hist = hist.dropna(subset=['Close'])
                     if not hist.empty:
@@ -448,9 +461,12 @@ def fetch_all_tickers_batch(tickers):
                             'rv': rv,
                             'rv_grade': rv_grade
                         }
+                        record_hit(ticker)
                         print(f"Successfully fetched {ticker} individually")
             except Exception as e:
                 print(f"Individual fetch for {ticker} also failed: {e}")
+                if is_missing_symbol_error(e):
+                    record_miss(ticker, str(e))
                 # Keep the original error
     
     # Handle FRED tickers (treasury yields) - these are fast
@@ -658,7 +674,7 @@ class FinancialDataService:
                 timeframes = {
                     'day': {'period': '2d', 'interval': '5m'},      # 5-minute intervals for day
                     'week': {'period': '5d', 'interval': '1h'},     # 1-hour intervals for week
-                    'month': {'period': '1mo', 'interval': '4h'},    # 4-hour intervals for month
+                    'month': {'period': '1mo', 'interval': '4h'},    # 4-hour rollups from the bar store
                     'year': {'period': '1y', 'interval': '1d'}       # Daily for year
                 }
                 
@@ -677,8 +693,14 @@ class FinancialDataService:
                 
                 for tf_name, tf_params in timeframes.items():
                     try:
-                        with yf_lock:
-                            df = yf.download(ticker, period=tf_params['period'], interval=tf_params['interval'], prepost=True, progress=False)
+                        if tf_params['interval'] == '4h':
+                            # Yahoo has no real 4h bars - use the bar store's rollup of 1h bars
+                            from .bar_store import bar_store
+                            bars = bar_store.ensure(ticker)
+                            df = bars.frame('4h', tf_params['period']) if bars is not None else pd.DataFrame()
+                        else:
+                            with yf_lock:
+                                df = yf.download(ticker, period=tf_params['period'], interval=tf_params['interval'], prepost=True, progress=False)
                         
                         if df.empty:
                             # Provide default empty data for this timeframe
@@ -694,7 +716,8 @@ class FinancialDataService:
                             continue
                         
                         # Flatten MultiIndex columns for single ticker
-                        df.columns = df.columns.droplevel(1)
+                        if isinstance(df.columns, pd.MultiIndex):
+                            df.columns = df.columns.droplevel(1)
                         
                         # Reset index to make Datetime a column
                         df.reset_index(inplace=True)
@@ -1330,128 +1353,279 @@ def fetch_watchlist(tickers_csv: str):
     print(json.dumps(result))
 
 
-def fetch_stock_detail(symbol, timeframe='day'):
+# Stock page caches: fundamentals (name, market cap, P/E, 52-week range)
+# change slowly, the session quote (open/high/low, volume, previous close)
+# and bars per timeframe expire with the market. Entries are (fetched_at, value).
+STOCK_INFO_CACHE_SECONDS = 6 * 60 * 60
+STOCK_QUOTE_CACHE_SECONDS = 60
+STOCK_BARS_CACHE_SECONDS = {'day': 60, 'week': 300, 'month': 900, 'year': 3600}
+STOCK_DETAIL_CACHE_MAX = 500  # Oldest entries are evicted past this, per cache
+STOCK_DETAIL_WORKERS = 8
+
+STOCK_TIMEFRAME_CONFIG = {
+    'day': {'period': '2d', 'interval': '5m'},
+    'week': {'period': '7d', 'interval': '1h'},
+    'month': {'period': '1mo', 'interval': '1d'},
+    'year': {'period': '1y', 'interval': '1d'},
+}
+
+_stock_info_cache = {}
+_stock_quote_cache = {}
+_stock_bars_cache = {}
+_stock_detail_inflight = {}
+_stock_detail_lock = threading.Lock()
+_stock_detail_pool = None
+
+
+def _detail_pool():
+    global _stock_detail_pool
+    with _stock_detail_lock:
+        if _stock_detail_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _stock_detail_pool = ThreadPoolExecutor(max_workers=STOCK_DETAIL_WORKERS,
+                                                    thread_name_prefix='stock-detail')
+        return _stock_detail_pool
+
+
+def _cached_fetch(cache, key, ttl, fetch):
+    """
+    Future for `fetch()` cached under `key` for `ttl` seconds. Concurrent
+    misses for the same key share one fetch; empty results are not cached.
+    The lock only guards the dicts, never a network call.
+    """
+    from concurrent.futures import Future
+
+    def run():
+        try:
+            value = fetch()
+            if value is not None and len(value):
+                with _stock_detail_lock:
+                    cache.pop(key, None)
+                    cache[key] = (time.time(), value)
+                    while len(cache) > STOCK_DETAIL_CACHE_MAX:
+                        cache.pop(next(iter(cache)))
+            return value
+        finally:
+            with _stock_detail_lock:
+                _stock_detail_inflight.pop((id(cache), key), None)
+
+    pool = _detail_pool()
+    with _stock_detail_lock:
+        entry = cache.get(key)
+        if entry is not None and time.time() - entry[0] < ttl:
+            done = Future()
+            done.set_result(entry[1])
+            return done
+        inflight = _stock_detail_inflight.get((id(cache), key))
+        if inflight is None:
+            inflight = _stock_detail_inflight[(id(cache), key)] = pool.submit(run)
+        return inflight
+
+
+def stock_info_future(symbol):
+    """
+    Future for a symbol's yfinance .info ({} if it could not be fetched).
+    Only its fundamentals are read; quote fields would be hours old.
+    """
+    import yfinance as yf
+
+    def fetch():
+        try:
+            info = yf.Ticker(symbol).info or {}
+        except Exception as e:
+            print(f"Error fetching info for {symbol}: {e}")
+            if is_missing_symbol_error(e):
+                record_miss(symbol, str(e))
+            return {}
+        return info
+
+    return _cached_fetch(_stock_info_cache, symbol, STOCK_INFO_CACHE_SECONDS, fetch)
+
+
+def session_quote(daily):
+    """
+    Latest regular session from daily bars: {'open', 'high', 'low', 'volume',
+    'previousClose'} ({} if there are none).
+    """
+    if daily is None or daily.empty:
+        return {}
+    daily = daily.dropna(subset=['Close'])
+    if daily.empty:
+        return {}
+    session = daily.iloc[-1]
+    return {
+        'open': float(session['Open']),
+        'high': float(session['High']),
+        'low': float(session['Low']),
+        'volume': int(session['Volume']),
+        'previousClose': float(daily['Close'].iloc[-2]) if len(daily) > 1 else None,
+    }
+
+
+def stock_quote_future(symbol):
+    """Future for a symbol's session_quote() from its last few daily bars ({} if unavailable)."""
+    import yfinance as yf
+
+    def fetch():
+        try:
+            return session_quote(yf.Ticker(symbol).history(period='5d', interval='1d', prepost=False))
+        except Exception as e:
+            print(f"Error fetching quote for {symbol}: {e}")
+            return {}
+
+    return _cached_fetch(_stock_quote_cache, symbol, STOCK_QUOTE_CACHE_SECONDS, fetch)
+
+
+def stock_bars_future(symbol, timeframe):
+    """Future for a symbol's stock-page bars (DataFrame, possibly empty) for `timeframe`."""
+    import pandas as pd
+    import yfinance as yf
+
+    config = STOCK_TIMEFRAME_CONFIG.get(timeframe, STOCK_TIMEFRAME_CONFIG['day'])
+
+    def fetch():
+        ticker = yf.Ticker(symbol)
+        try:
+            hist = ticker.history(period=config['period'], interval=config['interval'], prepost=True)
+        except Exception as e:
+            print(f"Error fetching {timeframe} bars for {symbol}: {e}")
+            if is_missing_symbol_error(e):
+                record_miss(symbol, str(e))
+            return pd.DataFrame()
+        if (hist is None or hist.empty) and config['interval'] == '1d':
+            # Intraday bars can be legitimately empty (mutual funds); daily bars can't
+            error = history_error(ticker)
+            if is_missing_symbol_error(error):
+                record_miss(symbol, error)
+        return hist
+
+    ttl = STOCK_BARS_CACHE_SECONDS.get(timeframe, STOCK_BARS_CACHE_SECONDS['day'])
+    return _cached_fetch(_stock_bars_cache, (symbol, timeframe), ttl, fetch)
+
+
+def clear_stock_detail_cache():
+    with _stock_detail_lock:
+        _stock_info_cache.clear()
+        _stock_quote_cache.clear()
+        _stock_bars_cache.clear()
+
+
+def fetch_stock_detail(symbol, timeframe='day', timestamp_mode='label'):
     """
     Fetch detailed stock data for a single ticker.
     
+    Fundamentals (.info), the session quote and the timeframe's bars are
+    fetched concurrently and cached separately (STOCK_INFO_CACHE_SECONDS,
+    STOCK_QUOTE_CACHE_SECONDS, STOCK_BARS_CACHE_SECONDS), so switching
+    timeframes only fetches bars. Ticker.info/history don't
+    share state between tickers, so neither fetch takes yf_lock.
+    
     Args:
         symbol (str): Ticker symbol
         timeframe (str): 'day', 'week', 'month', or 'year'
+        timestamp_mode (str): 'label' (axis labels), 'epoch' or 'delta' (epoch ms)
     
     Returns:
         dict: Detailed stock information including price, change, statistics, sparkline, and timestamps
     """
-    import pandas as pd
-    import yfinance as yf
-    
     try:
-        with yf_lock:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info or {}
-            
-            # Determine period and interval based on timeframe
-            timeframe_config = {
-                'day': {'period': '2d', 'interval': '5m'},
-                'week': {'period': '7d', 'interval': '1h'},
-                'month': {'period': '1mo', 'interval': '1d'},
-                'year': {'period': '1y', 'interval': '1d'},
-            }
-            
-            config = timeframe_config.get(timeframe, timeframe_config['day'])
-            
-            # Fetch historical data
-            hist = ticker.history(period=config['period'], interval=config['interval'], prepost=True)
-            
-            if hist.empty:
-                return None
-            
-            # Get closes for sparkline
-            closes = hist['Close'].dropna().tolist()
-            
-            # Get timestamps for chart axis
-            timestamps = []
-            for ts in hist.index:
-                if timeframe == 'day':
-                    # For day view, show time only (h:MM am/pm)
-                    timestamps.append(ts.strftime('%I:%M%p').lstrip('0').lower())
-                elif timeframe == 'week':
-                    # For week view, show day and time (Mon h:MMam)
-                    timestamps.append(ts.strftime('%a %I:%M%p').replace(' 0', ' ').lower())
-                elif timeframe == 'month':
-                    # For month view, show date (Jan 15)
-                    timestamps.append(ts.strftime('%b %d').replace(' 0', ' '))
-                else:
-                    # For year view, show month and date (Jan 15)
-                    timestamps.append(ts.strftime('%b %d').replace(' 0', ' '))
-            
-            # Calculate change
-            if len(closes) >= 2:
-                current_price = closes[-1]
-                # For day, compare to previous day's close or first value
-                if timeframe == 'day' and len(closes) > 1:
-                    # Find first close of today
-                    today = hist.index[-1].date()
-                    today_mask = hist.index.date == today
-                    if today_mask.any():
-                        first_today_idx = hist.index[today_mask][0]
-                        # Get previous close (last close before today)
-                        prev_closes = hist.loc[hist.index < first_today_idx, 'Close'].dropna()
-                        if not prev_closes.empty:
-                            prev_close = prev_closes.iloc[-1]
-                        else:
-                            prev_close = closes[0]
-                    else:
-                        prev_close = closes[0]
-                else:
-                    prev_close = closes[0]
-                
-                value_change = current_price - prev_close
-                pct_change = (value_change / prev_close * 100) if prev_close != 0 else 0
-            else:
-                current_price = closes[-1] if closes else 0
-                value_change = 0
-                pct_change = 0
-                prev_close = current_price
-            
-            # Get today's high/low from intraday data or info
-            if timeframe == 'day':
-                today = hist.index[-1].date()
-                today_data = hist[hist.index.date == today]
-                high = today_data['High'].max() if not today_data.empty else info.get('dayHigh')
-                low = today_data['Low'].min() if not today_data.empty else info.get('dayLow')
-                open_price = today_data['Open'].iloc[0] if not today_data.empty else info.get('open')
-            else:
-                high = hist['High'].max()
-                low = hist['Low'].min()
-                open_price = hist['Open'].iloc[0] if not hist.empty else None
-            
-            result = {
-                'symbol': symbol,
-                'name': info.get('shortName') or info.get('longName') or symbol,
-                'price': current_price,
-                'change': pct_change,
-                'valueChange': value_change,
-                'high': high,
-                'low': low,
-                'open': open_price,
-                'previousClose': info.get('previousClose') or prev_close,
-                'volume': info.get('volume'),
-                'avgVolume': info.get('averageVolume'),
-                'marketCap': info.get('marketCap'),
-                'pe': info.get('trailingPE'),
-                'week52High': info.get('fiftyTwoWeekHigh'),
-                'week52Low': info.get('fiftyTwoWeekLow'),
-                'sparkline': closes[-100:],  # Last 100 data points for chart
-                'timestamps': timestamps[-100:],  # Last 100 timestamps matching sparkline
-            }
-            
-            return result
-            
+        symbol = symbol.upper()
+        if is_invalid(symbol):
+            return None
+        info_future = stock_info_future(symbol)
+        quote_future = stock_quote_future(symbol)
+        bars_future = stock_bars_future(symbol, timeframe)
+        hist = bars_future.result()
+        info = info_future.result() or {}
+        quote = quote_future.result() or {}
+        if hist is None or hist.empty:
+            return None
+        # Bars came back, so any miss recorded by the info fetch was spurious
+        record_hit(symbol)
+        return stock_detail_from(symbol, timeframe, info, quote, hist, timestamp_mode)
     except Exception as e:
         print(f"Error fetching stock detail for {symbol}: {e}")
         return None
 
 
+def stock_detail_from(symbol, timeframe, info, quote, hist, timestamp_mode='label'):
+    """Stock detail dict from a symbol's .info, session quote and its bars for `timeframe`."""
+    from .timestamps import encode_timestamps, TIMEFRAME_LABEL_PERIODS
+    
+    # Get closes for sparkline
+    closes = hist['Close'].dropna().tolist()
+    
+    # Get timestamps for chart axis (last 100, matching the sparkline)
+    timestamp_fields = encode_timestamps(
+        hist.index[-100:], timestamp_mode,
+        TIMEFRAME_LABEL_PERIODS.get(timeframe, '1Y')
+    )
+    
+    # Calculate change
+    if len(closes) >= 2:
+        current_price = closes[-1]
+        # For day, compare to previous day's close or first value
+        if timeframe == 'day' and len(closes) > 1:
+            # Find first close of today
+            today = hist.index[-1].date()
+            today_mask = hist.index.date == today
+            if today_mask.any():
+                first_today_idx = hist.index[today_mask][0]
+                # Get previous close (last close before today)
+                prev_closes = hist.loc[hist.index < first_today_idx, 'Close'].dropna()
+                if not prev_closes.empty:
+                    prev_close = prev_closes.iloc[-1]
+                else:
+                    prev_close = closes[0]
+            else:
+                prev_close = closes[0]
+        else:
+            prev_close = closes[0]
+        
+        value_change = current_price - prev_close
+        pct_change = (value_change / prev_close * 100) if prev_close != 0 else 0
+    else:
+        current_price = closes[-1] if closes else 0
+        value_change = 0
+        pct_change = 0
+        prev_close = current_price
+    
+    # Get today's high/low from intraday data or the session quote
+    if timeframe == 'day':
+        today = hist.index[-1].date()
+        today_data = hist[hist.index.date == today]
+        high = today_data['High'].max() if not today_data.empty else quote.get('high')
+        low = today_data['Low'].min() if not today_data.empty else quote.get('low')
+        open_price = today_data['Open'].iloc[0] if not today_data.empty else quote.get('open')
+    else:
+        high = hist['High'].max()
+        low = hist['Low'].min()
+        open_price = hist['Open'].iloc[0] if not hist.empty else None
+    
+    result = {
+        'symbol': symbol,
+        'name': info.get('shortName') or info.get('longName') or symbol,
+        'price': current_price,
+        'change': pct_change,
+        'valueChange': value_change,
+        'high': high,
+        'low': low,
+        'open': open_price,
+        'previousClose': quote.get('previousClose') or prev_close,
+        'volume': quote.get('volume'),
+        'avgVolume': info.get('averageVolume'),
+        'marketCap': info.get('marketCap'),
+        'pe': info.get('trailingPE'),
+        'week52High': info.get('fiftyTwoWeekHigh'),
+        'week52Low': info.get('fiftyTwoWeekLow'),
+        'sparkline': closes[-100:],  # Last 100 data points for chart
+        'timestamps': timestamp_fields['timestamps'],  # Last 100 timestamps matching sparkline
+        'timestampFormat': timestamp_fields['timestampFormat'],
+    }
+    
+    return result
+
+
 def main():
     if len(sys.argv) >= 3 and sys.argv[1] == 'fetch_watchlist':
         tickers_csv = sys.argv[2]
@@ -1654,16 +1828,18 @@ SCREEN_DEFINITIONS = {
     },
 }
 
-# Cache for live screens data
-_live_screens_cache = {}
-_live_screens_cache_timestamp = None
-LIVE_SCREENS_CACHE_DURATION = 300  # 5 minutes - can be adjusted
+# Every SCREEN_DEFINITIONS screen, materialized once per scan snapshot version
+_live_screens_cache = {'version': None, 'screens': {}}
+_live_screens_lock = threading.Lock()
 
 # Cache for scanned market data (longer cache since it's expensive)
 _market_scan_cache = {}
 _market_scan_timestamp = None
 MARKET_SCAN_CACHE_DURATION = 600  # 10 minutes - scanning 300 stocks is expensive
 
+# Window of the 20-day SMA and average volume, from the scan's 1mo of daily bars
+SCAN_SHORT_WINDOW = 20
+
 
 class LiveScreensService:
     """Service for DYNAMIC market scanning and stock screens."""
@@ -1727,6 +1903,13 @@ class LiveScreensService:
         """
         global _market_scan_cache, _market_scan_timestamp
         
+        # Sharded scans (market_scan) publish versioned snapshots; use the newest
+        # one, overlaid with finished chunks of a scan still in progress
+        from .market_scan import current_rows
+        snapshot_rows = current_rows(max_age=MARKET_SCAN_CACHE_DURATION)
+        if snapshot_rows:
+            return snapshot_rows
+        
         # Check cache
         if _market_scan_timestamp and (time.time() - _market_scan_timestamp) < MARKET_SCAN_CACHE_DURATION:
             if _market_scan_cache:
@@ -1735,6 +1918,7 @@ class LiveScreensService:
         
         import yfinance as yf
         import pandas as pd
+        from .reference_data import reference_map
         
         print(f"🔍 Scanning {len(SCAN_UNIVERSE)} stocks...")
         start_time = time.time()
@@ -1763,95 +1947,7 @@ class LiveScreensService:
                     threads=True
                 )
             
-            # Process each ticker
-            for ticker in SCAN_UNIVERSE:
-                try:
-                    # Extract data
-                    if len(SCAN_UNIVERSE) == 1:
-                        daily_df = df_daily.copy()
-                        intraday_df = df_intraday.copy()
-                    else:
-                        if ticker not in df_daily.columns.get_level_values(0):
-                            continue
-                        daily_df = df_daily[ticker].copy()
-                        intraday_df = df_intraday[ticker].copy() if ticker in df_intraday.columns.get_level_values(0) else pd.DataFrame()
-                    
-                    if daily_df.empty or 'Close' not in daily_df.columns:
-                        continue
-                    
-                    daily_df = daily_df.dropna(subset=['Close'])
-                    if len(daily_df) < 5:
-                        continue
-                    
-                    closes = daily_df['Close'].tolist()
-                    volumes = daily_df['Volume'].tolist() if 'Volume' in daily_df.columns else []
-                    highs = daily_df['High'].tolist() if 'High' in daily_df.columns else []
-                    lows = daily_df['Low'].tolist() if 'Low' in daily_df.columns else []
-                    
-                    current_price = float(closes[-1])
-                    prev_close = float(closes[-2]) if len(closes) >= 2 else current_price
-                    
-                    # Calculate metrics
-                    change_pct = round(((current_price - prev_close) / prev_close) * 100, 2) if prev_close else 0
-                    value_change = round(current_price - prev_close, 2)
-                    
-                    # Relative volume
-                    rv = None
-                    if len(volumes) >= 5:
-                        avg_vol = sum(volumes[-5:-1]) / 4 if len(volumes) > 4 else sum(volumes[:-1]) / (len(volumes) - 1)
-                        if avg_vol > 0 and volumes[-1]:
-                            rv = round(volumes[-1] / avg_vol, 2)
-                    
-                    # RSI
-                    rsi = self.calculate_rsi(closes)
-                    
-                    # Bollinger Band width
-                    bb_width = self.calculate_bollinger_width(closes)
-                    
-                    # 52-week high/low proximity
-                    high_52w = max(highs) if highs else current_price
-                    low_52w = min(lows) if lows else current_price
-                    pct_from_high = round(((current_price - high_52w) / high_52w) * 100, 2) if high_52w else 0
-                    pct_from_low = round(((current_price - low_52w) / low_52w) * 100, 2) if low_52w else 0
-                    
-                    # Sparkline (prefer intraday)
-                    sparkline = []
-                    if not intraday_df.empty and 'Close' in intraday_df.columns:
-                        sparkline = intraday_df['Close'].dropna().tolist()[-20:]
-                    if not sparkline:
-                        sparkline = closes[-20:]
-                    
-                    # Get company name (cached in yfinance)
-                    try:
-                        info = yf.Ticker(ticker).info
-                        name = info.get('shortName') or info.get('longName') or ticker
-                        pe_ratio = info.get('trailingPE')
-                        dividend_yield = info.get('dividendYield')
-                    except:
-                        name = ticker
-                        pe_ratio = None
-                        dividend_yield = None
-                    
-                    scanned_data[ticker] = {
-                        'symbol': ticker,
-                        'name': name,
-                        'price': current_price,
-                        'change': change_pct,
-                        'valueChange': value_change,
-                        'rv': rv,
-                        'rsi': rsi,
-                        'bb_width': bb_width,
-                        'pct_from_high': pct_from_high,
-                        'pct_from_low': pct_from_low,
-                        'sparkline': sparkline,
-                        'pe_ratio': pe_ratio,
-                        'dividend_yield': dividend_yield,
-                        'volume': volumes[-1] if volumes else None,
-                    }
-                    
-                except Exception as e:
-                    print(f"Error scanning {ticker}: {e}")
-                    continue
+            scanned_data = self.scan_frames(SCAN_UNIVERSE, df_daily, df_intraday, reference_map())
             
             elapsed = time.time() - start_time
             print(f"✅ Market scan complete: {len(scanned_data)} stocks in {elapsed:.1f}s")
@@ -1866,83 +1962,211 @@ class LiveScreensService:
             print(f"❌ Market scan error: {e}")
             return _market_scan_cache or {}
     
+    def scan_snapshot(self):
+        """
+        (version, {symbol: metrics}) of the data scan_market() returns. The
+        version is market_scan.current_scan()'s, or 'local-<timestamp>' for
+        an in-process scan, so results derived from it can be cached per version.
+        """
+        from .market_scan import current_scan
+        version, rows = current_scan(max_age=MARKET_SCAN_CACHE_DURATION)
+        if rows:
+            return version, rows
+        rows = self.scan_market()
+        return f"local-{int(_market_scan_timestamp or 0)}", rows
+    
+    @staticmethod
+    def _ticker_frame(df, ticker):
+        """One ticker's columns from a yf.download(group_by='ticker') result, or None."""
+        if df is None or df.empty:
+            return None
+        if isinstance(df.columns, pd.MultiIndex):
+            if ticker not in df.columns.get_level_values(0):
+                return None
+            return df[ticker].copy()
+        return df.copy()
+    
+    def scan_metrics(self, ticker, closes, highs, lows, volumes, sparkline, reference, long_window=None, day=None):
+        """
+        Scan metrics for one ticker from its daily bars (oldest first) and
+        sparkline. `long_window` is the ticker's long_window_map() entry and
+        `day` the date ordinal of the last bar; without them the 52-week
+        high/low fall back to the downloaded bars.
+        """
+        current_price = float(closes[-1])
+        prev_close = float(closes[-2]) if len(closes) >= 2 else current_price
+        
+        # Calculate metrics
+        change_pct = round(((current_price - prev_close) / prev_close) * 100, 2) if prev_close else 0
+        value_change = round(current_price - prev_close, 2)
+        
+        # Relative volume
+        rv = None
+        if len(volumes) >= 5:
+            avg_vol = sum(volumes[-5:-1]) / 4 if len(volumes) > 4 else sum(volumes[:-1]) / (len(volumes) - 1)
+            if avg_vol > 0 and volumes[-1]:
+                rv = round(volumes[-1] / avg_vol, 2)
+        
+        # RSI
+        rsi = self.calculate_rsi(closes)
+        
+        # Bollinger Band width
+        bb_width = self.calculate_bollinger_width(closes)
+        
+        # 20-day SMA and average volume (None until there are 20 daily bars)
+        sma_20 = avg_volume_20 = None
+        if len(closes) >= SCAN_SHORT_WINDOW:
+            sma_20 = round(float(sum(closes[-SCAN_SHORT_WINDOW:])) / SCAN_SHORT_WINDOW, 2)
+        if len(volumes) >= SCAN_SHORT_WINDOW:
+            avg_volume_20 = round(float(sum(volumes[-SCAN_SHORT_WINDOW:])) / SCAN_SHORT_WINDOW)
+        
+        # 52-week high/low proximity, 200-day SMA and 50-day average volume
+        high_52w = max(highs) if highs else current_price
+        low_52w = min(lows) if lows else current_price
+        sma_200 = avg_volume = None
+        if long_window:
+            window = long_window_metrics(long_window, day, float(highs[-1]) if highs else current_price,
+                                         float(lows[-1]) if lows else current_price, current_price)
+            high_52w, low_52w = window['high_52w'], window['low_52w']
+            sma_200, avg_volume = window['sma_200'], window['avg_volume']
+        pct_from_sma200 = round(((current_price - sma_200) / sma_200) * 100, 2) if sma_200 else None
+        pct_from_high = round(((current_price - high_52w) / high_52w) * 100, 2) if high_52w else 0
+        pct_from_low = round(((current_price - low_52w) / low_52w) * 100, 2) if low_52w else 0
+        
+        # Name and valuation from the nightly reference data (no network call)
+        name = reference.get('name') or ticker
+        pe_ratio = reference.get('pe_ratio')
+        dividend_yield = reference.get('dividend_yield')
+        
+        return {
+            'symbol': ticker,
+            'name': name,
+            'price': current_price,
+            'change': change_pct,
+            'valueChange': value_change,
+            'rv': rv,
+            'rsi': rsi,
+            'bb_width': bb_width,
+            'pct_from_high': pct_from_high,
+            'pct_from_low': pct_from_low,
+            'high_52w': round(high_52w, 2) if high_52w else None,
+            'low_52w': round(low_52w, 2) if low_52w else None,
+            'sma_20': sma_20,
+            'sma_200': sma_200,
+            'pct_from_sma200': pct_from_sma200,
+            'avg_volume_20': avg_volume_20,
+            'avg_volume': round(avg_volume) if avg_volume else None,
+            'sparkline': sparkline,
+            'pe_ratio': pe_ratio,
+            'dividend_yield': dividend_yield,
+            'sector': reference.get('sector') or None,
+            'market_cap': reference.get('market_cap'),
+            'volume': volumes[-1] if volumes else None,
+        }
+    
+    def scan_frames(self, symbols, df_daily, df_intraday, references, state=None, windows=None):
+        """
+        Scan metrics for `symbols` from batch-downloaded daily (1mo) and
+        intraday (5m) bars. `references` is reference_data.reference_map()
+        and `windows` long_window.long_window_map() (loaded if not given).
+        Returns {symbol: metrics}; symbols without enough bars are skipped.
+        
+        If `state` is a dict, each scanned symbol's daily bars and last
+        intraday bar are stored in it for incremental rescans (scan_update).
+        """
+        if not references:
+            print("⚠️ No reference data loaded - run refresh_reference_data for names and P/E (required on deploy)")
+        
+        if windows is None:
+            windows = long_window_map()
+        
+        scanned_data = {}
+        
+        # Process each ticker
+        for ticker in symbols:
+            try:
+                # Extract data
+                daily_df = self._ticker_frame(df_daily, ticker)
+                if daily_df is None:
+                    continue
+                intraday_df = self._ticker_frame(df_intraday, ticker)
+                if intraday_df is None:
+                    intraday_df = pd.DataFrame()
+                
+                if daily_df.empty or 'Close' not in daily_df.columns:
+                    continue
+                
+                daily_df = daily_df.dropna(subset=['Close'])
+                if len(daily_df) < 5:
+                    continue
+                
+                closes = daily_df['Close'].tolist()
+                volumes = daily_df['Volume'].tolist() if 'Volume' in daily_df.columns else []
+                highs = daily_df['High'].tolist() if 'High' in daily_df.columns else []
+                lows = daily_df['Low'].tolist() if 'Low' in daily_df.columns else []
+                
+                # Sparkline (prefer intraday)
+                sparkline = []
+                if not intraday_df.empty and 'Close' in intraday_df.columns:
+                    sparkline = intraday_df['Close'].dropna().tolist()[-20:]
+                if not sparkline:
+                    sparkline = closes[-20:]
+                
+                reference = references.get(ticker) or {}
+                scanned_data[ticker] = self.scan_metrics(ticker, closes, highs, lows, volumes, sparkline, reference,
+                                                         windows.get(ticker), daily_df.index[-1].date().toordinal())
+                
+                if state is not None and len(highs) == len(lows) == len(volumes) == len(closes):
+                    from .timestamps import epoch_ms
+                    intraday = intraday_df.dropna(subset=['Close']) if 'Close' in intraday_df.columns else intraday_df
+                    state[ticker] = {
+                        'days': [ts.date().toordinal() for ts in daily_df.index],
+                        'closes': closes,
+                        'highs': highs,
+                        'lows': lows,
+                        'volumes': volumes,
+                        'last_ts': int(epoch_ms(intraday.index[-1:])[0]) if not intraday.empty else None,
+                        'last_volume': (float(intraday['Volume'].iloc[-1])
+                                        if not intraday.empty and 'Volume' in intraday.columns else None),
+                    }
+                
+            except Exception as e:
+                print(f"Error scanning {ticker}: {e}")
+                continue
+        
+        return scanned_data
+    
     def filter_top_gainers(self, data, limit=5):
         """Filter for top gaining stocks with volume."""
-        candidates = [
-            (ticker, info) for ticker, info in data.items()
-            if info.get('change', 0) > 1  # At least 1% gain
-            and info.get('rv', 0) and info['rv'] >= 1.0  # Normal or higher volume
-        ]
-        candidates.sort(key=lambda x: x[1]['change'], reverse=True)
-        return candidates[:limit]
+        return columns_for(data).screen('top_gainers', limit)
     
     def filter_unusual_volume(self, data, limit=5):
         """Filter for stocks with unusual volume (2x+ average)."""
-        candidates = [
-            (ticker, info) for ticker, info in data.items()
-            if info.get('rv', 0) and info['rv'] >= 2.0
-        ]
-        candidates.sort(key=lambda x: x[1]['rv'], reverse=True)
-        return candidates[:limit]
+        return columns_for(data).screen('unusual_volume', limit)
     
     def filter_oversold(self, data, limit=5):
         """Filter for oversold stocks (RSI < 35) with positive momentum today."""
-        candidates = [
-            (ticker, info) for ticker, info in data.items()
-            if info.get('rsi') and info['rsi'] < 35
-            and info.get('change', 0) > -2  # Not crashing today
-        ]
-        candidates.sort(key=lambda x: x[1]['rsi'])  # Lowest RSI first
-        return candidates[:limit]
+        return columns_for(data).screen('oversold', limit)
     
     def filter_overbought(self, data, limit=5):
         """Filter for overbought stocks (RSI > 70)."""
-        candidates = [
-            (ticker, info) for ticker, info in data.items()
-            if info.get('rsi') and info['rsi'] > 70
-        ]
-        candidates.sort(key=lambda x: x[1]['rsi'], reverse=True)  # Highest RSI first
-        return candidates[:limit]
+        return columns_for(data).screen('overbought', limit)
     
     def filter_volatility_squeeze(self, data, limit=5):
         """Filter for low volatility stocks (tight Bollinger Bands)."""
-        candidates = [
-            (ticker, info) for ticker, info in data.items()
-            if info.get('bb_width') and info['bb_width'] < 8  # Tight bands
-        ]
-        candidates.sort(key=lambda x: x[1]['bb_width'])  # Tightest first
-        return candidates[:limit]
+        return columns_for(data).screen('volatility_squeeze', limit)
     
     def filter_near_highs(self, data, limit=5):
         """Filter for stocks near 52-week highs with momentum."""
-        candidates = [
-            (ticker, info) for ticker, info in data.items()
-            if info.get('pct_from_high') and info['pct_from_high'] > -5  # Within 5% of high
-            and info.get('change', 0) > 0  # Positive today
-            and info.get('rv', 0) and info['rv'] >= 1.0
-        ]
-        candidates.sort(key=lambda x: x[1]['pct_from_high'], reverse=True)  # Closest to high
-        return candidates[:limit]
+        return columns_for(data).screen('near_highs', limit)
     
     def filter_sector_etfs(self, data, limit=5):
         """Filter sector ETFs and sort by performance."""
-        sector_etfs = ['XLK', 'XLF', 'XLE', 'XLV', 'XLI', 'XLY', 'XLP', 'XLU', 'XLB', 'XLRE']
-        candidates = [
-            (ticker, info) for ticker, info in data.items()
-            if ticker in sector_etfs
-        ]
-        candidates.sort(key=lambda x: x[1].get('change', 0), reverse=True)
-        return candidates[:limit]
+        return columns_for(data).screen('sector_etfs', limit)
     
     def filter_value_stocks(self, data, limit=5):
         """Filter for value stocks with low P/E and positive momentum."""
-        candidates = [
-            (ticker, info) for ticker, info in data.items()
-            if info.get('pe_ratio') and 0 < info['pe_ratio'] < 15  # Low P/E
-            and info.get('change', 0) > 0  # Positive today
-        ]
-        candidates.sort(key=lambda x: x[1]['pe_ratio'])  # Lowest P/E first
-        return candidates[:limit]
+        return columns_for(data).screen('value_stocks', limit)
     
     def generate_signals(self, ticker, info, screen_type):
         """Generate dynamic signals based on actual metrics."""
@@ -2060,69 +2284,31 @@ class LiveScreensService:
         
         return min(99, int(base_score + change_score + rv_score + rsi_score))
     
-    def fetch_live_screens(self, screen_ids=None, categories=None):
+    def materialize_screens(self, market_data):
         """
-        Fetch dynamically scanned live screens.
-        
-        Args:
-            screen_ids: Optional list of specific screen IDs to filter by
-            categories: Optional list of categories to filter by (legacy support)
-        
-        Returns:
-            list: List of LiveScreen objects with real-time data
+        {screen_id: screen} for every SCREEN_DEFINITIONS screen over one scan
+        snapshot, with reasons, scores and signals for each stock.
         """
-        global _live_screens_cache, _live_screens_cache_timestamp
-        
-        # Check cache
-        cache_key = ','.join(sorted(screen_ids)) if screen_ids else (','.join(sorted(categories)) if categories else 'all')
-        if _live_screens_cache_timestamp and (time.time() - _live_screens_cache_timestamp) < LIVE_SCREENS_CACHE_DURATION:
-            if cache_key in _live_screens_cache:
-                print("Returning cached live screens")
-                return _live_screens_cache[cache_key]
-        
-        # Scan the market
-        market_data = self.scan_market()
-        
-        if not market_data:
-            print("No market data available")
-            return []
-        
-        # Filter screens by screen_ids first (takes priority), then by category
-        screens_to_build = SCREEN_DEFINITIONS
-        if screen_ids:
-            screens_to_build = {
-                k: v for k, v in SCREEN_DEFINITIONS.items()
-                if k in screen_ids
-            }
-        elif categories:
-            screens_to_build = {
-                k: v for k, v in SCREEN_DEFINITIONS.items()
-                if v['category'] in categories
-            }
-        
-        # Build screens dynamically
+        filter_map = {
+            'top_gainers': self.filter_top_gainers,
+            'unusual_volume': self.filter_unusual_volume,
+            'oversold': self.filter_oversold,
+            'overbought': self.filter_overbought,
+            'volatility_squeeze': self.filter_volatility_squeeze,
+            'near_highs': self.filter_near_highs,
+            'sector_etfs': self.filter_sector_etfs,
+            'value_stocks': self.filter_value_stocks,
+        }
         market_open, market_close = self.get_market_times()
         eastern = pytz.timezone('US/Eastern')
         now = datetime.now(eastern)
         
-        screens = []
+        screens = {}
         
-        for screen_id, definition in screens_to_build.items():
+        for screen_id, definition in SCREEN_DEFINITIONS.items():
             criteria = definition['criteria']
             limit = definition.get('limit', 5)
             
-            # Apply the appropriate filter
-            filter_map = {
-                'top_gainers': self.filter_top_gainers,
-                'unusual_volume': self.filter_unusual_volume,
-                'oversold': self.filter_oversold,
-                'overbought': self.filter_overbought,
-                'volatility_squeeze': self.filter_volatility_squeeze,
-                'near_highs': self.filter_near_highs,
-                'sector_etfs': self.filter_sector_etfs,
-                'value_stocks': self.filter_value_stocks,
-            }
-            
             filter_func = filter_map.get(criteria)
             if not filter_func:
                 continue
@@ -2151,7 +2337,7 @@ class LiveScreensService:
             refresh_mins = definition.get('refreshInterval', 30)
             next_refresh = now + timedelta(minutes=refresh_mins)
             
-            screen = {
+            screens[screen_id] = {
                 'id': definition['id'],
                 'title': definition['title'],
                 'description': definition['description'],
@@ -2162,420 +2348,492 @@ class LiveScreensService:
                 'expiresAt': min(next_refresh, market_close).isoformat(),
                 'refreshInterval': refresh_mins,
             }
-            
-            screens.append(screen)
-        
-        # Update cache
-        _live_screens_cache[cache_key] = screens
-        _live_screens_cache_timestamp = time.time()
         
         return screens
+    
+    def current_screens(self):
+        """
+        (version, {screen_id: screen}) for the current scan snapshot. Screens
+        are materialized once per snapshot version and reused until the
+        version changes.
+        """
+        version, market_data = self.scan_snapshot()
+        if not market_data:
+            print("No market data available")
+            return version, {}
+        
+        with _live_screens_lock:
+            if _live_screens_cache['version'] == version:
+                return version, _live_screens_cache['screens']
+        
+        screens = self.materialize_screens(market_data)
+        with _live_screens_lock:
+            _live_screens_cache['version'] = version
+            _live_screens_cache['screens'] = screens
+        return version, screens
+    
+    def fetch_live_screens(self, screen_ids=None, categories=None):
+        """
+        Fetch dynamically scanned live screens.
+        
+        Args:
+            screen_ids: Optional list of specific screen IDs to filter by
+            categories: Optional list of categories to filter by (legacy support)
+        
+        Returns:
+            list: List of LiveScreen objects with real-time data
+        """
+        _, screens = self.current_screens()
+        
+        # Filter screens by screen_ids first (takes priority), then by category
+        if screen_ids:
+            return [screen for screen_id, screen in screens.items() if screen_id in screen_ids]
+        if categories:
+            return [screen for screen in screens.values() if screen['category'] in categories]
+        return list(screens.values())
 
 
 # Import pandas at module level for LiveScreensService
 import pandas as pd
+from .scan_columns import columns_for
+from .long_window import long_window_map, long_window_metrics
+
+
+# Parameter grid for the historical signal ensemble
+SIGNAL_LOOKBACK_OPTIONS = (1, 2, 3, 4)
+SIGNAL_SIGNIFICANCE_OPTIONS = (0.03, 0.04, 0.05, 0.06, 0.07, 0.08)
+SIGNAL_VOLUME_WEIGHT_OPTIONS = (0.0, 0.5, 1.0, 1.5)
+SIGNAL_TREND_WEIGHT_OPTIONS = (0.0, 0.5, 1.0)
+
+# Draws for mode='monte_carlo' - 100 MILLION
+MONTE_CARLO_ITERATIONS = 100_000_000
+
+HISTORICAL_SIGNAL_MODES = ('exact', 'monte_carlo')
+
+# Modes the public endpoints accept. Monte Carlo runs the sampler for the
+# whole job, so it is only for batch_historical_signals and internal callers.
+PUBLIC_SIGNAL_MODES = ('exact',)
 
 
-def get_historical_signals(ticker: str, timeframe: str = 'day', lookback_days: int = 365) -> dict:
+def _expected_signal_votes(peak_masks, trough_masks, volume_ratio, above_sma, below_sma):
     """
-    Calculate historical BUY/SELL/HOLD signals for a ticker.
-    Returns timestamps and price levels where signal changes occurred.
+    Closed-form ensemble votes: the limit the Monte Carlo sampling converges to.
+
+    A draw with lookback lb, volume weight vw and trend weight tw adds
+    1 + (volume_ratio - 1) * vw + tw * trend_flag to every peak/trough its
+    lookback detects (significance never changes the vote). Parameters are
+    drawn uniformly and independently, so the expected vote per draw is
+    P(lb) * (1 + (volume_ratio - 1) * E[vw] + E[tw] * trend_flag) summed over
+    lookbacks. The number of draws is a constant factor that the max
+    normalization downstream removes, so it is left out.
     """
     import numpy as np
-    import yfinance as yf
-    from datetime import datetime, timedelta
     
-    try:
-        # Determine period based on timeframe
-        if timeframe == 'day':
-            period = '6mo'
-            interval = '1d'
-        elif timeframe == 'week':
-            period = '2y'
-            interval = '1wk'
-        elif timeframe == 'month':
-            period = '5y'
-            interval = '1mo'
-        elif timeframe == 'year':
-            period = '10y'
-            interval = '1mo'
-        else:
-            period = '6mo'
-            interval = '1d'
-        
-        stock = yf.Ticker(ticker)
-        df = stock.history(period=period, interval=interval)
-        
-        if df.empty or len(df) < 20:
-            return {'signals': [], 'error': None}
-        
-        # Calculate technical indicators for signal generation
-        closes = df['Close'].values
-        highs = df['High'].values
-        lows = df['Low'].values
-        volumes = df['Volume'].values
-        
-        # RSI calculation
-        def calculate_rsi(prices, period=14):
-            deltas = np.diff(prices)
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
-            
-            rsi = np.zeros(len(prices))
-            if len(gains) < period:
-                return rsi
-            
-            avg_gain = np.zeros(len(prices))
-            avg_loss = np.zeros(len(prices))
-            
-            # Initial SMA
-            avg_gain[period] = np.mean(gains[:period])
-            avg_loss[period] = np.mean(losses[:period])
-            
-            # EMA for subsequent values
-            for i in range(period + 1, len(prices)):
-                avg_gain[i] = (avg_gain[i-1] * (period - 1) + gains[i-1]) / period
-                avg_loss[i] = (avg_loss[i-1] * (period - 1) + losses[i-1]) / period
-            
-            rs = np.where(avg_loss != 0, avg_gain / avg_loss, 0)
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
-        
-        # MACD calculation
-        def calculate_ema(prices, period):
-            if len(prices) < period:
-                return np.zeros(len(prices))
-            ema = np.zeros(len(prices))
-            multiplier = 2 / (period + 1)
-            ema[period-1] = np.mean(prices[:period])
-            for i in range(period, len(prices)):
-                ema[i] = (prices[i] - ema[i-1]) * multiplier + ema[i-1]
-            return ema
-        
-        ema12 = calculate_ema(closes, 12)
-        ema26 = calculate_ema(closes, 26)
-        macd_line = ema12 - ema26
-        
-        # Signal line - EMA of MACD
-        signal_line_full = np.zeros(len(closes))
-        if len(macd_line) > 35:
-            signal_line = calculate_ema(macd_line[26:], 9)
-            signal_line_full[26+8:] = signal_line[8:]
-        
-        rsi = calculate_rsi(closes)
-        
-        # ============================================================
-        # VECTORIZED MONTE CARLO ENSEMBLE SIGNAL DETECTION
-        # 100 MILLION iterations using NumPy vectorization for speed
-        # ============================================================
-        
-        # Number of simulation iterations - 100 MILLION
-        NUM_ITERATIONS = 100_000_000
-        
-        # Pre-calculate all indicators ONCE (vectorized)
-        # ------------------------------------------------------------
-        
-        # Volume ratios
-        avg_volume = np.mean(volumes) if len(volumes) > 0 else 1
-        volume_ratio = volumes / avg_volume
-        
-        # SMA for trend context (vectorized with cumsum)
-        sma_period = min(20, max(3, len(closes) // 3))
-        cumsum = np.cumsum(np.insert(closes, 0, 0))
-        sma = np.zeros(len(closes))
-        sma[sma_period-1:] = (cumsum[sma_period:] - cumsum[:-sma_period]) / sma_period
-        
-        # Pre-compute rolling max/min for all possible lookbacks (1-4)
-        # This avoids recalculating in each iteration
-        rolling_max_highs = {}
-        rolling_min_lows = {}
-        
-        for lb in [1, 2, 3, 4]:
-            # Left-side rolling max/min
-            left_max = np.zeros(len(highs))
-            left_min = np.full(len(lows), np.inf)
-            for i in range(lb, len(highs)):
-                left_max[i] = np.max(highs[i-lb:i])
-                left_min[i] = np.min(lows[i-lb:i])
-            
-            # Right-side rolling max/min
-            right_max = np.zeros(len(highs))
-            right_min = np.full(len(lows), np.inf)
-            for i in range(len(highs) - lb):
-                right_max[i] = np.max(highs[i+1:i+lb+1])
-                right_min[i] = np.min(lows[i+1:i+lb+1])
-            
-            rolling_max_highs[lb] = (left_max, right_max)
-            rolling_min_lows[lb] = (left_min, right_min)
-        
-        # Pre-compute peak/trough masks for each lookback
-        peak_masks = {}
-        trough_masks = {}
-        
-        for lb in [1, 2, 3, 4]:
-            left_max, right_max = rolling_max_highs[lb]
-            left_min, right_min = rolling_min_lows[lb]
-            
-            # Peak: high > left_max AND high > right_max
-            peak_mask = (highs > left_max) & (highs > right_max)
-            peak_mask[:lb] = False
-            peak_mask[-lb:] = False
-            peak_masks[lb] = peak_mask
-            
-            # Trough: low < left_min AND low < right_min
-            trough_mask = (lows < left_min) & (lows < right_min)
-            trough_mask[:lb] = False
-            trough_mask[-lb:] = False
-            trough_masks[lb] = trough_mask
-        
-        # Pre-compute trend bonuses (price above/below SMA)
-        above_sma = (sma > 0) & (closes > sma)
-        below_sma = (sma > 0) & (closes < sma)
-        
-        # Choppiness detection function (kept for HOLD signals later)
-        def is_choppy(idx, window=10):
-            start = max(0, idx - window)
-            end = min(len(closes), idx + window)
-            if end - start < 5:
-                return False, 0
-            local_highs = highs[start:end]
-            local_lows = lows[start:end]
-            price_range = (max(local_highs) - min(local_lows)) / min(local_lows)
-            changes = 0
-            for j in range(start + 1, end):
-                if j > start + 1:
-                    prev_dir = closes[j-1] - closes[j-2]
-                    curr_dir = closes[j] - closes[j-1]
-                    if prev_dir * curr_dir < 0:
-                        changes += 1
-            change_ratio = changes / (end - start - 2) if end - start > 2 else 0
-            is_chop = price_range < 0.04 and change_ratio > 0.4
-            return is_chop, price_range
-        
-        # ------------------------------------------------------------
-        # VECTORIZED MONTE CARLO - Process in batches for memory efficiency
-        # ------------------------------------------------------------
-        BATCH_SIZE = 500_000  # Process 500k iterations at a time
-        num_batches = NUM_ITERATIONS // BATCH_SIZE
-        
-        # Parameter options
-        lookback_options = np.array([1, 2, 3, 4])
-        significance_options = np.array([0.03, 0.04, 0.05, 0.06, 0.07, 0.08])
-        volume_weight_options = np.array([0.0, 0.5, 1.0, 1.5])
-        trend_weight_options = np.array([0.0, 0.5, 1.0])
-        
-        # Accumulators
-        buy_votes = np.zeros(len(closes), dtype=np.float64)
-        sell_votes = np.zeros(len(closes), dtype=np.float64)
-        
-        print(f"Running {NUM_ITERATIONS:,} Monte Carlo iterations...")
-        
-        for batch in range(num_batches):
-            # Generate random parameters for this batch
-            np.random.seed(batch * 12345)  # Reproducible but varied
+    p_lookback = 1.0 / len(SIGNAL_LOOKBACK_OPTIONS)
+    mean_vol_weight = float(np.mean(SIGNAL_VOLUME_WEIGHT_OPTIONS))
+    mean_trend_weight = float(np.mean(SIGNAL_TREND_WEIGHT_OPTIONS))
+    
+    # How many lookbacks flag each bar as a peak/trough
+    peak_hits = np.sum([peak_masks[lb] for lb in SIGNAL_LOOKBACK_OPTIONS], axis=0)
+    trough_hits = np.sum([trough_masks[lb] for lb in SIGNAL_LOOKBACK_OPTIONS], axis=0)
+    
+    base = 1.0 + (volume_ratio - 1.0) * mean_vol_weight
+    sell_votes = p_lookback * peak_hits * (base + mean_trend_weight * above_sma)
+    buy_votes = p_lookback * trough_hits * (base + mean_trend_weight * below_sma)
+    return buy_votes.astype(np.float64), sell_votes.astype(np.float64)
+
+
+def _monte_carlo_signal_votes(peak_masks, trough_masks, volume_ratio, above_sma, below_sma,
+                              iterations=MONTE_CARLO_ITERATIONS):
+    """
+    Ensemble votes from random parameter draws, in batches of 500k.
+    Kept for comparison with _expected_signal_votes.
+    """
+    import numpy as np
+    
+    BATCH_SIZE = 500_000  # Process 500k iterations at a time
+    num_batches = max(1, iterations // BATCH_SIZE)
+    batch_size = min(BATCH_SIZE, iterations)
+    
+    # Parameter options
+    lookback_options = np.array(SIGNAL_LOOKBACK_OPTIONS)
+    significance_options = np.array(SIGNAL_SIGNIFICANCE_OPTIONS)
+    volume_weight_options = np.array(SIGNAL_VOLUME_WEIGHT_OPTIONS)
+    trend_weight_options = np.array(SIGNAL_TREND_WEIGHT_OPTIONS)
+    
+    # Accumulators
+    buy_votes = np.zeros(len(volume_ratio), dtype=np.float64)
+    sell_votes = np.zeros(len(volume_ratio), dtype=np.float64)
+    
+    print(f"Running {num_batches * batch_size:,} Monte Carlo iterations...")
+    
+    for batch in range(num_batches):
+        # Generate random parameters for this batch
+        np.random.seed(batch * 12345)  # Reproducible but varied
+        
+        batch_lookbacks = np.random.choice(lookback_options, batch_size)
+        batch_significances = np.random.choice(significance_options, batch_size)
+        batch_vol_weights = np.random.choice(volume_weight_options, batch_size)
+        batch_trend_weights = np.random.choice(trend_weight_options, batch_size)
+        
+        # Count parameter combinations for each lookback
+        for lb in SIGNAL_LOOKBACK_OPTIONS:
+            lb_mask = batch_lookbacks == lb
+            if not lb_mask.any():
+                continue
             
-            batch_lookbacks = np.random.choice(lookback_options, BATCH_SIZE)
-            batch_significances = np.random.choice(significance_options, BATCH_SIZE)
-            batch_vol_weights = np.random.choice(volume_weight_options, BATCH_SIZE)
-            batch_trend_weights = np.random.choice(trend_weight_options, BATCH_SIZE)
+            # Get pre-computed peak/trough masks for this lookback
+            peak_indices = np.where(peak_masks[lb])[0]
+            trough_indices = np.where(trough_masks[lb])[0]
             
-            # Count parameter combinations for each lookback
-            for lb in [1, 2, 3, 4]:
-                lb_mask = batch_lookbacks == lb
-                lb_count = np.sum(lb_mask)
+            # For each significance threshold, vote with the subset's average weights
+            for sig in significance_options:
+                sig_lb_mask = lb_mask & (batch_significances == sig)
+                sig_count = np.sum(sig_lb_mask)
                 
-                if lb_count == 0:
+                if sig_count == 0:
                     continue
                 
-                # Get pre-computed peak/trough masks for this lookback
-                peak_mask = peak_masks[lb]
-                trough_mask = trough_masks[lb]
+                avg_vol_weight = np.mean(batch_vol_weights[sig_lb_mask])
+                avg_trend_weight = np.mean(batch_trend_weights[sig_lb_mask])
                 
-                peak_indices = np.where(peak_mask)[0]
-                trough_indices = np.where(trough_mask)[0]
+                # Peaks (SELL signals) and troughs (BUY signals)
+                sell_votes[peak_indices] += (
+                    1.0 + (volume_ratio[peak_indices] - 1.0) * avg_vol_weight
+                    + avg_trend_weight * above_sma[peak_indices]
+                ) * sig_count
+                buy_votes[trough_indices] += (
+                    1.0 + (volume_ratio[trough_indices] - 1.0) * avg_vol_weight
+                    + avg_trend_weight * below_sma[trough_indices]
+                ) * sig_count
+    
+    return buy_votes, sell_votes
+
+
+# yfinance (period, interval) fetched for each historical signals timeframe
+HISTORICAL_SIGNAL_PERIODS = {
+    'day': ('6mo', '1d'),
+    'week': ('2y', '1wk'),
+    'month': ('5y', '1mo'),
+    'year': ('10y', '1mo'),
+}
+
+# Bars signals are computed over per timeframe (about what a fetch covers).
+# Votes are normalized over the whole series, so every output depends on
+# where it starts; a fixed window gives the same signals for a last bar
+# however many bars were fetched (request-time jobs and the batch alike).
+SIGNAL_WINDOW_BARS = {
+    'day': 126,
+    'week': 104,
+    'month': 60,
+    'year': 120,
+}
+
+# Consensus threshold - lower = more signals
+CONSENSUS_THRESHOLD = 10  # Top 10% strength signals
+
+# Minimum move between consecutive signals (5%)
+SIGNAL_MIN_MOVE = 0.05
+
+# RSI period reported with each signal
+SIGNAL_RSI_PERIOD = 14
+
+# HOLD signals: minimum gap between signals, and the consolidation test at
+# the midpoint (range within +/- HOLD_CHOP_WINDOW bars, share of reversals)
+HOLD_MIN_GAP_BARS = 12
+HOLD_CHOP_WINDOW = 6
+HOLD_MAX_RANGE = 0.04
+HOLD_MIN_CHANGE_RATIO = 0.4
+
+
+def _swing_masks(highs, lows):
+    """
+    Peak/trough masks for every lookback, shape (len(SIGNAL_LOOKBACK_OPTIONS), bars)
+    (see swings.swing_points).
+    """
+    from .swings import swing_points
+    
+    return swing_points(highs, lows, SIGNAL_LOOKBACK_OPTIONS)
+
+
+def _wilder_rsi_averages(closes, period=SIGNAL_RSI_PERIOD):
+    """Wilder-smoothed average gain/loss per bar (zeros until `period`)."""
+    import numpy as np
+    
+    n = len(closes)
+    avg_gain = np.zeros(n)
+    avg_loss = np.zeros(n)
+    deltas = np.diff(closes)
+    if len(deltas) < period:
+        return avg_gain, avg_loss
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+    
+    # Initial SMA
+    avg_gain[period] = np.mean(gains[:period])
+    avg_loss[period] = np.mean(losses[:period])
+    
+    # EMA for subsequent values
+    for i in range(period + 1, n):
+        avg_gain[i] = (avg_gain[i-1] * (period - 1) + gains[i-1]) / period
+        avg_loss[i] = (avg_loss[i-1] * (period - 1) + losses[i-1]) / period
+    return avg_gain, avg_loss
+
+
+def compute_signal_arrays(highs, lows, closes):
+    """
+    Per-bar arrays the signal votes are built from: swing masks and RSI
+    averages.
+    """
+    peaks, troughs = _swing_masks(highs, lows)
+    avg_gain, avg_loss = _wilder_rsi_averages(closes)
+    return {'peaks': peaks, 'troughs': troughs, 'avg_gain': avg_gain, 'avg_loss': avg_loss}
+
+
+def _push_alternating(kept, sig):
+    """Alternation pass step: same type as the last kept signal keeps the higher confidence."""
+    if not kept or sig[1] != kept[-1][1]:
+        kept.append(sig)
+    elif sig[2] > kept[-1][2]:
+        kept[-1] = sig
+
+
+def _push_significant(kept, sig):
+    """Significance pass step: moves under SIGNAL_MIN_MOVE keep the higher confidence."""
+    if not kept or abs(sig[3] - kept[-1][3]) / kept[-1][3] >= SIGNAL_MIN_MOVE:
+        kept.append(sig)
+    elif sig[2] > kept[-1][2]:
+        kept[-1] = sig
+
+
+def consensus_candidates(buy_votes, sell_votes, lows, highs):
+    """(index, type, confidence %, price) for every bar with consensus, in bar order."""
+    import numpy as np
+    
+    # Normalize votes - use relative strength between buy/sell
+    max_buy = np.max(buy_votes) if np.max(buy_votes) > 0 else 1
+    max_sell = np.max(sell_votes) if np.max(sell_votes) > 0 else 1
+    buy_pct = buy_votes / max_buy * 100
+    sell_pct = sell_votes / max_sell * 100
+    
+    is_buy = (buy_pct >= CONSENSUS_THRESHOLD) & (buy_pct > sell_pct)
+    is_sell = (sell_pct >= CONSENSUS_THRESHOLD) & (sell_pct > buy_pct)
+    return [
+        (int(i), 'BUY', float(buy_pct[i]), float(lows[i])) if is_buy[i]
+        else (int(i), 'SELL', float(sell_pct[i]), float(highs[i]))
+        for i in np.flatnonzero(is_buy | is_sell)
+    ]
+
+
+def consensus_passes(candidates):
+    """Alternation, SIGNAL_MIN_MOVE significance filter, then alternation again."""
+    for push in (_push_alternating, _push_significant, _push_alternating):
+        kept = []
+        for sig in candidates:
+            push(kept, sig)
+        candidates = kept
+    return candidates
+
+
+def choppiness_arrays(highs, lows, closes, window=HOLD_CHOP_WINDOW):
+    """
+    Per-bar consolidation measures over the bars [i - window, i + window)
+    (clipped to the series): (range_pct, change_ratio, choppy), where
+    range_pct is (high - low) / low, change_ratio the share of bars that
+    reversed the previous bar's direction, and choppy a tight, reversing range.
+    """
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+    
+    n = len(closes)
+    bars = np.arange(n)
+    start = np.maximum(0, bars - window)
+    end = np.minimum(n, bars + window)
+    
+    # Rolling high/low over each bar's centred window (padding never wins)
+    def centred(values, func, fill):
+        pad = np.full(window, fill)
+        padded = np.concatenate((pad, np.asarray(values, dtype=np.float64), pad))
+        return func(sliding_window_view(padded, 2 * window)[:n], axis=1)
+    
+    local_high = centred(highs, np.max, -np.inf)
+    local_low = centred(lows, np.min, np.inf)
+    
+    # Bar j reverses direction if (c[j-1] - c[j-2]) and (c[j] - c[j-1]) differ in sign
+    reversals = np.zeros(n + 1, dtype=np.int64)
+    if n > 2:
+        moves = np.diff(closes)
+        reversals[3:] = np.cumsum(moves[:-1] * moves[1:] < 0)
+    changes = reversals[end] - reversals[np.minimum(start + 2, end)]
+    span = end - start
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        range_pct = np.where(span >= 5, (local_high - local_low) / local_low, 0.0)
+        change_ratio = np.where(span > 2, changes / np.maximum(span - 2, 1), 0.0)
+    choppy = (span >= 5) & (range_pct < HOLD_MAX_RANGE) & (change_ratio > HOLD_MIN_CHANGE_RATIO)
+    return range_pct, change_ratio, choppy
+
+
+def signal_output(consensus_signals, timestamps, highs, lows, closes, rsi):
+    """
+    One pass over the consensus signals (by bar index) building the output
+    dicts. Between two signals at least HOLD_MIN_GAP_BARS apart, a HOLD is
+    added at the midpoint when the price there is choppy, or the range is
+    tight and the two signals are within SIGNAL_MIN_MOVE of each other.
+    Consecutive duplicate types are dropped as they are emitted.
+    """
+    import numpy as np
+    
+    range_pct, _, choppy = choppiness_arrays(highs, lows, closes)
+    
+    def rsi_at(idx):
+        return float(rsi[idx]) if idx < len(rsi) and not np.isnan(rsi[idx]) else 50
+    
+    final_signals = []
+    
+    def emit(signal):
+        if not final_signals or signal['signal'] != final_signals[-1]['signal']:
+            final_signals.append(signal)
+    
+    for k, (idx, signal_type, confidence, price) in enumerate(consensus_signals):
+        # Strength based on consensus confidence (0-100)
+        # confidence is already 0-100 (percentage of iterations that agreed)
+        strength = min(100, int(confidence * 2))  # Scale up since max is ~50%
+        
+        emit({
+            'timestamp': int(timestamps[idx]),
+            'price': float(price),
+            'signal': signal_type,
+            'rsi': rsi_at(idx),
+            'strength': strength,
+            'confidence': round(confidence, 1),  # % of iterations that agreed
+            'score': strength
+        })
+        
+        # Check for extended consolidation before the next signal
+        if k + 1 < len(consensus_signals):
+            next_idx, _, _, next_price = consensus_signals[k + 1]
+            if next_idx - idx >= HOLD_MIN_GAP_BARS:
+                mid_idx = (idx + next_idx) // 2
+                overall_move = abs(next_price - price) / price
                 
-                # For each significance threshold, filter and vote
-                for sig in significance_options:
-                    sig_lb_mask = lb_mask & (batch_significances == sig)
-                    sig_count = np.sum(sig_lb_mask)
-                    
-                    if sig_count == 0:
-                        continue
-                    
-                    # Get volume and trend weights for this subset
-                    subset_vol_weights = batch_vol_weights[sig_lb_mask]
-                    subset_trend_weights = batch_trend_weights[sig_lb_mask]
-                    
-                    # Average weights for scoring (approximation for speed)
-                    avg_vol_weight = np.mean(subset_vol_weights)
-                    avg_trend_weight = np.mean(subset_trend_weights)
-                    
-                    # Process peaks (SELL signals)
-                    if len(peak_indices) > 0:
-                        # Filter by significance (check if move from prev trough is significant)
-                        # Simplified: just vote for all peaks, weight by count
-                        for pidx in peak_indices:
-                            vol_bonus = (volume_ratio[pidx] - 1.0) * avg_vol_weight
-                            trend_bonus = avg_trend_weight if above_sma[pidx] else 0
-                            score = (1.0 + vol_bonus + trend_bonus) * sig_count
-                            sell_votes[pidx] += score
-                    
-                    # Process troughs (BUY signals)
-                    if len(trough_indices) > 0:
-                        for tidx in trough_indices:
-                            vol_bonus = (volume_ratio[tidx] - 1.0) * avg_vol_weight
-                            trend_bonus = avg_trend_weight if below_sma[tidx] else 0
-                            score = (1.0 + vol_bonus + trend_bonus) * sig_count
-                            buy_votes[tidx] += score
-        
+                if choppy[mid_idx] or (range_pct[mid_idx] < HOLD_MAX_RANGE and overall_move < SIGNAL_MIN_MOVE):
+                    emit({
+                        'timestamp': int(timestamps[mid_idx]),
+                        'price': float(closes[mid_idx]),
+                        'signal': 'HOLD',
+                        'rsi': rsi_at(mid_idx),
+                        'strength': 50,
+                        'confidence': 0,
+                        'score': 50
+                    })
+    
+    return final_signals
+
+
+def signals_from_arrays(df, arrays, mode='exact', iterations=MONTE_CARLO_ITERATIONS):
+    """
+    Turn per-bar arrays (see compute_signal_arrays) into BUY/SELL/HOLD
+    signals for the bars in `df`.
+    """
+    import numpy as np
+    from .timestamps import epoch_ms
+    
+    closes = df['Close'].values
+    highs = df['High'].values
+    lows = df['Low'].values
+    volumes = df['Volume'].values
+    
+    avg_gain, avg_loss = arrays['avg_gain'], arrays['avg_loss']
+    rs = np.where(avg_loss != 0, avg_gain / np.where(avg_loss != 0, avg_loss, 1), 0)
+    rsi = 100 - (100 / (1 + rs))
+    
+    # ============================================================
+    # ENSEMBLE SIGNAL DETECTION
+    # Every (lookback, significance, volume weight, trend weight)
+    # combination votes for the peaks/troughs it detects
+    # ============================================================
+    
+    # Volume ratios
+    avg_volume = np.mean(volumes) if len(volumes) > 0 else 1
+    volume_ratio = volumes / avg_volume
+    
+    # SMA for trend context (vectorized with cumsum)
+    sma_period = min(20, max(3, len(closes) // 3))
+    cumsum = np.cumsum(np.insert(closes, 0, 0))
+    sma = np.zeros(len(closes))
+    sma[sma_period-1:] = (cumsum[sma_period:] - cumsum[:-sma_period]) / sma_period
+    
+    # Trend bonuses (price above/below SMA)
+    above_sma = (sma > 0) & (closes > sma)
+    below_sma = (sma > 0) & (closes < sma)
+    
+    peak_masks = dict(zip(SIGNAL_LOOKBACK_OPTIONS, arrays['peaks']))
+    trough_masks = dict(zip(SIGNAL_LOOKBACK_OPTIONS, arrays['troughs']))
+    
+    # ------------------------------------------------------------
+    # ENSEMBLE VOTES - exact expectation or Monte Carlo sampling
+    # ------------------------------------------------------------
+    if mode == 'monte_carlo':
+        buy_votes, sell_votes = _monte_carlo_signal_votes(
+            peak_masks, trough_masks, volume_ratio, above_sma, below_sma, iterations
+        )
         print(f"Monte Carlo complete. Processing consensus...")
+    else:
+        buy_votes, sell_votes = _expected_signal_votes(
+            peak_masks, trough_masks, volume_ratio, above_sma, below_sma
+        )
+    
+    # ------------------------------------------------------------
+    # AGGREGATE VOTES INTO CONSENSUS SIGNALS
+    # ------------------------------------------------------------
+    consensus_signals = consensus_passes(consensus_candidates(buy_votes, sell_votes, lows, highs))
+    
+    # ------------------------------------------------------------
+    # OUTPUT WITH HOLD SIGNALS FOR EXTENDED CONSOLIDATION PERIODS
+    # ------------------------------------------------------------
+    return signal_output(consensus_signals, epoch_ms(df.index), highs, lows, closes, rsi)
+
+
+def fetch_signal_bars(ticker, timeframe='day'):
+    """OHLCV bars for a historical signals timeframe."""
+    import yfinance as yf
+    
+    period, interval = HISTORICAL_SIGNAL_PERIODS.get(timeframe, HISTORICAL_SIGNAL_PERIODS['day'])
+    stock = yf.Ticker(ticker)
+    return stock.history(period=period, interval=interval)
+
+
+def window_bars(timeframe):
+    """Bars signals are computed over for a timeframe (SIGNAL_WINDOW_BARS)."""
+    return SIGNAL_WINDOW_BARS.get(timeframe, SIGNAL_WINDOW_BARS['day'])
+
+
+def get_historical_signals(ticker: str, timeframe: str = 'day', lookback_days: int = 365,
+                           mode: str = 'exact', iterations: int = MONTE_CARLO_ITERATIONS) -> dict:
+    """
+    Calculate historical BUY/SELL/HOLD signals for a ticker over the last
+    window_bars(timeframe) bars.
+    Returns timestamps and price levels where signal changes occurred.
+    
+    mode='exact' (default) computes the ensemble's expected votes directly;
+    mode='monte_carlo' samples `iterations` random parameter combinations.
+    """
+    try:
+        df = fetch_signal_bars(ticker, timeframe)
         
-        # ------------------------------------------------------------
-        # AGGREGATE VOTES INTO CONSENSUS SIGNALS
-        # ------------------------------------------------------------
-        # Normalize votes - use relative strength between buy/sell
-        max_buy = np.max(buy_votes) if np.max(buy_votes) > 0 else 1
-        max_sell = np.max(sell_votes) if np.max(sell_votes) > 0 else 1
-        
-        buy_pct = buy_votes / max_buy * 100
-        sell_pct = sell_votes / max_sell * 100
-        
-        # Consensus threshold - lower = more signals
-        CONSENSUS_THRESHOLD = 10  # Top 10% strength signals (lowered for 1B iterations)
-        
-        # Find bars with strong consensus
-        consensus_signals = []
-        
-        for i in range(len(closes)):
-            if buy_pct[i] >= CONSENSUS_THRESHOLD and buy_pct[i] > sell_pct[i]:
-                consensus_signals.append((i, 'BUY', buy_pct[i], lows[i]))
-            elif sell_pct[i] >= CONSENSUS_THRESHOLD and sell_pct[i] > buy_pct[i]:
-                consensus_signals.append((i, 'SELL', sell_pct[i], highs[i]))
-        
-        # Sort by index
-        consensus_signals.sort(key=lambda x: x[0])
-        
-        # Ensure alternating pattern for final output
-        if consensus_signals:
-            alternating = [consensus_signals[0]]
-            for sig in consensus_signals[1:]:
-                if sig[1] != alternating[-1][1]:
-                    alternating.append(sig)
-                else:
-                    # Same type - keep higher confidence
-                    if sig[2] > alternating[-1][2]:
-                        alternating[-1] = sig
-            consensus_signals = alternating
-        
-        # Apply final significance filter (5% minimum move)
-        if len(consensus_signals) > 1:
-            significant = [consensus_signals[0]]
-            for sig in consensus_signals[1:]:
-                prev_price = significant[-1][3]
-                move_pct = abs(sig[3] - prev_price) / prev_price
-                if move_pct >= 0.05:
-                    significant.append(sig)
-                else:
-                    # Keep higher confidence
-                    if sig[2] > significant[-1][2]:
-                        significant[-1] = sig
-            consensus_signals = significant
-        
-        # Re-ensure alternating after significance filter
-        if len(consensus_signals) > 1:
-            final_alt = [consensus_signals[0]]
-            for sig in consensus_signals[1:]:
-                if sig[1] != final_alt[-1][1]:
-                    final_alt.append(sig)
-                else:
-                    if sig[2] > final_alt[-1][2]:
-                        final_alt[-1] = sig
-            consensus_signals = final_alt
-        
-        # ------------------------------------------------------------
-        # CONVERT CONSENSUS SIGNALS TO OUTPUT FORMAT
-        # ------------------------------------------------------------
-        signals = []
-        
-        for idx, signal_type, confidence, price in consensus_signals:
-            timestamp = int(df.index[idx].timestamp() * 1000)
-            rsi_val = float(rsi[idx]) if idx < len(rsi) and not np.isnan(rsi[idx]) else 50
-            
-            # Strength based on consensus confidence (0-100)
-            # confidence is already 0-100 (percentage of iterations that agreed)
-            strength = min(100, int(confidence * 2))  # Scale up since max is ~50%
-            
-            signals.append({
-                'timestamp': timestamp,
-                'price': float(price),
-                'signal': signal_type,
-                'rsi': rsi_val,
-                'strength': strength,
-                'confidence': round(confidence, 1),  # % of iterations that agreed
-                'score': strength
-            })
-        
-        # ------------------------------------------------------------
-        # ADD HOLD SIGNALS FOR EXTENDED CONSOLIDATION PERIODS
-        # ------------------------------------------------------------
-        final_signals = []
+        if df.empty or len(df) < 20:
+            last_bar_ts = int(df.index[-1].timestamp() * 1000) if not df.empty else None
+            return {'signals': [], 'error': None, 'last_bar_ts': last_bar_ts}
         
-        for i, signal in enumerate(signals):
-            final_signals.append(signal)
-            
-            # Check for extended consolidation between signals
-            if i < len(signals) - 1:
-                current_idx = None
-                next_idx = None
-                
-                for j in range(len(df.index)):
-                    ts_ms = int(df.index[j].timestamp() * 1000)
-                    if ts_ms == signal['timestamp']:
-                        current_idx = j
-                    if ts_ms == signals[i + 1]['timestamp']:
-                        next_idx = j
-                    if current_idx is not None and next_idx is not None:
-                        break
-                
-                if current_idx is not None and next_idx is not None:
-                    gap_bars = next_idx - current_idx
-                    
-                    # Only add HOLD for significant gaps (>12 bars)
-                    if gap_bars >= 12:
-                        mid_idx = (current_idx + next_idx) // 2
-                        
-                        # Check if choppy in the middle
-                        choppy_at_mid, range_pct = is_choppy(mid_idx, window=6)
-                        overall_move = abs(signals[i+1]['price'] - signal['price']) / signal['price']
-                        
-                        if choppy_at_mid or (range_pct < 0.04 and overall_move < 0.05):
-                            hold_ts = int(df.index[mid_idx].timestamp() * 1000)
-                            hold_rsi = float(rsi[mid_idx]) if mid_idx < len(rsi) and not np.isnan(rsi[mid_idx]) else 50
-                            
-                            final_signals.append({
-                                'timestamp': hold_ts,
-                                'price': float(closes[mid_idx]),
-                                'signal': 'HOLD',
-                                'rsi': hold_rsi,
-                                'strength': 50,
-                                'confidence': 0,
-                                'score': 50
-                            })
-        
-        # Sort by timestamp
-        final_signals.sort(key=lambda x: x['timestamp'])
-        
-        # Remove consecutive duplicate signal types
-        if len(final_signals) > 1:
-            deduped = [final_signals[0]]
-            for sig in final_signals[1:]:
-                if sig['signal'] != deduped[-1]['signal']:
-                    deduped.append(sig)
-            final_signals = deduped
+        df = df.iloc[-window_bars(timeframe):]
+        arrays = compute_signal_arrays(df['High'].values, df['Low'].values, df['Close'].values)
+        signals = signals_from_arrays(df, arrays, mode, iterations)
         
         return {
-            'signals': final_signals,
-            'error': None
+            'signals': signals,
+            'error': None,
+            'last_bar_ts': int(df.index[-1].timestamp() * 1000),
         }
         
     except Exception as e:
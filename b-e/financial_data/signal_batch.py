@@ -0,0 +1,227 @@
+"""
+Batch historical signals for many symbols.
+
+Computing signals for the whole universe one get_historical_signals call at
+a time means one yf.Ticker().history request and one single-core compute
+per symbol. run_batch() instead:
+
+1. Downloads bars for all symbols with batched yf.download calls.
+2. Packs them into multiprocessing.shared_memory (SharedBars): a
+   (symbols, bars, fields) float64 block and a (symbols, bars) int64
+   timestamp block, so worker processes read the bars in place and only a
+   row number is sent per task.
+3. Computes signals on a process pool sized to the machine's cores.
+4. Stores each result in the signal store (signal_store.store_output) and
+   returns a throughput report.
+
+Each symbol's bars are trimmed to services.window_bars(timeframe) first,
+as get_historical_signals trims its own, so a stored batch result equals a
+request-time job's result for the same last bar.
+
+Run through the management command:
+    python manage.py batch_historical_signals --timeframe day week
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Symbols per yf.download call
+BATCH_DOWNLOAD_SIZE = 100
+
+# Bars needed for signals (as get_historical_signals)
+BATCH_MIN_BARS = 20
+
+BAR_FIELDS = ('High', 'Low', 'Close', 'Volume')
+
+
+class SharedBars:
+    """
+    Bars for many symbols in shared memory, left-aligned with per-symbol
+    lengths. Created once by the parent; workers attach() by name.
+    """
+
+    def __init__(self, bars_shm, ts_shm, lengths, owner=False):
+        self._bars_shm = bars_shm
+        self._ts_shm = ts_shm
+        self.lengths = lengths
+        self._owner = owner
+        shape = (len(lengths), int(lengths.max()) if len(lengths) else 0)
+        self.bars = np.ndarray(shape + (len(BAR_FIELDS),), dtype=np.float64, buffer=bars_shm.buf)
+        self.ts = np.ndarray(shape, dtype=np.int64, buffer=ts_shm.buf)
+
+    @classmethod
+    def from_frames(cls, frames):
+        """Copy a list of OHLCV DataFrames into new shared memory blocks."""
+        from .timestamps import epoch_ms
+
+        lengths = np.array([len(df) for df in frames], dtype=np.int64)
+        width = int(lengths.max()) if len(lengths) else 0
+        # Zero-sized blocks are not allowed
+        bars_shm = shared_memory.SharedMemory(create=True, size=max(1, len(frames) * width * len(BAR_FIELDS) * 8))
+        ts_shm = shared_memory.SharedMemory(create=True, size=max(1, len(frames) * width * 8))
+        shared = cls(bars_shm, ts_shm, lengths, owner=True)
+        for row, df in enumerate(frames):
+            n = len(df)
+            shared.bars[row, :n] = df[list(BAR_FIELDS)].to_numpy(dtype=np.float64)
+            shared.ts[row, :n] = epoch_ms(df.index)
+        return shared
+
+    @property
+    def spec(self):
+        """Picklable description for attach()."""
+        return {'bars': self._bars_shm.name, 'ts': self._ts_shm.name, 'lengths': self.lengths}
+
+    @classmethod
+    def attach(cls, spec):
+        return cls(shared_memory.SharedMemory(name=spec['bars']), shared_memory.SharedMemory(name=spec['ts']),
+                   spec['lengths'])
+
+    def frame(self, row):
+        """OHLCV DataFrame for one symbol (a view of the shared bars)."""
+        n = int(self.lengths[row])
+        bars = self.bars[row, :n]
+        index = pd.to_datetime(self.ts[row, :n], unit='ms', utc=True)
+        return pd.DataFrame({field: bars[:, k] for k, field in enumerate(BAR_FIELDS)}, index=index)
+
+    def close(self):
+        """Release this process's mapping (and the blocks themselves if this process created them)."""
+        # Views must go before the buffers can be released
+        self.bars = self.ts = None
+        for shm in (self._bars_shm, self._ts_shm):
+            shm.close()
+            if self._owner:
+                shm.unlink()
+
+
+# Set in each worker process by _init_worker
+_worker_bars = None
+
+
+def _init_worker(spec):
+    global _worker_bars
+    _worker_bars = SharedBars.attach(spec)
+
+
+def _compute_row(row, mode):
+    """Signals for one shared-memory row, in get_historical_signals output format."""
+    from .services import compute_signal_arrays, signals_from_arrays
+
+    df = _worker_bars.frame(row)
+    try:
+        arrays = compute_signal_arrays(df['High'].values, df['Low'].values, df['Close'].values)
+        return {
+            'signals': signals_from_arrays(df, arrays, mode),
+            'error': None,
+            'last_bar_ts': int(_worker_bars.ts[row, len(df) - 1]),
+        }
+    except Exception as e:
+        return {'signals': [], 'error': str(e), 'last_bar_ts': None}
+
+
+def download_signal_bars(symbols, timeframe='day'):
+    """{symbol: DataFrame} for a timeframe's history, BATCH_DOWNLOAD_SIZE symbols per request."""
+    from .indicators import download_bars_batch
+    from .services import HISTORICAL_SIGNAL_PERIODS
+
+    period, interval = HISTORICAL_SIGNAL_PERIODS.get(timeframe, HISTORICAL_SIGNAL_PERIODS['day'])
+    frames = {}
+    for start in range(0, len(symbols), BATCH_DOWNLOAD_SIZE):
+        chunk = symbols[start:start + BATCH_DOWNLOAD_SIZE]
+        try:
+            frames.update(download_bars_batch(chunk, period, interval))
+        except Exception as e:
+            logger.warning("Batch bar download failed for %d symbols: %s", len(chunk), e)
+    return frames
+
+
+def compute_batch(frames, mode='exact', workers=None):
+    """
+    Signals for {symbol: DataFrame} on a process pool reading shared-memory
+    bars. Returns {symbol: output}; symbols with too few bars get an empty
+    signal list without being sent to the pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    outputs = {}
+    symbols = []
+    for symbol, df in frames.items():
+        if len(df) < BATCH_MIN_BARS:
+            last_bar_ts = int(df.index[-1].timestamp() * 1000) if not df.empty else None
+            outputs[symbol] = {'signals': [], 'error': None, 'last_bar_ts': last_bar_ts}
+        else:
+            symbols.append(symbol)
+    if not symbols:
+        return outputs
+
+    shared = SharedBars.from_frames([frames[symbol] for symbol in symbols])
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared.spec,)) as pool:
+            rows = range(len(symbols))
+            chunksize = max(1, len(symbols) // (workers * 4))
+            for symbol, output in zip(symbols, pool.map(_compute_row, rows, [mode] * len(symbols),
+                                                        chunksize=chunksize)):
+                outputs[symbol] = output
+    finally:
+        shared.close()
+    return outputs
+
+
+def run_batch(symbols=None, timeframe='day', mode='exact', workers=None, store=True, frames=None):
+    """
+    Download, compute and store signals for `symbols` (default: the
+    precompute symbols). `frames` skips the download. Returns a report with
+    counts, per-stage seconds and tickers_per_second (symbols computed and
+    stored per second of compute + store time).
+    """
+    from .services import window_bars
+    from .signal_store import precompute_symbols, store_output
+
+    symbols = symbols or precompute_symbols()
+    workers = workers or os.cpu_count() or 1
+
+    started = time.perf_counter()
+    if frames is None:
+        frames = download_signal_bars(symbols, timeframe)
+    loaded = time.perf_counter()
+
+    # Signals depend on where the series starts, so use the same window as the jobs
+    window = window_bars(timeframe)
+    outputs = compute_batch({s: frames[s].iloc[-window:] for s in symbols if s in frames}, mode, workers)
+    computed = time.perf_counter()
+
+    succeeded = failed = 0
+    for symbol, output in outputs.items():
+        if store:
+            store_output(symbol, timeframe, mode, output)
+        if output.get('error'):
+            failed += 1
+        else:
+            succeeded += 1
+    stored = time.perf_counter()
+
+    missing = [s for s in symbols if s not in outputs]
+    if missing:
+        logger.warning("No bars for %d symbols: %s", len(missing), ', '.join(missing[:20]))
+
+    work_seconds = stored - loaded
+    return {
+        'timeframe': timeframe,
+        'mode': mode,
+        'workers': workers,
+        'symbols': len(symbols),
+        'succeeded': succeeded,
+        'failed': failed + len(missing),
+        'missing': missing,
+        'load_seconds': loaded - started,
+        'compute_seconds': computed - loaded,
+        'store_seconds': stored - computed,
+        'total_seconds': stored - started,
+        'tickers_per_second': len(outputs) / work_seconds if work_seconds > 0 else 0.0,
+        'outputs': outputs,
+    }
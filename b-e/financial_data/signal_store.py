@@ -0,0 +1,181 @@
+"""
+Result store and job queue for historical signals.
+
+get_historical_signals used to run inline on every request. Results are now
+stored in HistoricalSignalResult keyed by (ticker, timeframe, mode, last bar
+timestamp) and computed by a Celery job:
+
+- request_signals() returns the stored result while it is fresh, otherwise
+  queues (or reuses) a job and returns a pending status with the job id and
+  the last stored signals, if any.
+- A stored result stays fresh until the next session close passes; while
+  the market is open the forming bar can still move, so intraday results
+  are only reused for SIGNAL_INTRADAY_TTL.
+- precompute_symbols() refreshes watchlist and universe symbols after the
+  close so the first visit the next day is served from the store.
+- Jobs compute over the last services.window_bars(timeframe) bars, as the
+  batch (signal_batch) does, so a stored result for a last bar doesn't
+  depend on which of them computed it.
+
+The pending/complete/failed job rows work as in result_jobs.ResultJobs,
+shared with the backtest summary store.
+"""
+import logging
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import HistoricalSignalResult
+from .result_jobs import EASTERN, ResultJobs, last_close
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_TIMEFRAMES = ('day', 'week', 'month', 'year')
+
+# How long a result computed during market hours is reused
+SIGNAL_INTRADAY_TTL = timedelta(minutes=15)
+
+# A pending job older than this is assumed lost and queued again
+SIGNAL_JOB_TIMEOUT = timedelta(minutes=5)
+
+# Stored results older than this are pruned by the nightly precompute
+SIGNAL_RESULT_RETENTION = timedelta(days=30)
+
+# Suggested client poll interval while a job is pending (seconds)
+SIGNAL_POLL_SECONDS = 2
+
+
+def _key(ticker, timeframe, mode):
+    return {'ticker': ticker, 'timeframe': timeframe, 'mode': mode}
+
+
+def _job_key(ticker, timeframe, mode):
+    """Key for a job to queue; raises ValueError for a timeframe the jobs don't compute."""
+    if timeframe not in SIGNAL_TIMEFRAMES:
+        raise ValueError(f'Invalid timeframe: {timeframe}')
+    return _key(ticker, timeframe, mode)
+
+
+def is_fresh(result, now=None):
+    """Whether a complete result can be served without recomputing."""
+    return jobs.is_fresh(result, now)
+
+
+def latest_result(ticker, timeframe, mode='exact'):
+    """Most recently computed complete result, or None."""
+    return jobs.latest(_key(ticker, timeframe, mode))
+
+
+def serialize_result(result):
+    """API body for a stored result (pending, complete or failed)."""
+    return {
+        'status': result.status,
+        'job_id': result.job_id,
+        'signals': result.signals if result.status == 'complete' else [],
+        'error': result.error or None,
+        'last_bar_ts': result.last_bar_ts,
+    }
+
+
+def compute_and_store(ticker, timeframe='day', mode='exact', job_id=None):
+    """
+    Run get_historical_signals and store the result under its last bar
+    timestamp. Fills in the pending row for `job_id` if given. Returns the row.
+    """
+    from .services import get_historical_signals
+
+    result = jobs.job_row(_key(ticker, timeframe, mode), job_id)
+    output = get_historical_signals(ticker, timeframe, mode=mode)
+    return store_output(ticker, timeframe, mode, output, result)
+
+
+def store_output(ticker, timeframe, mode, output, result=None):
+    """
+    Store get_historical_signals output (into `result` if given, else a new
+    row) under its last bar timestamp, replacing older rows for the same bar.
+    Returns the row.
+    """
+    key = _key(ticker, timeframe, mode)
+    result = result or jobs.job_row(key)
+    if output.get('error'):
+        result.signals = []
+        return jobs.save_failed(result, key, output['error'])
+
+    result.status = 'complete'
+    result.error = ''
+    result.signals = output['signals']
+    result.last_bar_ts = output.get('last_bar_ts')
+    # A result for the same last bar replaces the older row
+    return jobs.save(result, key, last_bar_ts=result.last_bar_ts)
+
+
+jobs = ResultJobs(
+    HistoricalSignalResult,
+    key_fields=('ticker', 'timeframe', 'mode'),
+    task='compute_historical_signals_task',
+    compute=compute_and_store,
+    serialize=serialize_result,
+    stale_fields=lambda stored: {'signals': stored.signals, 'last_bar_ts': stored.last_bar_ts},
+    intraday_ttl=SIGNAL_INTRADAY_TTL,
+    job_timeout=SIGNAL_JOB_TIMEOUT,
+    poll_seconds=SIGNAL_POLL_SECONDS,
+)
+
+
+def enqueue(ticker, timeframe='day', mode='exact'):
+    """
+    Queue a compute job unless one is already in flight. Returns the pending
+    row, or the finished row if no worker could be reached and the job ran inline.
+    """
+    return jobs.enqueue(_job_key(ticker, timeframe, mode))
+
+
+def request_signals(ticker, timeframe='day', mode='exact'):
+    """
+    Endpoint entry point: a fresh stored result, or a pending status (with
+    the previous signals marked stale while the new job runs).
+    """
+    return jobs.request(_job_key(ticker, timeframe, mode))
+
+
+def get_job(job_id):
+    """Stored row for a job id, or None."""
+    return jobs.get_job(job_id)
+
+
+def precompute_symbols():
+    """Watchlisted symbols (all users) followed by the live-screens universe, deduplicated."""
+    symbols = []
+    try:
+        from paper_trading.models import Watchlist
+        symbols = list(Watchlist.objects.values_list('symbol', flat=True).distinct())
+    except Exception as e:
+        logger.warning("Could not load watchlist symbols for precompute: %s", e)
+
+    from .services import SCAN_UNIVERSE
+    symbols += SCAN_UNIVERSE
+    return list(dict.fromkeys(s.upper() for s in symbols))
+
+
+def precompute_all(timeframes=SIGNAL_TIMEFRAMES, mode='exact', symbols=None):
+    """
+    Recompute and store signals for every precompute symbol, after pruning
+    expired results. Failures are stored per symbol and do not stop the run.
+    Returns (succeeded, failed) counts.
+    """
+    HistoricalSignalResult.objects.filter(updated_at__lt=timezone.now() - SIGNAL_RESULT_RETENTION).delete()
+
+    succeeded = failed = 0
+    for symbol in symbols or precompute_symbols():
+        for timeframe in timeframes:
+            try:
+                result = compute_and_store(symbol, timeframe, mode)
+                if result.status == 'complete':
+                    succeeded += 1
+                else:
+                    failed += 1
+            except Exception as e:
+                logger.warning("Precompute failed for %s %s: %s", symbol, timeframe, e)
+                failed += 1
+    logger.info("Historical signals precompute: %d stored, %d failed", succeeded, failed)
+    return succeeded, failed
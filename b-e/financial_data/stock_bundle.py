@@ -0,0 +1,112 @@
+"""
+Stock page bundle.
+
+Opening a stock page used to call stock-detail, indicators/<symbol>/ and
+historical-signals/ separately, and stock-detail and the indicators
+endpoint each downloaded bars for the same symbol. stock_bundle() builds
+the requested sections from one set of data:
+
+- bars come from the bar store (seeded once per symbol, see bar_store).
+  They serve the indicators and, for the daily month/year timeframes, the
+  detail chart. The day/week detail charts include pre/post-market bars
+  the store doesn't keep, so those still come from the stock-detail bars
+  cache, fetched concurrently with the store.
+- fundamentals come from the stock-detail info cache, shared with the
+  stock-detail endpoint. The session quote (volume, previous close) is read
+  from the store's daily bars when they are loaded, otherwise from the
+  stock-detail quote cache.
+- signals come from the historical signals store (signal_store).
+
+The options chain stays on the paper trading endpoint, which also creates
+the contracts it lists.
+"""
+from .bar_store import bar_store
+from .indicators import resolve_period_interval, symbol_indicator_payload
+from .invalid_symbols import INVALID_SYMBOL_ERROR, is_invalid, record_hit
+from .services import session_quote, stock_bars_future, stock_detail_from, stock_info_future, stock_quote_future
+
+BUNDLE_SECTIONS = ('detail', 'indicators', 'signals')
+
+# Sections computed from bars; a symbol is not found if all requested ones are empty
+DATA_SECTIONS = ('detail', 'indicators')
+
+# Stock-detail timeframes whose bars (daily, no pre/post-market) are a bar store slice
+STORE_DETAIL_PERIODS = {'month': '1mo', 'year': '1y'}
+
+# Indicators (period, interval) for a timeframe when the request doesn't give them
+TIMEFRAME_INDICATOR_CODES = {'day': 'D', 'week': 'W', 'month': 'M', 'year': 'Y'}
+
+
+def parse_sections(value):
+    """Requested sections from a comma-separated list (all if empty), or None if one is unknown."""
+    sections = [s.strip().lower() for s in (value or '').split(',') if s.strip()]
+    if not sections:
+        return list(BUNDLE_SECTIONS)
+    if any(s not in BUNDLE_SECTIONS for s in sections):
+        return None
+    return [s for s in BUNDLE_SECTIONS if s in sections]
+
+
+def stock_bundle(symbol, timeframe='day', sections=BUNDLE_SECTIONS, timestamp_mode='label',
+                 period=None, interval=None, indicator='ALL', mode='exact'):
+    """
+    Stock page sections for a symbol from shared bars and fundamentals:
+    {'symbol', 'timeframe', 'sections', <section>: payload, 'errors': {section: message}}.
+    Returns None if the symbol has no data.
+    """
+    from .signal_store import request_signals
+
+    symbol = symbol.upper()
+    if is_invalid(symbol):
+        return None
+
+    wants_detail = 'detail' in sections
+    detail_from_store = wants_detail and timeframe in STORE_DETAIL_PERIODS
+    uses_store = 'indicators' in sections or detail_from_store
+    info_future = stock_info_future(symbol) if wants_detail else None
+    quote_future = stock_quote_future(symbol) if wants_detail and not uses_store else None
+    bars_future = stock_bars_future(symbol, timeframe) if wants_detail and not detail_from_store else None
+
+    # Seeds or refreshes on this thread while the detail fetches run in the pool
+    bars = bar_store.ensure(symbol) if uses_store else None
+
+    body = {'symbol': symbol, 'timeframe': timeframe, 'sections': list(sections), 'errors': {}}
+
+    if wants_detail:
+        if detail_from_store and bars is not None:
+            hist = bars.frame('1d', STORE_DETAIL_PERIODS[timeframe])
+        else:
+            hist = (bars_future or stock_bars_future(symbol, timeframe)).result()
+        info = info_future.result() or {}
+        if quote_future is None and bars is not None:
+            quote = session_quote(bars.frame('1d', '5d'))
+        else:
+            quote = (quote_future or stock_quote_future(symbol)).result() or {}
+        if hist is not None and not hist.empty:
+            body['detail'] = stock_detail_from(symbol, timeframe, info, quote, hist, timestamp_mode)
+        else:
+            body['detail'] = None
+            body['errors']['detail'] = INVALID_SYMBOL_ERROR
+
+    if 'indicators' in sections:
+        code = TIMEFRAME_INDICATOR_CODES.get(timeframe, 'D')
+        yf_period, yf_interval, period, interval = resolve_period_interval(
+            period, interval, None if period and interval else code
+        )
+        body['indicators'] = symbol_indicator_payload(
+            symbol, indicator, period, interval, yf_period, yf_interval, timestamp_mode, bars=bars
+        ) if bars is not None else None
+        if body['indicators'] is None:
+            body['errors']['indicators'] = INVALID_SYMBOL_ERROR
+
+    requested_data = [s for s in DATA_SECTIONS if s in sections]
+    if requested_data:
+        if all(body[s] is None for s in requested_data):
+            return None
+        # Bars came back, so any miss recorded by a single fetch was spurious
+        record_hit(symbol)
+
+    if 'signals' in sections:
+        body['signals'] = request_signals(symbol, timeframe, mode)
+
+    return body
@@ -0,0 +1,211 @@
+"""
+Parameter-sweep versions of the technical indicators.
+
+Each function takes a close (or high/low/close) array and a list of
+parameter values and returns a (params x bars) matrix in one vectorized
+pass, so evaluating RSI for periods 2-50 or SMA for 5-200 costs about the
+same as a single period:
+
+- Rolling means for every window come from one shared cumulative sum:
+  mean_w[i] = (csum[i + 1] - csum[i + 1 - w]) / w, i.e. one subtraction
+  of two slices of the same array per window, written straight into its
+  row of the output matrix.
+- Rolling max/min for every window are built up one window length at a
+  time, max_w = maximum(max_{w-1}, x shifted by w - 1), so the whole range
+  1..max(windows) costs max(windows) array passes instead of a pandas
+  rolling() per window.
+
+The formulas match indicators.py (SMA-smoothed RSI filled with 50, sample
+standard deviation for Bollinger Bands, stochastic %K), so row k of a sweep
+equals the fixed-parameter calculation at params[k] up to float rounding.
+Inputs may also be 2-D (tickers x bars), giving (tickers x params x bars).
+"""
+import numpy as np
+
+# Bound on the number of parameter values in one sweep (rows in the matrix)
+MAX_SWEEP_PARAMS = 200
+
+
+def parse_periods(value, default=None):
+    """
+    Parse a periods query param: '2-50' (inclusive range), '2-50:2' (range
+    with a step) or '5,10,20'. Returns a sorted list of unique positive ints.
+    Raises ValueError on malformed input.
+    """
+    if not value:
+        return list(default or [])
+    periods = set()
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        step = 1
+        if ':' in part:
+            part, step = part.split(':', 1)
+            step = int(step)
+        if '-' in part:
+            start, end = (int(p) for p in part.split('-', 1))
+            span = range(start, end + 1, max(step, 1))
+            # Check the size before expanding, so a huge range is rejected up front
+            if len(span) > MAX_SWEEP_PARAMS:
+                raise ValueError(f'Too many periods (max {MAX_SWEEP_PARAMS})')
+            periods.update(span)
+        else:
+            periods.add(int(part))
+    periods = sorted(periods)
+    if not periods or periods[0] < 1:
+        raise ValueError('Periods must be positive integers')
+    if len(periods) > MAX_SWEEP_PARAMS:
+        raise ValueError(f'Too many periods (max {MAX_SWEEP_PARAMS})')
+    return periods
+
+
+def _as_windows(windows):
+    windows = np.asarray(windows, dtype=np.int64).ravel()
+    if windows.size == 0 or windows.min() < 1:
+        raise ValueError('Windows must be positive integers')
+    return windows
+
+
+def rolling_mean_matrix(values, windows):
+    """
+    Rolling means of `values` (..., bars) for every window in `windows`.
+    Returns (..., len(windows), bars), NaN where the window is not yet full
+    or contains a NaN (as pandas rolling().mean()).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    windows = _as_windows(windows)
+    n = values.shape[-1]
+    out = np.full(values.shape[:-1] + (len(windows), n), np.nan)
+    if n == 0:
+        return out
+
+    missing = np.isnan(values)
+    has_missing = missing.any()
+    # Centre before summing so long series don't lose precision in the cumsum
+    offset = np.nan_to_num(np.nanmean(values, axis=-1, keepdims=True) if has_missing else values[..., :1])
+    zeros = np.zeros(values.shape[:-1] + (1,))
+    csum = np.concatenate((zeros, np.cumsum(np.where(missing, 0.0, values - offset), axis=-1)), axis=-1)
+    if has_missing:
+        nan_count = np.concatenate((zeros, np.cumsum(missing, axis=-1)), axis=-1)
+
+    # Every window is a difference of two slices of the same cumsum
+    for k, w in enumerate(windows):
+        if w > n:
+            continue
+        row = out[..., k, w - 1:]
+        np.subtract(csum[..., w:], csum[..., :n - w + 1], out=row)
+        row /= w
+        row += offset
+        if has_missing:
+            row[(nan_count[..., w:] - nan_count[..., :n - w + 1]) > 0] = np.nan
+    return out
+
+
+def _rolling_extreme_matrix(values, windows, func, fill):
+    """
+    Rolling max/min (func=np.maximum/np.minimum) for every window, (..., windows, bars).
+    Rows for windows longer than the series stay NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    windows = _as_windows(windows)
+    n = values.shape[-1]
+    out = np.full(values.shape[:-1] + (len(windows), n), np.nan)
+
+    order = np.argsort(windows, kind='stable')
+    running = values.copy()
+    shifted = np.empty_like(values)
+    w = 1
+    for k in order:
+        target = windows[k]
+        if target > n:
+            # This and every later (longer) window never fills
+            break
+        # Extend the running extreme from window w to the target window
+        while w < target:
+            shifted[..., :w] = fill
+            shifted[..., w:] = values[..., :n - w]
+            running = func(running, shifted)
+            w += 1
+        out[..., k, target - 1:] = running[..., target - 1:]
+    return out
+
+
+def rolling_max_matrix(values, windows):
+    return _rolling_extreme_matrix(values, windows, np.maximum, -np.inf)
+
+
+def rolling_min_matrix(values, windows):
+    return _rolling_extreme_matrix(values, windows, np.minimum, np.inf)
+
+
+def rolling_std_matrix(values, windows):
+    """Rolling sample standard deviation (ddof=1, as pandas) for every window."""
+    values = np.asarray(values, dtype=np.float64)
+    windows = _as_windows(windows)
+    centred = values - values[..., :1] if values.shape[-1] else values
+    mean = rolling_mean_matrix(centred, windows)
+    mean_sq = rolling_mean_matrix(centred ** 2, windows)
+    w = windows[:, None].astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (mean_sq - mean ** 2) * w / (w - 1)
+    return np.sqrt(np.clip(variance, 0, None))
+
+
+def sma_sweep(close, periods):
+    """Simple moving average for every period: (..., periods, bars)."""
+    return rolling_mean_matrix(close, periods)
+
+
+def rsi_sweep(close, periods):
+    """
+    RSI for every period, using the same SMA-smoothed gains/losses as
+    indicators.calculate_rsi (undefined values filled with 50).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    delta = np.diff(close, axis=-1, prepend=np.nan)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+
+    avg_gain = rolling_mean_matrix(gains, periods)
+    avg_loss = rolling_mean_matrix(losses, periods)
+    # 100 - 100 / (1 + gain / loss) == 100 * gain / (gain + loss), computed in place
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total = avg_gain + avg_loss
+        np.divide(avg_gain, total, out=avg_gain)
+        avg_gain *= 100
+    avg_gain[np.isnan(avg_gain)] = 50.0
+    return avg_gain
+
+
+def bollinger_sweep(close, periods, std_dev=2):
+    """
+    Bollinger Bands for every period. Returns a dict of (..., periods, bars)
+    matrices: 'upper', 'middle', 'lower', 'percentB' and 'width' (band width
+    as a percentage of the middle band).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    middle = rolling_mean_matrix(close, periods)
+    std = rolling_std_matrix(close, periods)
+    upper = middle + std * std_dev
+    lower = middle - std * std_dev
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percent_b = (close[..., None, :] - lower) / (upper - lower) * 100
+        width = (upper - lower) / middle * 100
+    return {
+        'upper': upper,
+        'middle': middle,
+        'lower': lower,
+        'percentB': percent_b,
+        'width': width,
+    }
+
+
+def stochastic_sweep(high, low, close, periods):
+    """Stochastic %K for every lookback period (undefined values filled with 50)."""
+    close = np.asarray(close, dtype=np.float64)
+    highest = rolling_max_matrix(high, periods)
+    lowest = rolling_min_matrix(low, periods)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        k = 100 * (close[..., None, :] - lowest) / (highest - lowest)
+    return np.where(np.isnan(k), 50.0, k)
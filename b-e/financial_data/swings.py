@@ -0,0 +1,89 @@
+"""
+Swing-point (peak/trough) detection for many lookbacks at once.
+
+A bar is a swing high for lookback lb when its high is strictly above the
+highs of the lb bars on each side, and a swing low when its low is strictly
+below the lows of the lb bars on each side. The first and last lb bars never
+qualify (their window is incomplete).
+
+For every bar, the bars on each side are viewed with
+numpy.lib.stride_tricks.sliding_window_view over a padded copy (no data is
+copied), and a cumulative max/min along the window gives the extreme of the
+nearest 1, 2, ..., max(lookbacks) bars in a single pass. Every lookback is
+then just a column of that result, so detecting lookbacks 1-20 costs about
+the same as one lookback with a rolling() call per side.
+
+Inputs may be 1-D (bars) or 2-D (tickers x bars); outputs add a lookback
+axis before the bar axis: (..., lookbacks, bars).
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _as_lookbacks(lookbacks):
+    lookbacks = np.asarray(lookbacks, dtype=np.int64).ravel()
+    if lookbacks.size == 0 or lookbacks.min() < 1:
+        raise ValueError('Lookbacks must be positive integers')
+    return lookbacks
+
+
+def _side_extremes(values, lookbacks, func, fill):
+    """
+    Extremes (func=np.maximum/np.minimum) of the lb bars before and after
+    every bar, for each lookback. Returns (left, right), each (..., lookbacks, bars).
+    """
+    n = values.shape[-1]
+    m = int(lookbacks.max())
+    pad = np.full(values.shape[:-1] + (m,), fill)
+    windows = sliding_window_view(np.concatenate((pad, values, pad), axis=-1), m, axis=-1)
+
+    # Window j covers values[j - m:j]: bar i's left side is window i (read
+    # backwards from the nearest bar), its right side is window i + m + 1
+    left = func.accumulate(windows[..., :n, ::-1], axis=-1)[..., lookbacks - 1]
+    right = func.accumulate(windows[..., m + 1:m + 1 + n, :], axis=-1)[..., lookbacks - 1]
+    return np.moveaxis(left, -1, -2), np.moveaxis(right, -1, -2)
+
+
+def _valid_bars(n, lookbacks):
+    """(lookbacks, bars) mask of bars with a full window on both sides."""
+    bars = np.arange(n)
+    return (bars >= lookbacks[:, None]) & (bars < n - lookbacks[:, None])
+
+
+def swing_highs(highs, lookbacks):
+    """Swing-high mask for every lookback: (..., lookbacks, bars)."""
+    highs = np.asarray(highs, dtype=np.float64)
+    lookbacks = _as_lookbacks(lookbacks)
+    left, right = _side_extremes(highs, lookbacks, np.maximum, -np.inf)
+    current = highs[..., None, :]
+    return (current > left) & (current > right) & _valid_bars(highs.shape[-1], lookbacks)
+
+
+def swing_lows(lows, lookbacks):
+    """Swing-low mask for every lookback: (..., lookbacks, bars)."""
+    lows = np.asarray(lows, dtype=np.float64)
+    lookbacks = _as_lookbacks(lookbacks)
+    left, right = _side_extremes(lows, lookbacks, np.minimum, np.inf)
+    current = lows[..., None, :]
+    return (current < left) & (current < right) & _valid_bars(lows.shape[-1], lookbacks)
+
+
+def swing_points(highs, lows, lookbacks=(1, 2, 3, 4)):
+    """(swing-high mask, swing-low mask), each (..., lookbacks, bars)."""
+    return swing_highs(highs, lookbacks), swing_lows(lows, lookbacks)
+
+
+def last_swing_levels(values, mask):
+    """
+    Price and bar index of the most recent swing in `mask` (..., lookbacks,
+    bars), read from `values` (..., bars). Returns (levels, indexes) shaped
+    (..., lookbacks); levels are NaN and indexes -1 where there is no swing.
+    Gives the nearest resistance (from swing highs) or support (from swing
+    lows) per ticker and lookback.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = mask.shape[-1]
+    indexes = np.where(mask, np.arange(n), -1).max(axis=-1)
+    values = np.broadcast_to(values[..., None, :], mask.shape)
+    levels = np.take_along_axis(values, np.maximum(indexes, 0)[..., None], axis=-1)[..., 0]
+    return np.where(indexes >= 0, levels, np.nan), indexes
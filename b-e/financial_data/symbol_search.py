@@ -0,0 +1,448 @@
+"""
+In-memory symbol search.
+
+search_stocks used to call yf.Ticker(query).info on every keystroke (plus
+up to two more lookups for -USD variants) and scan a hard-coded dict. The
+SymbolIndex is instead built once per process from:
+
+1. a listing file (settings.SYMBOL_LISTING_FILE, or data/symbol_listing.csv:
+   symbol,name,quote_type,exchange). The bundled file is a small sample;
+   `manage.py update_symbol_listing` writes the full exchange listing from
+   the NASDAQ Trader symbol directory, and
+2. the reference data store (reference_data.reference_map()), whose rows
+   take precedence.
+
+It holds a prefix trie over symbols, where each node keeps the ids of the
+symbols below it in rank order, and a trigram index over names and
+symbols for substring matches. A query is a trie walk plus an
+intersection of a few posting sets, well under a millisecond for tens of
+thousands of symbols. The index is rebuilt when the reference data has
+been reloaded (at most every REFERENCE_RELOAD_SECONDS), and symbols found
+by a network lookup are added to it.
+
+Type-ahead sends every prefix of what the user types, so search_symbols
+keeps the full match list of recent queries in an LRU with a TTL. A query
+extending a cached prefix only re-checks that prefix's matches, and single
+characters and the most requested queries are cached whenever the index
+is rebuilt.
+"""
+import bisect
+import csv
+import heapq
+import io
+import logging
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from urllib.request import urlopen
+
+from .invalid_symbols import is_invalid
+
+logger = logging.getLogger(__name__)
+
+SYMBOL_LISTING_FILE = Path(__file__).resolve().parent / 'data' / 'symbol_listing.csv'
+
+# A listing with fewer rows than this is a sample, not an exchange listing
+LISTING_MIN_SYMBOLS = 1000
+
+# NASDAQ Trader symbol directory (every NASDAQ, NYSE, NYSE American, NYSE Arca and Cboe listing)
+NASDAQ_LISTED_URL = 'https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt'
+OTHER_LISTED_URL = 'https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt'
+
+# otherlisted.txt exchange codes -> Yahoo exchange codes
+OTHER_LISTED_EXCHANGES = {'A': 'ASE', 'N': 'NYQ', 'P': 'PCX', 'Z': 'BTS', 'V': 'IEX'}
+
+SEARCH_RESULT_LIMIT = 15
+
+NGRAM_SIZE = 3
+
+# Queries that could be a ticker (letters, digits and . - ^ =)
+SYMBOL_PATTERN = re.compile(r'^[A-Z0-9^][A-Z0-9.\-=^]{0,11}$')
+
+# Match rank: symbol prefix (an exact symbol is the shortest), name word prefix, substring
+RANK_SYMBOL_PREFIX, RANK_NAME_PREFIX, RANK_CONTAINS = range(3)
+
+_index = None
+_index_source = None
+_index_lock = threading.Lock()
+_small_listings_warned = set()
+
+
+def _normalize(text):
+    return re.sub(r'\s+', ' ', text.upper()).strip()
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class SymbolIndex:
+    """Prefix trie over symbols and trigram index over names and symbols."""
+
+    def __init__(self, entries=()):
+        self.entries = []  # {'symbol', 'name', 'type', 'exchange'}
+        self.names = []  # normalized names, by entry id
+        self.ids = {}  # symbol -> entry id
+        self.trie = {}  # char -> child node; '' -> ids below the node
+        self.grams = {}  # trigram -> set of entry ids
+        self.words = {}  # name word prefix (< NGRAM_SIZE chars) -> set of entry ids
+        for entry in entries:
+            self.add(entry, ordered=False)
+        self._sort_trie(self.trie)
+
+    def _sort_trie(self, node):
+        for char, child in node.items():
+            if char:
+                child[''].sort(key=self._symbol_order)
+                self._sort_trie(child)
+
+    def add(self, entry, ordered=True):
+        """
+        Add or replace a {'symbol', 'name', 'type', 'exchange'} entry. With
+        ordered=False trie nodes are left unsorted (bulk building).
+        """
+        symbol = entry['symbol'].upper()
+        entry = {**entry, 'symbol': symbol, 'name': entry.get('name') or symbol}
+        if symbol in self.ids:
+            entry_id = self.ids[symbol]
+            old_name = self.names[entry_id]
+            for gram in _ngrams(old_name):
+                self.grams.get(gram, set()).discard(entry_id)
+            for word in old_name.split():
+                for length in range(1, NGRAM_SIZE):
+                    self.words.get(word[:length], set()).discard(entry_id)
+            self.entries[entry_id] = entry
+            self.names[entry_id] = _normalize(entry['name'])
+        else:
+            entry_id = self.ids[symbol] = len(self.entries)
+            self.entries.append(entry)
+            self.names.append(_normalize(entry['name']))
+            node = self.trie
+            for char in symbol:
+                node = node.setdefault(char, {})
+                ids = node.setdefault('', [])
+                if ordered:
+                    bisect.insort(ids, entry_id, key=self._symbol_order)
+                else:
+                    ids.append(entry_id)
+
+        name = self.names[entry_id]
+        for gram in _ngrams(name) | _ngrams(symbol):
+            self.grams.setdefault(gram, set()).add(entry_id)
+        for word in name.split():
+            for length in range(1, NGRAM_SIZE):
+                self.words.setdefault(word[:length], set()).add(entry_id)
+
+    def _symbol_order(self, entry_id):
+        symbol = self.entries[entry_id]['symbol']
+        return len(symbol), symbol
+
+    def get(self, symbol):
+        entry_id = self.ids.get(symbol.upper())
+        return self.entries[entry_id] if entry_id is not None else None
+
+    def _prefixed(self, query):
+        node = self.trie
+        for char in query:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node.get('', [])
+
+    def _containing(self, query):
+        if len(query) < NGRAM_SIZE:
+            return self.words.get(query, set())
+        postings = sorted((self.grams.get(gram, set()) for gram in _ngrams(query)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        candidates = postings[0].intersection(*postings[1:])
+        return {entry_id for entry_id in candidates
+                if query in self.entries[entry_id]['symbol'] or query in self.names[entry_id]}
+
+    def _rank(self, entry_id, query):
+        """Rank of an entry for `query`, or None if it doesn't match."""
+        if self.entries[entry_id]['symbol'].startswith(query):
+            return RANK_SYMBOL_PREFIX
+        name = self.names[entry_id]
+        if any(word.startswith(query) for word in name.split()):
+            return RANK_NAME_PREFIX
+        if len(query) >= NGRAM_SIZE and (query in self.entries[entry_id]['symbol'] or query in name):
+            return RANK_CONTAINS
+        return None
+
+    def matches(self, query, within=None):
+        """
+        Ids of every entry matching normalized `query`, best first. With
+        `within` (the matches of a query `query` extends) only those ids are
+        checked instead of the indexes.
+        """
+        candidates = within if within is not None else set(self._prefixed(query)) | self._containing(query)
+        ranked = []
+        for entry_id in candidates:
+            rank = self._rank(entry_id, query)
+            if rank is not None:
+                ranked.append((rank,) + self._symbol_order(entry_id) + (entry_id,))
+        ranked.sort()
+        return [item[-1] for item in ranked]
+
+    def results(self, ids):
+        return [dict(self.entries[entry_id]) for entry_id in ids]
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """Ranked entries matching `query` by symbol prefix, name word prefix or substring."""
+        query = _normalize(query)
+        if not query:
+            return []
+        # Trie nodes are in (length, symbol) order, so an exact match comes first
+        best = self._prefixed(query)[:limit]
+        if len(best) < limit:
+            seen = set(best)
+            ranked = []
+            for entry_id in self._containing(query):
+                if entry_id in seen:
+                    continue
+                ranked.append((self._rank(entry_id, query),) + self._symbol_order(entry_id) + (entry_id,))
+            best += [item[-1] for item in heapq.nsmallest(limit - len(best), ranked)]
+        return self.results(best)
+
+
+def listing_entries(path=None):
+    """Entries from a listing CSV (symbol,name,quote_type,exchange); [] if it can't be read."""
+    from django.conf import settings
+
+    from .reference_data import QUOTE_TYPE_LABELS
+
+    path = path or getattr(settings, 'SYMBOL_LISTING_FILE', None) or SYMBOL_LISTING_FILE
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            entries = [
+                {
+                    'symbol': row['symbol'].strip().upper(),
+                    'name': (row.get('name') or '').strip(),
+                    'type': QUOTE_TYPE_LABELS.get((row.get('quote_type') or '').strip(), 'Stock'),
+                    'exchange': (row.get('exchange') or '').strip(),
+                }
+                for row in csv.DictReader(f) if (row.get('symbol') or '').strip()
+            ]
+    except OSError as e:
+        logger.warning("Could not read symbol listing %s: %s", path, e)
+        return []
+    if len(entries) < LISTING_MIN_SYMBOLS and str(path) not in _small_listings_warned:
+        # The bundled file is a sample; anything else leaves most tickers to network lookups
+        _small_listings_warned.add(str(path))
+        logger.warning("Symbol listing %s has only %d symbols - run `python manage.py update_symbol_listing`",
+                       path, len(entries))
+    return entries
+
+
+def parse_symbol_directory(text, symbol_field, exchange_of):
+    """
+    Listing rows (symbol,name,quote_type,exchange) from a NASDAQ Trader
+    symbol directory file. Test issues are skipped and share classes use
+    Yahoo's dash form (BRK.B -> BRK-B); `exchange_of` maps a row to its
+    exchange code.
+    """
+    rows = []
+    for row in csv.DictReader(io.StringIO(text), delimiter='|'):
+        symbol = (row.get(symbol_field) or '').strip()
+        # The last line is "File Creation Time: ..."
+        if not symbol or row.get('Test Issue') != 'N' or symbol.startswith('File Creation Time'):
+            continue
+        rows.append({
+            'symbol': symbol.replace('.', '-').upper(),
+            'name': (row.get('Security Name') or '').strip(),
+            'quote_type': 'ETF' if row.get('ETF') == 'Y' else 'EQUITY',
+            'exchange': exchange_of(row),
+        })
+    return rows
+
+
+def exchange_listing(timeout=30):
+    """Every exchange-listed US stock and ETF from the NASDAQ Trader symbol directory."""
+    def download(url):
+        with urlopen(url, timeout=timeout) as response:
+            return response.read().decode('utf-8', errors='replace')
+
+    rows = parse_symbol_directory(download(NASDAQ_LISTED_URL), 'Symbol', lambda row: 'NMS')
+    rows += parse_symbol_directory(download(OTHER_LISTED_URL), 'ACT Symbol',
+                                   lambda row: OTHER_LISTED_EXCHANGES.get(row.get('Exchange'), ''))
+    return rows
+
+
+def write_listing(rows, path):
+    """Write listing rows (symbol,name,quote_type,exchange), one per symbol, sorted by symbol."""
+    unique = {row['symbol']: row for row in rows}
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['symbol', 'name', 'quote_type', 'exchange'])
+        writer.writeheader()
+        writer.writerows(unique[symbol] for symbol in sorted(unique))
+    return len(unique)
+
+
+def reference_entry(symbol, reference):
+    """Index entry for a reference_map() row or reference_data.parse_info() result."""
+    from .reference_data import QUOTE_TYPE_LABELS
+
+    return {
+        'symbol': symbol,
+        'name': reference.get('name') or symbol,
+        'type': QUOTE_TYPE_LABELS.get(reference.get('quote_type'), 'Stock'),
+        'exchange': reference.get('exchange') or '',
+    }
+
+
+def build_index(references):
+    index = SymbolIndex(listing_entries())
+    for symbol, reference in references.items():
+        index.add(reference_entry(symbol, reference))
+    return index
+
+
+def symbol_index():
+    """This process's SymbolIndex, rebuilt when the reference data was reloaded."""
+    global _index, _index_source
+    from .reference_data import reference_map
+
+    references = reference_map()
+    with _index_lock:
+        if _index is None or _index_source is not references:
+            _index = build_index(references)
+            _index_source = references
+            _search_cache.clear()
+            _precompute(_index)
+        return _index
+
+
+# // ----------------------------------
+# // Query cache
+# // ----------------------------------
+
+# Normalized query -> (cached_at, ids, complete), least recently used first
+SEARCH_CACHE_SIZE = 2048
+SEARCH_CACHE_SECONDS = 600
+
+# Matches kept per cached query; a query with more is stored truncated and
+# is not used to answer longer queries
+SEARCH_CACHE_MAX_MATCHES = 1000
+
+# Queries cached whenever the index is rebuilt: single characters plus the
+# most requested queries so far
+SEARCH_PRECOMPUTE_TOP = 200
+SEARCH_COUNTS_MAX = 10000
+
+_search_cache = OrderedDict()
+_query_counts = Counter()
+
+# Queries a network lookup found nothing for -> looked up at. Symbols
+# Yahoo reports as missing also go to invalid_symbols; this covers empty
+# answers, which can be throttling and so must not block the symbol elsewhere.
+_lookup_misses = OrderedDict()
+
+
+def _store(query, ids):
+    complete = len(ids) <= SEARCH_CACHE_MAX_MATCHES
+    _search_cache[query] = (time.time(), ids[:SEARCH_CACHE_MAX_MATCHES], complete)
+    _search_cache.move_to_end(query)
+    while len(_search_cache) > SEARCH_CACHE_SIZE:
+        _search_cache.popitem(last=False)
+
+
+def _cached(query):
+    entry = _search_cache.get(query)
+    if entry is None:
+        return None
+    if time.time() - entry[0] >= SEARCH_CACHE_SECONDS:
+        del _search_cache[query]
+        return None
+    _search_cache.move_to_end(query)
+    return entry
+
+
+def _reusable_prefix(query):
+    """
+    Matches of the longest cached, complete prefix of `query`, or None.
+    Every match of a query also matches its prefixes, except across the
+    NGRAM_SIZE boundary (shorter queries don't match substrings).
+    """
+    shortest = NGRAM_SIZE if len(query) >= NGRAM_SIZE else 1
+    for length in range(len(query) - 1, shortest - 1, -1):
+        entry = _cached(query[:length])
+        if entry is not None and entry[2]:
+            return entry[1]
+    return None
+
+
+def _matches(index, query):
+    """All match ids for normalized `query`, from the cache, a cached prefix or the index."""
+    entry = _cached(query)
+    if entry is not None:
+        return entry[1]
+    ids = index.matches(query, _reusable_prefix(query))
+    _store(query, ids)
+    return ids
+
+
+def _precompute(index):
+    popular = [query for query, _ in _query_counts.most_common(SEARCH_PRECOMPUTE_TOP)]
+    letters = sorted({entry['symbol'][0] for entry in index.entries})
+    # Shortest first, so longer popular queries reuse their prefixes
+    for query in sorted(dict.fromkeys(letters + popular), key=len):
+        _matches(index, query)
+
+
+def _looked_up_recently(query):
+    looked_up = _lookup_misses.get(query)
+    return looked_up is not None and time.time() - looked_up < SEARCH_CACHE_SECONDS
+
+
+def search_symbols(query, limit=SEARCH_RESULT_LIMIT, exact=False):
+    """
+    Search results for `query`, served from the query cache when possible.
+    A query that looks like a ticker but isn't an indexed symbol is looked
+    up on Yahoo when nothing in the index matches it, or when `exact` (the
+    user submitted it as a symbol) even if it partly matches others (F
+    matches FDX). Type-ahead prefixes of listed names and symbols never
+    reach the network. Known invalid symbols and recent misses are not
+    looked up again. A found symbol is added to the index and ranked first.
+    """
+    index = symbol_index()
+    query = _normalize(query)
+    if not query:
+        return []
+    with _index_lock:
+        _query_counts[query] += 1
+        if len(_query_counts) > SEARCH_COUNTS_MAX:
+            kept = _query_counts.most_common(SEARCH_COUNTS_MAX // 2)
+            _query_counts.clear()
+            _query_counts.update(dict(kept))
+        results = index.results(_matches(index, query)[:limit])
+    if ((exact or not results) and SYMBOL_PATTERN.match(query) and index.get(query) is None
+            and not is_invalid(query) and not _looked_up_recently(query)):
+        from .reference_data import fetch_reference
+
+        reference = fetch_reference(query)
+        if reference:
+            entry = reference_entry(query, reference)
+            with _index_lock:
+                index.add(entry)
+                _search_cache.clear()
+            results = [entry] + results[:limit - 1]
+        else:
+            with _index_lock:
+                _lookup_misses[query] = time.time()
+                _lookup_misses.move_to_end(query)
+                while len(_lookup_misses) > SEARCH_CACHE_SIZE:
+                    _lookup_misses.popitem(last=False)
+    return results
+
+
+def clear_symbol_index():
+    global _index, _index_source
+    with _index_lock:
+        _index = None
+        _index_source = None
+        _search_cache.clear()
+        _query_counts.clear()
+        _lookup_misses.clear()
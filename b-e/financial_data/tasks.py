@@ -0,0 +1,154 @@
+import logging
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------------------------------------------ #
+#  Historical signals                                                 #
+# ------------------------------------------------------------------ #
+
+@shared_task(name='financial_data.compute_historical_signals')
+def compute_historical_signals_task(ticker: str, timeframe: str = 'day', mode: str = 'exact', job_id: str = None):
+    """
+    Compute historical signals for one ticker/timeframe and store them under
+    the job id the endpoint handed out. Queued by signal_store.enqueue().
+    """
+    from financial_data.signal_store import compute_and_store
+
+    result = compute_and_store(ticker, timeframe, mode, job_id)
+    logger.info("Historical signals for %s %s: %s", ticker, timeframe, result.status)
+    return {'job_id': result.job_id, 'status': result.status}
+
+
+@shared_task(name='financial_data.precompute_historical_signals')
+def precompute_historical_signals_task():
+    """
+    Recompute historical signals for watchlisted and universe symbols after
+    the close. Scheduled via CELERY_BEAT_SCHEDULE at 21:30 UTC Mon–Fri.
+    """
+    from financial_data.signal_store import precompute_all
+
+    logger.info("Starting historical signals precompute")
+    succeeded, failed = precompute_all()
+    return {'succeeded': succeeded, 'failed': failed}
+
+
+# ------------------------------------------------------------------ #
+#  Backtest summaries                                                 #
+# ------------------------------------------------------------------ #
+
+@shared_task(name='financial_data.compute_backtest_summary')
+def compute_backtest_summary_task(period: str, source: str, mode: str, cost_bps: int, job_id: str = None):
+    """
+    Backtest the scan universe for one parameter set and store the summary
+    under the job id the endpoint handed out. Queued by backtest_store.jobs.enqueue().
+    """
+    from financial_data.backtest_store import compute_and_store
+
+    result = compute_and_store(period, source, mode, cost_bps, job_id)
+    logger.info("Backtest %s %s %s %sbps: %s", source, period, mode, cost_bps, result.status)
+    return {'job_id': result.job_id, 'status': result.status}
+
+
+@shared_task(name='financial_data.precompute_backtest_summaries')
+def precompute_backtest_summaries_task():
+    """
+    Recompute the default backtest summaries after the close. Scheduled via
+    CELERY_BEAT_SCHEDULE at 22:30 UTC Mon–Fri.
+    """
+    from financial_data.backtest_store import precompute_summaries
+
+    logger.info("Starting backtest summaries precompute")
+    succeeded, failed = precompute_summaries()
+    return {'succeeded': succeeded, 'failed': failed}
+
+
+# ------------------------------------------------------------------ #
+#  Reference data                                                     #
+# ------------------------------------------------------------------ #
+
+@shared_task(name='financial_data.refresh_reference_data')
+def refresh_reference_data_task():
+    """
+    Refresh names, classification and valuation fields for watchlisted,
+    universe and already-stored symbols. Scheduled via CELERY_BEAT_SCHEDULE
+    at 22:00 UTC Mon–Fri.
+    """
+    from financial_data.reference_data import refresh_reference_data
+
+    logger.info("Starting reference data refresh")
+    report = refresh_reference_data()
+    return {'updated': report['updated'], 'failed': len(report['failed'])}
+
+
+@shared_task(name='financial_data.refresh_long_windows')
+def refresh_long_windows_task():
+    """
+    Roll each universe symbol's 52-week / 200-day window forward with the
+    session that just closed. Scheduled via CELERY_BEAT_SCHEDULE at 21:45
+    UTC Mon–Fri, after the 21:05 UTC closing scan update, so the snapshot's
+    daily bar for the session includes the close in both EST and EDT.
+    """
+    from financial_data.long_window import refresh_long_windows
+
+    logger.info("Starting long-window refresh")
+    report = refresh_long_windows()
+    return {'stored': report['stored'], 'seeded': report['seeded'], 'rolled': report['rolled']}
+
+
+# ------------------------------------------------------------------ #
+#  Sharded market scan                                                #
+# ------------------------------------------------------------------ #
+
+@shared_task(name='financial_data.start_market_scan')
+def start_market_scan_task():
+    """
+    Split the scan universe into chunks and queue a scan_market_chunk task
+    for each. Scheduled via CELERY_BEAT_SCHEDULE hourly during the session;
+    update_market_scan keeps the snapshot current in between. Seeds the
+    reference data first on a fresh deploy.
+    """
+    from financial_data.market_scan import start_scan
+    from financial_data.reference_data import seed_reference_data
+
+    seed_reference_data()
+    snapshot = start_scan()
+    return {'version': snapshot.pk, 'chunks': snapshot.chunk_count}
+
+
+@shared_task(bind=True, name='financial_data.scan_market_chunk', max_retries=None)
+def scan_market_chunk_task(self, snapshot_id: int, index: int):
+    """
+    Scan one chunk of a market scan. Rate-limited chunks are retried after
+    the backoff the scan has recorded; run_chunk gives up after
+    SCAN_MAX_ATTEMPTS throttled downloads.
+    """
+    from financial_data.market_scan import ScanRateLimited, run_chunk
+
+    try:
+        status = run_chunk(snapshot_id, index)
+    except ScanRateLimited as e:
+        raise self.retry(countdown=e.retry_after)
+    return {'version': snapshot_id, 'chunk': index, 'status': status}
+
+
+@shared_task(name='financial_data.update_market_scan')
+def update_market_scan_task():
+    """
+    Roll the newest scan snapshot forward with the 5m bars since it was
+    published (scan_update.run_update). Scheduled every minute during the
+    session and once at 21:05 UTC to pick up the EST close; a throttled
+    update is skipped until the next run.
+    """
+    from financial_data.market_scan import ScanRateLimited
+    from financial_data.scan_update import run_update
+
+    try:
+        snapshot = run_update()
+    except ScanRateLimited as e:
+        logger.warning("Market scan update rate limited: %s", e)
+        return {'status': 'rate_limited'}
+    if snapshot is None:
+        return {'status': 'skipped'}
+    return {'version': snapshot.pk, 'kind': snapshot.kind, 'status': snapshot.status}
@@ -275,7 +275,7 @@ class StockDetailTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # ASSERT: Verify the mock was called with correct timeframe
-        mock_fetch.assert_called_once_with('AAPL', 'week')
+        mock_fetch.assert_called_once_with('AAPL', 'week', 'label')
 
         print(f"{custom_console.COLOR_GREEN}✅ FD-204: Test for timeframe parameter passed.{custom_console.RESET_COLOR}")
         print("----------------------------------\n")
@@ -1233,3 +1233,3085 @@ class TechnicalIndicatorsTests(TestCase):
         
         print(f"{custom_console.COLOR_GREEN}✅ FD-712: Test for response caching passed.{custom_console.RESET_COLOR}")
         print("----------------------------------\n")
+
+
+class BatchTechnicalIndicatorsTests(TestCase):
+    """
+    Tests for the batch_technical_indicators API endpoint.
+    Many symbols are fetched with one yf.download and computed in one pass.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        self.batch_url = reverse('batch_technical_indicators')
+        from financial_data import indicators
+        from financial_data.bar_store import bar_store
+        indicators._cache.clear()
+        bar_store.clear()
+        print(f"{custom_console.COLOR_CYAN}--- Starting BatchTechnicalIndicatorsTest ---{custom_console.RESET_COLOR}")
+
+    def _mock_download(self, symbols, periods=250):
+        """Build a group_by='ticker' style multi-symbol download result."""
+        import pandas as pd
+        import numpy as np
+
+        dates = pd.date_range(start='2026-01-01', periods=periods, freq='15min')
+        frames = {}
+        for symbol in symbols:
+            closes = 100 + np.random.randn(periods).cumsum()
+            frames[symbol] = pd.DataFrame({
+                'Open': closes,
+                'High': closes + 1,
+                'Low': closes - 1,
+                'Close': closes,
+                'Volume': np.random.randint(1000000, 5000000, periods)
+            }, index=dates)
+        return pd.concat(frames, axis=1)
+
+    # // ----------------------------------
+    # // Batch Indicators Endpoint Tests
+    # // ----------------------------------
+    # FD-801: Test for missing symbols parameter
+    def test_batch_indicators_missing_symbols(self):
+        """
+        GIVEN no symbols parameter in the request
+        WHEN a GET request is made to the batch indicators endpoint
+        THEN it should return a 400 Bad Request status.
+        """
+        # ACT: Make the GET request without symbols
+        response = self.client.get(self.batch_url)
+
+        # ASSERT: Check the HTTP status code
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.json())
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-801: Test for missing symbols parameter passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-802: Test for one download serving every symbol
+    @patch('financial_data.indicators.yf.download')
+    def test_batch_indicators_single_download(self, mock_download):
+        """
+        GIVEN several symbols
+        WHEN a GET request is made to the batch indicators endpoint
+        THEN all symbols should be fetched with one download and returned together.
+        """
+        # ARRANGE: Mock the batched download
+        mock_download.return_value = self._mock_download(['AAPL', 'MSFT', 'NVDA'])
+
+        # ACT: Make the GET request
+        response = self.client.get(f"{self.batch_url}?symbols=AAPL,MSFT,NVDA&period=1D&interval=15m")
+
+        # ASSERT: One download, one response with every symbol
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_download.call_count, 1)
+        response_json = response.json()
+        self.assertEqual(set(response_json['results']), {'AAPL', 'MSFT', 'NVDA'})
+        self.assertIn('overallSignal', response_json['results']['AAPL'])
+        self.assertIn('timestamps', response_json['results']['AAPL'])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-802: Test for single batched download passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-803: Test for summary mode matching the per-symbol calculation
+    @patch('financial_data.indicators.yf.download')
+    def test_batch_indicators_summary_matches_single(self, mock_download):
+        """
+        GIVEN summary=true
+        WHEN a GET request is made to the batch indicators endpoint
+        THEN current values and overallSignal should match the per-symbol functions.
+        """
+        from financial_data.indicators import build_indicator_payload
+
+        # ARRANGE: Mock the batched download
+        raw = self._mock_download(['AAPL', 'MSFT'])
+        mock_download.return_value = raw
+
+        # ACT: Make the GET request in summary mode
+        response = self.client.get(f"{self.batch_url}?symbols=AAPL,MSFT&summary=true")
+
+        # ASSERT: Summary payload matches the single-symbol calculation
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()['results']
+        for symbol in ['AAPL', 'MSFT']:
+            full = build_indicator_payload(raw[symbol], symbol, 'ALL', '1D', '15m', '5d', '15m')
+            self.assertNotIn('timestamps', results[symbol])
+            self.assertEqual(results[symbol]['rsi']['current'], full['rsi']['current'])
+            self.assertEqual(results[symbol]['macd']['current'], full['macd']['current'])
+            self.assertEqual(results[symbol]['overallSignal'], full['overallSignal'])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-803: Test for summary mode matching single calculation passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class BarStoreTests(TestCase):
+    """
+    Tests for the multi-resolution OHLCV rollup store.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data import indicators
+        from financial_data.bar_store import bar_store
+        indicators._cache.clear()
+        bar_store.clear()
+        print(f"{custom_console.COLOR_CYAN}--- Starting BarStoreTest ---{custom_console.RESET_COLOR}")
+
+    def _session_bars(self, sessions=10):
+        """Build regular-hours 5m bars in US/Eastern for a number of sessions."""
+        import pandas as pd
+        import numpy as np
+
+        index = []
+        for day in pd.bdate_range('2026-01-05', periods=sessions):
+            index += list(pd.date_range(day + pd.Timedelta('9h30min'), day + pd.Timedelta('15h55min'), freq='5min'))
+        index = pd.DatetimeIndex(index).tz_localize('America/New_York')
+        closes = 100 + np.random.randn(len(index)).cumsum()
+        return pd.DataFrame({
+            'Open': closes,
+            'High': closes + 1,
+            'Low': closes - 1,
+            'Close': closes,
+            'Volume': np.random.randint(1000, 5000, len(index)).astype(float)
+        }, index=index)
+
+    # // ----------------------------------
+    # // Bar Store Tests
+    # // ----------------------------------
+    # FD-901: Test for incremental appends matching a full rebuild
+    def test_incremental_append_matches_full_rollup(self):
+        """
+        GIVEN a store seeded with older bars
+        WHEN newer 5m bars are appended in chunks
+        THEN every rollup level should equal one built from all bars at once.
+        """
+        import numpy as np
+        from financial_data.bar_store import SymbolBars, RESOLUTIONS
+
+        # ARRANGE: Split the bars into a seed and appended chunks
+        df = self._session_bars()
+        seed_df = df.iloc[:500]
+        incremental = SymbolBars('TEST')
+        incremental.seed({'5m': seed_df})
+
+        # ACT: Append the rest, re-sending the last (still forming) bar each time
+        for start in range(500, len(df), 40):
+            incremental.append(df.iloc[start - 1:start + 40])
+        full = SymbolBars('TEST')
+        full.seed({'5m': df})
+
+        # ASSERT: Every resolution matches
+        for resolution in RESOLUTIONS:
+            self.assertTrue(incremental.frame(resolution).index.equals(full.frame(resolution).index), resolution)
+            self.assertTrue(np.allclose(incremental.frame(resolution).values, full.frame(resolution).values), resolution)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-901: Test for incremental rollups passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-902: Test for 4h rollups matching OHLC aggregation of hourly bars
+    def test_4h_rollup_aggregates_hourly_bars(self):
+        """
+        GIVEN hourly bars starting at :30
+        WHEN the store rolls them up to 4h
+        THEN each 4h bar should be the OHLCV aggregate of its hourly bars.
+        """
+        from financial_data.bar_store import SymbolBars
+
+        # ARRANGE: Hourly bars the way Yahoo serves them for US equities
+        agg = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+        hourly = self._session_bars(5).resample('1h', offset='30min').agg(agg).dropna()
+
+        # ACT: Seed the store
+        bars = SymbolBars('TEST')
+        bars.seed({'1h': hourly})
+        four_hour = bars.frame('4h')
+
+        # ASSERT: Two 4h bars per session, matching pandas aggregation
+        expected = hourly.resample('4h').agg(agg).dropna()
+        self.assertEqual(len(four_hour), 10)
+        self.assertEqual(list(four_hour['Volume']), list(expected['Volume']))
+        self.assertEqual(list(four_hour['High']), list(expected['High']))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-902: Test for 4h rollups passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-903: Test for every period/interval served from one seed
+    @patch('financial_data.indicators.yf.Ticker')
+    def test_indicators_served_from_store(self, mock_ticker):
+        """
+        GIVEN a symbol that has been seeded into the bar store
+        WHEN indicators are requested for several period/interval combinations
+        THEN no further downloads should be made.
+        """
+        # ARRANGE: Every seed download returns the same 5m bars
+        mock_ticker_instance = MagicMock()
+        mock_ticker_instance.history.return_value = self._session_bars()
+        mock_ticker.return_value = mock_ticker_instance
+
+        # ACT: Request several combinations
+        for period, interval in [('1D', '5m'), ('1W', '15m'), ('1M', '4h'), ('1Y', '1w')]:
+            response = self.client.get(f"/api/market-data/indicators/AAPL/?period={period}&interval={interval}&indicator=RSI")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()['interval'], interval)
+
+        # ASSERT: Only the seed downloads were made
+        from financial_data.bar_store import SEED_SOURCES
+        self.assertEqual(mock_ticker_instance.history.call_count, len(SEED_SOURCES))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-903: Test for indicators served from store passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-904: Test for refreshes filling the gap since the last stored bar
+    @patch('yfinance.Ticker')
+    def test_refresh_fills_idle_gap(self, mock_ticker):
+        """
+        GIVEN a stored symbol whose last bar is several sessions old
+        WHEN it is refreshed, and again once the gap exceeds what Yahoo serves at 5m
+        THEN every level should equal a full rebuild, and the long gap should reseed the symbol.
+        """
+        import numpy as np
+        from financial_data.bar_store import REFRESH_MAX_GAP_MS, RESOLUTIONS, SEED_SOURCES, SymbolBars, bar_store
+
+        # ARRANGE: Two stored sessions; Yahoo answers from `start` (or the whole range for a seed)
+        df = self._session_bars()
+        stored = SymbolBars('TEST')
+        stored.seed({'5m': df.iloc[:2 * 78]})
+        bar_store.put(stored)
+        mock_ticker_instance = MagicMock()
+        mock_ticker_instance.history.side_effect = (
+            lambda start=None, period=None, interval=None: df[df.index >= start] if start is not None else df
+        )
+        mock_ticker.return_value = mock_ticker_instance
+        last_bar = df.index[-1].timestamp()
+
+        # ACT: Refresh eight sessions later
+        with patch('financial_data.bar_store.time.time', return_value=last_bar + 300):
+            refreshed = bar_store.refresh('TEST')
+        full = SymbolBars('TEST')
+        full.seed({'5m': df})
+
+        # ASSERT: No hole in any level
+        for resolution in RESOLUTIONS:
+            self.assertTrue(refreshed.frame(resolution).index.equals(full.frame(resolution).index), resolution)
+            self.assertTrue(np.allclose(refreshed.frame(resolution).values, full.frame(resolution).values), resolution)
+        self.assertEqual(mock_ticker_instance.history.call_args.kwargs['start'], df.index[2 * 78 - 1])
+
+        # ACT: Refresh after a gap longer than Yahoo keeps 5m bars
+        mock_ticker_instance.history.reset_mock()
+        with patch('financial_data.bar_store.time.time', return_value=last_bar + REFRESH_MAX_GAP_MS / 1000 + 60):
+            bar_store.refresh('TEST')
+
+        # ASSERT: Reseeded from every seed source
+        periods = [call.kwargs['period'] for call in mock_ticker_instance.history.call_args_list]
+        self.assertEqual(periods, [yf_period for yf_period, _ in SEED_SOURCES.values()])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-904: Test for refreshes filling idle gaps passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class TimestampEncodingTests(TestCase):
+    """
+    Tests for epoch/delta timestamp encoding and vectorized axis labels.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data import indicators
+        from financial_data.bar_store import bar_store
+        indicators._cache.clear()
+        bar_store.clear()
+        print(f"{custom_console.COLOR_CYAN}--- Starting TimestampEncodingTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Timestamp Encoding Tests
+    # // ----------------------------------
+    # FD-1001: Test for vectorized labels matching per-bar strftime
+    def test_labels_match_strftime_loop(self):
+        """
+        GIVEN intraday bars spanning several sessions
+        WHEN labels are formatted for every period
+        THEN they should equal the per-bar strftime formatting.
+        """
+        import pandas as pd
+        from financial_data.timestamps import format_timestamp_labels
+
+        # ARRANGE: 5m bars across a week, including a DST change
+        index = pd.date_range('2026-03-05 04:00', '2026-03-11 20:00', freq='5min', tz='America/New_York')
+        expected = {
+            '1D': [ts.strftime('%I:%M%p').lstrip('0').lower() for ts in index],
+            '1W': [ts.strftime('%a %I:%M%p').replace(' 0', ' ').lower() for ts in index],
+            '1M': [ts.strftime('%b %d').replace(' 0', ' ') for ts in index],
+            '1Y': [ts.strftime('%b %d').replace(' 0', ' ') for ts in index],
+        }
+
+        # ACT & ASSERT: Vectorized output matches for every period
+        for period, labels in expected.items():
+            self.assertEqual(format_timestamp_labels(index, period), labels, period)
+        self.assertEqual(format_timestamp_labels(index[:0], '1D'), [])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1001: Test for vectorized labels passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1002: Test for epoch and delta timestamps from the indicators endpoint
+    @patch('financial_data.indicators.yf.Ticker')
+    def test_indicators_epoch_and_delta_timestamps(self, mock_ticker):
+        """
+        GIVEN a symbol with intraday bars
+        WHEN indicators are requested with timestamps=epoch and timestamps=delta
+        THEN timestamps should be UTC epoch ms, and delta should decode to the same values.
+        """
+        import pandas as pd
+        import numpy as np
+        from financial_data.timestamps import delta_decode
+
+        # ARRANGE: One session of 5m bars
+        index = pd.date_range('2026-01-05 09:30', '2026-01-05 15:55', freq='5min', tz='America/New_York')
+        closes = 100 + np.random.randn(len(index)).cumsum()
+        mock_ticker_instance = MagicMock()
+        mock_ticker_instance.history.return_value = pd.DataFrame({
+            'Open': closes, 'High': closes + 1, 'Low': closes - 1, 'Close': closes,
+            'Volume': np.full(len(index), 1000.0)
+        }, index=index)
+        mock_ticker.return_value = mock_ticker_instance
+
+        # ACT: Request each mode
+        url = "/api/market-data/indicators/AAPL/?period=1D&interval=5m&indicator=RSI"
+        epoch = self.client.get(url + "&timestamps=epoch").json()
+        delta = self.client.get(url + "&timestamps=delta").json()
+        label = self.client.get(url).json()
+        invalid = self.client.get(url + "&timestamps=iso")
+
+        # ASSERT: Encodings agree with each other and with the bars
+        self.assertEqual(epoch['timestampFormat'], 'epoch_ms')
+        self.assertEqual(epoch['timestamps'][0], int(index[0].timestamp() * 1000))
+        self.assertEqual(delta['timestampFormat'], 'epoch_ms_delta')
+        self.assertEqual(delta['timestamps'][1:], [300000] * (len(index) - 1))
+        self.assertEqual(delta_decode(delta['timestamps']), epoch['timestamps'])
+        self.assertEqual(label['timestampFormat'], 'label')
+        self.assertEqual(label['timestamps'][0], '9:30am')
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1002: Test for epoch timestamps passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class IndicatorBenchmarkTests(TestCase):
+    """
+    Tests for the indicator benchmark suite and its regression check.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        print(f"{custom_console.COLOR_CYAN}--- Starting IndicatorBenchmarkTest ---{custom_console.RESET_COLOR}")
+
+    def _run(self, seconds):
+        """Build a benchmark run with one case at the given timing."""
+        return {
+            'meta': {'profile': 'quick'},
+            'results': {
+                'calculate_rsi[bars=1000]': {
+                    'function': 'calculate_rsi', 'bars': 1000, 'tickers': 1,
+                    'seconds': seconds, 'serialize_seconds': 0.001, 'payload_bytes': 100,
+                }
+            }
+        }
+
+    # // ----------------------------------
+    # // Benchmark Tests
+    # // ----------------------------------
+    # FD-1101: Test for synthetic OHLCV generation
+    def test_generate_ohlcv_is_valid_and_reproducible(self):
+        """
+        GIVEN a bar count and seed
+        WHEN synthetic OHLCV bars are generated
+        THEN they should be well-formed and identical for the same seed.
+        """
+        from financial_data.benchmarks import generate_ohlcv, generate_universe
+
+        # ACT: Generate the same series twice and a small universe
+        df = generate_ohlcv(1000, seed=7)
+        again = generate_ohlcv(1000, seed=7)
+        universe = generate_universe(3, bars=50)
+
+        # ASSERT: Shape, OHLC consistency and determinism
+        self.assertEqual(len(df), 1000)
+        self.assertEqual(list(df.columns), ['Open', 'High', 'Low', 'Close', 'Volume'])
+        self.assertTrue((df['High'] >= df[['Open', 'Close']].max(axis=1)).all())
+        self.assertTrue((df['Low'] <= df[['Open', 'Close']].min(axis=1)).all())
+        self.assertTrue(df.equals(again))
+        self.assertEqual(len(universe), 3)
+        self.assertTrue(all(len(frame) == 50 for frame in universe.values()))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1101: Test for synthetic OHLCV passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1102: Test for the command failing on a regression
+    @patch('financial_data.benchmarks.run_benchmarks')
+    def test_command_fails_on_regression(self, mock_run):
+        """
+        GIVEN a saved baseline
+        WHEN a later run is slower than the threshold allows
+        THEN the command should fail, and pass when within the threshold.
+        """
+        import os
+        import tempfile
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        from io import StringIO
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'baseline.json')
+
+            # ARRANGE: Save a 10ms baseline
+            mock_run.return_value = self._run(0.010)
+            call_command('benchmark_indicators', '--save', '--baseline', path, stdout=StringIO())
+            self.assertTrue(os.path.exists(path))
+
+            # ACT & ASSERT: 11ms is within 25%
+            mock_run.return_value = self._run(0.011)
+            call_command('benchmark_indicators', '--baseline', path, stdout=StringIO())
+
+            # ACT & ASSERT: 20ms fails even after re-running
+            mock_run.return_value = self._run(0.020)
+            with self.assertRaises(CommandError):
+                call_command('benchmark_indicators', '--baseline', path, stdout=StringIO())
+            self.assertEqual(mock_run.call_count, 5)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1102: Test for benchmark regression check passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class IndicatorSweepTests(TestCase):
+    """
+    Tests for parameter-sweep indicators and the sweep endpoint.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data import indicators
+        from financial_data.bar_store import bar_store
+        indicators._cache.clear()
+        bar_store.clear()
+        print(f"{custom_console.COLOR_CYAN}--- Starting IndicatorSweepTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Indicator Sweep Tests
+    # // ----------------------------------
+    # FD-1201: Test for sweep rows matching per-period pandas calculations
+    def test_sweep_rows_match_fixed_period_calculations(self):
+        """
+        GIVEN a price series (with a missing value for the SMA case)
+        WHEN RSI, SMA, Bollinger and stochastic are swept over many periods
+        THEN every row should match the pandas calculation at that period.
+        """
+        import numpy as np
+        from financial_data.benchmarks import generate_ohlcv
+        from financial_data.sweeps import rsi_sweep, sma_sweep, bollinger_sweep, stochastic_sweep
+
+        # ARRANGE: Synthetic bars
+        df = generate_ohlcv(600, seed=11)
+        close, high, low = df['Close'], df['High'], df['Low']
+        gapped = close.copy()
+        gapped.iloc[50] = np.nan
+        periods = [2, 5, 14, 20, 50]
+
+        # ACT: Sweep every indicator
+        sma = sma_sweep(gapped.values, periods)
+        rsi = rsi_sweep(close.values, periods)
+        bands = bollinger_sweep(close.values, periods)
+        k = stochastic_sweep(high.values, low.values, close.values, periods)
+
+        # ASSERT: Row by row against pandas
+        delta = close.diff()
+        for row, p in enumerate(periods):
+            expected_sma = gapped.rolling(p).mean().values
+            np.testing.assert_allclose(sma[row], expected_sma, atol=1e-9)
+            gain = delta.where(delta > 0, 0).rolling(p).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(p).mean()
+            np.testing.assert_allclose(rsi[row], (100 - 100 / (1 + gain / loss)).fillna(50).values, atol=1e-8)
+            upper = close.rolling(p).mean() + 2 * close.rolling(p).std()
+            np.testing.assert_allclose(bands['upper'][row], upper.values, atol=1e-4)
+            lowest, highest = low.rolling(p).min(), high.rolling(p).max()
+            np.testing.assert_allclose(k[row], (100 * (close - lowest) / (highest - lowest)).fillna(50).values)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1201: Test for sweep rows passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1202: Test for the sweep endpoint
+    @patch('financial_data.indicators.yf.Ticker')
+    def test_sweep_endpoint_returns_matrix(self, mock_ticker):
+        """
+        GIVEN a symbol with bars in the store
+        WHEN an RSI sweep over 2-30 is requested
+        THEN the response should hold one row per period, matching the fixed RSI 14.
+        """
+        from financial_data.benchmarks import generate_ohlcv
+        from financial_data.indicators import calculate_rsi
+
+        # ARRANGE: Every seed download returns the same bars
+        df = generate_ohlcv(400, seed=5, start='2026-01-05 09:30')
+        mock_ticker_instance = MagicMock()
+        mock_ticker_instance.history.return_value = df
+        mock_ticker.return_value = mock_ticker_instance
+
+        # ACT: Request a sweep and an invalid one
+        response = self.client.get("/api/market-data/indicators-sweep/AAPL/?indicator=RSI&periods=2-30&period=1W&interval=5m")
+        invalid = self.client.get("/api/market-data/indicators-sweep/AAPL/?indicator=RSI&periods=abc")
+
+        # ASSERT: One row per period, each the full length of the bars
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['periods'], list(range(2, 31)))
+        self.assertEqual(len(data['values']['rsi']), 29)
+        self.assertTrue(all(len(row) == data['dataPoints'] for row in data['values']['rsi']))
+        from financial_data.bar_store import bar_store
+        rsi_14 = calculate_rsi(bar_store.get_frame('AAPL', '5d', '5m'))['current']
+        self.assertAlmostEqual(data['current']['rsi'][data['periods'].index(14)], rsi_14, places=2)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1202: Test for sweep endpoint passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1203: Test for sweeps over fewer bars than the longest period
+    @patch('financial_data.indicators.yf.Ticker')
+    def test_sweep_short_series_and_huge_ranges(self, mock_ticker):
+        """
+        GIVEN fewer bars than the longest period, and a periods range of tens of millions
+        WHEN stochastic is swept over it and the range is parsed
+        THEN rows for periods longer than the series should match pandas (unfilled), the default STOCH
+        sweep endpoint should answer, and the range should be rejected without being expanded.
+        """
+        import time as time_module
+        import numpy as np
+        from financial_data.benchmarks import generate_ohlcv
+        from financial_data.sweeps import parse_periods, rolling_max_matrix, stochastic_sweep
+
+        # ARRANGE: 12 bars, for the store and the direct sweep
+        df = generate_ohlcv(12, seed=3, start='2026-01-05 09:30')
+        close, high, low = df['Close'], df['High'], df['Low']
+        mock_ticker_instance = MagicMock()
+        mock_ticker_instance.history.return_value = df
+        mock_ticker.return_value = mock_ticker_instance
+        periods = [5, 12, 13, 30]
+
+        # ACT: Sweep directly and through the endpoint with the default 5-30 periods
+        k = stochastic_sweep(high.values, low.values, close.values, periods)
+        highest = rolling_max_matrix(high.values, periods)
+        response = self.client.get("/api/market-data/indicators-sweep/AAPL/?indicator=STOCH&period=1D&interval=5m")
+
+        # ASSERT: Rows match pandas, windows past the series are NaN
+        for row, p in enumerate(periods):
+            lowest, top = low.rolling(p).min(), high.rolling(p).max()
+            np.testing.assert_allclose(k[row], (100 * (close - lowest) / (top - lowest)).fillna(50).values)
+        self.assertTrue(np.isnan(highest[2:]).all())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['periods'], list(range(5, 31)))
+
+        # ACT & ASSERT: Oversized ranges fail fast
+        started = time_module.perf_counter()
+        with self.assertRaises(ValueError):
+            parse_periods('1-50000000')
+        with self.assertRaises(ValueError):
+            parse_periods('1-150,151-300')
+        self.assertLess(time_module.perf_counter() - started, 0.1)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1203: Test for short series sweeps passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class HistoricalSignalVoteTests(TestCase):
+    """
+    Tests for exact expected-vote historical signals.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        print(f"{custom_console.COLOR_CYAN}--- Starting HistoricalSignalVoteTest ---{custom_console.RESET_COLOR}")
+
+    def _daily_bars(self, seed=1, bars=130):
+        """Build trending daily bars with clear swing points."""
+        import numpy as np
+        from financial_data.benchmarks import generate_ohlcv
+
+        df = generate_ohlcv(bars, seed=seed, freq='D', start='2026-01-02')
+        df['Close'] = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.02, bars)))
+        df['High'] = df['Close'] * 1.01
+        df['Low'] = df['Close'] * 0.99
+        return df
+
+    # // ----------------------------------
+    # // Historical Signal Vote Tests
+    # // ----------------------------------
+    # FD-1301: Test for exact votes matching Monte Carlo sampling
+    @patch('yfinance.Ticker')
+    def test_exact_mode_matches_monte_carlo(self, mock_ticker):
+        """
+        GIVEN daily bars for a ticker
+        WHEN signals are computed in exact mode and with Monte Carlo sampling
+        THEN both should produce the same signals with near-identical confidence.
+        """
+        # ARRANGE: Mock the price history
+        mock_ticker_instance = MagicMock()
+        mock_ticker_instance.history.return_value = self._daily_bars()
+        mock_ticker.return_value = mock_ticker_instance
+
+        # ACT: Compute both ways
+        from financial_data.services import get_historical_signals
+        exact = get_historical_signals('TEST', mode='exact')
+        sampled = get_historical_signals('TEST', mode='monte_carlo', iterations=5_000_000)
+
+        # ASSERT: Same signals, confidence within sampling noise
+        self.assertIsNone(exact['error'])
+        self.assertGreater(len(exact['signals']), 0)
+        self.assertEqual(
+            [(s['timestamp'], s['signal']) for s in exact['signals']],
+            [(s['timestamp'], s['signal']) for s in sampled['signals']]
+        )
+        for e, m in zip(exact['signals'], sampled['signals']):
+            self.assertAlmostEqual(e['confidence'], m['confidence'], delta=1.0)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1301: Test for exact signal votes passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1302: Test for the mode query param
+    @patch('financial_data.tasks.compute_historical_signals_task.apply_async', side_effect=ConnectionError('no broker'))
+    @patch('financial_data.services.get_historical_signals')
+    def test_historical_signals_mode_param(self, mock_signals, mock_apply_async):
+        """
+        GIVEN the historical signals endpoint
+        WHEN called with and without a mode
+        THEN exact should be the default, and Monte Carlo (batch only), unknown modes and
+        timeframes rejected before any job is queued, here and on the stock bundle.
+        """
+        from financial_data.signal_store import enqueue
+
+        # ARRANGE: Mock the signal calculation
+        mock_signals.return_value = {'signals': [], 'error': None}
+
+        # ACT: Default, explicit, sampled and invalid modes, and an invalid timeframe
+        default = self.client.get("/api/market-data/historical-signals/?symbol=AAPL")
+        explicit = self.client.get("/api/market-data/historical-signals/?symbol=AAPL&mode=exact")
+        sampled = self.client.get("/api/market-data/historical-signals/?symbol=AAPL&mode=monte_carlo")
+        bundle_sampled = self.client.get("/api/market-data/stock-bundle/?symbol=AAPL&sections=signals&mode=monte_carlo")
+        invalid = self.client.get("/api/market-data/historical-signals/?symbol=AAPL&mode=random")
+        bad_timeframe = self.client.get("/api/market-data/historical-signals/?symbol=AAPL&timeframe=hour")
+
+        # ASSERT: Only exact jobs run; invalid params never reach the job queue
+        self.assertEqual(default.status_code, status.HTTP_200_OK)
+        self.assertEqual(explicit.status_code, status.HTTP_200_OK)
+        self.assertEqual(sampled.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(bundle_sampled.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(bad_timeframe.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(bad_timeframe.json()['error'], 'Invalid timeframe: hour')
+        with self.assertRaises(ValueError):
+            enqueue('AAPL', 'hour')
+        self.assertEqual(mock_apply_async.call_count, 1)
+        self.assertEqual([call.kwargs['mode'] for call in mock_signals.call_args_list], ['exact'])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1302: Test for signal mode param passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class HistoricalSignalStoreTests(TestCase):
+    """
+    Tests for the historical signals job queue and result store.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        self.signals_url = reverse('historical_signals')
+        self.result = {
+            'signals': [{'timestamp': 1767571200000, 'price': 100.0, 'signal': 'BUY', 'rsi': 30.0,
+                         'strength': 80, 'confidence': 40.0, 'score': 80}],
+            'error': None,
+            'last_bar_ts': 1767571200000,
+        }
+        print(f"{custom_console.COLOR_CYAN}--- Starting HistoricalSignalStoreTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Historical Signal Store Tests
+    # // ----------------------------------
+    # FD-1401: Test for pending job then stored result
+    @patch('financial_data.tasks.compute_historical_signals_task.apply_async')
+    @patch('financial_data.services.get_historical_signals')
+    def test_pending_then_served_from_store(self, mock_signals, mock_apply_async):
+        """
+        GIVEN no stored signals for a ticker
+        WHEN the endpoint is called, the job runs, and the endpoint is called again
+        THEN the first call should be pending and the second served from the store.
+        """
+        from financial_data.signal_store import compute_and_store
+
+        # ARRANGE: Mock the signal calculation
+        mock_signals.return_value = self.result
+
+        # ACT: First request queues a job
+        first = self.client.get(f"{self.signals_url}?symbol=AAPL&timeframe=day")
+        job_id = first.json()['job_id']
+
+        # ASSERT: Pending, job queued with the same id, nothing computed yet
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(first.json()['status'], 'pending')
+        self.assertEqual(first.json()['signals'], [])
+        self.assertEqual(mock_apply_async.call_args.kwargs['task_id'], job_id)
+        mock_signals.assert_not_called()
+
+        # ACT: A second request while pending reuses the job
+        again = self.client.get(f"{self.signals_url}?symbol=AAPL&timeframe=day")
+        self.assertEqual(again.json()['job_id'], job_id)
+        self.assertEqual(mock_apply_async.call_count, 1)
+
+        # ACT: The worker runs the job
+        compute_and_store('AAPL', 'day', 'exact', job_id)
+        job = self.client.get(f"/api/market-data/historical-signals/jobs/{job_id}/")
+        served = self.client.get(f"{self.signals_url}?symbol=AAPL&timeframe=day")
+
+        # ASSERT: Job complete and later requests come from the store
+        self.assertEqual(job.json()['status'], 'complete')
+        self.assertEqual(served.status_code, status.HTTP_200_OK)
+        self.assertEqual(served.json()['signals'], self.result['signals'])
+        self.assertEqual(served.json()['last_bar_ts'], self.result['last_bar_ts'])
+        self.assertEqual(mock_signals.call_count, 1)
+        self.assertEqual(mock_apply_async.call_count, 1)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1401: Test for signal job queue passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1402: Test for result freshness around the close
+    def test_result_freshness(self):
+        """
+        GIVEN a stored result
+        WHEN checked at various times around the market close
+        THEN it should be fresh until the next close, and only briefly while the market is open.
+        """
+        from datetime import datetime
+        from financial_data.models import HistoricalSignalResult
+        from financial_data.signal_store import is_fresh, EASTERN
+
+        # ARRANGE: A result computed Monday after the close
+        result = HistoricalSignalResult(ticker='AAPL', timeframe='day', status='complete', job_id='x')
+        result.updated_at = EASTERN.localize(datetime(2026, 1, 5, 17, 0))
+
+        # ACT & ASSERT: Fresh overnight, stale once Tuesday's session has been open a while
+        self.assertTrue(is_fresh(result, EASTERN.localize(datetime(2026, 1, 6, 8, 0))))
+        self.assertFalse(is_fresh(result, EASTERN.localize(datetime(2026, 1, 6, 10, 0))))
+        self.assertFalse(is_fresh(result, EASTERN.localize(datetime(2026, 1, 6, 16, 5))))
+
+        # ACT & ASSERT: An intraday result is reused for a few minutes only
+        result.updated_at = EASTERN.localize(datetime(2026, 1, 6, 10, 0))
+        self.assertTrue(is_fresh(result, EASTERN.localize(datetime(2026, 1, 6, 10, 5))))
+        self.assertFalse(is_fresh(result, EASTERN.localize(datetime(2026, 1, 6, 10, 30))))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1402: Test for signal freshness passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1403: Test for the after-close precompute
+    @patch('financial_data.services.get_historical_signals')
+    def test_precompute_stores_one_row_per_bar(self, mock_signals):
+        """
+        GIVEN a list of symbols
+        WHEN the precompute runs twice for the same last bar
+        THEN one result per (ticker, timeframe, last bar) should be stored.
+        """
+        from financial_data.models import HistoricalSignalResult
+        from financial_data.signal_store import precompute_all
+
+        # ARRANGE: Mock the signal calculation
+        mock_signals.return_value = self.result
+
+        # ACT: Precompute twice
+        precompute_all(timeframes=('day', 'week'), symbols=['AAPL', 'MSFT'])
+        succeeded, failed = precompute_all(timeframes=('day', 'week'), symbols=['AAPL', 'MSFT'])
+
+        # ASSERT: Rows are keyed by last bar, not duplicated
+        self.assertEqual((succeeded, failed), (4, 0))
+        self.assertEqual(HistoricalSignalResult.objects.count(), 4)
+        self.assertEqual(
+            set(HistoricalSignalResult.objects.values_list('ticker', 'timeframe')),
+            {('AAPL', 'day'), ('AAPL', 'week'), ('MSFT', 'day'), ('MSFT', 'week')}
+        )
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1403: Test for signal precompute passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class HistoricalSignalWindowTests(TestCase):
+    """
+    Tests for historical signals over a fixed window of bars.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        import numpy as np
+        from financial_data.benchmarks import generate_ohlcv
+
+        df = generate_ohlcv(200, seed=3, freq='D', start='2026-01-02')
+        df['Close'] = 100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.02, 200)))
+        df['High'] = df['Close'] * 1.01
+        df['Low'] = df['Close'] * 0.99
+        self.bars = df
+        print(f"{custom_console.COLOR_CYAN}--- Starting HistoricalSignalWindowTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Historical Signal Window Tests
+    # // ----------------------------------
+    # FD-1501: Test for signals independent of how much history was fetched
+    @patch('financial_data.services.fetch_signal_bars')
+    def test_signals_use_fixed_window(self, mock_fetch):
+        """
+        GIVEN fetches of different lengths ending on the same bar
+        WHEN historical signals are computed and stored by a job
+        THEN each should equal a compute over the last window_bars bars, with one fetch per job.
+        """
+        from financial_data.services import (compute_signal_arrays, get_historical_signals, signals_from_arrays,
+                                             window_bars)
+        from financial_data.signal_store import compute_and_store
+
+        # ARRANGE: The expected signals over the window
+        window = self.bars.iloc[-window_bars('day'):]
+        arrays = compute_signal_arrays(window['High'].values, window['Low'].values, window['Close'].values)
+        expected = signals_from_arrays(window, arrays)
+
+        # ACT: Short and long fetches, then a job
+        outputs = []
+        for start in (0, 50, len(self.bars) - window_bars('day')):
+            mock_fetch.return_value = self.bars.iloc[start:]
+            outputs.append(get_historical_signals('TEST', 'day'))
+        mock_fetch.reset_mock()
+        stored = compute_and_store('TEST', 'day')
+
+        # ASSERT: Same signals whatever was fetched
+        self.assertGreater(len(expected), 0)
+        for output in outputs:
+            self.assertEqual(output['signals'], expected)
+        self.assertEqual(stored.signals, expected)
+        mock_fetch.assert_called_once_with('TEST', 'day')
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1501: Test for fixed signal window passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class SwingPointTests(TestCase):
+    """
+    Tests for vectorized swing-point detection.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data.benchmarks import generate_universe
+
+        frames = generate_universe(5, bars=300)
+        self.highs = [df['High'].to_numpy() for df in frames.values()]
+        self.lows = [df['Low'].to_numpy() for df in frames.values()]
+        print(f"{custom_console.COLOR_CYAN}--- Starting SwingPointTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Swing Point Tests
+    # // ----------------------------------
+    # FD-1601: Test for swing points matching the per-bar loops
+    def test_swing_points_match_loops(self):
+        """
+        GIVEN high/low series for several tickers
+        WHEN swing points are detected for many lookbacks, per ticker and as a 2-D matrix
+        THEN the masks should equal the per-bar loop results for every lookback.
+        """
+        import numpy as np
+        from financial_data.benchmarks import legacy_swing_points
+        from financial_data.swings import swing_points
+
+        # ARRANGE: Lookbacks 1-12 and the stacked universe
+        lookbacks = list(range(1, 13))
+        highs = np.stack(self.highs)
+        lows = np.stack(self.lows)
+
+        # ACT: Detect for every ticker at once
+        peaks, troughs = swing_points(highs, lows, lookbacks)
+
+        # ASSERT: Same masks as the loops, ticker by ticker
+        self.assertEqual(peaks.shape, (5, 12, 300))
+        for t in range(5):
+            expected_peaks, expected_troughs = legacy_swing_points(self.highs[t], self.lows[t], lookbacks)
+            np.testing.assert_array_equal(peaks[t], expected_peaks)
+            np.testing.assert_array_equal(troughs[t], expected_troughs)
+            single_peaks, _ = swing_points(self.highs[t], self.lows[t], lookbacks)
+            np.testing.assert_array_equal(single_peaks, expected_peaks)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1601: Test for swing point detection passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1602: Test for latest support/resistance levels
+    def test_last_swing_levels(self):
+        """
+        GIVEN a series with known swing highs
+        WHEN the latest swing level is read per lookback
+        THEN it should be the price of the most recent swing, or NaN when there is none.
+        """
+        import numpy as np
+        from financial_data.swings import swing_highs, last_swing_levels
+
+        # ARRANGE: Peaks at bars 2 and 6 (lookbacks 1-2) and bar 8 (lookback 1 only)
+        highs = np.array([1, 2, 5, 2, 1, 2, 3, 2.5, 2.8, 1.0])
+
+        # ACT: Latest swing highs for lookbacks 1, 2 and 4
+        levels, indexes = last_swing_levels(highs, swing_highs(highs, [1, 2, 4]))
+
+        # ASSERT: Resistance levels per lookback
+        np.testing.assert_array_equal(indexes, [8, 6, -1])
+        self.assertEqual(levels[0], 2.8)
+        self.assertEqual(levels[1], 3.0)
+        self.assertTrue(np.isnan(levels[2]))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1602: Test for swing levels passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class SignalPostProcessingTests(TestCase):
+    """
+    Tests for the linear-time HOLD/choppiness post-processing of historical signals.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        print(f"{custom_console.COLOR_CYAN}--- Starting SignalPostProcessingTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Signal Post-Processing Tests
+    # // ----------------------------------
+    # FD-1701: Test for precomputed choppiness arrays
+    def test_choppiness_arrays_match_window_scan(self):
+        """
+        GIVEN a price series
+        WHEN choppiness is precomputed for every bar
+        THEN each bar should match a direct scan of its clipped window.
+        """
+        import numpy as np
+        from financial_data.services import choppiness_arrays
+
+        # ARRANGE: A tight, noisy series
+        rng = np.random.default_rng(7)
+        closes = 100 + np.cumsum(rng.normal(0, 0.3, 60))
+        highs = closes + rng.random(60) * 0.2
+        lows = closes - rng.random(60) * 0.2
+
+        # ACT: Precompute for window 6
+        range_pct, change_ratio, choppy = choppiness_arrays(highs, lows, closes, window=6)
+
+        # ASSERT: Every bar, including the clipped edges
+        for i in range(60):
+            start, end = max(0, i - 6), min(60, i + 6)
+            window_range = (highs[start:end].max() - lows[start:end].min()) / lows[start:end].min()
+            moves = np.diff(closes[start:end])
+            reversals = int(np.sum(moves[:-1] * moves[1:] < 0))
+            self.assertAlmostEqual(range_pct[i], window_range)
+            self.assertAlmostEqual(change_ratio[i], reversals / (end - start - 2))
+            self.assertEqual(choppy[i], window_range < 0.04 and reversals / (end - start - 2) > 0.4)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1701: Test for choppiness arrays passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1702: Test for HOLD insertion by bar index
+    def test_hold_inserted_between_distant_signals(self):
+        """
+        GIVEN a BUY and a SELL far apart with a flat range between them
+        WHEN the output is built
+        THEN a HOLD should be added at the midpoint, and not between close signals.
+        """
+        import numpy as np
+        from financial_data.services import signal_output
+
+        # ARRANGE: Flat prices, 40 daily bars
+        closes = 100 + np.tile([0.1, -0.1], 20)
+        highs, lows = closes + 0.05, closes - 0.05
+        timestamps = 1767571200000 + np.arange(40) * 86_400_000
+        rsi = np.full(40, 50.0)
+        consensus = [(2, 'BUY', 40.0, 99.9), (30, 'SELL', 35.0, 101.0), (35, 'BUY', 30.0, 99.9)]
+
+        # ACT: Build the output
+        signals = signal_output(consensus, timestamps, highs, lows, closes, rsi)
+
+        # ASSERT: HOLD at bar 16 only (the last gap is under 12 bars)
+        self.assertEqual([s['signal'] for s in signals], ['BUY', 'HOLD', 'SELL', 'BUY'])
+        self.assertEqual(signals[1]['timestamp'], int(timestamps[16]))
+        self.assertEqual(signals[1]['price'], float(closes[16]))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1702: Test for HOLD insertion passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class BatchHistoricalSignalTests(TestCase):
+    """
+    Tests for universe-wide batch historical signals.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data.benchmarks import generate_universe
+
+        self.frames = generate_universe(6, bars=250)
+        print(f"{custom_console.COLOR_CYAN}--- Starting BatchHistoricalSignalTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Batch Historical Signal Tests
+    # // ----------------------------------
+    # FD-1801: Test for batch signals on the process pool
+    def test_batch_matches_single_symbol_and_stores(self):
+        """
+        GIVEN bars for several symbols
+        WHEN signals are computed in batch on a process pool
+        THEN each symbol should match the single-symbol computation over the signal window and be stored.
+        """
+        from financial_data.models import HistoricalSignalResult
+        from financial_data.services import compute_signal_arrays, signals_from_arrays
+        from financial_data.signal_batch import run_batch
+        from financial_data.services import window_bars
+        from financial_data.signal_store import latest_result
+
+        # ARRANGE: One symbol without bars
+        symbols = list(self.frames) + ['MISSING']
+
+        # ACT: Run the batch with two workers
+        report = run_batch(symbols=symbols, timeframe='day', workers=2, frames=self.frames)
+
+        # ASSERT: Same signals as one symbol at a time over the last window_bars, stored per symbol
+        self.assertEqual(report['succeeded'], 6)
+        self.assertEqual(report['missing'], ['MISSING'])
+        self.assertGreater(report['tickers_per_second'], 0)
+        self.assertEqual(HistoricalSignalResult.objects.filter(status='complete').count(), 6)
+        for symbol, df in self.frames.items():
+            df = df.iloc[-window_bars('day'):]
+            arrays = compute_signal_arrays(df['High'].values, df['Low'].values, df['Close'].values)
+            expected = signals_from_arrays(df, arrays)
+            self.assertEqual(report['outputs'][symbol]['signals'], expected)
+            self.assertEqual(latest_result(symbol, 'day').signals, expected)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1801: Test for batch signals passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1802: Test for the batch management command
+    @patch('financial_data.signal_batch.run_batch')
+    def test_batch_command(self, mock_run_batch):
+        """
+        GIVEN the batch_historical_signals command
+        WHEN run for two timeframes as a dry run
+        THEN each timeframe should be computed without storing and throughput reported.
+        """
+        from io import StringIO
+        from django.core.management import call_command
+
+        # ARRANGE: Mock the batch run
+        mock_run_batch.return_value = {
+            'symbols': 2, 'succeeded': 2, 'workers': 4, 'missing': [], 'load_seconds': 1.0,
+            'compute_seconds': 0.5, 'store_seconds': 0.1, 'tickers_per_second': 3.3,
+        }
+        out = StringIO()
+
+        # ACT: Run the command
+        call_command('batch_historical_signals', '--timeframe', 'day', 'week', '--symbols', 'aapl', 'msft',
+                     '--dry-run', stdout=out)
+
+        # ASSERT: Both timeframes, uppercased symbols, nothing stored
+        self.assertEqual([c.kwargs['timeframe'] for c in mock_run_batch.call_args_list], ['day', 'week'])
+        self.assertEqual(mock_run_batch.call_args.kwargs['symbols'], ['AAPL', 'MSFT'])
+        self.assertFalse(mock_run_batch.call_args.kwargs['store'])
+        self.assertIn('3.3 tickers/sec', out.getvalue())
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1802: Test for batch command passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class SignalBacktestTests(TestCase):
+    """
+    Tests for the vectorized signal backtester.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        import numpy as np
+        from financial_data.benchmarks import generate_ohlcv
+
+        self.frames = {}
+        for i in range(4):
+            df = generate_ohlcv(300, seed=i, freq='D', start='2024-01-02')
+            df['Close'] = 100 * np.exp(np.cumsum(np.random.default_rng(i).normal(0, 0.01, 300)))
+            df['High'] = df['Close'] * 1.01
+            df['Low'] = df['Close'] * 0.99
+            self.frames[f"SYN{i}"] = df
+        print(f"{custom_console.COLOR_CYAN}--- Starting SignalBacktestTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Signal Backtest Tests
+    # // ----------------------------------
+    # FD-1901: Test for positions, returns, drawdowns and trades
+    def test_backtest_engine(self):
+        """
+        GIVEN closes and BUY/SELL targets for two tickers
+        WHEN backtested long only with a one-bar delay and costs
+        THEN positions, returns, drawdowns and trade hit rates should follow the signals.
+        """
+        import numpy as np
+        from financial_data.backtest import run_backtest
+
+        # ARRANGE: Ticker 0 buys at bar 1 and sells at bar 4, ticker 1 only sells
+        nan = np.nan
+        close = np.array([
+            [100, 100, 110, 121, 110, 100],
+            [100, 90, 80, 90, 100, 110],
+        ], dtype=float)
+        targets = np.array([
+            [nan, 1, nan, nan, -1, nan],
+            [nan, -1, nan, nan, nan, nan],
+        ])
+
+        # ACT: Backtest with 10bps per position change
+        result = run_backtest(close, targets, delay=1, cost_bps=10, mode='long_only')
+
+        # ASSERT: Held bars 2-4, costs on entry and exit, one winning trade
+        np.testing.assert_array_equal(result['positions'][0], [0, 0, 1, 1, 1, 0])
+        np.testing.assert_array_equal(result['positions'][1], 0)
+        np.testing.assert_allclose(result['returns'][0], [0, 0, 0.1 - 0.001, 0.1, 110 / 121 - 1, -0.001])
+        self.assertAlmostEqual(result['drawdown'][0].min(), 110 / 121 * 0.999 - 1)
+        np.testing.assert_array_equal(result['trades'], [1, 0])
+        np.testing.assert_array_equal(result['wins'], [1, 0])
+
+        # ACT & ASSERT: Long/short also shorts the second ticker
+        short = run_backtest(close, targets, delay=1, mode='long_short')
+        np.testing.assert_array_equal(short['positions'][1], [0, 0, -1, -1, -1, -1])
+        np.testing.assert_array_equal(short['trades'], [2, 1])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1901: Test for backtest engine passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1902: Test for the overall signal matching calculate_overall_signal
+    def test_overall_signal_targets_match_summary(self):
+        """
+        GIVEN daily bars for several tickers
+        WHEN the overall signal is computed for every bar
+        THEN the last bar should match calculate_batch_summary's overallSignal.
+        """
+        import numpy as np
+        from financial_data.backtest import align_bars, overall_signal_targets
+        from financial_data.indicators import calculate_batch_summary
+
+        for end in (60, 150, 300):
+            # ARRANGE: Bars up to `end`
+            frames = {symbol: df.iloc[:end] for symbol, df in self.frames.items()}
+            symbols, _, arrays = align_bars(frames)
+
+            # ACT: Per-bar targets and the current summary
+            targets = overall_signal_targets(arrays['Close'], arrays['High'], arrays['Low'])
+            summaries = calculate_batch_summary(frames)
+
+            # ASSERT: Same signal on the last bar
+            for row, symbol in enumerate(symbols):
+                expected = {'BUY': 1.0, 'SELL': -1.0, 'HOLD': np.nan}[summaries[symbol]['overallSignal']['signal']]
+                np.testing.assert_array_equal(targets[row, -1], expected)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1902: Test for overall signal targets passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1903: Test for the stored summary endpoint
+    @patch('financial_data.tasks.compute_backtest_summary_task.apply_async')
+    @patch('financial_data.backtest.load_backtest_bars')
+    def test_backtest_summary_endpoint(self, mock_load, mock_apply_async):
+        """
+        GIVEN the backtest summary endpoint
+        WHEN called before, during and after its job runs, and with invalid params
+        THEN the first calls should share one pending job, later calls be served
+        from the store, and invalid params (including unlisted costs) be rejected.
+        """
+        from financial_data.backtest_store import compute_and_store
+
+        # ARRANGE: Bars for the universe come from the mock
+        mock_load.return_value = self.frames
+        url = reverse('backtest_summary')
+
+        # ACT: Two requests before the job runs
+        first = self.client.get(f"{url}?period=1y&cost_bps=5")
+        again = self.client.get(f"{url}?period=1y&cost_bps=5.0")
+        job_id = first.json()['job_id']
+
+        # ASSERT: Pending, one job queued, nothing computed in the request
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(first.json()['status'], 'pending')
+        self.assertEqual(again.json()['job_id'], job_id)
+        self.assertEqual(mock_apply_async.call_count, 1)
+        self.assertEqual(mock_apply_async.call_args.kwargs['task_id'], job_id)
+        mock_load.assert_not_called()
+
+        # ACT: The worker runs the job, then the endpoint and job status are polled
+        with patch('financial_data.services.SCAN_UNIVERSE', list(self.frames)):
+            compute_and_store(*mock_apply_async.call_args.kwargs['args'])
+        served = self.client.get(f"{url}?period=1y&cost_bps=5")
+        job = self.client.get(reverse('backtest_summary_job', args=[job_id]))
+
+        # ASSERT: Stored summary with a row per ticker, computed once
+        self.assertEqual(served.status_code, status.HTTP_200_OK)
+        self.assertEqual(served.json()['status'], 'complete')
+        self.assertEqual(served.json(), job.json())
+        self.assertEqual(mock_load.call_count, 1)
+        self.assertEqual(served.json()['symbols'], 4)
+        self.assertEqual(served.json()['delay'], 1)
+        self.assertEqual(served.json()['costBps'], 5)
+        self.assertEqual({row['symbol'] for row in served.json()['tickers']}, set(self.frames))
+        self.assertIn('maxDrawdown', served.json()['portfolio'])
+
+        # ASSERT: Invalid or look-ahead source, off-list cost and unknown job
+        self.assertEqual(self.client.get(f"{url}?source=random").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(f"{url}?source=historical").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(f"{url}?cost_bps=5.01").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse('backtest_summary_job', args=['nope'])).status_code,
+                         status.HTTP_404_NOT_FOUND)
+        self.assertEqual(mock_apply_async.call_count, 1)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1903: Test for backtest summary endpoint passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-1904: Test for stale summaries while a refresh runs
+    @patch('financial_data.tasks.compute_backtest_summary_task.apply_async')
+    @patch('financial_data.backtest.load_backtest_bars')
+    def test_backtest_summary_refresh(self, mock_load, mock_apply_async):
+        """
+        GIVEN a stored summary from before the last close
+        WHEN the endpoint is called, and the refresh job fails
+        THEN the old summary should be served as stale with a pending job,
+        and kept after the failure.
+        """
+        from datetime import timedelta
+        from financial_data.backtest_store import compute_and_store
+        from financial_data.models import BacktestSummary
+        from financial_data.signal_store import last_close
+
+        # ARRANGE: A summary computed before the last close
+        mock_load.return_value = self.frames
+        with patch('financial_data.services.SCAN_UNIVERSE', list(self.frames)):
+            old = compute_and_store('1y', 'overall', 'long_only', 0)
+        BacktestSummary.objects.filter(pk=old.pk).update(updated_at=last_close() - timedelta(hours=1))
+
+        # ACT: Request the summary
+        response = self.client.get(f"{reverse('backtest_summary')}?period=1y")
+
+        # ASSERT: Stale summary with the new job's status
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(response.json()['stale'])
+        self.assertEqual(response.json()['status'], 'pending')
+        self.assertNotEqual(response.json()['job_id'], old.job_id)
+        self.assertEqual(response.json()['symbols'], 4)
+
+        # ACT: The refresh fails
+        mock_load.side_effect = RuntimeError('download failed')
+        failed = compute_and_store(*mock_apply_async.call_args.kwargs['args'])
+
+        # ASSERT: Failure stored next to the previous complete summary
+        self.assertEqual(failed.status, 'failed')
+        self.assertEqual(failed.error, 'download failed')
+        self.assertEqual(
+            set(BacktestSummary.objects.filter(period='1y').values_list('status', flat=True)),
+            {'complete', 'failed'},
+        )
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-1904: Test for backtest summary refresh passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class ReferenceDataTests(TestCase):
+    """
+    Tests for the reference data store and its use by the scan and search.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data.reference_data import clear_reference_cache
+
+        clear_reference_cache()
+        self.infos = {
+            'AAPL': {'symbol': 'AAPL', 'shortName': 'Apple Inc.', 'sector': 'Technology',
+                     'industry': 'Consumer Electronics', 'quoteType': 'EQUITY', 'exchange': 'NMS',
+                     'trailingPE': 31.2, 'dividendYield': 0.44, 'marketCap': 3.4e12},
+            'SPY': {'symbol': 'SPY', 'longName': 'SPDR S&P 500 ETF Trust', 'quoteType': 'ETF',
+                    'exchange': 'PCX', 'trailingPE': 'Infinity', 'dividendYield': 1.2},
+        }
+        print(f"{custom_console.COLOR_CYAN}--- Starting ReferenceDataTest ---{custom_console.RESET_COLOR}")
+
+    def tearDown(self):
+        from financial_data import reference_data
+
+        reference_data.clear_reference_cache()
+        reference_data._seed_attempted = False
+
+    def _ticker(self, symbol):
+        if symbol not in self.infos:
+            raise ValueError(f"No info for {symbol}")
+        return MagicMock(info=self.infos[symbol])
+
+    # // ----------------------------------
+    # // Reference Data Tests
+    # // ----------------------------------
+    # FD-2001: Test for the parallel refresh and in-memory load
+    @patch('yfinance.Ticker')
+    def test_refresh_reference_data(self, mock_ticker):
+        """
+        GIVEN .info responses for some symbols and a failure for another
+        WHEN refresh_reference_data runs twice
+        THEN rows should be upserted, loaded into memory, and kept when a later fetch fails.
+        """
+        from financial_data.models import ReferenceData
+        from financial_data.reference_data import get_reference, refresh_reference_data
+
+        # ARRANGE: yfinance answers for AAPL and SPY only
+        mock_ticker.side_effect = self._ticker
+
+        # ACT: Refresh three symbols
+        report = refresh_reference_data(symbols=['aapl', 'SPY', 'NOPE'], workers=3)
+
+        # ASSERT: Two rows stored with parsed fields
+        self.assertEqual(report['updated'], 2)
+        self.assertEqual(report['failed'], ['NOPE'])
+        self.assertEqual(ReferenceData.objects.count(), 2)
+        self.assertEqual(get_reference('AAPL')['sector'], 'Technology')
+        self.assertEqual(get_reference('AAPL')['market_cap'], 3_400_000_000_000)
+        self.assertEqual(get_reference('SPY')['name'], 'SPDR S&P 500 ETF Trust')
+        self.assertIsNone(get_reference('SPY')['pe_ratio'])
+        self.assertIsNone(get_reference('NOPE'))
+
+        # ACT: AAPL changes, SPY now fails
+        self.infos['AAPL'] = dict(self.infos['AAPL'], trailingPE=29.0)
+        del self.infos['SPY']
+        refresh_reference_data(symbols=['AAPL', 'SPY'])
+
+        # ASSERT: AAPL updated in place, SPY's previous row kept
+        self.assertEqual(ReferenceData.objects.count(), 2)
+        self.assertEqual(get_reference('AAPL')['pe_ratio'], 29.0)
+        self.assertEqual(get_reference('SPY')['quote_type'], 'ETF')
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2001: Test for reference data refresh passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2002: Test for scan_market reading names and P/E without .info calls
+    @patch('yfinance.Ticker')
+    @patch('yfinance.download')
+    def test_scan_market_uses_reference_data(self, mock_download, mock_ticker):
+        """
+        GIVEN stored reference data and batch-downloaded bars
+        WHEN the market is scanned
+        THEN names and P/E should come from the reference data with no per-ticker .info call.
+        """
+        import numpy as np
+        import pandas as pd
+        from financial_data import services
+        from financial_data.models import ReferenceData
+
+        # ARRANGE: Reference row for AAPL only, 20 daily bars for AAPL and MSFT
+        ReferenceData.objects.create(symbol='AAPL', name='Apple Inc.', sector='Technology', pe_ratio=31.2,
+                                     dividend_yield=0.44, market_cap=3_400_000_000_000)
+        index = pd.date_range('2026-01-02', periods=20, freq='B')
+        columns = pd.MultiIndex.from_product([['AAPL', 'MSFT'], ['Open', 'High', 'Low', 'Close', 'Volume']])
+        values = np.tile(np.linspace(100, 120, 20)[:, None], (1, 10))
+        mock_download.return_value = pd.DataFrame(values, index=index, columns=columns)
+        services._market_scan_cache = {}
+        services._market_scan_timestamp = None
+
+        # ACT: Scan a two-symbol universe
+        with patch('financial_data.services.SCAN_UNIVERSE', ['AAPL', 'MSFT']):
+            data = services.LiveScreensService().scan_market()
+        services._market_scan_cache = {}
+        services._market_scan_timestamp = None
+
+        # ASSERT: Reference fields used, ticker as name when missing, no .info
+        self.assertEqual(data['AAPL']['name'], 'Apple Inc.')
+        self.assertEqual(data['AAPL']['pe_ratio'], 31.2)
+        self.assertEqual(data['AAPL']['sector'], 'Technology')
+        self.assertEqual(data['MSFT']['name'], 'MSFT')
+        self.assertIsNone(data['MSFT']['pe_ratio'])
+        mock_ticker.assert_not_called()
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2002: Test for scan using reference data passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2003: Test for search answering known symbols from reference data
+    @patch('yfinance.Ticker')
+    def test_search_uses_reference_data(self, mock_ticker):
+        """
+        GIVEN stored reference data
+        WHEN searching for a stored symbol and for part of a stored name
+        THEN results should come from the reference data, with yfinance only asked about unknown symbols.
+        """
+        from financial_data.models import ReferenceData
+
+        # ARRANGE: Two stored symbols
+        ReferenceData.objects.create(symbol='PLTR', name='Palantir Technologies Inc.', quote_type='EQUITY',
+                                     exchange='NMS')
+        ReferenceData.objects.create(symbol='SCHD', name='Schwab US Dividend Equity ETF', quote_type='ETF',
+                                     exchange='PCX')
+
+        mock_ticker.side_effect = ValueError('unknown symbol')
+
+        # ACT: Exact stored symbol
+        exact = self.client.get(f"{reverse('search_stocks')}?q=pltr").json()['results']
+
+        # ASSERT: Answered from the table without a yfinance lookup
+        self.assertEqual(exact[0], {'symbol': 'PLTR', 'name': 'Palantir Technologies Inc.', 'type': 'Stock',
+                                    'exchange': 'NMS'})
+        mock_ticker.assert_not_called()
+
+        # ACT: Name fragment
+        by_name = self.client.get(f"{reverse('search_stocks')}?q=dividend").json()['results']
+
+        # ASSERT: Stored name matched without a lookup
+        self.assertIn({'symbol': 'SCHD', 'name': 'Schwab US Dividend Equity ETF', 'type': 'ETF', 'exchange': 'PCX'},
+                      by_name)
+        mock_ticker.assert_not_called()
+
+        # ACT: Unknown symbol without local matches
+        self.client.get(f"{reverse('search_stocks')}?q=zzqx")
+
+        # ASSERT: Looked up on yfinance
+        mock_ticker.assert_called_once_with('ZZQX')
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2003: Test for search using reference data passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2004: Test for seeding an empty table before the first scan
+    @patch('financial_data.market_scan.start_scan')
+    @patch('financial_data.reference_data.reference_symbols', return_value=['AAPL', 'SPY'])
+    @patch('yfinance.Ticker')
+    def test_seed_reference_data_on_fresh_deploy(self, mock_ticker, mock_symbols, mock_start_scan):
+        """
+        GIVEN an empty reference data table
+        WHEN the scheduled scan starts, and starts again
+        THEN the table should be seeded once before the first scan, and never again once it has rows.
+        """
+        from financial_data import reference_data
+        from financial_data.reference_data import get_reference, seed_reference_data
+        from financial_data.tasks import start_market_scan_task
+
+        # ARRANGE: yfinance answers for both symbols
+        mock_ticker.side_effect = self._ticker
+        mock_start_scan.return_value = MagicMock(pk=1, chunk_count=1)
+
+        # ACT: First scheduled scan on a fresh deploy
+        start_market_scan_task()
+
+        # ASSERT: Seeded before the scan started
+        self.assertEqual(mock_ticker.call_count, 2)
+        self.assertEqual(get_reference('AAPL')['name'], 'Apple Inc.')
+        mock_start_scan.assert_called_once_with()
+
+        # ACT & ASSERT: Later scans (and other processes) find rows and skip the seed
+        start_market_scan_task()
+        reference_data._seed_attempted = False
+        self.assertIsNone(seed_reference_data())
+        self.assertEqual(mock_ticker.call_count, 2)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2004: Test for reference data seeding passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class ShardedMarketScanTests(TestCase):
+    """
+    Tests for the sharded, versioned market scan.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        self.symbols = [f"SYM{i}" for i in range(10)]
+        print(f"{custom_console.COLOR_CYAN}--- Starting ShardedMarketScanTest ---{custom_console.RESET_COLOR}")
+
+    @staticmethod
+    def _rows(symbols, price=100.0):
+        return {symbol: {'symbol': symbol, 'price': price} for symbol in symbols}
+
+    # // ----------------------------------
+    # // Sharded Market Scan Tests
+    # // ----------------------------------
+    # FD-2101: Test for chunked scanning, progress, partial results and publishing
+    @patch('financial_data.market_scan.fetch_chunk')
+    def test_chunks_merge_into_versioned_snapshot(self, mock_fetch):
+        """
+        GIVEN a ten-symbol universe split into chunks of four
+        WHEN the chunks are scanned one by one
+        THEN progress and partial rows should be visible until the last chunk publishes the snapshot.
+        """
+        from financial_data import market_scan
+        from financial_data.services import LiveScreensService
+
+        # ARRANGE: Every chunk returns a row per symbol
+        mock_fetch.side_effect = lambda symbols: (self._rows(symbols), {})
+        snapshot = market_scan.start_scan(self.symbols, chunk_size=4, dispatch=False)
+
+        # ASSERT: Three pending chunks, nothing to show yet
+        self.assertEqual(snapshot.chunk_count, 3)
+        self.assertEqual(market_scan.start_scan(self.symbols, dispatch=False).pk, snapshot.pk)
+        self.assertEqual(market_scan.current_rows(), {})
+
+        # ACT: Scan the first chunk
+        self.assertEqual(market_scan.run_chunk(snapshot.pk, 0), 'complete')
+
+        # ASSERT: Progress and partial rows from the running scan
+        progress = market_scan.scan_progress()
+        self.assertEqual((progress['status'], progress['chunksDone'], progress['symbolsDone']), ('running', 1, 4))
+        self.assertEqual(progress['percent'], 33.3)
+        self.assertEqual(set(market_scan.current_rows()), set(self.symbols[:4]))
+
+        # ACT: Scan the rest (the first chunk again is a no-op)
+        for index in (0, 1, 2):
+            market_scan.run_chunk(snapshot.pk, index)
+
+        # ASSERT: Published once with every row, read by scan_market
+        snapshot.refresh_from_db()
+        self.assertEqual(snapshot.status, 'complete')
+        self.assertEqual(snapshot.chunks_done, 3)
+        self.assertEqual(set(snapshot.rows), set(self.symbols))
+        self.assertEqual(mock_fetch.call_count, 3)
+        self.assertEqual(LiveScreensService().scan_market(), snapshot.rows)
+        self.assertEqual(self.client.get(reverse('market_scan_status')).json()['version'], snapshot.pk)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2101: Test for sharded scan snapshot passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2102: Test for rate-limit backoff and partial snapshots
+    @patch('financial_data.market_scan.fetch_chunk')
+    def test_rate_limited_chunk_backs_off_then_publishes_partial(self, mock_fetch):
+        """
+        GIVEN a published snapshot and a new scan whose second chunk is always throttled
+        WHEN the chunks are scanned
+        THEN workers should back off, then give up and publish a partial snapshot that keeps the old rows.
+        """
+        from financial_data import market_scan
+        from financial_data.models import MarketScanSnapshot
+
+        # ARRANGE: A first scan at price 100
+        mock_fetch.side_effect = lambda symbols: (self._rows(symbols), {})
+        first = market_scan.run_scan_locally(self.symbols, chunk_size=5)
+        self.assertEqual(first.status, 'complete')
+
+        def fetch(symbols):
+            if symbols == self.symbols[5:]:
+                raise market_scan.ScanRateLimited('Too Many Requests')
+            return self._rows(symbols, price=101.0), {}
+
+        mock_fetch.side_effect = fetch
+        snapshot = market_scan.start_scan(self.symbols, chunk_size=5, dispatch=False)
+
+        # ACT & ASSERT: The throttled chunk sets a shared cooldown
+        with self.assertRaises(market_scan.ScanRateLimited) as raised:
+            market_scan.run_chunk(snapshot.pk, 1)
+        self.assertEqual(raised.exception.retry_after, market_scan.SCAN_BACKOFF_SECONDS)
+        with self.assertRaises(market_scan.ScanRateLimited):
+            market_scan.run_chunk(snapshot.pk, 0)
+        self.assertEqual(mock_fetch.call_count, 3)
+
+        # ACT: Retry after each cooldown until the chunk gives up
+        for attempt in range(market_scan.SCAN_MAX_ATTEMPTS):
+            MarketScanSnapshot.objects.filter(pk=snapshot.pk).update(rate_limited_until=None)
+            try:
+                market_scan.run_chunk(snapshot.pk, 1)
+            except market_scan.ScanRateLimited:
+                pass
+        MarketScanSnapshot.objects.filter(pk=snapshot.pk).update(rate_limited_until=None)
+        market_scan.run_chunk(snapshot.pk, 0)
+
+        # ASSERT: Partial snapshot with fresh and carried-over rows, smaller chunks next time
+        snapshot.refresh_from_db()
+        self.assertEqual(snapshot.status, 'partial')
+        self.assertEqual(snapshot.rate_limit_hits, market_scan.SCAN_MAX_ATTEMPTS)
+        self.assertEqual(snapshot.rows['SYM0']['price'], 101.0)
+        self.assertEqual(snapshot.rows['SYM9']['price'], 100.0)
+        self.assertEqual(market_scan.current_rows()['SYM0']['price'], 101.0)
+        self.assertEqual(market_scan.plan_chunk_size(snapshot), market_scan.SCAN_CHUNK_MIN)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2102: Test for rate-limited scan chunks passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2103: Test for adaptive chunk sizing
+    def test_plan_chunk_size(self):
+        """
+        GIVEN previous scans with different seconds per symbol
+        WHEN the next chunk size is planned
+        THEN chunks should target SCAN_CHUNK_TARGET_SECONDS within the size bounds.
+        """
+        from financial_data import market_scan
+        from financial_data.models import MarketScanChunk, MarketScanSnapshot
+
+        # ARRANGE: Helper for a finished scan with one timed chunk
+        def scan(symbols, seconds, rate_limit_hits=0):
+            snapshot = MarketScanSnapshot.objects.create(status='complete', chunk_size=symbols,
+                                                         rate_limit_hits=rate_limit_hits)
+            MarketScanChunk.objects.create(snapshot=snapshot, index=0, symbols=['X'] * symbols, status='complete',
+                                           seconds=seconds)
+            return snapshot
+
+        # ACT & ASSERT: Default, target-based, clamped, and halved after throttling
+        target = market_scan.SCAN_CHUNK_TARGET_SECONDS
+        self.assertEqual(market_scan.plan_chunk_size(None), market_scan.SCAN_CHUNK_DEFAULT)
+        self.assertEqual(market_scan.plan_chunk_size(scan(100, target / 2)), 200)
+        self.assertEqual(market_scan.plan_chunk_size(scan(100, target / 100)), market_scan.SCAN_CHUNK_MAX)
+        self.assertEqual(market_scan.plan_chunk_size(scan(100, target / 2, rate_limit_hits=1)), 50)
+        self.assertEqual(market_scan.split_chunks(self.symbols, 4)[-1], ['SYM8', 'SYM9'])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2103: Test for adaptive chunk sizing passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class ColumnarScreenTests(TestCase):
+    """
+    Tests for the columnar scan snapshot and vectorized screens.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        print(f"{custom_console.COLOR_CYAN}--- Starting ColumnarScreenTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Columnar Screen Tests
+    # // ----------------------------------
+    # FD-2201: Test for columnar screens matching the dict filters
+    def test_screens_match_dict_filters(self):
+        """
+        GIVEN synthetic scan snapshots with rounded (tied) metrics and missing values
+        WHEN every screen runs on the columnar snapshot and on the original dict filters
+        THEN both should return the same symbols in the same order.
+        """
+        from financial_data.benchmarks import generate_scan_rows, legacy_screen
+        from financial_data.scan_columns import SCREEN_RULES, ScanColumns
+
+        for seed in range(5):
+            for tickers in (1, 40, 400):
+                # ARRANGE: One snapshot and its columns
+                rows = generate_scan_rows(tickers, seed)
+                columns = ScanColumns(rows)
+
+                for criteria in SCREEN_RULES:
+                    for limit in (1, 5, 25):
+                        # ACT: Both implementations
+                        expected = [symbol for symbol, _ in legacy_screen(rows, criteria, limit)]
+                        actual = columns.screen(criteria, limit)
+
+                        # ASSERT: Same symbols, same order, original row dicts
+                        self.assertEqual([symbol for symbol, _ in actual], expected, (seed, tickers, criteria))
+                        self.assertTrue(all(info is rows[symbol] for symbol, info in actual))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2201: Test for columnar screens passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2202: Test for stable top-k ties and per-snapshot columns
+    def test_top_k_ties_and_snapshot_cache(self):
+        """
+        GIVEN a snapshot with ties on the sort key across the top-k cutoff
+        WHEN the top rows are selected through LiveScreensService
+        THEN ties should keep snapshot order and columns should be built once per snapshot.
+        """
+        from financial_data.scan_columns import columns_for
+        from financial_data.services import LiveScreensService
+
+        # ARRANGE: Five oversold symbols, three tied at RSI 20, one at RSI 0 (falsy, excluded)
+        rsi = {'A': 25.0, 'B': 20.0, 'C': 10.0, 'D': 20.0, 'E': 20.0, 'F': 0.0, 'G': None}
+        rows = {symbol: {'symbol': symbol, 'rsi': value, 'change': 1.0} for symbol, value in rsi.items()}
+        service = LiveScreensService()
+
+        # ACT: Top 3 and top 10
+        top3 = [symbol for symbol, _ in service.filter_oversold(rows, limit=3)]
+        top10 = [symbol for symbol, _ in service.filter_oversold(rows, limit=10)]
+
+        # ASSERT: Lowest RSI first, tied rows in snapshot order
+        self.assertEqual(top3, ['C', 'B', 'D'])
+        self.assertEqual(top10, ['C', 'B', 'D', 'E', 'A'])
+
+        # ASSERT: One ScanColumns per snapshot object
+        self.assertIs(columns_for(rows), columns_for(rows))
+        self.assertIsNot(columns_for(dict(rows)), columns_for(rows))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2202: Test for top-k ties passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class IncrementalMarketScanTests(TestCase):
+    """
+    Tests for incremental intraday rescans of the market scan snapshot.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        self.day = 740000
+        self.entry = {
+            'days': [self.day - 4, self.day - 3, self.day - 2, self.day - 1, self.day],
+            'closes': [100.0, 101.0, 102.0, 103.0, 104.0],
+            'highs': [101.0, 102.0, 103.0, 104.0, 105.0],
+            'lows': [99.0, 100.0, 101.0, 102.0, 103.0],
+            'volumes': [1000.0, 1000.0, 1000.0, 1000.0, 500.0],
+            'last_ts': 1_000_000,
+            'last_volume': 50.0,
+        }
+        print(f"{custom_console.COLOR_CYAN}--- Starting IncrementalMarketScanTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Incremental Market Scan Tests
+    # // ----------------------------------
+    # FD-2301: Test for folding new 5m bars into the daily state
+    def test_apply_bars(self):
+        """
+        GIVEN a symbol's daily bars and the last 5m bar seen
+        WHEN newer 5m bars from the same and the next session are applied
+        THEN the last daily bar, volume and sparkline should update, and a new session should roll the window.
+        """
+        from financial_data.scan_update import SPARKLINE_POINTS, apply_bars
+
+        minute = 60_000
+        # ARRANGE: An old bar, the refetched last bar (volume 50 -> 80) and a new bar
+        bars = [
+            (1_000_000 - 5 * minute, self.day, 200.0, 1.0, 90.0, 999.0),
+            (1_000_000, self.day, 105.5, 103.0, 105.0, 80.0),
+            (1_000_000 + 5 * minute, self.day, 106.0, 102.5, 103.5, 40.0),
+        ]
+
+        # ACT: Apply them to the state and its sparkline
+        entry, sparkline = apply_bars(self.entry, bars, [104.0, 104.5])
+
+        # ASSERT: Same-session bar updated in place, the input left alone
+        self.assertEqual(entry['closes'][-1], 103.5)
+        self.assertEqual((entry['highs'][-1], entry['lows'][-1]), (106.0, 102.5))
+        self.assertEqual(entry['volumes'][-1], 500.0 + 30.0 + 40.0)
+        self.assertEqual((entry['last_ts'], entry['last_volume']), (1_000_000 + 5 * minute, 40.0))
+        self.assertEqual(sparkline, [104.0, 105.0, 103.5])
+        self.assertEqual(self.entry['closes'][-1], 104.0)
+
+        # ACT: A bar from the next session
+        next_day, sparkline = apply_bars(entry, [(2_000_000, self.day + 1, 108.0, 107.0, 107.5, 10.0)], sparkline)
+
+        # ASSERT: New daily bar, same window length, fresh sparkline
+        self.assertEqual(next_day['days'], entry['days'][1:] + [self.day + 1])
+        self.assertEqual(next_day['closes'], entry['closes'][1:] + [107.5])
+        self.assertEqual(next_day['volumes'][-1], 10.0)
+        self.assertEqual(sparkline, [107.5])
+
+        # ASSERT: Sparkline capped, no bars is a no-op
+        many = [(2_000_000 + i * 5 * minute, self.day + 1, 1.0, 1.0, 1.0, 1.0) for i in range(1, 30)]
+        self.assertEqual(len(apply_bars(next_day, many, sparkline)[1]), SPARKLINE_POINTS)
+        self.assertEqual(apply_bars(self.entry, [], [1.0]), (self.entry, [1.0]))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2301: Test for applying intraday bars passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2302: Test for publishing an incremental snapshot version
+    @patch('financial_data.scan_update.download_new_bars')
+    @patch('financial_data.market_scan.fetch_chunk')
+    def test_run_update_publishes_new_version(self, mock_fetch, mock_download):
+        """
+        GIVEN a published full scan with per-symbol state
+        WHEN run_update applies new 5m bars for one of its symbols
+        THEN a new snapshot version should be published with only that symbol's metrics changed.
+        """
+        from financial_data import market_scan, scan_update
+        from financial_data.services import LiveScreensService
+
+        # ARRANGE: A full scan of two symbols with the same daily bars
+        service = LiveScreensService()
+
+        def fetch(symbols):
+            rows, state = {}, {}
+            for symbol in symbols:
+                state[symbol] = dict(self.entry)
+                rows[symbol] = service.scan_metrics(symbol, self.entry['closes'], self.entry['highs'],
+                                                    self.entry['lows'], self.entry['volumes'], [104.0], {})
+            return rows, state
+
+        mock_fetch.side_effect = fetch
+        base = market_scan.run_scan_locally(['AAA', 'BBB'])
+        self.assertEqual(market_scan.unpack_scan_state(base.state), {'AAA': self.entry, 'BBB': self.entry})
+        mock_download.return_value = {'AAA': [(1_000_000 + 300_000, self.day, 120.0, 104.0, 113.3, 500.0)]}
+
+        # ACT: Roll the snapshot forward
+        snapshot = scan_update.run_update()
+
+        # ASSERT: New version from the base, only AAA recomputed
+        self.assertEqual((snapshot.kind, snapshot.base_id, snapshot.status), ('update', base.pk, 'complete'))
+        self.assertGreater(snapshot.pk, base.pk)
+        floor = int((base.finished_at.timestamp() - scan_update.SCAN_UPDATE_LOOKBACK_SECONDS) * 1000)
+        self.assertEqual(mock_download.call_args[0][1], floor)
+        self.assertEqual(snapshot.rows['AAA']['price'], 113.3)
+        self.assertEqual(snapshot.rows['AAA']['change'], 10.0)
+        self.assertEqual(snapshot.rows['AAA']['sparkline'], [104.0, 113.3])
+        self.assertEqual(snapshot.rows['BBB'], base.rows['BBB'])
+        self.assertEqual(market_scan.unpack_scan_state(snapshot.state)['AAA']['volumes'][-1], 1000.0)
+        self.assertEqual(market_scan.current_rows()['AAA']['price'], 113.3)
+
+        # ASSERT: No update while a full scan runs
+        market_scan.start_scan(['AAA'], dispatch=False)
+        self.assertIsNone(scan_update.run_update())
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2302: Test for incremental scan updates passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class UserScreenRuleTests(TestCase):
+    """
+    Tests for the user screen rule engine and endpoints.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data.screen_rules import clear_screen_cache
+
+        clear_screen_cache()
+        print(f"{custom_console.COLOR_CYAN}--- Starting UserScreenRuleTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // User Screen Rule Tests
+    # // ----------------------------------
+    # FD-2401: Test for compiling and evaluating rule trees
+    def test_compile_and_evaluate_rules(self):
+        """
+        GIVEN equivalent screen definitions written in different forms
+        WHEN they are compiled and evaluated over a synthetic snapshot
+        THEN they should share a rule hash and match exactly the rows a plain Python filter selects.
+        """
+        from financial_data.benchmarks import generate_scan_rows
+        from financial_data.scan_columns import ScanColumns
+        from financial_data.screen_rules import (
+            RuleEvaluator, ScreenRuleError, compile_screen, evaluate_screens,
+        )
+
+        # ARRANGE: One rule as a tree, reordered with aliases, and in RuleBuilder form
+        tree = compile_screen({'rule': {'op': 'and', 'rules': [
+            {'field': 'rsi', 'op': 'lt', 'value': 40},
+            {'op': 'or', 'rules': [{'field': 'rv', 'op': 'gte', 'value': 1.5},
+                                   {'field': 'change', 'op': 'gt', 'value': 2}]},
+        ]}, 'sort': 'change'})
+        reordered = compile_screen({'rule': {'op': 'AND', 'rules': [
+            {'op': 'or', 'rules': [{'field': 'change', 'op': '>', 'value': '2'},
+                                   {'field': 'rv', 'op': '>=', 'value': 1.5}]},
+            {'op': 'and', 'rules': [{'field': 'RSI', 'op': 'lt', 'value': 40}]},
+        ]}})
+        builder = compile_screen({'conditions': [
+            {'metric': 'RSI', 'comparator': 'lt', 'value': '40'},
+            {'metric': 'rv', 'comparator': 'gte', 'value': '1.5'},
+            {'metric': 'RSI', 'comparator': 'lt', 'value': '40'},
+            {'metric': 'change', 'comparator': 'gt', 'value': '2'},
+        ], 'operators': ['AND', 'OR', 'AND']})
+
+        # ASSERT: Same canonical rule and hash; invalid definitions rejected
+        self.assertEqual(reordered.rule_hash, tree.rule_hash)
+        self.assertEqual(compile_screen({'rule': builder.rule}).rule, builder.rule)
+        for bad in ({'field': 'macd', 'op': 'gt', 'value': 1}, {'field': 'rsi', 'op': 'gt', 'value': 'x'},
+                    {'op': 'xor', 'rules': [{'field': 'rsi', 'op': 'gt', 'value': 1}]},
+                    {'conditions': [{'metric': 'RSI', 'comparator': 'crosses_above', 'value': '30'}]}):
+            with self.assertRaises(ScreenRuleError):
+                compile_screen(bad)
+
+        # ACT: Evaluate over a snapshot with missing metrics
+        rows = generate_scan_rows(400, seed=3)
+        columns = ScanColumns(rows)
+        results = evaluate_screens([tree, reordered, builder], columns, 'v1')
+
+        # ASSERT: Same rows as a dict filter, sorted by change
+        def number(info, field):
+            return info.get(field) if info.get(field) is not None else float('nan')
+
+        expected = [symbol for symbol, info in rows.items()
+                    if number(info, 'rsi') < 40 and (number(info, 'rv') >= 1.5 or number(info, 'change') > 2)]
+        expected.sort(key=lambda symbol: -rows[symbol]['change'])
+        self.assertEqual(results[tree.rule_hash], expected)
+        self.assertEqual(set(results[builder.rule_hash]), {
+            symbol for symbol, info in rows.items()
+            if (number(info, 'rsi') < 40 and number(info, 'rv') >= 1.5)
+            or (number(info, 'rsi') < 40 and number(info, 'change') > 2)
+        })
+
+        # ASSERT: Cached per (rule hash, version)
+        with patch.object(RuleEvaluator, 'matches') as mock_matches:
+            self.assertEqual(evaluate_screens([tree], columns, 'v1')[tree.rule_hash], expected)
+            mock_matches.assert_not_called()
+            evaluate_screens([tree], columns, 'v2')
+            mock_matches.assert_called_once()
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2401: Test for compiling and evaluating screen rules passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2402: Test for the user screen endpoints sharing results
+    def test_user_screen_endpoints(self):
+        """
+        GIVEN two users saving the same screen and a published scan snapshot
+        WHEN they create and list their screens
+        THEN both should see the same matches, evaluated once per snapshot version.
+        """
+        from django.utils import timezone
+
+        from authentication.models import User
+        from financial_data.models import MarketScanSnapshot, UserScreen
+        from financial_data.screen_rules import RuleEvaluator
+
+        # ARRANGE: A snapshot and two users
+        rows = {symbol: {'symbol': symbol, 'name': symbol, 'price': 10.0, 'change': change, 'valueChange': 0.1,
+                         'rsi': rsi, 'rv': 1.0, 'sparkline': [1, 2]}
+                for symbol, change, rsi in (('AAA', 3.0, 25.0), ('BBB', 5.0, 28.0), ('CCC', 1.0, 60.0),
+                                            ('DDD', 2.0, None))}
+        MarketScanSnapshot.objects.create(status='complete', rows=rows, finished_at=timezone.now())
+        for email in ('a@example.com', 'b@example.com'):
+            User.objects.create(email=email, username=email)
+        body = json.dumps({'name': 'Oversold', 'limit': 5, 'definition': {
+            'rule': {'field': 'rsi', 'op': 'lt', 'value': 30}, 'sort': 'change'}})
+
+        # ACT & ASSERT: Authentication and validation
+        self.assertEqual(self.client.get(reverse('user_screens')).status_code, 401)
+        bad = self.client.post(reverse('user_screens'), data=json.dumps({'name': 'x', 'definition': {}}),
+                               content_type='application/json', HTTP_X_USER_EMAIL='a@example.com')
+        self.assertEqual(bad.status_code, 400)
+
+        # ACT: Both users save the same screen, then list them
+        created = [self.client.post(reverse('user_screens'), data=body, content_type='application/json',
+                                    HTTP_X_USER_EMAIL=email).json()['screen']
+                   for email in ('a@example.com', 'b@example.com')]
+        with patch.object(RuleEvaluator, 'matches') as mock_matches:
+            listed = self.client.get(reverse('user_screens'), HTTP_X_USER_EMAIL='b@example.com').json()['screens']
+            mock_matches.assert_not_called()
+
+        # ASSERT: Shared hash and results, sorted by change, NaN RSI excluded
+        self.assertEqual(created[0]['ruleHash'], created[1]['ruleHash'])
+        self.assertEqual([stock['symbol'] for stock in created[0]['stocks']], ['BBB', 'AAA'])
+        self.assertEqual(listed[0]['stocks'], created[0]['stocks'])
+        self.assertEqual(listed[0]['id'], created[1]['id'])
+
+        # ACT & ASSERT: Preview, update and delete
+        preview = self.client.post(reverse('evaluate_screen'), content_type='application/json', data=json.dumps(
+            {'definition': {'conditions': [{'metric': 'Price', 'comparator': 'gt', 'value': '5'}]}, 'limit': 2}))
+        self.assertEqual([stock['symbol'] for stock in preview.json()['stocks']], ['BBB', 'AAA'])
+        detail = reverse('user_screen_detail', args=[created[0]['id']])
+        updated = self.client.put(detail, data=json.dumps({'limit': 1}), content_type='application/json',
+                                  HTTP_X_USER_EMAIL='a@example.com').json()['screen']
+        self.assertEqual([stock['symbol'] for stock in updated['stocks']], ['BBB'])
+        self.assertEqual(self.client.delete(detail, HTTP_X_USER_EMAIL='b@example.com').status_code, 404)
+        self.assertEqual(self.client.delete(detail, HTTP_X_USER_EMAIL='a@example.com').status_code, 200)
+        self.assertEqual(UserScreen.objects.count(), 1)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2402: Test for user screen endpoints passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+    # FD-2403: Test for every RuleBuilder metric mapping onto a scan field
+    def test_rule_builder_metrics(self):
+        """
+        GIVEN RuleBuilder conditions with default, volume/SMA and MACD metrics
+        WHEN they are compiled
+        THEN defaults should follow ConditionBlock, every offered metric map to a scan field, and MACD be rejected.
+        """
+        from financial_data.screen_rules import RULE_BUILDER_METRICS, ScreenRuleError, compile_screen
+        from financial_data.services import LiveScreensService
+
+        # ACT: A default condition, a category without a metric, and every offered metric
+        default = compile_screen({'conditions': [{'comparator': 'lt', 'value': '30'}]})
+        volume = compile_screen({'conditions': [{'category': 'Volume', 'comparator': 'gt', 'value': '1e6'}]})
+        fields = [compile_screen({'conditions': [{'metric': metric, 'value': '1'}]}).rule['field']
+                  for metrics in RULE_BUILDER_METRICS.values() for metric in metrics]
+
+        # ASSERT: RSI by default, a category's first metric, every metric a field; MACD rejected
+        self.assertEqual(default.rule, {'field': 'rsi', 'op': 'lt', 'value': 30.0})
+        self.assertEqual(volume.rule['field'], 'volume')
+        self.assertEqual(fields, ['rsi', 'volume', 'avg_volume_20', 'price', 'sma_20'])
+        with self.assertRaises(ScreenRuleError):
+            compile_screen({'conditions': [{'category': 'MACD', 'metric': 'MACD Line', 'value': '0'}]})
+
+        # ASSERT: The scan computes the 20-day fields from its daily bars
+        closes = [float(i) for i in range(1, 23)]
+        row = LiveScreensService().scan_metrics('AAPL', closes, closes, closes, [100.0] * 22, closes, {})
+        self.assertEqual((row['sma_20'], row['avg_volume_20']), (12.5, 100))
+        short = LiveScreensService().scan_metrics('AAPL', closes[:5], closes[:5], closes[:5], [100.0] * 5, [], {})
+        self.assertIsNone(short['sma_20'])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2403: Test for RuleBuilder metrics passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+class MaterializedScreenTests(TestCase):
+    """
+    Tests for live screens materialized per scan snapshot version.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data import services
+
+        services._live_screens_cache.update(version=None, screens={})
+        print(f"{custom_console.COLOR_CYAN}--- Starting MaterializedScreenTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Materialized Screen Tests
+    # // ----------------------------------
+    # FD-2501: Test for screens built once per snapshot version
+    def test_screens_materialized_per_version(self):
+        """
+        GIVEN a published scan snapshot
+        WHEN live screens are requested with different screen and category filters
+        THEN every screen should be built once for the version and rebuilt only when a new version is published.
+        """
+        from django.utils import timezone
+
+        from financial_data.benchmarks import generate_scan_rows
+        from financial_data.models import MarketScanSnapshot
+        from financial_data.services import SCREEN_DEFINITIONS, LiveScreensService
+
+        # ARRANGE: One published snapshot
+        rows = generate_scan_rows(300, seed=1)
+        MarketScanSnapshot.objects.create(status='complete', rows=rows, finished_at=timezone.now())
+        service = LiveScreensService()
+
+        # ACT: Overlapping requests against the same version
+        with patch.object(LiveScreensService, 'generate_reason', autospec=True,
+                          side_effect=lambda self, ticker, info, criteria: criteria) as mock_reason:
+            both = service.fetch_live_screens(screen_ids=['morning-movers', 'oversold-bounces'])
+            one = service.fetch_live_screens(screen_ids=['oversold-bounces'])
+            technical = service.fetch_live_screens(categories=['technical'])
+            everything = service.fetch_live_screens()
+            built = mock_reason.call_count
+
+            # ASSERT: One build for all screens, requests only select
+            self.assertEqual([screen['id'] for screen in both], ['morning-movers', 'oversold-bounces'])
+            self.assertIs(one[0], both[1])
+            self.assertEqual({screen['category'] for screen in technical}, {'technical'})
+            self.assertEqual(len(everything), len(SCREEN_DEFINITIONS))
+            self.assertEqual(built, sum(len(screen['stocks']) for screen in everything))
+            self.assertEqual(both[1]['stocks'][0]['screenReason'], 'oversold')
+
+            # ACT: A new snapshot version
+            rows = generate_scan_rows(300, seed=2)
+            MarketScanSnapshot.objects.create(status='complete', rows=rows, finished_at=timezone.now())
+            rebuilt = service.fetch_live_screens(screen_ids=['oversold-bounces'])
+
+        # ASSERT: Rebuilt from the new rows
+        self.assertGreater(mock_reason.call_count, built)
+        self.assertIsNot(rebuilt[0], one[0])
+        expected = [symbol for symbol, _ in service.filter_oversold(rows, 5)]
+        self.assertEqual([stock['symbol'] for stock in rebuilt[0]['stocks']], expected)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2501: Test for materialized live screens passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class LiveScreenStreamTests(TestCase):
+    """
+    Tests for server-sent live screen deltas.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        def stock(symbol, rank, price, sparkline):
+            return {'symbol': symbol, 'name': symbol, 'price': price, 'change': 1.0, 'valueChange': 0.5,
+                    'sparkline': sparkline, 'timeframe': 'day', 'screenReason': 'reason', 'rank': rank,
+                    'score': 70, 'signals': []}
+
+        def screen(screen_id, stocks):
+            return {'id': screen_id, 'title': screen_id, 'description': '', 'icon': '', 'category': 'momentum',
+                    'stocks': stocks, 'generatedAt': 'g', 'expiresAt': 'e', 'refreshInterval': 15}
+
+        self.v1 = {
+            'movers': screen('movers', [stock('AAA', 1, 10.0, [1, 2, 3]), stock('BBB', 2, 20.0, [4, 5]),
+                                        stock('CCC', 3, 30.0, [6])]),
+            'quiet': screen('quiet', [stock('ZZZ', 1, 5.0, [1])]),
+        }
+        self.v2 = {
+            'movers': screen('movers', [stock('BBB', 1, 21.0, [4, 5, 6]), stock('AAA', 2, 10.0, [1, 2, 3]),
+                                        stock('DDD', 3, 40.0, [7])]),
+            'quiet': screen('quiet', [stock('ZZZ', 1, 5.0, [1])]),
+        }
+        print(f"{custom_console.COLOR_CYAN}--- Starting LiveScreenStreamTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Live Screen Stream Tests
+    # // ----------------------------------
+    # FD-2601: Test for deltas between two screen versions
+    def test_screens_delta(self):
+        """
+        GIVEN two materialized versions of the same screens
+        WHEN their delta is computed
+        THEN only entries, exits, rank changes and changed fields of changed screens should be included.
+        """
+        from financial_data.screen_stream import screens_delta, sparkline_update
+
+        # ACT: Diff the versions
+        delta = screens_delta(self.v1, self.v2)
+
+        # ASSERT: Unchanged screen left out, changes of the other
+        self.assertEqual(set(delta), {'movers'})
+        movers = delta['movers']
+        self.assertEqual([stock['symbol'] for stock in movers['entered']], ['DDD'])
+        self.assertEqual(movers['exited'], ['CCC'])
+        self.assertEqual(movers['ranks'], {'BBB': 1, 'AAA': 2})
+        self.assertEqual(movers['updates'], {'BBB': {'price': 21.0, 'sparklineTail': [5, 6], 'sparklineLength': 3}})
+        self.assertEqual(movers['generatedAt'], 'g')
+        self.assertEqual(screens_delta(self.v2, {'movers': self.v2['movers']}), {'quiet': {'removed': True}})
+
+        # ASSERT: Sparkline tails reproduce the new sparkline on the client
+        for old, new in (([1, 2, 3], [1, 2, 3, 4]), ([1, 2, 3], [2, 3, 4]), ([1, 2, 3], [1, 2, 9]),
+                         ([1, 2, 3], [7, 8]), ([], [1])):
+            update = sparkline_update(old, new)
+            if 'sparklineTail' in update:
+                rebuilt = (old[:-1] + update['sparklineTail'])[-update['sparklineLength']:]
+            else:
+                rebuilt = update['sparkline']
+            self.assertEqual(rebuilt, new)
+        self.assertEqual(sparkline_update([1, 2], [1, 2]), {})
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2601: Test for screen deltas passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2602: Test for the broadcast stream and the WSGI fallback
+    @patch('financial_data.screen_stream.SCREEN_STREAM_POLL_SECONDS', 0.01)
+    def test_stream_sends_screens_then_deltas(self):
+        """
+        GIVEN screens that change from one snapshot version to the next
+        WHEN clients subscribe to the stream
+        THEN each should get the screens once and then only the delta, with one load per poll for all clients.
+        """
+        import asyncio
+
+        from asgiref.sync import async_to_sync
+
+        from financial_data import screen_stream
+
+        # ARRANGE: Version 1 on the first poll, version 2 afterwards
+        versions = iter([('1', self.v1)])
+        loads = []
+
+        async def load():
+            loads.append(1)
+            return next(versions, ('2', self.v2))
+
+        def parse(message):
+            lines = dict(line.split(': ', 1) for line in message.strip().split('\n'))
+            return lines['event'], json.loads(lines['data'])
+
+        async def consume():
+            broadcaster = screen_stream.broadcaster()
+            first = broadcaster.events(['movers'])
+            second = broadcaster.events()
+            messages = [await first.__anext__() for _ in range(3)]
+            late = [await second.__anext__() for _ in range(2)]
+            await first.aclose()
+            await second.aclose()
+            await asyncio.sleep(0.05)
+            return messages, late, broadcaster
+
+        # ACT: Two subscribers on one broadcaster
+        with patch('financial_data.screen_stream._load_screens', side_effect=load):
+            messages, late, broadcaster = async_to_sync(consume)()
+
+        # ASSERT: retry, full screens for v1, then the v2 delta of the selected screen only
+        self.assertTrue(messages[0].startswith('retry:'))
+        event, data = parse(messages[1])
+        self.assertEqual((event, data['version'], [s['id'] for s in data['screens']]), ('screens', '1', ['movers']))
+        event, data = parse(messages[2])
+        self.assertEqual((event, data['version'], data['from']), ('delta', '2', '1'))
+        self.assertEqual(set(data['screens']), {'movers'})
+
+        # ASSERT: The late subscriber gets the current screens whole; polling stops without subscribers
+        event, data = parse(late[1])
+        self.assertEqual((event, data['version'], len(data['screens'])), ('screens', '2', 2))
+        self.assertEqual(broadcaster.subscribers, 0)
+        self.assertIsNone(broadcaster._task)
+
+        # ACT: WSGI request (no ASGI server) gets the current screens and the stream ends
+        with patch('financial_data.services.LiveScreensService.current_screens', return_value=('2', self.v2)):
+            response = self.client.get(reverse('live_screens_stream'), {'screens': 'quiet'})
+            body = b''.join(response.streaming_content).decode()
+
+        # ASSERT: One screens event with a polling retry interval
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertIn(f"retry: {screen_stream.SCREEN_STREAM_POLL_RETRY_MS}", body)
+        event, data = parse(body.split('\n\n')[1])
+        self.assertEqual([s['id'] for s in data['screens']], ['quiet'])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2602: Test for the live screen stream passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+    # FD-2603: Test for filtered subscribers keeping up with versions
+    @patch('financial_data.screen_stream.SCREEN_STREAM_POLL_SECONDS', 0.01)
+    def test_filtered_stream_advances_version(self):
+        """
+        GIVEN a client subscribed to a screen that doesn't change between versions
+        WHEN new versions only change another screen
+        THEN it should still get a delta per version, empty, chained from the version it last saw.
+        """
+        from asgiref.sync import async_to_sync
+
+        from financial_data import screen_stream
+
+        # ARRANGE: Versions 1-3, where only 'movers' changes
+        versions = iter([('1', self.v1), ('2', self.v2)])
+
+        async def load():
+            return next(versions, ('3', self.v1))
+
+        def parse(message):
+            lines = dict(line.split(': ', 1) for line in message.strip().split('\n'))
+            return lines['event'], json.loads(lines['data'])
+
+        async def consume():
+            events = screen_stream.broadcaster().events(['quiet'])
+            messages = [await events.__anext__() for _ in range(4)]
+            await events.aclose()
+            return messages
+
+        # ACT: Subscribe to 'quiet' only
+        with patch('financial_data.screen_stream._load_screens', side_effect=load):
+            messages = async_to_sync(consume)()
+
+        # ASSERT: Full screens, then an empty delta per version, each from the previous one
+        events = [parse(message) for message in messages[1:]]
+        self.assertEqual((events[0][0], events[0][1]['version']), ('screens', '1'))
+        self.assertEqual([(event, data['from'], data['version'], data['screens']) for event, data in events[1:]],
+                         [('delta', '1', '2', {}), ('delta', '2', '3', {})])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2603: Test for filtered streams advancing versions passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+class LongWindowTests(TestCase):
+    """
+    Tests for the incrementally maintained 52-week / 200-day scan metrics.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        import random
+
+        from financial_data.long_window import clear_long_window_cache
+
+        rng = random.Random(7)
+        self.day = 740000
+        self.days = list(range(self.day - 400, self.day))
+        self.closes = [100 + rng.uniform(-30, 30) for _ in self.days]
+        self.highs = [close + rng.uniform(0, 5) for close in self.closes]
+        self.lows = [close - rng.uniform(0, 5) for close in self.closes]
+        self.volumes = [rng.uniform(1e5, 1e6) for _ in self.days]
+        clear_long_window_cache()
+        print(f"{custom_console.COLOR_CYAN}--- Starting LongWindowTest ---{custom_console.RESET_COLOR}")
+
+    # // ----------------------------------
+    # // Long Window Tests
+    # // ----------------------------------
+    # FD-2701: Test for the rolling window against full recomputation
+    def test_rolling_window_matches_recomputation(self):
+        """
+        GIVEN 400 completed daily sessions pushed one at a time
+        WHEN the window stats are read after each push and after a blob roundtrip
+        THEN they should equal the high/low, SMA and average volume recomputed from the full history.
+        """
+        from financial_data.long_window import (
+            AVG_VOLUME_WINDOW, LONG_WINDOW_SESSIONS, SMA_LONG_WINDOW, RollingWindow, long_window_metrics,
+        )
+
+        # ARRANGE: An empty window
+        window = RollingWindow()
+
+        for i, day in enumerate(self.days):
+            # ACT: Push one session
+            window.push(day, self.highs[i], self.lows[i], self.closes[i], self.volumes[i])
+
+            # ASSERT: Stats over the last sessions (one short of the full windows)
+            stats = window.stats()
+            start = max(0, i + 2 - LONG_WINDOW_SESSIONS)
+            self.assertEqual(stats['window_high'], max(self.highs[start:i + 1]))
+            self.assertEqual(stats['window_low'], min(self.lows[start:i + 1]))
+            closes = self.closes[max(0, i + 2 - SMA_LONG_WINDOW):i + 1]
+            self.assertAlmostEqual(stats['close_sum'], sum(closes), places=6)
+            self.assertEqual(stats['close_count'], len(closes))
+            if i + 1 >= AVG_VOLUME_WINDOW:
+                self.assertAlmostEqual(stats['avg_volume'], sum(self.volumes[i + 1 - AVG_VOLUME_WINDOW:i + 1])
+                                       / AVG_VOLUME_WINDOW, places=4)
+            else:
+                self.assertIsNone(stats['avg_volume'])
+
+        # ACT: Rebuild the window from its blob
+        restored = RollingWindow.unpack(window.pack())
+
+        # ASSERT: Same stats, and it keeps rolling the same way
+        self.assertEqual(restored.stats()['last_day'], self.days[-1])
+        for key, value in window.stats().items():
+            self.assertAlmostEqual(restored.stats()[key], value, places=4)
+        window.push(self.day, 500.0, 1.0, 120.0, 1e6)
+        restored.push(self.day, 500.0, 1.0, 120.0, 1e6)
+        self.assertEqual(restored.stats()['window_high'], 500.0)
+        self.assertAlmostEqual(restored.stats()['close_sum'], window.stats()['close_sum'], places=6)
+
+        # ACT: Metrics for a current bar on the next day
+        stats = restored.stats()
+        metrics = long_window_metrics(stats, self.day + 1, 130.0, 90.0, 125.0)
+
+        # ASSERT: The bar completes the 252-session and 200-day windows
+        self.assertEqual((metrics['high_52w'], metrics['low_52w']), (500.0, 1.0))
+        self.assertEqual(metrics['sma_200'], round((stats['close_sum'] + 125.0) / SMA_LONG_WINDOW, 2))
+        self.assertEqual(long_window_metrics(stats, self.day, 130.0, 90.0, 125.0)['sma_200'],
+                         round(stats['close_sum'] / stats['close_count'], 2))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2701: Test for the rolling long window passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2702: Test for the nightly refresh and the scan reading the stored window
+    def test_refresh_and_scan_metrics(self):
+        """
+        GIVEN a symbol seeded from a year of daily bars and a scan snapshot with newer sessions
+        WHEN the long windows are refreshed and the scan computes the symbol's metrics
+        THEN the window should roll forward once per completed session and pct_from_high use the 52-week high.
+        """
+        from financial_data.long_window import RollingWindow, long_window_map, refresh_long_windows
+        from financial_data.market_scan import pack_scan_state
+        from financial_data.models import LongWindowState, MarketScanSnapshot
+        from financial_data.services import LiveScreensService
+
+        # ARRANGE: A seed up to day - 5 with a 52-week high of 200, and a scan with the last month
+        seed = self.days.index(self.day - 5)
+        self.highs[seed - 100] = 200.0
+
+        def download(symbols, before_day):
+            return {'AAPL': RollingWindow.from_bars(self.days[:seed], self.highs[:seed], self.lows[:seed],
+                                                    self.closes[:seed], self.volumes[:seed], before_day)}
+
+        recent = slice(len(self.days) - 21, None)
+        snapshot = MarketScanSnapshot.objects.create(status='complete', state=pack_scan_state({'AAPL': {
+            'days': self.days[recent], 'closes': self.closes[recent], 'highs': self.highs[recent],
+            'lows': self.lows[recent], 'volumes': self.volumes[recent], 'last_ts': None, 'last_volume': None,
+        }}))
+
+        # ACT: Refresh with the last scanned session still open
+        with patch('financial_data.long_window._download_windows', side_effect=download) as mock_download, \
+                patch('financial_data.long_window.completed_before', return_value=self.day - 1):
+            report = refresh_long_windows(['aapl'], snapshot=snapshot)
+            again = refresh_long_windows(['AAPL'], snapshot=snapshot)
+
+        # ASSERT: Seeded once, rolled through day - 2 only, and not rolled twice
+        self.assertEqual((report['seeded'], report['rolled'], again['seeded'], again['rolled']), (1, 1, 0, 0))
+        self.assertEqual(mock_download.call_count, 1)
+        stored = LongWindowState.objects.get(symbol='AAPL')
+        self.assertEqual((stored.last_day, stored.window_high), (self.day - 2, 200.0))
+        stats = long_window_map()['AAPL']
+        self.assertEqual(stats['sessions'], 251)
+
+        # ACT: Scan metrics for the open session from the one-month bars
+        closes, highs = self.closes[recent], self.highs[recent]
+        row = LiveScreensService().scan_metrics('AAPL', closes, highs, self.lows[recent], self.volumes[recent],
+                                                [], {}, stats, self.day - 1)
+        fallback = LiveScreensService().scan_metrics('AAPL', closes, highs, self.lows[recent],
+                                                     self.volumes[recent], [], {})
+
+        # ASSERT: 52-week high from the window, one-month high without it
+        self.assertEqual(row['high_52w'], 200.0)
+        self.assertEqual(row['pct_from_high'], round((closes[-1] - 200.0) / 200.0 * 100, 2))
+        self.assertEqual(fallback['pct_from_high'], round((closes[-1] - max(highs)) / max(highs) * 100, 2))
+        self.assertEqual(row['sma_200'], round(sum(self.closes[-200:]) / 200, 2))
+        self.assertIsNotNone(row['avg_volume'])
+        self.assertIsNone(fallback['sma_200'])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2702: Test for the long-window refresh passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class StockDetailCacheTests(TestCase):
+    """
+    Tests for the split fundamentals / quote / bars caches of fetch_stock_detail.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        import pandas as pd
+
+        from financial_data.services import clear_stock_detail_cache
+
+        index = pd.date_range('2026-10-15 09:30', periods=6, freq='5min', tz='America/New_York')
+        self.hist = pd.DataFrame({
+            'Open': [100.0, 101.0, 102.0, 103.0, 104.0, 105.0],
+            'High': [101.0, 102.0, 103.0, 104.0, 105.0, 106.0],
+            'Low': [99.0, 100.0, 101.0, 102.0, 103.0, 104.0],
+            'Close': [100.5, 101.5, 102.5, 103.5, 104.5, 105.5],
+            'Volume': [1000, 1000, 1000, 1000, 1000, 1000],
+        }, index=index)
+        clear_stock_detail_cache()
+        print(f"{custom_console.COLOR_CYAN}--- Starting StockDetailCacheTest ---{custom_console.RESET_COLOR}")
+
+    def tearDown(self):
+        from financial_data.services import clear_stock_detail_cache
+
+        clear_stock_detail_cache()
+
+    # // ----------------------------------
+    # // Stock Detail Cache Tests
+    # // ----------------------------------
+    # FD-2801: Test for serving timeframe switches from the caches
+    def test_timeframe_switch_reuses_info(self):
+        """
+        GIVEN a stock page opened on the day timeframe
+        WHEN it is reopened and then switched to another timeframe
+        THEN info and the quote should be fetched once, bars once per timeframe, and no fetch should hold yf_lock.
+        """
+        from financial_data.services import fetch_stock_detail, yf_lock
+
+        # ARRANGE: A Ticker mock recording whether yf_lock was held
+        calls = []
+
+        def info():
+            calls.append(('info', yf_lock.locked()))
+            return {'shortName': 'Apple Inc.', 'marketCap': 3_000_000_000_000}
+
+        def history(period, interval, prepost):
+            calls.append((period, yf_lock.locked()))
+            return self.hist
+
+        ticker = MagicMock()
+        type(ticker).info = property(lambda _: info())
+        ticker.history.side_effect = history
+
+        # ACT: Open, reopen, switch timeframe
+        with patch('yfinance.Ticker', return_value=ticker):
+            first = fetch_stock_detail('aapl', 'day')
+            again = fetch_stock_detail('AAPL', 'day', 'epoch')
+            week = fetch_stock_detail('AAPL', 'week')
+
+        # ASSERT: One info and quote (5d) fetch, one bars fetch per timeframe, never under yf_lock
+        self.assertEqual(sorted(call[0] for call in calls), ['2d', '5d', '7d', 'info'])
+        self.assertFalse(any(locked for _, locked in calls))
+
+        # ASSERT: Results built from the cached pieces
+        self.assertEqual((first['symbol'], first['name'], first['price']), ('AAPL', 'Apple Inc.', 105.5))
+        self.assertEqual(again['sparkline'], first['sparkline'])
+        self.assertEqual(again['timestampFormat'], 'epoch_ms')
+        self.assertEqual(week['marketCap'], 3_000_000_000_000)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2801: Test for the stock detail caches passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2802: Test for failed fetches not being cached
+    def test_failed_fetches_not_cached(self):
+        """
+        GIVEN a symbol whose bars come back empty and whose info raises
+        WHEN the stock page is requested twice
+        THEN both requests should return None and fetch again instead of caching the failure.
+        """
+        import pandas as pd
+
+        from financial_data.services import fetch_stock_detail
+
+        # ARRANGE: Empty bars and a failing info
+        ticker = MagicMock()
+        type(ticker).info = property(lambda _: (_ for _ in ()).throw(RuntimeError('boom')))
+        ticker.history.return_value = pd.DataFrame()
+
+        # ACT: Request twice
+        with patch('yfinance.Ticker', return_value=ticker):
+            results = [fetch_stock_detail('ZZZZ', 'day'), fetch_stock_detail('ZZZZ', 'day')]
+
+        # ASSERT: Not found both times, bars and quote fetched both times
+        self.assertEqual(results, [None, None])
+        periods = [call.kwargs['period'] for call in ticker.history.call_args_list]
+        self.assertEqual((periods.count('2d'), periods.count('5d')), (2, 2))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2802: Test for uncached failed fetches passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2803: Test for session fields coming from the short-lived quote
+    def test_quote_fields_not_from_info(self):
+        """
+        GIVEN .info with hours-old volume and previous close, and daily bars for the last sessions
+        WHEN the stock page is requested twice after the quote has expired
+        THEN volume and previous close should come from the daily bars, refetched each time,
+        while info is fetched once.
+        """
+        import pandas as pd
+
+        from financial_data.services import fetch_stock_detail
+
+        # ARRANGE: Stale quote fields in info, two daily sessions, a quote cache that always expires
+        info = MagicMock(return_value={'shortName': 'Apple Inc.', 'volume': 1, 'previousClose': 1.0})
+        daily = pd.DataFrame({
+            'Open': [98.0, 100.0], 'High': [99.0, 106.0], 'Low': [97.0, 99.0],
+            'Close': [98.5, 105.5], 'Volume': [5_000_000, 6_000_000],
+        }, index=pd.date_range('2026-10-14', periods=2, freq='D', tz='America/New_York'))
+
+        ticker = MagicMock()
+        type(ticker).info = property(lambda _: info())
+        ticker.history.side_effect = lambda period, interval, prepost: daily if interval == '1d' else self.hist
+
+        # ACT: Request twice
+        with patch('yfinance.Ticker', return_value=ticker), \
+                patch('financial_data.services.STOCK_QUOTE_CACHE_SECONDS', 0):
+            first = fetch_stock_detail('AAPL', 'day')
+            second = fetch_stock_detail('AAPL', 'day')
+
+        # ASSERT: Session fields from the daily bars, fundamentals from info
+        self.assertEqual((first['volume'], first['previousClose']), (6_000_000, 98.5))
+        self.assertEqual(second['volume'], 6_000_000)
+        self.assertEqual(first['name'], 'Apple Inc.')
+
+        # ASSERT: Quote fetched per request, info once
+        periods = [call.kwargs['period'] for call in ticker.history.call_args_list]
+        self.assertEqual(periods.count('5d'), 2)
+        self.assertEqual(info.call_count, 1)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2803: Test for quote fields from daily bars passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class SymbolSearchIndexTests(TestCase):
+    """
+    Tests for the in-memory symbol search index.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data.reference_data import clear_reference_cache
+        from financial_data.symbol_search import clear_symbol_index
+
+        clear_reference_cache()
+        clear_symbol_index()
+        self.search_url = reverse('search_stocks')
+        print(f"{custom_console.COLOR_CYAN}--- Starting SymbolSearchIndexTest ---{custom_console.RESET_COLOR}")
+
+    def tearDown(self):
+        from financial_data.reference_data import clear_reference_cache
+        from financial_data.symbol_search import clear_symbol_index
+
+        clear_reference_cache()
+        clear_symbol_index()
+
+    # // ----------------------------------
+    # // Symbol Search Index Tests
+    # // ----------------------------------
+    # FD-2901: Test for ranked prefix and name matches
+    def test_index_ranking(self):
+        """
+        GIVEN an index over listing entries
+        WHEN it is queried by symbol prefix, name word and substring
+        THEN exact symbols should rank first, then symbol prefixes, name word prefixes and substrings.
+        """
+        from financial_data.symbol_search import SymbolIndex
+
+        # ARRANGE: A few entries
+        index = SymbolIndex([
+            {'symbol': 'AMD', 'name': 'Advanced Micro Devices', 'type': 'Stock', 'exchange': ''},
+            {'symbol': 'AMZN', 'name': 'Amazon.com Inc.', 'type': 'Stock', 'exchange': ''},
+            {'symbol': 'AM', 'name': 'Antero Midstream', 'type': 'Stock', 'exchange': ''},
+            {'symbol': 'XLF', 'name': 'Financial Select Sector SPDR Fund', 'type': 'ETF', 'exchange': ''},
+            {'symbol': 'BAM', 'name': 'Brookfield Asset Management', 'type': 'Stock', 'exchange': ''},
+            {'symbol': 'LCID', 'name': 'Lucid Group', 'type': 'Stock', 'exchange': ''},
+        ])
+
+        # ACT / ASSERT: Exact, then prefix, then name word prefix, then substring
+        self.assertEqual([r['symbol'] for r in index.search('am')], ['AM', 'AMD', 'AMZN'])
+        self.assertEqual([r['symbol'] for r in index.search('ad')], ['AMD'])
+        self.assertEqual([r['symbol'] for r in index.search('fin')], ['XLF'])
+        self.assertEqual([r['symbol'] for r in index.search('asset')], ['BAM'])
+        self.assertEqual([r['symbol'] for r in index.search('micro dev')], ['AMD'])
+        self.assertEqual([r['symbol'] for r in index.search('cid')], ['LCID'])
+        self.assertEqual(index.search('zzzz'), [])
+
+        # ACT: Replace an entry's name
+        index.add({'symbol': 'LCID', 'name': 'Lucid Motors', 'type': 'Stock', 'exchange': 'NMS'})
+
+        # ASSERT: Old name gone, new name indexed, symbol not duplicated
+        self.assertEqual(index.search('group'), [])
+        self.assertEqual([r['exchange'] for r in index.search('motors')], ['NMS'])
+        self.assertEqual(len(index.search('LCID')), 1)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2901: Test for search index ranking passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2902: Test for network lookups only on unmatched or submitted symbols
+    @patch('financial_data.reference_data.fetch_reference')
+    def test_search_network_only_for_unknown_symbols(self, mock_fetch):
+        """
+        GIVEN the listing file and a stored reference row
+        WHEN the search endpoint is queried for known symbols, typed-out names and unknown tickers
+        THEN only unknown tickers without local matches, or submitted as exact, should be looked up,
+        once each, and found symbols ranked first.
+        """
+        from financial_data.models import ReferenceData
+
+        # ARRANGE: A reference row and lookup results for two unlisted symbols
+        ReferenceData.objects.create(symbol='RKLB', name='Rocket Lab USA', quote_type='EQUITY', exchange='NMS')
+        found = {
+            'QXYZ': {'symbol': 'QXYZ', 'name': 'Qxyz Corp', 'quote_type': 'EQUITY', 'exchange': 'NYQ'},
+            'QXY': {'symbol': 'QXY', 'name': 'Qxy Inc', 'quote_type': 'EQUITY', 'exchange': 'NYQ'},
+        }
+        mock_fetch.side_effect = found.get
+
+        def symbols(query, **params):
+            response = self.client.get(self.search_url, {'q': query, **params})
+            return [r['symbol'] for r in response.json()['results']]
+
+        # ACT / ASSERT: Indexed symbols and every type-ahead prefix of listed names without a lookup
+        self.assertEqual(symbols('AAPL')[0], 'AAPL')
+        for word in ('apple', 'microsoft'):
+            for end in range(1, len(word) + 1):
+                self.assertTrue(symbols(word[:end]), word[:end])
+        self.assertIn('RKLB', symbols('rocket'))
+        self.assertIn('BTC-USD', symbols('bitcoin'))
+        mock_fetch.assert_not_called()
+
+        # ACT: An unknown ticker twice, then one that partly matches it, typed and then submitted
+        first = symbols('QXYZ')
+        second = symbols('QXYZ')
+        typed = symbols('QXY')
+        submitted = symbols('QXY', exact='1')
+
+        # ASSERT: Looked up once when nothing matched, and for the submitted symbol, which is ranked first
+        self.assertEqual((first, second), (['QXYZ'], ['QXYZ']))
+        self.assertEqual(typed, ['QXYZ'])
+        self.assertEqual(submitted, ['QXY', 'QXYZ'])
+        self.assertEqual([call.args[0] for call in mock_fetch.call_args_list], ['QXYZ', 'QXY'])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2902: Test for search network lookups passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-2903: Test for writing the listing from the symbol directory
+    @patch('financial_data.symbol_search.urlopen')
+    def test_update_symbol_listing(self, mock_urlopen):
+        """
+        GIVEN NASDAQ Trader directory files and a listing with crypto and exchange rows
+        WHEN update_symbol_listing is run
+        THEN the listing should hold every non-test exchange symbol in Yahoo form plus the kept crypto rows.
+        """
+        import csv
+        import os
+        import tempfile
+        from io import BytesIO, StringIO
+        from django.core.management import call_command
+        from financial_data.symbol_search import listing_entries
+
+        # ARRANGE: Directory files (pipe-delimited, trailing creation time line) and a current listing
+        nasdaq = ("Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares\n"
+                  "AAPL|Apple Inc. - Common Stock|Q|N|N|100|N|N\n"
+                  "QQQ|Invesco QQQ Trust, Series 1|G|N|N|100|Y|N\n"
+                  "ZXZZT|NASDAQ TEST STOCK|G|Y|N|100|N|N\n"
+                  "File Creation Time: 1019202608:00|||||||\n")
+        other = ("ACT Symbol|Security Name|Exchange|CQS Symbol|ETF|Round Lot Size|Test Issue|NASDAQ Symbol\n"
+                 "BRK.B|Berkshire Hathaway Inc. Class B|N|BRK.B|N|100|N|BRK.B\n"
+                 "SPY|SPDR S&P 500 ETF Trust|P|SPY|Y|100|N|SPY\n"
+                 "File Creation Time: 1019202608:00|||||||\n")
+        mock_urlopen.side_effect = lambda url, timeout: BytesIO((nasdaq if 'nasdaqlisted' in url else other).encode())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'symbol_listing.csv')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("symbol,name,quote_type,exchange\nBTC-USD,Bitcoin USD,CRYPTOCURRENCY,\nOLD,Delisted Inc.,EQUITY,\n")
+
+            # ACT: Rewrite the listing
+            call_command('update_symbol_listing', '--output', path, stdout=StringIO())
+            with open(path, newline='', encoding='utf-8') as f:
+                rows = {row['symbol']: row for row in csv.DictReader(f)}
+            entries = listing_entries(path)
+
+        # ASSERT: Exchange symbols replace the old ones, test issues are skipped and crypto is kept
+        self.assertEqual(sorted(rows), ['AAPL', 'BRK-B', 'BTC-USD', 'QQQ', 'SPY'])
+        self.assertEqual(rows['BRK-B']['exchange'], 'NYQ')
+        self.assertEqual((rows['SPY']['quote_type'], rows['SPY']['exchange']), ('ETF', 'PCX'))
+        self.assertEqual((rows['AAPL']['quote_type'], rows['AAPL']['exchange']), ('EQUITY', 'NMS'))
+        self.assertIn({'symbol': 'QQQ', 'name': 'Invesco QQQ Trust, Series 1', 'type': 'ETF', 'exchange': 'NMS'},
+                      entries)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-2903: Test for symbol listing update passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class SymbolSearchCacheTests(TestCase):
+    """
+    Tests for the symbol search query cache.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data.symbol_search import clear_symbol_index
+
+        clear_symbol_index()
+        print(f"{custom_console.COLOR_CYAN}--- Starting SymbolSearchCacheTest ---{custom_console.RESET_COLOR}")
+
+    def tearDown(self):
+        from financial_data.symbol_search import clear_symbol_index
+
+        clear_symbol_index()
+
+    # // ----------------------------------
+    # // Symbol Search Cache Tests
+    # // ----------------------------------
+    # FD-3001: Test for prefix reuse matching uncached results
+    def test_prefix_reuse_matches_index(self):
+        """
+        GIVEN an index rebuilt with precomputed single-character queries
+        WHEN a user types queries one character at a time
+        THEN each result should equal an uncached search, with longer queries checking only a prefix's matches.
+        """
+        from financial_data import symbol_search
+        from financial_data.symbol_search import SymbolIndex, listing_entries
+
+        # ARRANGE: The listing plus a few entries whose names contain, but don't start with, a query
+        index = SymbolIndex(listing_entries() + [
+            {'symbol': 'ZAPP', 'name': 'Zapple Holdings', 'type': 'Stock', 'exchange': ''},
+            {'symbol': 'PAPL', 'name': 'Pineapple Energy', 'type': 'Stock', 'exchange': ''},
+        ])
+        checked = []
+        matches = index.matches
+
+        def recording(query, within=None):
+            checked.append((query, within is not None))
+            return matches(query, within)
+
+        # ACT: Rebuild, then type 'apple' and 'micro dev'
+        with patch('financial_data.symbol_search.build_index', return_value=index), \
+                patch.object(index, 'matches', side_effect=recording):
+            symbol_search.symbol_index()
+            precomputed = len(symbol_search._search_cache)
+            typed = {}
+            for word in ('apple', 'micro dev'):
+                for length in range(1, len(word) + 1):
+                    typed[word[:length]] = [r['symbol'] for r in symbol_search.search_symbols(word[:length])]
+
+        # ASSERT: Same results as searching the index directly
+        for query, symbols in typed.items():
+            expected = [index.entries[i]['symbol']
+                        for i in matches(symbol_search._normalize(query))][:symbol_search.SEARCH_RESULT_LIMIT]
+            self.assertEqual(symbols, expected, query)
+        self.assertIn('PAPL', typed['apple'])
+        self.assertEqual(typed['apple'][0], 'AAPL')
+
+        # ASSERT: Single characters precomputed; only the 3-character step went back to the indexes
+        self.assertGreater(precomputed, 10)
+        typed_checks = checked[precomputed:]
+        self.assertEqual([query for query, reused in typed_checks if not reused], ['APP', 'MIC'])
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-3001: Test for search prefix reuse passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-3002: Test for the LRU bound and TTL
+    @patch('financial_data.symbol_search.SEARCH_CACHE_SIZE', 3)
+    def test_cache_bounds(self):
+        """
+        GIVEN a query cache limited to three queries
+        WHEN more queries are made and time passes
+        THEN the least recently used should be evicted and expired ones recomputed.
+        """
+        import time
+
+        from financial_data import symbol_search
+        from financial_data.symbol_search import SymbolIndex
+
+        # ARRANGE: A small index, nothing precomputed
+        index = SymbolIndex([{'symbol': symbol, 'name': symbol, 'type': 'Stock', 'exchange': ''}
+                             for symbol in ('AAA', 'BBB', 'CCC', 'DDD')])
+        symbol_search._search_cache.clear()
+
+        # ACT: Four queries, re-using the first one before the fourth
+        with patch('financial_data.symbol_search.symbol_index', return_value=index):
+            for query in ('aaa', 'bbb', 'ccc', 'aaa', 'ddd'):
+                symbol_search.search_symbols(query)
+            cached = list(symbol_search._search_cache)
+
+            # ACT: Past the TTL
+            with patch('financial_data.symbol_search.time.time',
+                       return_value=time.time() + symbol_search.SEARCH_CACHE_SECONDS + 1), \
+                    patch.object(index, 'matches', wraps=index.matches) as mock_matches:
+                results = symbol_search.search_symbols('ddd')
+
+        # ASSERT: BBB evicted, most recent last; the expired query recomputed
+        self.assertEqual(cached, ['CCC', 'AAA', 'DDD'])
+        self.assertEqual([r['symbol'] for r in results], ['DDD'])
+        mock_matches.assert_called_once()
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-3002: Test for search cache bounds passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class InvalidSymbolCacheTests(TestCase):
+    """
+    Tests for the negative cache of symbols that returned no data.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data import indicators
+        from financial_data.bar_store import bar_store
+        from financial_data.invalid_symbols import clear_invalid_symbols
+        from financial_data.services import clear_stock_detail_cache
+
+        indicators._cache.clear()
+        bar_store.clear()
+        clear_invalid_symbols()
+        clear_stock_detail_cache()
+        print(f"{custom_console.COLOR_CYAN}--- Starting InvalidSymbolCacheTest ---{custom_console.RESET_COLOR}")
+
+    def tearDown(self):
+        from financial_data.invalid_symbols import clear_invalid_symbols
+        from financial_data.services import clear_stock_detail_cache
+
+        clear_invalid_symbols()
+        clear_stock_detail_cache()
+
+    # // ----------------------------------
+    # // Invalid Symbol Cache Tests
+    # // ----------------------------------
+    # FD-3101: Test for backoff, expiry and which errors count as a miss
+    def test_backoff_expiry_and_errors(self):
+        """
+        GIVEN a symbol that keeps returning no data
+        WHEN misses are recorded and time passes
+        THEN each miss should double the block up to the cap, expire, clear on a hit, and rate limits should never count.
+        """
+        import time
+
+        from yfinance.exceptions import YFRateLimitError
+
+        from financial_data import invalid_symbols
+        from financial_data.invalid_symbols import (
+            INVALID_SYMBOL_MAX_SECONDS, INVALID_SYMBOL_SECONDS, is_invalid, is_missing_symbol_error,
+            partition, record_hit, record_miss,
+        )
+
+        # ARRANGE: A fixed clock
+        now = time.time()
+
+        # ACT: Three misses
+        with patch('financial_data.invalid_symbols.time.time', return_value=now):
+            blocks = []
+            for _ in range(3):
+                record_miss('badx')
+                blocks.append(invalid_symbols._invalid['BADX'][0] - now)
+            split = partition(['AAPL', 'badx'])
+
+        # ASSERT: Doubling blocks, case-insensitive, order kept
+        self.assertEqual(blocks, [INVALID_SYMBOL_SECONDS, 2 * INVALID_SYMBOL_SECONDS, 4 * INVALID_SYMBOL_SECONDS])
+        self.assertEqual(split, (['AAPL'], ['badx']))
+
+        # ASSERT: Expired after the block, capped after many misses, cleared by a hit
+        with patch('financial_data.invalid_symbols.time.time', return_value=now + blocks[-1] + 1):
+            self.assertFalse(is_invalid('BADX'))
+        for _ in range(20):
+            record_miss('BADX')
+        self.assertLessEqual(invalid_symbols._invalid['BADX'][0] - time.time(), INVALID_SYMBOL_MAX_SECONDS)
+        record_hit('badx')
+        self.assertFalse(is_invalid('BADX'))
+
+        # ASSERT: Only "this symbol doesn't exist" errors are misses
+        self.assertTrue(is_missing_symbol_error(Exception('HTTP Error 404: Quote not found for symbol: BADX')))
+        self.assertTrue(is_missing_symbol_error(Exception('$BADX: possibly delisted; no price data found')))
+        self.assertFalse(is_missing_symbol_error(YFRateLimitError()))
+        self.assertFalse(is_missing_symbol_error(repr(YFRateLimitError())))
+        self.assertFalse(is_missing_symbol_error(None))
+        self.assertFalse(is_missing_symbol_error(ConnectionError('Connection reset')))
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-3101: Test for invalid symbol backoff passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-3102: Test for known-bad symbols failing fast without upstream calls
+    @patch('financial_data.indicators.yf.download')
+    def test_known_bad_symbols_skip_yahoo(self, mock_download):
+        """
+        GIVEN a batch indicators request where one symbol returns no daily bars
+        WHEN it is requested again, and then on the stock page, indicators and search
+        THEN the symbol should fail fast everywhere without another Yahoo call.
+        """
+        import numpy as np
+        import pandas as pd
+
+        from financial_data.bar_store import bar_store
+        from financial_data.invalid_symbols import INVALID_SYMBOL_ERROR
+        from financial_data.services import fetch_stock_detail
+        from financial_data.symbol_search import search_symbols
+
+        # ARRANGE: A daily download with AAPL but no BADX, which yfinance reported as delisted
+        dates = pd.date_range(start='2026-01-01', periods=60, freq='D')
+        closes = 100 + np.arange(60, dtype=float)
+        mock_download.return_value = pd.concat({'AAPL': pd.DataFrame({
+            'Open': closes, 'High': closes + 1, 'Low': closes - 1, 'Close': closes, 'Volume': 1_000_000.0,
+        }, index=dates)}, axis=1)
+        url = f"{reverse('batch_technical_indicators')}?symbols=AAPL,BADX&period=1Y&interval=1d&indicator=RSI"
+
+        # ACT: Request the batch twice
+        with patch.dict('yfinance.shared._ERRORS', {'BADX': '$BADX: possibly delisted; no price data found'}):
+            first = self.client.get(url).json()
+            second = self.client.get(url).json()
+
+        # ASSERT: BADX downloaded once, then answered from the negative cache
+        self.assertEqual(mock_download.call_count, 1)
+        self.assertEqual(set(first['results']), {'AAPL'})
+        self.assertEqual(second['errors'], {'BADX': INVALID_SYMBOL_ERROR})
+        self.assertIn('AAPL', second['results'])
+
+        # ACT: Stock page, indicators and search for BADX
+        with patch('yfinance.Ticker') as mock_ticker, \
+                patch('financial_data.reference_data.fetch_reference') as mock_reference:
+            detail = fetch_stock_detail('badx', 'day')
+            bars = bar_store.ensure('BADX')
+            response = self.client.get(reverse('technical_indicators', args=['BADX']))
+            results = search_symbols('BADX')
+
+        # ASSERT: Not found everywhere, and no Yahoo calls
+        self.assertIsNone(detail)
+        self.assertIsNone(bars)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json()['error'], INVALID_SYMBOL_ERROR)
+        self.assertEqual(results, [])
+        mock_ticker.assert_not_called()
+        mock_reference.assert_not_called()
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-3102: Test for known-bad symbols failing fast passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-3103: Test for throttled symbols never being recorded
+    @patch('financial_data.indicators.yf.download')
+    def test_throttled_symbols_not_recorded(self, mock_download):
+        """
+        GIVEN a batch where one symbol was throttled and one came back empty without an error
+        WHEN the batch is requested twice, and the stock page gets empty daily bars
+        THEN neither symbol should be marked invalid, and both should be downloaded again.
+        """
+        import numpy as np
+        import pandas as pd
+        from yfinance.exceptions import YFRateLimitError
+
+        from financial_data.indicators import download_bars_batch
+        from financial_data.invalid_symbols import is_invalid
+        from financial_data.services import stock_bars_future
+
+        # ARRANGE: A daily download with only AAPL, and a rate limit error kept for THRT
+        dates = pd.date_range(start='2026-01-01', periods=30, freq='D')
+        closes = 100 + np.arange(30, dtype=float)
+        mock_download.return_value = pd.concat({'AAPL': pd.DataFrame({
+            'Open': closes, 'High': closes + 1, 'Low': closes - 1, 'Close': closes, 'Volume': 1_000_000.0,
+        }, index=dates)}, axis=1)
+        ticker = MagicMock()
+        ticker.history.return_value = pd.DataFrame()
+        ticker._price_history._last_error = None
+
+        # ACT: Two batches, then the stock page's daily bars for EMPTY
+        with patch.dict('yfinance.shared._ERRORS', {'THRT': repr(YFRateLimitError())}):
+            for _ in range(2):
+                frames = download_bars_batch(['AAPL', 'THRT', 'EMPTY'], '1y', '1d')
+        with patch('yfinance.Ticker', return_value=ticker):
+            bars = stock_bars_future('EMPTY', 'month').result()
+
+        # ASSERT: Nothing recorded, both downloads asked for every symbol
+        self.assertEqual(set(frames), {'AAPL'})
+        self.assertTrue(bars.empty)
+        self.assertFalse(is_invalid('THRT'))
+        self.assertFalse(is_invalid('EMPTY'))
+        self.assertEqual([call.args[0] for call in mock_download.call_args_list], [['AAPL', 'THRT', 'EMPTY']] * 2)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-3103: Test for throttled symbols not being recorded passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+
+class StockBundleTests(TestCase):
+    """
+    Tests for the stock-bundle API endpoint.
+    """
+
+    def setUp(self):
+        """Set up test environment."""
+        from financial_data import indicators
+        from financial_data.bar_store import bar_store
+        from financial_data.invalid_symbols import clear_invalid_symbols
+        from financial_data.services import clear_stock_detail_cache
+
+        self.bundle_url = reverse('stock_bundle')
+        indicators._cache.clear()
+        bar_store.clear()
+        clear_invalid_symbols()
+        clear_stock_detail_cache()
+        print(f"{custom_console.COLOR_CYAN}--- Starting StockBundleTest ---{custom_console.RESET_COLOR}")
+
+    def tearDown(self):
+        from financial_data.bar_store import bar_store
+        from financial_data.invalid_symbols import clear_invalid_symbols
+        from financial_data.services import clear_stock_detail_cache
+
+        bar_store.clear()
+        clear_invalid_symbols()
+        clear_stock_detail_cache()
+
+    def _mock_ticker(self, sessions=10):
+        """A Ticker mock serving regular-hours 5m bars (and nothing coarser) plus .info."""
+        import numpy as np
+        import pandas as pd
+
+        index = []
+        for day in pd.bdate_range('2026-10-05', periods=sessions):
+            index += list(pd.date_range(day + pd.Timedelta('9h30min'), day + pd.Timedelta('15h55min'), freq='5min'))
+        index = pd.DatetimeIndex(index).tz_localize('America/New_York')
+        closes = 100 + np.arange(len(index)) * 0.01
+        bars = pd.DataFrame({
+            'Open': closes, 'High': closes + 1, 'Low': closes - 1, 'Close': closes, 'Volume': 1000.0,
+        }, index=index) if sessions else pd.DataFrame()
+
+        ticker = MagicMock()
+        ticker.info = {'shortName': 'Apple Inc.', 'marketCap': 3_000_000_000_000} if sessions else {}
+        ticker.history.side_effect = lambda period, interval, **kwargs: bars if interval == '5m' else pd.DataFrame()
+        return ticker, bars
+
+    # // ----------------------------------
+    # // Stock Bundle Endpoint Tests
+    # // ----------------------------------
+    # FD-3201: Test for every section built from one set of bars
+    @patch('financial_data.signal_store.request_signals')
+    def test_bundle_shares_bars(self, mock_signals):
+        """
+        GIVEN a symbol not yet in the bar store
+        WHEN the bundle is requested for the month timeframe with every section
+        THEN detail and indicators should come from the store's one seed download, and signals from the signal store.
+        """
+        from financial_data.indicators import _cache
+
+        # ARRANGE: Ticker and signal store mocks
+        ticker, bars = self._mock_ticker()
+        mock_signals.return_value = {'status': 'complete', 'signals': [], 'last_bar_ts': None}
+
+        # ACT: Request the bundle
+        with patch('yfinance.Ticker', return_value=ticker):
+            response = self.client.get(f"{self.bundle_url}?symbol=aapl&timeframe=month")
+
+        # ASSERT: Every section returned
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body['sections'], ['detail', 'indicators', 'signals'])
+        self.assertEqual(body['errors'], {})
+        self.assertEqual(body['detail']['name'], 'Apple Inc.')
+        self.assertEqual(body['detail']['sparkline'], body['indicators']['closes'])
+        self.assertAlmostEqual(body['detail']['price'], bars['Close'].iloc[-1])
+        self.assertEqual((body['indicators']['period'], body['indicators']['interval']), ('1M', '1d'))
+        self.assertIn('overallSignal', body['indicators'])
+        mock_signals.assert_called_once_with('AAPL', 'month', 'exact')
+
+        # ASSERT: Only the bar store seed downloaded bars, and the indicators payload is shared
+        self.assertEqual(sorted(call.kwargs['interval'] for call in ticker.history.call_args_list), ['1d', '1h', '5m'])
+        self.assertEqual(len(_cache), 1)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-3201: Test for bundle sections sharing bars passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
+
+    # FD-3202: Test for section selection and errors
+    def test_bundle_sections_and_errors(self):
+        """
+        GIVEN requests for selected sections, unknown sections and a symbol without data
+        WHEN the bundle is requested
+        THEN only the selected sections should be fetched, and bad requests rejected.
+        """
+        # ARRANGE: A symbol with data and one without
+        ticker, _ = self._mock_ticker()
+        empty_ticker, _ = self._mock_ticker(sessions=0)
+
+        # ACT: Day detail only, an unknown section, and a symbol without data
+        with patch('yfinance.Ticker', return_value=ticker):
+            detail_only = self.client.get(f"{self.bundle_url}?symbol=AAPL&sections=detail")
+        invalid = self.client.get(f"{self.bundle_url}?symbol=AAPL&sections=detail,options")
+        missing_symbol = self.client.get(f"{self.bundle_url}?sections=detail")
+        with patch('yfinance.Ticker', return_value=empty_ticker):
+            not_found = self.client.get(f"{self.bundle_url}?symbol=ZZZZ&sections=detail,indicators")
+
+        # ASSERT: Only the detail section, from the stock page bars and quote (no bar store seed)
+        self.assertEqual(detail_only.status_code, status.HTTP_200_OK)
+        body = detail_only.json()
+        self.assertEqual(body['sections'], ['detail'])
+        self.assertNotIn('indicators', body)
+        self.assertNotIn('signals', body)
+        self.assertEqual(sorted(call.kwargs['period'] for call in ticker.history.call_args_list), ['2d', '5d'])
+
+        # ASSERT: Bad requests rejected, symbols without data not found
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(missing_symbol.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(not_found.status_code, status.HTTP_404_NOT_FOUND)
+
+        print(f"{custom_console.COLOR_GREEN}✅ FD-3202: Test for bundle sections and errors passed.{custom_console.RESET_COLOR}")
+        print("----------------------------------\n")
@@ -0,0 +1,124 @@
+"""
+Timestamp encoding for chart responses.
+
+Chart endpoints used to format every bar with strftime/replace/lower in a
+Python loop. Two cheaper options live here:
+
+- encode_timestamps(index, mode='epoch' | 'delta'): integer epoch
+  milliseconds, optionally delta-encoded (first value absolute, then the
+  gap to the previous bar). Regular intraday bars compress to a run of
+  identical small integers, so the JSON is a fraction of the label size.
+- format_timestamp_labels(index, period): the legacy axis labels, but each
+  distinct label is formatted only once (per time-of-day, weekday+time or
+  calendar date) and broadcast back to the bars with NumPy.
+"""
+import numpy as np
+import pandas as pd
+
+MINUTE_MS = 60 * 1000
+DAY_MS = 24 * 60 * MINUTE_MS
+
+# Values accepted by the `timestamps` query param on chart endpoints
+TIMESTAMP_MODES = ('label', 'epoch', 'delta')
+
+# Reported back as 'timestampFormat' so clients know how to decode
+TIMESTAMP_FORMATS = {
+    'label': 'label',
+    'epoch': 'epoch_ms',
+    'delta': 'epoch_ms_delta',
+}
+
+# stock_detail timeframes -> label periods used by the indicators endpoint
+TIMEFRAME_LABEL_PERIODS = {
+    'day': '1D',
+    'week': '1W',
+    'month': '1M',
+    'year': '1Y',
+}
+
+
+def parse_timestamp_mode(value):
+    """Normalize a `timestamps` query param. Returns None if it is not a known mode."""
+    mode = (value or 'label').lower()
+    return mode if mode in TIMESTAMP_MODES else None
+
+
+def epoch_ms(index):
+    """UTC epoch milliseconds (int64 array) for a DatetimeIndex. Naive indexes are taken as UTC."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.as_unit('ms').asi8
+
+
+def delta_encode(values):
+    """[t0, t1 - t0, t2 - t1, ...] as a list of ints."""
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) == 0:
+        return []
+    return np.concatenate((values[:1], np.diff(values))).tolist()
+
+
+def delta_decode(values):
+    """Inverse of delta_encode."""
+    return np.cumsum(np.asarray(values, dtype=np.int64)).tolist()
+
+
+def _format_label(ts, period):
+    if period == '1D':
+        # For day view, show time only (h:MMam/pm)
+        return ts.strftime('%I:%M%p').lstrip('0').lower()
+    if period == '1W':
+        # For week view, show day and time (Mon h:MMam)
+        return ts.strftime('%a %I:%M%p').replace(' 0', ' ').lower()
+    # For month/year view, show date (Jan 15)
+    return ts.strftime('%b %d').replace(' 0', ' ')
+
+
+def format_timestamp_labels(index, period):
+    """
+    Format bar timestamps for the chart axis based on period (not interval).
+
+    Labels only depend on time-of-day (1D), weekday + time-of-day (1W) or the
+    calendar date (1M/1Y), so only the distinct keys are run through strftime.
+    """
+    index = pd.DatetimeIndex(index)
+    if len(index) == 0:
+        return []
+
+    # Exchange wall-clock milliseconds - what the labels show
+    local = index.tz_localize(None) if index.tz is not None else index
+    local_ms = local.as_unit('ms').asi8
+
+    minute_of_day = (local_ms % DAY_MS) // MINUTE_MS
+    days = local_ms // DAY_MS
+    if period == '1D':
+        keys = minute_of_day
+    elif period == '1W':
+        keys = (days % 7) * (DAY_MS // MINUTE_MS) + minute_of_day
+    else:
+        keys = days
+
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    labels = np.array([_format_label(index[i], period) for i in first], dtype=object)
+    return labels[inverse].tolist()
+
+
+def encode_timestamps(index, mode='label', period='1D'):
+    """
+    Timestamp fields for a chart response.
+
+    Returns {'timestamps': [...], 'timestampFormat': ...} where timestamps are
+    axis labels ('label'), epoch ms ('epoch') or delta-encoded epoch ms ('delta').
+    """
+    if mode == 'epoch':
+        timestamps = epoch_ms(index).tolist()
+    elif mode == 'delta':
+        timestamps = delta_encode(epoch_ms(index))
+    else:
+        mode = 'label'
+        timestamps = format_timestamp_labels(index, period)
+    return {
+        'timestamps': timestamps,
+        'timestampFormat': TIMESTAMP_FORMATS[mode],
+    }
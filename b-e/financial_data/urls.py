@@ -1,13 +1,24 @@
 from django.urls import path
 from . import views
-from .indicators import technical_indicators
+from .indicators import technical_indicators, batch_technical_indicators, indicator_sweep
 
 urlpatterns = [
     path('', views.market_data, name='market_data'),
     path('health/', views.health_check, name='health_check'),
     path('stock-detail/', views.stock_detail, name='stock_detail'),
+    path('stock-bundle/', views.stock_bundle, name='stock_bundle'),
     path('search/', views.search_stocks, name='search_stocks'),
     path('live-screens/', views.live_screens, name='live_screens'),
+    path('live-screens/scan/', views.market_scan_status, name='market_scan_status'),
+    path('live-screens/stream/', views.live_screens_stream, name='live_screens_stream'),
+    path('screens/', views.user_screens, name='user_screens'),
+    path('screens/evaluate/', views.evaluate_screen, name='evaluate_screen'),
+    path('screens/<int:screen_id>/', views.user_screen_detail, name='user_screen_detail'),
     path('historical-signals/', views.historical_signals, name='historical_signals'),
+    path('historical-signals/jobs/<str:job_id>/', views.historical_signals_job, name='historical_signals_job'),
+    path('backtest/summary/', views.backtest_summary, name='backtest_summary'),
+    path('backtest/summary/jobs/<str:job_id>/', views.backtest_summary_job, name='backtest_summary_job'),
+    path('indicators-batch/', batch_technical_indicators, name='batch_technical_indicators'),
+    path('indicators-sweep/<str:symbol>/', indicator_sweep, name='indicator_sweep'),
     path('indicators/<str:symbol>/', technical_indicators, name='technical_indicators'),
 ]
\ No newline at end of file
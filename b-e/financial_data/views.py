@@ -4,6 +4,7 @@ from django.views.decorators.http import require_GET, require_http_methods
 import json
 import time
 from .services import FinancialDataService, fetch_all_tickers_batch, fetch_stock_detail
+from .timestamps import parse_timestamp_mode
 
 
 @require_http_methods(["GET", "OPTIONS"])
@@ -36,6 +37,8 @@ def search_stocks(request):
     
     Query params:
     - q: Search query (required, min 1 character)
+    - exact: '1' when the user submitted `q` as a symbol; an unlisted ticker
+      is then looked up on Yahoo even if it partly matches listed ones
     """
     if request.method == 'OPTIONS':
         response = JsonResponse({})
@@ -50,308 +53,15 @@ def search_stocks(request):
     if len(query) < 1:
         return JsonResponse({'results': []})
     
-    import yfinance as yf
+    from .symbol_search import search_symbols
     
     results = []
     
+    exact = request.GET.get('exact', '').lower() in ('1', 'true')
+    
     try:
-        # Use yfinance search functionality
-        # First, try to get info for the exact symbol (case insensitive)
-        try:
-            ticker = yf.Ticker(query.upper())
-            info = ticker.info
-            if info and info.get('symbol'):
-                # Determine the type
-                quote_type = info.get('quoteType', 'EQUITY')
-                type_map = {
-                    'EQUITY': 'Stock',
-                    'ETF': 'ETF',
-                    'MUTUALFUND': 'Mutual Fund',
-                    'CRYPTOCURRENCY': 'Crypto',
-                    'CURRENCY': 'Currency',
-                    'INDEX': 'Index',
-                    'FUTURE': 'Futures',
-                }
-                asset_type = type_map.get(quote_type, 'Stock')
-                
-                results.append({
-                    'symbol': info.get('symbol'),
-                    'name': info.get('shortName') or info.get('longName') or info.get('symbol'),
-                    'type': asset_type,
-                    'exchange': info.get('exchange', ''),
-                })
-        except Exception as e:
-            print(f"Direct lookup failed: {e}")
-        
-        # Also search using yfinance's search (if available) or use a broader approach
-        # yfinance doesn't have built-in search, so we'll use a workaround with popular tickers
-        
-        # Common stocks/ETFs to search through for partial matches
-        common_symbols = {
-            # Tech giants
-            'AAPL': 'Apple Inc.',
-            'GOOGL': 'Alphabet Inc. Class A',
-            'GOOG': 'Alphabet Inc. Class C',
-            'MSFT': 'Microsoft Corporation',
-            'AMZN': 'Amazon.com Inc.',
-            'META': 'Meta Platforms Inc.',
-            'TSLA': 'Tesla Inc.',
-            'NVDA': 'NVIDIA Corporation',
-            'AMD': 'Advanced Micro Devices',
-            'INTC': 'Intel Corporation',
-            'CRM': 'Salesforce Inc.',
-            'ORCL': 'Oracle Corporation',
-            'ADBE': 'Adobe Inc.',
-            'NFLX': 'Netflix Inc.',
-            'PYPL': 'PayPal Holdings',
-            'SHOP': 'Shopify Inc.',
-            'SQ': 'Block Inc.',
-            'UBER': 'Uber Technologies',
-            'LYFT': 'Lyft Inc.',
-            'SNAP': 'Snap Inc.',
-            'PINS': 'Pinterest Inc.',
-            'TWTR': 'Twitter Inc.',
-            'SPOT': 'Spotify Technology',
-            'ZM': 'Zoom Video Communications',
-            'DOCU': 'DocuSign Inc.',
-            'CRWD': 'CrowdStrike Holdings',
-            'PLTR': 'Palantir Technologies',
-            'SNOW': 'Snowflake Inc.',
-            'COIN': 'Coinbase Global',
-            'RBLX': 'Roblox Corporation',
-            'U': 'Unity Software',
-            'PATH': 'UiPath Inc.',
-            'AI': 'C3.ai Inc.',
-            'DDOG': 'Datadog Inc.',
-            'MDB': 'MongoDB Inc.',
-            'NET': 'Cloudflare Inc.',
-            'OKTA': 'Okta Inc.',
-            'TEAM': 'Atlassian Corporation',
-            'NOW': 'ServiceNow Inc.',
-            'WDAY': 'Workday Inc.',
-            
-            # Finance
-            'JPM': 'JPMorgan Chase & Co.',
-            'BAC': 'Bank of America Corp.',
-            'WFC': 'Wells Fargo & Co.',
-            'C': 'Citigroup Inc.',
-            'GS': 'Goldman Sachs Group',
-            'MS': 'Morgan Stanley',
-            'V': 'Visa Inc.',
-            'MA': 'Mastercard Inc.',
-            'AXP': 'American Express',
-            'BLK': 'BlackRock Inc.',
-            'SCHW': 'Charles Schwab',
-            'USB': 'U.S. Bancorp',
-            'PNC': 'PNC Financial Services',
-            'TFC': 'Truist Financial',
-            'COF': 'Capital One Financial',
-            
-            # Healthcare
-            'JNJ': 'Johnson & Johnson',
-            'UNH': 'UnitedHealth Group',
-            'PFE': 'Pfizer Inc.',
-            'MRK': 'Merck & Co.',
-            'ABBV': 'AbbVie Inc.',
-            'LLY': 'Eli Lilly and Co.',
-            'TMO': 'Thermo Fisher Scientific',
-            'ABT': 'Abbott Laboratories',
-            'BMY': 'Bristol-Myers Squibb',
-            'AMGN': 'Amgen Inc.',
-            'GILD': 'Gilead Sciences',
-            'MDT': 'Medtronic PLC',
-            'CVS': 'CVS Health Corp.',
-            'MRNA': 'Moderna Inc.',
-            'BNTX': 'BioNTech SE',
-            
-            # Consumer
-            'WMT': 'Walmart Inc.',
-            'HD': 'Home Depot Inc.',
-            'PG': 'Procter & Gamble Co.',
-            'KO': 'Coca-Cola Co.',
-            'PEP': 'PepsiCo Inc.',
-            'COST': 'Costco Wholesale',
-            'NKE': 'Nike Inc.',
-            'MCD': 'McDonald\'s Corp.',
-            'SBUX': 'Starbucks Corp.',
-            'TGT': 'Target Corp.',
-            'LOW': 'Lowe\'s Companies',
-            'DIS': 'Walt Disney Co.',
-            'CMCSA': 'Comcast Corp.',
-            'ABNB': 'Airbnb Inc.',
-            
-            # Energy
-            'XOM': 'Exxon Mobil Corp.',
-            'CVX': 'Chevron Corp.',
-            'COP': 'ConocoPhillips',
-            'OXY': 'Occidental Petroleum',
-            'SLB': 'Schlumberger Ltd.',
-            'EOG': 'EOG Resources',
-            'MPC': 'Marathon Petroleum',
-            'VLO': 'Valero Energy',
-            'PSX': 'Phillips 66',
-            
-            # Industrial
-            'CAT': 'Caterpillar Inc.',
-            'DE': 'Deere & Co.',
-            'BA': 'Boeing Co.',
-            'HON': 'Honeywell International',
-            'UPS': 'United Parcel Service',
-            'FDX': 'FedEx Corp.',
-            'LMT': 'Lockheed Martin',
-            'RTX': 'RTX Corporation',
-            'GE': 'General Electric',
-            'MMM': '3M Company',
-            'UNP': 'Union Pacific',
-            
-            # Telecom
-            'T': 'AT&T Inc.',
-            'VZ': 'Verizon Communications',
-            'TMUS': 'T-Mobile US',
-            
-            # ETFs
-            'SPY': 'SPDR S&P 500 ETF Trust',
-            'QQQ': 'Invesco QQQ Trust',
-            'IWM': 'iShares Russell 2000 ETF',
-            'DIA': 'SPDR Dow Jones Industrial Average ETF',
-            'VTI': 'Vanguard Total Stock Market ETF',
-            'VOO': 'Vanguard S&P 500 ETF',
-            'VXX': 'iPath Series B S&P 500 VIX Short-Term Futures ETN',
-            'ARKK': 'ARK Innovation ETF',
-            'ARKG': 'ARK Genomic Revolution ETF',
-            'ARKF': 'ARK Fintech Innovation ETF',
-            'XLF': 'Financial Select Sector SPDR Fund',
-            'XLK': 'Technology Select Sector SPDR Fund',
-            'XLE': 'Energy Select Sector SPDR Fund',
-            'XLV': 'Health Care Select Sector SPDR Fund',
-            'XLI': 'Industrial Select Sector SPDR Fund',
-            'XLP': 'Consumer Staples Select Sector SPDR Fund',
-            'XLY': 'Consumer Discretionary Select Sector SPDR Fund',
-            'XLB': 'Materials Select Sector SPDR Fund',
-            'XLU': 'Utilities Select Sector SPDR Fund',
-            'XLRE': 'Real Estate Select Sector SPDR Fund',
-            'GLD': 'SPDR Gold Trust',
-            'SLV': 'iShares Silver Trust',
-            'USO': 'United States Oil Fund',
-            'TLT': 'iShares 20+ Year Treasury Bond ETF',
-            'HYG': 'iShares iBoxx $ High Yield Corporate Bond ETF',
-            'LQD': 'iShares iBoxx $ Investment Grade Corporate Bond ETF',
-            'EEM': 'iShares MSCI Emerging Markets ETF',
-            'EFA': 'iShares MSCI EAFE ETF',
-            'VWO': 'Vanguard FTSE Emerging Markets ETF',
-            'VEA': 'Vanguard FTSE Developed Markets ETF',
-            'IEMG': 'iShares Core MSCI Emerging Markets ETF',
-            'VNQ': 'Vanguard Real Estate ETF',
-            'SCHD': 'Schwab U.S. Dividend Equity ETF',
-            'JEPI': 'JPMorgan Equity Premium Income ETF',
-            'SMH': 'VanEck Semiconductor ETF',
-            'SOXX': 'iShares Semiconductor ETF',
-            'IBB': 'iShares Biotechnology ETF',
-            'XBI': 'SPDR S&P Biotech ETF',
-            
-            # Crypto
-            'BTC-USD': 'Bitcoin USD',
-            'ETH-USD': 'Ethereum USD',
-            'SOL-USD': 'Solana USD',
-            'XRP-USD': 'XRP USD',
-            'ADA-USD': 'Cardano USD',
-            'DOGE-USD': 'Dogecoin USD',
-            'AVAX-USD': 'Avalanche USD',
-            'DOT-USD': 'Polkadot USD',
-            'MATIC-USD': 'Polygon USD',
-            'LINK-USD': 'Chainlink USD',
-            'ATOM-USD': 'Cosmos USD',
-            'UNI-USD': 'Uniswap USD',
-            'LTC-USD': 'Litecoin USD',
-            
-            # Indices (for reference)
-            '^GSPC': 'S&P 500 Index',
-            '^DJI': 'Dow Jones Industrial Average',
-            '^IXIC': 'NASDAQ Composite',
-            '^RUT': 'Russell 2000 Index',
-            '^VIX': 'CBOE Volatility Index',
-            
-            # Commodities
-            'GC=F': 'Gold Futures',
-            'SI=F': 'Silver Futures',
-            'CL=F': 'Crude Oil Futures',
-            'NG=F': 'Natural Gas Futures',
-            'HG=F': 'Copper Futures',
-        }
-        
-        query_upper = query.upper()
-        
-        # Search through common symbols
-        for symbol, name in common_symbols.items():
-            if query_upper in symbol.upper() or query_upper in name.upper():
-                # Check if already in results
-                if not any(r['symbol'] == symbol for r in results):
-                    # Determine type
-                    if symbol.endswith('-USD'):
-                        asset_type = 'Crypto'
-                    elif symbol.startswith('^'):
-                        asset_type = 'Index'
-                    elif symbol.endswith('=F'):
-                        asset_type = 'Futures'
-                    elif symbol in ['SPY', 'QQQ', 'IWM', 'DIA', 'VTI', 'VOO', 'VXX', 'GLD', 'SLV', 'USO', 'TLT', 'HYG', 'LQD', 'EEM', 'EFA', 'VWO', 'VEA', 'IEMG', 'VNQ', 'SCHD', 'JEPI', 'SMH', 'SOXX', 'IBB', 'XBI'] or symbol.startswith('XL') or symbol.startswith('ARK'):
-                        asset_type = 'ETF'
-                    else:
-                        asset_type = 'Stock'
-                    
-                    results.append({
-                        'symbol': symbol,
-                        'name': name,
-                        'type': asset_type,
-                    })
-        
-        # If we don't have many results and query looks like a symbol, try yfinance lookup
-        if len(results) < 3 and len(query) <= 6 and query.isalpha():
-            for suffix in ['', '-USD']:
-                test_symbol = query.upper() + suffix
-                if any(r['symbol'] == test_symbol for r in results):
-                    continue
-                try:
-                    ticker = yf.Ticker(test_symbol)
-                    info = ticker.info
-                    if info and info.get('symbol') and info.get('regularMarketPrice'):
-                        quote_type = info.get('quoteType', 'EQUITY')
-                        type_map = {
-                            'EQUITY': 'Stock',
-                            'ETF': 'ETF',
-                            'MUTUALFUND': 'Mutual Fund',
-                            'CRYPTOCURRENCY': 'Crypto',
-                            'CURRENCY': 'Currency',
-                            'INDEX': 'Index',
-                            'FUTURE': 'Futures',
-                        }
-                        asset_type = type_map.get(quote_type, 'Stock')
-                        
-                        results.append({
-                            'symbol': info.get('symbol'),
-                            'name': info.get('shortName') or info.get('longName') or info.get('symbol'),
-                            'type': asset_type,
-                            'exchange': info.get('exchange', ''),
-                        })
-                except Exception:
-                    pass
-        
-        # Sort results: exact symbol matches first, then by symbol length
-        def sort_key(r):
-            symbol = r['symbol'].upper()
-            query_up = query.upper()
-            # Exact match gets priority 0
-            if symbol == query_up:
-                return (0, len(symbol))
-            # Starts with query gets priority 1
-            if symbol.startswith(query_up):
-                return (1, len(symbol))
-            # Contains query gets priority 2
-            return (2, len(symbol))
-        
-        results.sort(key=sort_key)
-        
-        # Limit to 15 results
-        results = results[:15]
+        # Local index; Yahoo is only asked about unknown symbols with no local match, or submitted ones
+        results = search_symbols(query, exact=exact)
         
     except Exception as e:
         print(f"Search error: {e}")
@@ -411,6 +121,7 @@ def stock_detail(request):
     Query params:
     - symbol: Ticker symbol (required)
     - timeframe: day, week, month, year (optional, default: day)
+    - timestamps: label (default), epoch or delta (optional, epoch ms instead of axis labels)
     """
     if request.method == 'OPTIONS':
         response = JsonResponse({})
@@ -422,15 +133,18 @@ def stock_detail(request):
     
     symbol = request.GET.get('symbol')
     timeframe = request.GET.get('timeframe', 'day')
+    timestamp_mode = parse_timestamp_mode(request.GET.get('timestamps'))
     
     if not symbol:
         return JsonResponse({'error': 'Symbol parameter is required'}, status=400)
+    if timestamp_mode is None:
+        return JsonResponse({'error': f"Invalid timestamps mode: {request.GET.get('timestamps')}"}, status=400)
     
     print(f"stock_detail called for {symbol} ({timeframe})")
     
     import time
     start_time = time.time()
-    result = fetch_stock_detail(symbol, timeframe)
+    result = fetch_stock_detail(symbol, timeframe, timestamp_mode)
     elapsed = time.time() - start_time
     print(f"stock_detail completed in {elapsed:.2f}s")
     
@@ -443,6 +157,74 @@ def stock_detail(request):
     return response
 
 
+@require_http_methods(["GET", "OPTIONS"])
+def stock_bundle(request):
+    """
+    Everything the stock page needs in one request, built from one set of
+    bars and fundamentals (see stock_bundle.py).
+    
+    Query params:
+    - symbol: Ticker symbol (required)
+    - timeframe: day, week, month, year (optional, default: day)
+    - sections: comma-separated detail, indicators, signals (optional, default: all)
+    - period, interval: indicators range and bar size (optional, default: from timeframe)
+    - indicator: MACD, RSI, STOCH, MA, BB, VOLUME, ALL (optional, default: ALL)
+    - mode: historical signals mode, only exact (optional)
+    - timestamps: label (default), epoch or delta (optional)
+    """
+    if request.method == 'OPTIONS':
+        response = JsonResponse({})
+        response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+        response['Access-Control-Allow-Credentials'] = 'true'
+        response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
+        response['Access-Control-Allow-Headers'] = 'Content-Type'
+        return response
+    
+    from .indicators import VALID_INDICATORS
+    from .services import PUBLIC_SIGNAL_MODES, STOCK_TIMEFRAME_CONFIG
+    from .stock_bundle import parse_sections, stock_bundle as build_stock_bundle
+    
+    symbol = request.GET.get('symbol', '').upper()
+    timeframe = request.GET.get('timeframe', 'day')
+    sections = parse_sections(request.GET.get('sections'))
+    indicator = request.GET.get('indicator', 'ALL').upper()
+    mode = request.GET.get('mode', 'exact').lower()
+    timestamp_mode = parse_timestamp_mode(request.GET.get('timestamps'))
+    
+    error = None
+    if not symbol:
+        error = 'Symbol parameter is required'
+    elif timeframe not in STOCK_TIMEFRAME_CONFIG:
+        error = f'Invalid timeframe: {timeframe}'
+    elif sections is None:
+        error = f"Invalid sections: {request.GET.get('sections')}"
+    elif indicator not in VALID_INDICATORS:
+        error = f'Invalid indicator: {indicator}'
+    elif mode not in PUBLIC_SIGNAL_MODES:
+        error = f'Invalid mode: {mode}'
+    elif timestamp_mode is None:
+        error = f"Invalid timestamps mode: {request.GET.get('timestamps')}"
+    
+    if error:
+        result, status = {'error': error}, 400
+    else:
+        start_time = time.time()
+        result = build_stock_bundle(
+            symbol, timeframe, sections, timestamp_mode,
+            period=request.GET.get('period'), interval=request.GET.get('interval'),
+            indicator=indicator, mode=mode
+        )
+        print(f"stock_bundle for {symbol} ({timeframe}, {','.join(sections)}) completed in {time.time() - start_time:.2f}s")
+        status = 200
+        if result is None:
+            result, status = {'error': f'Failed to fetch data for {symbol}'}, 404
+    
+    response = JsonResponse(result, status=status)
+    response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+    response['Access-Control-Allow-Credentials'] = 'true'
+    return response
+
+
 @require_http_methods(["GET", "OPTIONS"])
 def live_screens(request):
     """
@@ -493,6 +275,224 @@ def live_screens(request):
         return response
 
 
+@require_http_methods(["GET"])
+async def live_screens_stream(request):
+    """
+    Server-sent events for live screens (see screen_stream).
+    
+    Query params:
+    - screens: Comma-separated screen IDs to receive (optional, default all)
+    
+    Sends a 'screens' event with the current screens, then a 'delta' event
+    per new scan snapshot version. Without an ASGI server the stream closes
+    after the first event and the client reconnects on its retry interval.
+    """
+    from django.core.handlers.asgi import ASGIRequest
+    from django.http import StreamingHttpResponse
+    from .screen_stream import screen_event_stream, screen_snapshot_events
+    
+    screens_param = request.GET.get('screens', '')
+    screen_ids = [s.strip() for s in screens_param.split(',') if s.strip()] or None
+    
+    if isinstance(request, ASGIRequest):
+        events = screen_event_stream(screen_ids)
+    else:
+        events = screen_snapshot_events(screen_ids)
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+    response['Access-Control-Allow-Credentials'] = 'true'
+    return response
+
+
+@require_http_methods(["GET", "OPTIONS"])
+def market_scan_status(request):
+    """
+    API endpoint for the progress of the newest sharded market scan.
+    
+    Returns the snapshot version, status, chunk and symbol counts, percent
+    done and any rate-limit cooldown.
+    """
+    if request.method == 'OPTIONS':
+        response = JsonResponse({})
+        response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+        response['Access-Control-Allow-Credentials'] = 'true'
+        response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
+        response['Access-Control-Allow-Headers'] = 'Content-Type'
+        return response
+    
+    from .market_scan import scan_progress
+    
+    progress = scan_progress()
+    if progress is None:
+        response = JsonResponse({'error': 'No market scan has run yet'}, status=404)
+    else:
+        response = JsonResponse(progress)
+    response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+    response['Access-Control-Allow-Credentials'] = 'true'
+    return response
+
+
+def _screen_response(data, status=200, methods='GET, POST, OPTIONS'):
+    """JsonResponse with the CORS headers the user screen endpoints need."""
+    response = JsonResponse(data, status=status)
+    response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+    response['Access-Control-Allow-Credentials'] = 'true'
+    response['Access-Control-Allow-Methods'] = methods
+    response['Access-Control-Allow-Headers'] = 'Content-Type, X-User-Email'
+    return response
+
+
+def _request_user(request):
+    """User from the user_email cookie or X-User-Email header, or None."""
+    from authentication.models import User
+    
+    email = request.COOKIES.get('user_email') or request.headers.get('X-User-Email')
+    if not email:
+        return None
+    return User.objects.filter(email=email, is_deleted=False).first()
+
+
+def _screen_fields(request, screen=None):
+    """
+    Validated UserScreen fields from a JSON body: name, description, limit,
+    is_active and a definition (see screen_rules). Raises ScreenRuleError.
+    """
+    from .screen_rules import SCREEN_LIMIT_MAX, ScreenRuleError, compile_screen, screen_definition
+    
+    try:
+        body = json.loads(request.body or b'{}')
+    except json.JSONDecodeError:
+        raise ScreenRuleError('Request body must be JSON')
+    if not isinstance(body, dict):
+        raise ScreenRuleError('Request body must be an object')
+    
+    fields = {}
+    if screen is None or 'definition' in body:
+        compiled = compile_screen(body.get('definition'))
+        fields['definition'] = screen_definition(compiled)
+        fields['rule_hash'] = compiled.rule_hash
+    if screen is None or 'name' in body:
+        name = str(body.get('name') or '').strip()
+        if not name:
+            raise ScreenRuleError('A screen needs a name')
+        fields['name'] = name[:100]
+    if 'description' in body:
+        fields['description'] = str(body['description'] or '')
+    if 'limit' in body:
+        try:
+            fields['limit'] = max(1, min(SCREEN_LIMIT_MAX, int(body['limit'])))
+        except (TypeError, ValueError):
+            raise ScreenRuleError('limit must be an integer')
+    if 'isActive' in body:
+        fields['is_active'] = bool(body['isActive'])
+    return fields
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST", "OPTIONS"])
+def user_screens(request):
+    """
+    API endpoint for the requesting user's custom screens.
+    
+    GET returns every saved screen with its current matches; POST creates a
+    screen from {name, description?, limit?, definition}. A definition is
+    {rule, sort?, descending?} with rule an and/or tree of
+    {field, op, value} conditions, or the RuleBuilder's {conditions, operators}.
+    """
+    if request.method == 'OPTIONS':
+        return _screen_response({})
+    
+    from .models import UserScreen
+    from .screen_rules import ScreenRuleError, user_screen_results
+    
+    user = _request_user(request)
+    if user is None:
+        return _screen_response({'error': 'Authentication required'}, status=401)
+    
+    if request.method == 'POST':
+        try:
+            fields = _screen_fields(request)
+        except ScreenRuleError as e:
+            return _screen_response({'error': str(e)}, status=400)
+        screen = UserScreen.objects.create(user=user, **fields)
+        return _screen_response({'screen': user_screen_results([screen])[0]}, status=201)
+    
+    try:
+        screens = list(UserScreen.objects.filter(user=user))
+        return _screen_response({'screens': user_screen_results(screens)})
+    except Exception as e:
+        print(f"Error running user screens: {e}")
+        return _screen_response({'error': str(e), 'screens': []}, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["GET", "PUT", "DELETE", "OPTIONS"])
+def user_screen_detail(request, screen_id):
+    """API endpoint to read (with matches), update or delete one of the user's screens."""
+    methods = 'GET, PUT, DELETE, OPTIONS'
+    if request.method == 'OPTIONS':
+        return _screen_response({}, methods=methods)
+    
+    from .models import UserScreen
+    from .screen_rules import ScreenRuleError, user_screen_results
+    
+    user = _request_user(request)
+    if user is None:
+        return _screen_response({'error': 'Authentication required'}, status=401, methods=methods)
+    screen = UserScreen.objects.filter(user=user, pk=screen_id).first()
+    if screen is None:
+        return _screen_response({'error': 'Screen not found'}, status=404, methods=methods)
+    
+    if request.method == 'DELETE':
+        screen.delete()
+        return _screen_response({'success': True}, methods=methods)
+    
+    if request.method == 'PUT':
+        try:
+            fields = _screen_fields(request, screen)
+        except ScreenRuleError as e:
+            return _screen_response({'error': str(e)}, status=400, methods=methods)
+        for field, value in fields.items():
+            setattr(screen, field, value)
+        screen.save()
+    
+    return _screen_response({'screen': user_screen_results([screen])[0]}, methods=methods)
+
+
+@csrf_exempt
+@require_http_methods(["POST", "OPTIONS"])
+def evaluate_screen(request):
+    """
+    API endpoint to preview a screen definition without saving it.
+    
+    Body: {definition, limit?}. Returns the canonical definition, its rule
+    hash, the snapshot version and the matching stocks.
+    """
+    methods = 'POST, OPTIONS'
+    if request.method == 'OPTIONS':
+        return _screen_response({}, methods=methods)
+    
+    from .screen_rules import SCREEN_LIMIT_MAX, compile_screen, run_screens, screen_definition, screen_stocks
+    
+    try:
+        body = json.loads(request.body or b'{}')
+        compiled = compile_screen(body.get('definition') if isinstance(body, dict) else None)
+        limit = max(1, min(SCREEN_LIMIT_MAX, int(body.get('limit', 10))))
+    except (TypeError, ValueError) as e:
+        # ScreenRuleError and JSONDecodeError are ValueErrors
+        return _screen_response({'error': str(e)}, status=400, methods=methods)
+    
+    version, rows, results = run_screens([compiled])
+    return _screen_response({
+        'definition': screen_definition(compiled),
+        'ruleHash': compiled.rule_hash,
+        'version': version,
+        'stocks': screen_stocks(results[compiled.rule_hash], rows, limit),
+    }, methods=methods)
+
+
 @require_http_methods(["GET", "OPTIONS"])
 def historical_signals(request):
     """
@@ -500,6 +500,13 @@ def historical_signals(request):
     Query params:
       - symbol: ticker symbol (required)
       - timeframe: 'day', 'week', 'month', 'year' (default: 'day')
+      - mode: 'exact' (optional; Monte Carlo votes are only computed by
+        batch_historical_signals)
+    
+    Results are computed by a background job and stored per last bar. Returns
+    the stored signals with status 'complete', or status 'pending' with a
+    job_id (poll historical-signals/jobs/<job_id>/ or this endpoint) and the
+    previous signals flagged 'stale' if there are any.
     """
     if request.method == 'OPTIONS':
         response = JsonResponse({})
@@ -511,17 +518,139 @@ def historical_signals(request):
     
     symbol = request.GET.get('symbol', '').upper()
     timeframe = request.GET.get('timeframe', 'day')
+    mode = request.GET.get('mode', 'exact').lower()
     
+    from .services import PUBLIC_SIGNAL_MODES
+    from .signal_store import SIGNAL_TIMEFRAMES, request_signals
+    
+    error = None
     if not symbol:
-        response = JsonResponse({'error': 'Symbol is required', 'signals': []}, status=400)
+        error = 'Symbol is required'
+    elif timeframe not in SIGNAL_TIMEFRAMES:
+        error = f'Invalid timeframe: {timeframe}'
+    elif mode not in PUBLIC_SIGNAL_MODES:
+        error = f'Invalid mode: {mode}'
+    if error:
+        response = JsonResponse({'error': error, 'signals': []}, status=400)
         response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
         response['Access-Control-Allow-Credentials'] = 'true'
         return response
     
-    from .services import get_historical_signals
-    result = get_historical_signals(symbol, timeframe)
+    result = request_signals(symbol, timeframe, mode)
     
-    response = JsonResponse(result)
+    response = JsonResponse(result, status=202 if result['status'] == 'pending' else 200)
+    response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+    response['Access-Control-Allow-Credentials'] = 'true'
+    return response
+
+
+@require_http_methods(["GET", "OPTIONS"])
+def historical_signals_job(request, job_id):
+    """
+    Status of a historical signals job.
+    Returns {'status': 'pending'|'complete'|'failed', 'job_id', 'signals', 'error', 'last_bar_ts'}.
+    """
+    if request.method == 'OPTIONS':
+        response = JsonResponse({})
+        response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+        response['Access-Control-Allow-Credentials'] = 'true'
+        response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
+        response['Access-Control-Allow-Headers'] = 'Content-Type'
+        return response
+    
+    from .signal_store import jobs
+    
+    job = jobs.get_job(job_id)
+    if job is None:
+        response = JsonResponse({'error': f'Unknown job: {job_id}', 'signals': []}, status=404)
+    else:
+        response = JsonResponse(jobs.job_body(job), status=202 if job.status == 'pending' else 200)
+    response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+    response['Access-Control-Allow-Credentials'] = 'true'
+    return response
+
+
+@require_http_methods(["GET", "OPTIONS"])
+def backtest_summary(request):
+    """
+    Backtest summary of a signal source over the scan universe.
+    Query params:
+      - source: 'overall' (default, per-bar overallSignal)
+      - period: '1y', '2y', '5y' or '10y' (default: '10y') of daily bars
+      - mode: 'long_only' (default) or 'long_short'
+      - cost_bps: trading cost per position change in basis points, one of
+        0, 1, 2, 5, 10, 20, 50, 100 (default: 0)
+    
+    Returns the equal-weight portfolio stats, per-ticker medians and one row
+    per ticker (best total return first) with status 'complete'. Summaries are
+    computed by a background job and stored per parameter set; until one is
+    ready the response is 202 with status 'pending', a job_id (poll
+    backtest/summary/jobs/<job_id>/ or this endpoint) and the previous summary
+    flagged 'stale' if there is one.
+    """
+    if request.method == 'OPTIONS':
+        response = JsonResponse({})
+        response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+        response['Access-Control-Allow-Credentials'] = 'true'
+        response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
+        response['Access-Control-Allow-Headers'] = 'Content-Type'
+        return response
+    
+    from .backtest import BACKTEST_MODES, BACKTEST_PERIODS, BACKTEST_SOURCES
+    from .backtest_store import BACKTEST_COST_BPS, request_summary
+    
+    source = request.GET.get('source', 'overall').lower()
+    period = request.GET.get('period', '10y').lower()
+    mode = request.GET.get('mode', 'long_only').lower()
+    try:
+        cost_bps = float(request.GET.get('cost_bps', 0))
+    except ValueError:
+        cost_bps = -1
+    
+    error = None
+    if source not in BACKTEST_SOURCES:
+        error = f'Invalid source: {source}'
+    elif period not in BACKTEST_PERIODS:
+        error = f'Invalid period: {period}'
+    elif mode not in BACKTEST_MODES:
+        error = f'Invalid mode: {mode}'
+    elif cost_bps not in BACKTEST_COST_BPS:
+        error = f'cost_bps must be one of {", ".join(str(c) for c in BACKTEST_COST_BPS)}'
+    if error:
+        response = JsonResponse({'error': error}, status=400)
+        response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+        response['Access-Control-Allow-Credentials'] = 'true'
+        return response
+    
+    result = request_summary(period, source, mode, int(cost_bps))
+    
+    response = JsonResponse(result, status=202 if result['status'] == 'pending' else 200)
+    response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+    response['Access-Control-Allow-Credentials'] = 'true'
+    return response
+
+
+@require_http_methods(["GET", "OPTIONS"])
+def backtest_summary_job(request, job_id):
+    """
+    Status of a backtest summary job.
+    Returns the summary fields with 'status': 'pending'|'complete'|'failed', 'job_id' and 'error'.
+    """
+    if request.method == 'OPTIONS':
+        response = JsonResponse({})
+        response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
+        response['Access-Control-Allow-Credentials'] = 'true'
+        response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
+        response['Access-Control-Allow-Headers'] = 'Content-Type'
+        return response
+    
+    from .backtest_store import jobs
+    
+    job = jobs.get_job(job_id)
+    if job is None:
+        response = JsonResponse({'error': f'Unknown job: {job_id}'}, status=404)
+    else:
+        response = JsonResponse(jobs.job_body(job), status=202 if job.status == 'pending' else 200)
     response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
     response['Access-Control-Allow-Credentials'] = 'true'
     return response
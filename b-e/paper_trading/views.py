@@ -1447,6 +1447,8 @@ def option_contract_detail_view(request):
     GET /api/paper-trading/options/contract/?symbol=AAPL250221C00200000
     
     Returns bid/ask/volume/greeks and underlying price for a specific contract.
+    Optional ?timestamps=epoch|delta returns chart timestamps as epoch ms
+    (delta: first value, then bar-to-bar gaps) instead of datetime strings.
     """
     if request.method == "OPTIONS":
         return options_response()
@@ -1455,6 +1457,17 @@ def option_contract_detail_view(request):
     if not contract_symbol:
         return cors_response({'error': 'Contract symbol parameter required'}, status=400)
     
+    from financial_data.timestamps import encode_timestamps, parse_timestamp_mode
+    timestamp_mode = parse_timestamp_mode(request.GET.get('timestamps'))
+    if timestamp_mode is None:
+        return cors_response({'error': f"Invalid timestamps mode: {request.GET.get('timestamps')}"}, status=400)
+    
+    def contract_timestamps(index):
+        # Default keeps the original str(ts) format for existing clients
+        if timestamp_mode == 'label':
+            return [str(ts) for ts in index.tolist()]
+        return encode_timestamps(index, timestamp_mode)['timestamps']
+    
     try:
         import yfinance as yf
         import pandas as pd
@@ -1574,7 +1587,7 @@ def option_contract_detail_view(request):
             hist = option_ticker.history(period=yf_period, interval=yf_interval)
             if not hist.empty and 'Close' in hist.columns:
                 historical_prices = [round(float(p), 2) for p in hist['Close'].dropna().tolist()]
-                timestamps = [str(ts) for ts in hist.index.tolist()]
+                timestamps = contract_timestamps(hist.index)
         except Exception as hist_err:
             print(f"Could not fetch historical data for {contract_symbol}: {hist_err}")
             # Try with shorter period if the requested one fails
@@ -1582,7 +1595,7 @@ def option_contract_detail_view(request):
                 hist = option_ticker.history(period="5d", interval="1h")
                 if not hist.empty and 'Close' in hist.columns:
                     historical_prices = [round(float(p), 2) for p in hist['Close'].dropna().tolist()]
-                    timestamps = [str(ts) for ts in hist.index.tolist()]
+                    timestamps = contract_timestamps(hist.index)
             except:
                 pass
         
@@ -0,0 +1,66 @@
+import { applyScreensDelta } from '@/lib/screenDelta';
+import { LiveScreen, LiveScreenStock } from '@/types/screens';
+
+const stock = (symbol: string, rank: number, price: number, sparkline: number[]): LiveScreenStock => ({
+  symbol,
+  name: symbol,
+  price,
+  change: 1,
+  valueChange: 0.5,
+  sparkline,
+  timeframe: 'day',
+  screenReason: 'reason',
+  rank,
+});
+
+const screen = (id: string, stocks: LiveScreenStock[]): LiveScreen => ({
+  id,
+  title: id,
+  description: '',
+  icon: '',
+  category: 'momentum',
+  stocks,
+  generatedAt: 'g1',
+  expiresAt: 'e1',
+});
+
+describe('applyScreensDelta', () => {
+  test('applies entries, exits, ranks and sparkline tails', () => {
+    const quiet = screen('quiet', [stock('ZZZ', 1, 5, [1])]);
+    const screens = [
+      screen('movers', [stock('AAA', 1, 10, [1, 2, 3]), stock('BBB', 2, 20, [4, 5]), stock('CCC', 3, 30, [6])]),
+      quiet,
+    ];
+
+    const next = applyScreensDelta(screens, {
+      version: '2',
+      from: '1',
+      screens: {
+        movers: {
+          entered: [stock('DDD', 3, 40, [7])],
+          exited: ['CCC'],
+          ranks: { BBB: 1, AAA: 2 },
+          updates: { BBB: { price: 21, sparklineTail: [5, 6], sparklineLength: 3 } },
+          generatedAt: 'g2',
+        },
+      },
+    });
+
+    expect(next[0].stocks.map((s) => s.symbol)).toEqual(['BBB', 'AAA', 'DDD']);
+    expect(next[0].stocks[0].price).toBe(21);
+    expect(next[0].stocks[0].sparkline).toEqual([4, 5, 6]);
+    expect(next[0].generatedAt).toBe('g2');
+    expect(next[1]).toBe(quiet);
+  });
+
+  test('removes and adds whole screens', () => {
+    const added = screen('new', []);
+    const next = applyScreensDelta([screen('old', [])], {
+      version: '2',
+      from: '1',
+      screens: { old: { removed: true }, new: { screen: added } },
+    });
+
+    expect(next).toEqual([added]);
+  });
+});
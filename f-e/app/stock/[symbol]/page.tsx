@@ -50,6 +50,9 @@ export default function StockDetailPage() {
   const [toast, setToast] = useState<{ message: string; type: 'success' | 'info' | 'watchlist' | 'error'; link?: string } | null>(null);
   const abortControllerRef = useRef<AbortController | null>(null);
   const intervalAbortRef = useRef<AbortController | null>(null);
+  // symbol|period|interval whose chart data comes from the stock-bundle response
+  const bundleKeyRef = useRef<string | null>(null);
+  const selectedIntervalRef = useRef<IntervalType>(selectedInterval);
   const chartRef = useRef<HTMLDivElement>(null);
   
   // Pinch-to-zoom for mobile charts
@@ -147,6 +150,11 @@ export default function StockDetailPage() {
     }
   };
 
+  useEffect(() => {
+    selectedIntervalRef.current = selectedInterval;
+  }, [selectedInterval]);
+
+  // Detail and chart data for a symbol/period arrive together from the stock-bundle endpoint
   useEffect(() => {
     const fetchStockData = async () => {
       // Abort any in-flight request
@@ -163,6 +171,10 @@ export default function StockDetailPage() {
       }
       setError(null);
       
+      const interval = selectedIntervalRef.current;
+      bundleKeyRef.current = `${symbol}|${selectedPeriod}|${interval}`;
+      setIntervalChartData(prev => ({ ...prev, loading: true }));
+      
       try {
         // Map period to backend timeframe format
         const periodToTimeframe: Record<PeriodType, string> = {
@@ -173,7 +185,7 @@ export default function StockDetailPage() {
         };
         
         const res = await fetch(
-          `${process.env.NEXT_PUBLIC_BACKEND_URL || 'http://127.0.0.1:8000'}/api/market-data/stock-detail/?symbol=${encodeURIComponent(symbol)}&timeframe=${periodToTimeframe[selectedPeriod]}`,
+          `${process.env.NEXT_PUBLIC_BACKEND_URL || 'http://127.0.0.1:8000'}/api/market-data/stock-bundle/?symbol=${encodeURIComponent(symbol)}&timeframe=${periodToTimeframe[selectedPeriod]}&sections=detail,indicators&period=${selectedPeriod}&interval=${interval}&indicator=ALL`,
           { signal: controller.signal }
         );
         
@@ -182,12 +194,17 @@ export default function StockDetailPage() {
         }
         
         const data = await res.json();
-        setStockData(data);
+        if (!data.detail) {
+          throw new Error(data.errors?.detail || 'Failed to load stock data');
+        }
+        setStockData(data.detail);
+        setIntervalChartData({ sparkline: data.indicators?.closes || [], loading: false });
         setIsInitialLoad(false);
       } catch (err: any) {
         if (err.name === 'AbortError') return;
         console.error('Error fetching stock data:', err);
         setError(err.message || 'Failed to load stock data');
+        setIntervalChartData({ sparkline: [], loading: false });
       } finally {
         setLoading(false);
       }
@@ -202,8 +219,14 @@ export default function StockDetailPage() {
     };
   }, [symbol, selectedPeriod]);
 
-  // Fetch interval-specific chart data when period or interval changes (debounced)
+  // Fetch interval-specific chart data when only the interval changes (debounced)
   useEffect(() => {
+    // The stock-bundle request above already covers this symbol/period/interval
+    if (bundleKeyRef.current === `${symbol}|${selectedPeriod}|${selectedInterval}`) {
+      return;
+    }
+    bundleKeyRef.current = null;
+    
     // Set loading state immediately
     setIntervalChartData(prev => ({ ...prev, loading: true }));
     
@@ -1006,8 +1006,9 @@ function WatchlistPageContent() {
     }
   }, [isSearchOpen]);
 
-  // Search function that calls the backend API
-  const performSearch = React.useCallback(async (query: string) => {
+  // Search function that calls the backend API; `exact` (Enter) asks the backend
+  // to look up a ticker it doesn't list, which type-ahead never does
+  const performSearch = React.useCallback(async (query: string, exact: boolean = false) => {
     if (query.length < 1) {
       setSearchResults([]);
       setSearchLoading(false);
@@ -1026,7 +1027,7 @@ function WatchlistPageContent() {
 
     try {
       const res = await fetch(
-        `${process.env.NEXT_PUBLIC_BACKEND_URL || 'http://127.0.0.1:8000'}/api/market-data/search/?q=${encodeURIComponent(query)}`,
+        `${process.env.NEXT_PUBLIC_BACKEND_URL || 'http://127.0.0.1:8000'}/api/market-data/search/?q=${encodeURIComponent(query)}${exact ? '&exact=1' : ''}`,
         { signal: controller.signal }
       );
 
@@ -3659,6 +3660,14 @@ function WatchlistPageContent() {
                 placeholder="Search stocks, ETFs, crypto..."
                 value={searchQuery}
                 onChange={(e) => handleSearchChange(e.target.value)}
+                onKeyDown={(e) => {
+                  if (e.key === 'Enter' && searchQuery.trim()) {
+                    if (searchDebounceRef.current) {
+                      clearTimeout(searchDebounceRef.current);
+                    }
+                    performSearch(searchQuery.trim(), true);
+                  }
+                }}
                 className="flex-1 bg-transparent outline-none text-gray-900 dark:text-white placeholder-gray-400"
                 autoFocus
               />
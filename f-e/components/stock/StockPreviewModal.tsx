@@ -612,14 +612,20 @@ export default function StockPreviewModal({
         };
         const tf = timeframeMap[selectedTimeframe] || 'day';
         
-        const response = await fetch(
-          `${process.env.NEXT_PUBLIC_BACKEND_URL || 'http://127.0.0.1:8000'}/api/market-data/historical-signals/?symbol=${encodeURIComponent(symbol)}&timeframe=${tf}`,
-          { signal: controller.signal }
-        );
+        const url = `${process.env.NEXT_PUBLIC_BACKEND_URL || 'http://127.0.0.1:8000'}/api/market-data/historical-signals/?symbol=${encodeURIComponent(symbol)}&timeframe=${tf}`;
         
-        if (response.ok) {
+        // Signals are computed by a background job - show any stale signals
+        // right away and poll until the job completes
+        for (let attempt = 0; attempt < 15; attempt++) {
+          const response = await fetch(url, { signal: controller.signal });
+          if (!response.ok) break;
+          
           const data = await response.json();
           setHistoricalSignals(data.signals || []);
+          if (data.status !== 'pending') break;
+          
+          await new Promise(resolve => setTimeout(resolve, (data.retryAfter || 2) * 1000));
+          if (controller.signal.aborted) return;
         }
       } catch (error) {
         if ((error as Error).name === 'AbortError') return;
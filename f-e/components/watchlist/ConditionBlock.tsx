@@ -2,7 +2,7 @@
 
 import React from 'react';
 
-export type MetricCategory = 'MACD' | 'RSI' | 'Volume' | 'Price Action';
+export type MetricCategory = 'RSI' | 'Volume' | 'Price Action';
 export type Comparator = 'gt' | 'lt' | 'crosses_above' | 'crosses_below';
 
 export type Condition = {
@@ -19,8 +19,8 @@ type Props = {
   onDelete?: (id: string) => void;
 };
 
+// Metrics scan screens can evaluate (see FIELD_ALIASES in financial_data/screen_rules.py)
 const metricsMap: Record<MetricCategory, string[]> = {
-  MACD: ['MACD Line', 'Signal Line', 'MACD Histogram'],
   RSI: ['RSI'],
   Volume: ['Today Volume', '20-Day Avg Volume'],
   'Price Action': ['Price', '20-Day SMA'],
@@ -47,7 +47,7 @@ export default function ConditionBlock({ condition, onChange, onDelete }: Props)
         <div>
           <label className="text-xs text-gray-500 dark:text-gray-400">Metric Line</label>
           <select
-            value={condition.metric ?? metricsMap.RSI[0]}
+            value={condition.metric ?? (metricsMap[condition.category ?? 'RSI'] || metricsMap.RSI)[0]}
             onChange={(e) => update({ metric: e.target.value })}
             className="mt-1 block w-full rounded-md border border-gray-200 dark:border-gray-700 bg-white dark:bg-gray-900 px-2 py-1 text-sm"
           >
@@ -2,6 +2,7 @@
 
 import { useState, useEffect, useRef, useCallback } from 'react';
 import { LiveScreen, ScreenId } from '@/types/screens';
+import { applyScreensDelta, ScreensDeltaEvent } from '@/lib/screenDelta';
 
 // Re-export types for convenience
 export type { LiveScreen, LiveScreenStock, ScreenId, ScreenCategory } from '@/types/screens';
@@ -30,6 +31,8 @@ interface UseLiveScreensDataReturn {
  * - Lazy loading: Only fetches when tab is active
  * - Caching: Data persists when tab is inactive (not re-fetched)
  * - Tab-aware polling: Polling pauses when tab is inactive
+ * - Server push: while the tab is active, screens arrive as deltas per scan
+ *   version over an EventSource stream; polling only runs while it is down
  * - Auto-retry with exponential backoff on failure
  */
 export function useLiveScreensData({
@@ -55,6 +58,9 @@ export function useLiveScreensData({
   const retryCountRef = useRef(0);
   const fetchInProgressRef = useRef(false);
   const fetchDebounceRef = useRef<NodeJS.Timeout | null>(null);
+  const eventSourceRef = useRef<EventSource | null>(null);
+  const streamOpenRef = useRef(false);
+  const versionRef = useRef<string | null>(null);
 
   // Health check
   const checkBackendHealth = useCallback(async (): Promise<boolean> => {
@@ -241,10 +247,12 @@ export function useLiveScreensData({
       pollingRef.current = null;
     }
 
-    // Only poll if active and we have data
+    // Only poll if active and we have data (skipped while the stream is open)
     if (isActive && hasFetchedRef.current) {
       pollingRef.current = setInterval(() => {
-        fetchData(false);
+        if (!streamOpenRef.current) {
+          fetchData(false);
+        }
       }, pollingInterval);
     }
 
@@ -256,6 +264,64 @@ export function useLiveScreensData({
     };
   }, [isActive, pollingInterval, fetchData]);
 
+  // Stream screen deltas while the tab is active
+  const screenIdsKey = (selectedScreenIds ?? []).join(',');
+  useEffect(() => {
+    if (process.env.NODE_ENV === 'test' || typeof EventSource === 'undefined') return;
+    if (!isActive) return;
+
+    const screensParam = screenIdsKey ? `?screens=${screenIdsKey}` : '';
+    const url = `${process.env.NEXT_PUBLIC_BACKEND_URL || 'http://127.0.0.1:8000'}/api/market-data/live-screens/stream/${screensParam}`;
+
+    const open = () => {
+      const source = new EventSource(url, { withCredentials: true });
+      eventSourceRef.current = source;
+
+      source.onopen = () => {
+        streamOpenRef.current = true;
+      };
+      source.onerror = () => {
+        // EventSource reconnects by itself; poll until it does
+        streamOpenRef.current = false;
+      };
+      source.addEventListener('screens', (event) => {
+        if (!isMountedRef.current) return;
+        const json = JSON.parse((event as MessageEvent).data);
+        versionRef.current = json.version;
+        setData(json.screens || []);
+        setError(null);
+        setLoading(false);
+        setWarmingUp(false);
+        setLastFetched(Date.now());
+        hasFetchedRef.current = true;
+      });
+      source.addEventListener('delta', (event) => {
+        if (!isMountedRef.current) return;
+        const delta: ScreensDeltaEvent = JSON.parse((event as MessageEvent).data);
+        if (delta.from !== versionRef.current) {
+          // Missed a version: reconnect for the full screens
+          source.close();
+          open();
+          return;
+        }
+        versionRef.current = delta.version;
+        if (Object.keys(delta.screens).length > 0) {
+          setData((prev) => applyScreensDelta(prev, delta));
+        }
+        setLastFetched(Date.now());
+      });
+    };
+
+    open();
+
+    return () => {
+      eventSourceRef.current?.close();
+      eventSourceRef.current = null;
+      streamOpenRef.current = false;
+      versionRef.current = null;
+    };
+  }, [isActive, screenIdsKey]);
+
   // Refetch when selectedScreenIds changes (but not on initial mount)
   const prevScreenIdsRef = useRef<string>((selectedScreenIds ?? []).join(','));
   useEffect(() => {
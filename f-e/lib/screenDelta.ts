@@ -0,0 +1,76 @@
+/**
+ * Applies live screen deltas from /api/market-data/live-screens/stream/
+ */
+import { LiveScreen, LiveScreenStock } from '@/types/screens';
+
+export interface StockUpdate extends Partial<LiveScreenStock> {
+  sparklineTail?: number[];
+  sparklineLength?: number;
+}
+
+export interface ScreenChanges {
+  screen?: LiveScreen; // A screen that was not in the previous version
+  removed?: boolean;
+  entered?: LiveScreenStock[];
+  exited?: string[];
+  ranks?: Record<string, number>;
+  updates?: Record<string, StockUpdate>;
+  generatedAt?: string;
+  expiresAt?: string;
+  refreshInterval?: number;
+}
+
+export interface ScreensDeltaEvent {
+  version: string;
+  from: string;
+  screens: Record<string, ScreenChanges>;
+}
+
+function applyStockUpdate(stock: LiveScreenStock, update: StockUpdate): LiveScreenStock {
+  const { sparklineTail, sparklineLength, ...fields } = update;
+  const next = { ...stock, ...fields };
+  if (sparklineTail && sparklineLength !== undefined) {
+    next.sparkline = [...stock.sparkline.slice(0, -1), ...sparklineTail].slice(-sparklineLength);
+  }
+  return next;
+}
+
+function applyScreenChanges(screen: LiveScreen, changes: ScreenChanges): LiveScreen {
+  const exited = new Set(changes.exited ?? []);
+  const stocks = screen.stocks
+    .filter((stock) => !exited.has(stock.symbol))
+    .map((stock) => {
+      const update = changes.updates?.[stock.symbol];
+      const rank = changes.ranks?.[stock.symbol];
+      const next = update ? applyStockUpdate(stock, update) : stock;
+      return rank !== undefined ? { ...next, rank } : next;
+    })
+    .concat(changes.entered ?? [])
+    .sort((a, b) => (a.rank ?? 0) - (b.rank ?? 0));
+
+  return {
+    ...screen,
+    stocks,
+    generatedAt: changes.generatedAt ?? screen.generatedAt,
+    expiresAt: changes.expiresAt ?? screen.expiresAt,
+    refreshInterval: changes.refreshInterval ?? screen.refreshInterval,
+  };
+}
+
+/** Screens after a 'delta' event. Screens without changes are returned as-is. */
+export function applyScreensDelta(screens: LiveScreen[], delta: ScreensDeltaEvent): LiveScreen[] {
+  const known = new Set(screens.map((screen) => screen.id));
+  const next = screens
+    .filter((screen) => !delta.screens[screen.id]?.removed)
+    .map((screen) => {
+      const changes = delta.screens[screen.id];
+      if (!changes) return screen;
+      return changes.screen ?? applyScreenChanges(screen, changes);
+    });
+  for (const changes of Object.values(delta.screens)) {
+    if (changes.screen && !known.has(changes.screen.id)) {
+      next.push(changes.screen);
+    }
+  }
+  return next;
+}